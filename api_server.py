@@ -0,0 +1,387 @@
+"""
+Headless JSON-HTTP-API für den Schalsteinmauer Betonrechner
+Stellt calculate_all(), Batch-Berechnungen sowie Grafik- und PDF-Export
+ohne Streamlit bereit (z.B. für Webshop und ERP)
+
+Start:
+    python api_server.py --host 127.0.0.1 --port 8000 --workers 4
+
+Endpunkte:
+    GET  /health              Statusabfrage
+    POST /calculate           Einzelberechnung (Parameter wie calculate_all)
+    POST /batch               {"walls": [...]} → {"results": [...]}
+    POST /project             {"walls": [...], "cement_price": ...} → Projektsumme
+    POST /figure?view=2d      Plotly-Figure als JSON (view: 2d, 3d, top)
+    POST /pdf                 PDF-Bericht (application/pdf)
+"""
+
+import argparse
+import inspect
+import json
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from calculations import calculate_all
+from instrumentation import span
+from project import PROJECT_PRICES, aggregate_walls, project_rows
+
+try:
+    import orjson
+except ImportError:  # optional, schnellere JSON-Kodierung
+    orjson = None
+
+
+# Erlaubte Parameter für calculate_all (einmalig ermittelt)
+CALCULATE_PARAMS = frozenset(inspect.signature(calculate_all).parameters)
+
+# Obergrenzen zum Schutz des Servers
+MAX_BODY_BYTES = 5 * 1024 * 1024
+MAX_BATCH_SIZE = 10000
+
+# Parameter, die keine Zahlen sind
+NON_NUMERIC_PARAMS = frozenset({'stone_type', 'is_two_zone', 'openings'})
+
+
+def dumps(data) -> bytes:
+    """
+    Kodiert Daten kompakt als JSON (orjson, falls installiert)
+
+    Args:
+        data: JSON-serialisierbare Daten
+
+    Returns:
+        UTF-8-kodiertes JSON
+    """
+    with span('json.serialize'):
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def parse_wall_params(payload) -> Dict:
+    """
+    Prüft die Parameter einer Mauer aus einem JSON-Request
+
+    Args:
+        payload: Dekodierter JSON-Body
+
+    Returns:
+        Parameter-Dictionary für calculate_all()
+
+    Raises:
+        ValueError: bei ungültigen Parametern
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Mauer-Parameter müssen ein JSON-Objekt sein!")
+
+    unknown = set(payload) - CALCULATE_PARAMS
+    if unknown:
+        raise ValueError(f"Unbekannte Parameter: {', '.join(sorted(unknown))}")
+
+    missing = {'length', 'start_height', 'end_height', 'width', 'stone_type'} - set(payload)
+    if missing:
+        raise ValueError(f"Fehlende Parameter: {', '.join(sorted(missing))}")
+
+    params = dict(payload)
+    for key, value in payload.items():
+        if key in NON_NUMERIC_PARAMS or value is None:
+            continue
+        try:
+            if isinstance(value, bool):
+                raise TypeError(key)
+            params[key] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Ungültiger Wert für {key}: Zahl erwartet!")
+
+    if not isinstance(params['stone_type'], str):
+        raise ValueError("Ungültiger Wert für stone_type: Text erwartet!")
+    if params.get('is_two_zone') is not None and not isinstance(params['is_two_zone'], bool):
+        raise ValueError("Ungültiger Wert für is_two_zone: true oder false erwartet!")
+    if params.get('openings') is not None and not isinstance(params['openings'], list):
+        raise ValueError("Ungültiger Wert für openings: Liste erwartet!")
+    return params
+
+
+def run_batch(params: List[Dict]) -> bytes:
+    """
+    Berechnet mehrere Mauern einzeln
+    (läuft im Worker-Pool)
+
+    Args:
+        params: Parameter je Mauer für calculate_all()
+
+    Returns:
+        Antwort-JSON {"results": [...]} als Bytes
+    """
+    return dumps({'results': [calculate_all(**p) for p in params]})
+
+
+def run_project(params: List[Dict], prices: Dict) -> bytes:
+    """
+    Berechnet ein Projekt mit gemeinsamer Rundung
+    (läuft im Worker-Pool)
+
+    Args:
+        params: Parameter je Mauer für aggregate_walls() (mit name)
+        prices: Projektpreise (Schlüssel aus PROJECT_PRICES)
+
+    Returns:
+        Antwort-JSON als Bytes
+    """
+    result = aggregate_walls(params, **prices)
+    return dumps({
+        'totals': result.totals,
+        'standalone_totals': result.standalone_totals,
+        'savings': result.savings,
+        'stones_by_type': result.stones_by_type,
+        'costs': result.costs,
+        'walls': project_rows(result)
+    })
+
+
+def render_figure(params: Dict, view: str) -> bytes:
+    """
+    Berechnet die Mauer und erstellt eine Plotly-Figure als JSON
+    (läuft im Worker-Pool)
+
+    Args:
+        params: Parameter für calculate_all()
+        view: '2d', '3d' oder 'top'
+
+    Returns:
+        Figure-JSON als Bytes
+    """
+    from visualization import create_2d_view, create_3d_view, create_top_view
+
+    result = calculate_all(**params)
+    if 'error' in result:
+        raise ValueError(result['error'])
+
+    views = {'2d': create_2d_view, '3d': create_3d_view, 'top': create_top_view}
+    fig = views[view](result['layout'], params['width'] / 100)
+    with span('json.serialize'):
+        return fig.to_json().encode('utf-8')
+
+
+def render_pdf(params: Dict) -> bytes:
+    """
+    Berechnet die Mauer und erstellt den PDF-Bericht
+    (läuft im Worker-Pool)
+
+    Args:
+        params: Parameter für calculate_all()
+
+    Returns:
+        PDF-Daten
+    """
+    from pdf_export import create_pdf_report
+    from visualization import create_2d_view
+
+    result = calculate_all(**params)
+    if 'error' in result:
+        raise ValueError(result['error'])
+
+    inputs = {
+        'length': params['length'],
+        'start_height': params['start_height'],
+        'end_height': params['end_height'],
+        'width': params['width']
+    }
+    fig_2d = create_2d_view(result['layout'], params['width'] / 100)
+    return create_pdf_report(result, inputs, fig_2d).getvalue()
+
+
+class APIServer(ThreadingHTTPServer):
+    """HTTP-Server mit begrenztem Worker-Pool für rechenintensive Endpunkte"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        workers: int = 4,
+        use_processes: bool = False,
+        max_pending: Optional[int] = None
+    ):
+        super().__init__(address, APIRequestHandler)
+
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor: Executor = pool_class(max_workers=workers)
+
+        # Begrenzte Warteschlange: volle Queue → 503 statt unbegrenztem Rückstau
+        self.pending = threading.BoundedSemaphore(max_pending or workers * 4)
+
+    def submit(self, fn, *args):
+        """
+        Führt eine Aufgabe im Worker-Pool aus und wartet auf das Ergebnis
+
+        Returns:
+            Ergebnis der Aufgabe oder None, wenn der Pool ausgelastet ist
+        """
+        if not self.pending.acquire(blocking=False):
+            return None
+        try:
+            return self.executor.submit(fn, *args).result()
+        finally:
+            self.pending.release()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """Request-Handler mit Keep-Alive (HTTP/1.1)"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MauerPlanerAPI/1.0'
+
+    # Header und Body werden getrennt geschrieben; ohne TCP_NODELAY
+    # bremst Nagle + Delayed-ACK jede Keep-Alive-Antwort um ~40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Kein Logging pro Request (Durchsatz)
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str = 'application/json'):
+        """Sendet eine Antwort mit Content-Length (Voraussetzung für Keep-Alive)"""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, data):
+        self.send_body(status, dumps(data))
+
+    def send_error_json(self, status: int, message: str):
+        self.send_json(status, {'error': message})
+
+    def send_pooled(self, fn, *args, content_type: str = 'application/json'):
+        """Führt fn im Worker-Pool aus und sendet das Ergebnis (503, wenn der Pool ausgelastet ist)"""
+        body = self.server.submit(fn, *args)
+        if body is None:
+            self.send_error_json(503, "Server ausgelastet, bitte später erneut versuchen")
+        else:
+            self.send_body(200, body, content_type)
+
+    def read_json(self):
+        """
+        Liest und dekodiert den JSON-Body
+
+        Raises:
+            ValueError: bei fehlendem, zu großem oder ungültigem Body
+        """
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            raise ValueError("Leerer Request-Body!")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ValueError("Request-Body zu groß!")
+
+        raw = self.rfile.read(length)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise ValueError("Ungültiges JSON!")
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        else:
+            self.send_error_json(404, "Unbekannter Endpunkt")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        routes = {
+            '/calculate': self.handle_calculate,
+            '/batch': self.handle_batch,
+            '/project': self.handle_project,
+            '/figure': self.handle_figure,
+            '/pdf': self.handle_pdf
+        }
+        handler = routes.get(url.path)
+        if handler is None:
+            # Body verwerfen, damit die Verbindung weiter nutzbar bleibt
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            self.send_error_json(404, "Unbekannter Endpunkt")
+            return
+
+        try:
+            payload = self.read_json()
+            handler(payload, parse_qs(url.query))
+        except ValueError as e:
+            self.send_error_json(400, str(e))
+        except Exception as e:
+            self.send_error_json(500, f"Interner Fehler: {e}")
+
+    def handle_calculate(self, payload, query: Dict):
+        result = calculate_all(**parse_wall_params(payload))
+        self.send_json(400 if 'error' in result else 200, result)
+
+    def handle_batch(self, payload, query: Dict):
+        walls = payload.get('walls') if isinstance(payload, dict) else None
+        if not isinstance(walls, list):
+            raise ValueError("Erwartet: {\"walls\": [...]}")
+        if len(walls) > MAX_BATCH_SIZE:
+            raise ValueError(f"Maximal {MAX_BATCH_SIZE} Mauern pro Batch!")
+
+        self.send_pooled(run_batch, [parse_wall_params(wall) for wall in walls])
+
+    def handle_project(self, payload, query: Dict):
+        walls = payload.get('walls') if isinstance(payload, dict) else None
+        if not isinstance(walls, list):
+            raise ValueError("Erwartet: {\"walls\": [...]}")
+        if len(walls) > MAX_BATCH_SIZE:
+            raise ValueError(f"Maximal {MAX_BATCH_SIZE} Mauern pro Projekt!")
+
+        params = []
+        for wall in walls:
+            # Name ist nur für den Bericht, kein Parameter von calculate_all()
+            if isinstance(wall, dict):
+                wall = dict(wall)
+                name = wall.pop('name', None)
+            else:
+                name = None
+            params.append(dict(parse_wall_params(wall), name=name))
+
+        prices = {key: payload[key] for key in PROJECT_PRICES if payload.get(key) is not None}
+        self.send_pooled(run_project, params, prices)
+
+    def handle_figure(self, payload, query: Dict):
+        view = query.get('view', ['2d'])[0]
+        if view not in ('2d', '3d', 'top'):
+            raise ValueError(f"Ungültige Ansicht: {view}")
+
+        self.send_pooled(render_figure, parse_wall_params(payload), view)
+
+    def handle_pdf(self, payload, query: Dict):
+        self.send_pooled(render_pdf, parse_wall_params(payload), content_type='application/pdf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MauerPlaner JSON-API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Größe des Worker-Pools für Batch, Projekt, Grafik und PDF")
+    parser.add_argument('--processes', action='store_true',
+                        help="Prozess- statt Thread-Pool verwenden")
+    args = parser.parse_args()
+
+    server = APIServer((args.host, args.port), workers=args.workers, use_processes=args.processes)
+    print(f"MauerPlaner API läuft auf http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
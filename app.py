@@ -5,17 +5,42 @@ Streamlit Web-Anwendung
 Berechnet Betonbedarf für Schalsteinmauern basierend auf FCN-Spezifikationen
 """
 
+import math
+
 import streamlit as st
 import yaml
 from calculations import (
-    load_config, calculate_all, validate_inputs,
+    load_config, calculate_all, validate_inputs, get_stone_layout,
     get_height_warnings, get_concrete_recommendation, get_disclaimer
 )
 from visualization import (
-    create_2d_view, create_3d_view, create_top_view,
+    create_2d_view, create_tiled_2d_view, create_3d_view, create_top_view,
+    create_sensitivity_heatmap, create_tornado_chart,
+    create_network_plan_view, create_network_3d_view,
     should_show_performance_warning
 )
-from pdf_export import create_pdf_report
+from pdf_export import create_pdf_report, create_text_report
+from gltf_export import create_glb
+from dxf_export import create_dxf
+from thumbnails import data_uri, thumbnail
+from tiled_view import DEFAULT_VIEWPORT_M, use_tiled_view
+from lite_mode import get_settings as get_lite_settings, lite_mode_default, lite_rows
+from precompute import ensure_warm_up, get_precomputed, get_figures, table_info
+from optimizer import compare_stone_types, rank_options, RANK_CRITERIA
+from sensitivity import (
+    SWEEP_PARAMS, SWEEP_LABELS, base_values, price_sweep, relative_axis, sweep_to_csv, tornado
+)
+from monte_carlo import monte_carlo, get_settings as get_mc_settings
+from project import aggregate_walls, project_cutting_plan, project_rows, project_to_csv
+from rebar_cutting import reinforcement_plan
+from course_bom import course_page, iter_course_csv
+from stone_layout import course_count
+from pour_planner import pour_plan, project_pour_plan
+from logistics import LINES as LOGISTICS_LINES, delivery_plan
+from reverse_solver import TARGETS, solve_height, solve_length
+from course_snapping import snap_candidates, snap_rows
+from wall_network import aggregate_network, segment_rows
+from instrumentation import begin_trace, end_trace, span, stage_breakdown, export_jsonl
 
 # Seiten-Konfiguration
 st.set_page_config(
@@ -36,6 +61,32 @@ st.set_page_config(
     }
 )
 
+# Zeitmessung pro Rerun (verstecktes Debug-Panel über ?debug=1)
+debug_mode = st.query_params.get("debug") == "1"
+rerun_trace = begin_trace("rerun", active=debug_mode)
+
+
+def show_debug_panel():
+    """Debug-Panel: Stufen-Aufschlüsselung dieses Reruns (nur mit ?debug=1)"""
+    finished_trace = end_trace(rerun_trace)
+    if finished_trace:
+        with st.expander("🐞 Debug: Laufzeit der Stufen", expanded=True):
+            st.caption(f"Rerun gesamt: {finished_trace.duration_ns / 1e6:.1f} ms")
+            table = table_info()
+            st.caption(
+                f"Vorberechnet: {'ja' if precomputed else 'nein'} | "
+                f"Tabelle: {table['answers']} Antworten, {table['figures']} Figure-Sätze, "
+                f"{'aktuell' if table['current'] else 'veraltet/in Arbeit'}"
+            )
+            st.table(stage_breakdown(finished_trace))
+            st.download_button(
+                label="📥 Letzte Traces als JSONL",
+                data=export_jsonl(),
+                file_name="mauerplaner_traces.jsonl",
+                mime="application/x-ndjson"
+            )
+
+
 # Titel mit Branding
 st.title("🧱 MauerPlaner")
 st.markdown("**Betonbedarfsrechner für Schalsteinmauern** | *by LEANOFY*")
@@ -44,9 +95,19 @@ st.caption("Präzise Berechnung basierend auf FCN-Spezifikationen")
 # Lade Konfiguration
 config = load_config()
 
+# Vorberechnete Antworten für Vorlagen/häufige Maße (einmal pro Prozess und Config-Stand)
+ensure_warm_up()
+
 # Sidebar - Eingaben
 st.sidebar.header("⚙️ Eingaben")
 
+# Lite-Modus für Smartphones: erkannt am User-Agent, ?lite=1 / ?lite=0 oder Schalter
+lite_mode = st.sidebar.toggle(
+    "📱 Lite-Modus (mobil)",
+    value=lite_mode_default(st.query_params.get("lite"), st.context.headers.get("User-Agent")),
+    help="Nur Mengen und eine kleine Ansicht – wenig Daten für schwache Verbindungen, ohne 3D und Tabs"
+)
+
 # Template-Auswahl (Niedrige Priorität)
 st.sidebar.subheader("Vorlage auswählen (optional)")
 template_options = ["Keine Vorlage"] + [
@@ -66,6 +127,15 @@ if selected_template != "Keine Vorlage":
     template_data = config['templates'][template_key]
     st.sidebar.info(f"📋 {template_data['description']}")
 
+# Vorlagen-Galerie: Ansicht jeder Vorlage (ohne Plotly, zwischengespeichert)
+if not lite_mode:
+    with st.sidebar.expander("🖼️ Vorlagen-Galerie"):
+        for key, data in config['templates'].items():
+            template_layout = get_stone_layout(
+                data['wall_length_m'], data['wall_start_height_m'], data['wall_end_height_m'], data['stone_type']
+            )
+            st.image(thumbnail(template_layout, 'png'), caption=f"{key}: {data['name']}")
+
 # Stein-Auswahl ZUERST (für diskrete Höhenschritte)
 st.sidebar.subheader("🧱 Schalstein-Typ")
 
@@ -260,6 +330,36 @@ width = st.sidebar.number_input(
     help="Wandstärke in cm (Standard: Dicke des gewählten Steins)"
 )
 
+# Öffnungen (Rohrdurchführungen, Tore, Nischen)
+OPENING_COLUMNS = {
+    'name': "Bezeichnung",
+    'x': "Position x (m)",
+    'width': "Breite (m)",
+    'bottom': "Unterkante (m)",
+    'height': "Höhe (m)"
+}
+with st.sidebar.expander("🚪 Öffnungen"):
+    st.caption("Rechteckige Aussparungen durch die ganze Wand; Position ab Mauerbeginn.")
+    opening_rows = st.data_editor(
+        [dict.fromkeys(OPENING_COLUMNS)],
+        num_rows="dynamic",
+        column_config={
+            'name': st.column_config.TextColumn(OPENING_COLUMNS['name']),
+            **{key: st.column_config.NumberColumn(label, min_value=0.0, step=0.01, format="%.2f")
+               for key, label in OPENING_COLUMNS.items() if key != 'name'}
+        },
+        column_order=list(OPENING_COLUMNS),
+        hide_index=True,
+        key="openings_editor"
+    )
+    # Nur vollständig ausgefüllte Zeilen übernehmen
+    openings = [
+        {'name': row.get('name') or f"Öffnung {number}",
+         **{key: float(row[key]) for key in ('x', 'width', 'bottom', 'height')}}
+        for number, row in enumerate(opening_rows, start=1)
+        if all(row.get(key) is not None for key in ('x', 'width', 'bottom', 'height'))
+    ]
+
 # Kosten (Mittlere Priorität)
 st.sidebar.subheader("💰 Materialpreise")
 enable_costs = st.sidebar.checkbox("Kosten berechnen", value=True)
@@ -309,6 +409,39 @@ if enable_costs:
 else:
     rebar_price = None
 
+# Rückwärtsrechnung: größte Mauer für Budget, Betonmenge oder Steinanzahl
+if not lite_mode:
+    with st.sidebar.expander("🎯 Rückwärtsrechnung"):
+        solve_target = st.selectbox("Vorgabe", list(TARGETS), format_func=TARGETS.get)
+        solve_value = st.number_input(
+            TARGETS[solve_target],
+            min_value=0.0,
+            value={'cost': 2000.0, 'volume': 1.5, 'stones': 100.0}[solve_target],
+            step={'cost': 100.0, 'volume': 0.1, 'stones': 10.0}[solve_target]
+        )
+        solve_for = st.radio("Gesucht", ["Länge (bei aktuellen Höhen)", "Höhe (bei aktueller Länge)"])
+        solve_prices = dict(cement_price=cement_price, gravel_price=gravel_price,
+                            stone_price=stone_price, rebar_price=rebar_price)
+        
+        if solve_for.startswith("Länge"):
+            solution = solve_length(solve_target, solve_value, start_height, end_height,
+                                    selected_stone_type, **solve_prices)
+            answer = f"max. {solution['length']:.2f} m Länge"
+        else:
+            solution = solve_height(solve_target, solve_value, length, selected_stone_type, **solve_prices)
+            answer = f"max. {solution['height']:.3f} m Höhe ({solution['rows']} Reihen)"
+        
+        if solution['value'] > 0:
+            reached = f"{solution['value']:.2f} €" if solve_target == 'cost' else (
+                f"{solution['value']:.2f} m³" if solve_target == 'volume' else f"{solution['value']:.0f} Steine")
+            st.success(f"**{answer}** → {reached}")
+            if solution['at_limit']:
+                st.caption("Obergrenze der Suche erreicht")
+        else:
+            st.warning("Vorgabe reicht nicht für die kleinste Mauer")
+        if is_two_zone:
+            st.caption("Als einfache Mauer von Anfangs- zu Endhöhe gerechnet")
+
 # Berechnung durchführen
 st.sidebar.markdown("---")
 if st.sidebar.button("🔄 Neu berechnen", type="primary", use_container_width=True):
@@ -318,7 +451,7 @@ if st.sidebar.button("🔄 Neu berechnen", type="primary", use_container_width=T
 st.markdown("---")
 
 # Berechnung
-result = calculate_all(
+wall_params = dict(
     length=length,
     start_height=start_height,
     end_height=end_height,
@@ -335,6 +468,12 @@ result = calculate_all(
     zone2_end_height=zone2_end_height
 )
 
+# Vorberechnete Antwort bzw. Figures verwenden, falls vorhanden (nicht bei Öffnungen)
+calculation_params = dict(wall_params, openings=openings)
+precomputed = get_precomputed(calculation_params)
+precomputed_figures = precomputed.figures if precomputed else get_figures(calculation_params)
+result = precomputed.result if precomputed else calculate_all(**calculation_params)
+
 # Fehlerbehandlung (Mittlere Priorität)
 if 'error' in result:
     st.error(f"❌ **Fehler:** {result['error']}")
@@ -345,6 +484,19 @@ if result['warnings']:
     for warning in result['warnings']:
         st.warning(warning)
 
+# Lite-Modus: Zahlen zuerst, kleine Ansicht als PNG, keine Plotly-Figures und Tabs
+if lite_mode:
+    lite_settings = get_lite_settings()
+    st.table(lite_rows(result))
+    st.image(
+        thumbnail(result['layout'], 'png', lite_settings['thumbnail_width_px'], lite_settings['thumbnail_height_px']),
+        caption=f"{length:.2f} m, {start_height:.2f} m → {end_height:.2f} m, {width:.1f} cm"
+    )
+    st.caption(result['disclaimer'])
+    st.caption("Vollansicht mit 3D, Vergleich und Export: Lite-Modus in der Sidebar ausschalten.")
+    show_debug_panel()
+    st.stop()
+
 # Ergebnisse in Tabs
 tab_overview, tab_viz, tab_materials, tab_export = st.tabs([
     "📊 Übersicht", "🎨 Visualisierung", "📦 Materialien & Kosten", "📄 Export"
@@ -358,9 +510,15 @@ with tab_overview:
     
     with col1:
         st.metric("Fläche", f"{result['area']} m²")
+        if result.get('openings'):
+            st.caption(f"🚪 abzüglich {result['opening_area_m2']} m² Öffnungen")
     
     with col2:
         st.metric("Anzahl Steine", f"{result['total_stones']} St.")
+        cuts = result['stone_cuts']
+        st.caption(f"✂️ Zuschnitt: {cuts['half_stones']} halbe, {cuts['cut_stones']} sonstige Steine")
+        if 'removed_stones' in cuts:
+            st.caption(f"🚪 {cuts['removed_stones']} Steine entfallen wegen Öffnungen")
     
     with col3:
         st.metric("Reihen", f"{result['rows']}")
@@ -462,6 +620,51 @@ with tab_overview:
         st.write(f"**Füllvolumen:** {result['stone_data']['fill_volume_per_stone_liters']:.2f} L/Stein")
         st.write(f"**Gesamt-Füllvolumen:** {result['stone_data']['fill_volume_per_m2_liters']} L/m²")
     
+    # Steintyp-Vergleich (alle Typen in einem Durchlauf, ohne Rerun pro Typ)
+    st.markdown("---")
+    st.subheader("⚖️ Steintypen vergleichen")
+    
+    if st.checkbox("Vergleich anzeigen", value=False,
+                   help="Alle Steintypen für diese Mauer berechnen"):
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            rank_criterion = st.selectbox(
+                "Sortieren nach",
+                list(RANK_CRITERIA.keys()),
+                format_func=lambda key: RANK_CRITERIA[key][1],
+                help="Günstigste bzw. leichteste Option zuerst"
+            )
+        with col2:
+            include_combinations = st.checkbox(
+                "Kombinationen (Zone 1/2)",
+                value=False,
+                disabled=not is_two_zone,
+                help="Bei 2-Zonen-Mauern: maßgleiche Steintypen je Zone kombinieren"
+            )
+        
+        comparison = compare_stone_types(
+            include_combinations=include_combinations,
+            **{k: v for k, v in wall_params.items() if k not in ('width', 'stone_type')}
+        )
+        st.dataframe(rank_options(comparison, rank_criterion), hide_index=True, use_container_width=True)
+        st.caption(
+            "Jeder Steintyp mit seiner eigenen Wandstärke. Ohne aktivierte Kostenrechnung "
+            "werden die Standardpreise aus der Konfiguration verwendet. Gewicht = Steine + Zement + Kies."
+        )
+    
+    # Höhen auf ganze Reihen (Kandidaten in einem Durchlauf)
+    st.markdown("---")
+    st.subheader("📐 Höhen auf ganze Reihen")
+    snapping = snap_candidates(
+        **{k: v for k, v in wall_params.items() if k != 'width'}
+    )
+    if snapping['snapped']:
+        st.caption("✅ Alle Höhen sind ganze Steinreihen – keine angeschnittene oberste Reihe.")
+    else:
+        st.info("💡 Mindestens eine Höhe liegt zwischen zwei Steinreihen. "
+                "Vorschläge mit ganzen Reihen und die Änderung gegenüber der aktuellen Mauer:")
+        st.dataframe(snap_rows(snapping, is_two_zone), hide_index=True, use_container_width=True)
+    
     # Betonempfehlung
     st.markdown("---")
     st.subheader("🏗️ Betonempfehlung nach FCN")
@@ -480,12 +683,30 @@ with tab_viz:
         st.warning(warning_msg)
     
     # Tabs für 2D/3D
-    viz_tab_2d, viz_tab_3d, viz_tab_top = st.tabs(["🖼️ 2D Seitenansicht", "🎮 3D Ansicht", "🗺️ Draufsicht"])
+    viz_tab_2d, viz_tab_3d, viz_tab_top, viz_tab_network = st.tabs(
+        ["🖼️ 2D Seitenansicht", "🎮 3D Ansicht", "🗺️ Draufsicht", "🧭 Mauerzug"]
+    )
     
     with viz_tab_2d:
         st.subheader("Seitenansicht mit versetztem Mauerwerk")
-        fig_2d = create_2d_view(result['layout'], width / 100)
-        st.plotly_chart(fig_2d, use_container_width=True)
+        if use_tiled_view(result['layout']):
+            # Lange Mauer: Übersicht + Einzelsteine nur im gewählten Ausschnitt
+            wall_length = float(result['layout']['total_length'])
+            viewport = st.slider(
+                "Ausschnitt (m)",
+                min_value=0.0,
+                max_value=wall_length,
+                value=(0.0, min(DEFAULT_VIEWPORT_M, wall_length)),
+                step=0.5,
+                help="Einzelne Steine werden nur im Ausschnitt geladen, der Rest der Mauer als Übersicht"
+            )
+            fig_2d = create_tiled_2d_view(result['layout'], width / 100, viewport)
+        elif precomputed_figures:
+            fig_2d = precomputed_figures.fig_2d
+        else:
+            fig_2d = create_2d_view(result['layout'], width / 100)
+        with span('plotly_chart.2d'):
+            st.plotly_chart(fig_2d, use_container_width=True)
         
         st.caption(
             "Die 2D-Ansicht zeigt die Steine in versetzter Anordnung (halbsteinversetzt). "
@@ -496,8 +717,12 @@ with tab_viz:
         st.subheader("3D-Ansicht (interaktiv)")
         st.info("💡 Tipp: Ziehen Sie mit der Maus, um die Ansicht zu drehen. Scrollen zum Zoomen.")
         
-        fig_3d = create_3d_view(result['layout'], width / 100)
-        st.plotly_chart(fig_3d, use_container_width=True)
+        if precomputed_figures:
+            fig_3d = precomputed_figures.fig_3d
+        else:
+            fig_3d = create_3d_view(result['layout'], width / 100)
+        with span('plotly_chart.3d'):
+            st.plotly_chart(fig_3d, use_container_width=True)
         
         st.caption(
             "Die 3D-Ansicht zeigt jeden Stein als einzelnen Quader. "
@@ -506,8 +731,78 @@ with tab_viz:
     
     with viz_tab_top:
         st.subheader("Draufsicht")
-        fig_top = create_top_view(result['layout'], width / 100)
-        st.plotly_chart(fig_top, use_container_width=True)
+        if precomputed_figures:
+            fig_top = precomputed_figures.fig_top
+        else:
+            fig_top = create_top_view(result['layout'], width / 100)
+        with span('plotly_chart.top'):
+            st.plotly_chart(fig_top, use_container_width=True)
+    
+    with viz_tab_network:
+        st.subheader("Mauerzug im Grundriss (Ecken und Anschlüsse)")
+        st.caption(
+            "Mauerstücke auf der Mauerachse eintragen; gemeinsame Endpunkte bilden Ecken bzw. "
+            "Anschlüsse. Eine durchlaufende Mauer am Anschluss in zwei Stücke teilen."
+        )
+        # Vorschlag: aktuelle Mauer mit 3 m Winkel (L-Form)
+        network_rows = st.data_editor(
+            [
+                {'name': "Mauer", 'x0': 0.0, 'y0': 0.0, 'x1': float(length), 'y1': 0.0,
+                 'start_height': float(start_height), 'end_height': float(end_height)},
+                {'name': "Winkel", 'x0': float(length), 'y0': 0.0, 'x1': float(length), 'y1': 3.0,
+                 'start_height': float(end_height), 'end_height': float(end_height)}
+            ],
+            num_rows="dynamic",
+            column_config={
+                'name': st.column_config.TextColumn("Bezeichnung"),
+                'x0': st.column_config.NumberColumn("Von x (m)", format="%.2f"),
+                'y0': st.column_config.NumberColumn("Von y (m)", format="%.2f"),
+                'x1': st.column_config.NumberColumn("Nach x (m)", format="%.2f"),
+                'y1': st.column_config.NumberColumn("Nach y (m)", format="%.2f"),
+                'start_height': st.column_config.NumberColumn("Höhe Anfang (m)", min_value=0.01, format="%.2f"),
+                'end_height': st.column_config.NumberColumn("Höhe Ende (m)", min_value=0.01, format="%.2f")
+            },
+            hide_index=True,
+            use_container_width=True,
+            key="network_editor"
+        )
+        network_segments = [
+            {'name': row.get('name'), 'start': (row['x0'], row['y0']), 'end': (row['x1'], row['y1']),
+             'start_height': row['start_height'], 'end_height': row.get('end_height') or row['start_height']}
+            for row in network_rows
+            if all(row.get(key) is not None for key in ('x0', 'y0', 'x1', 'y1', 'start_height'))
+        ]
+        
+        try:
+            network = aggregate_network(
+                network_segments, selected_stone_type,
+                cement_price=cement_price, gravel_price=gravel_price,
+                stone_price=stone_price, rebar_price=rebar_price
+            ) if network_segments else None
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            network = None
+        
+        if network:
+            network_totals = network.project.totals
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Schalsteine", f"{network_totals['stones']} Stück")
+            with col2:
+                st.metric("Beton", f"{network_totals['volume_with_buffer_m3']:.2f} m³")
+            with col3:
+                st.metric("Zement", f"{network_totals['cement_bags']} Säcke")
+            with col4:
+                st.metric("Bewehrung", f"{network_totals['rods_6m']} Stäbe")
+            if network.saved_stones:
+                st.caption(f"🧱 {network.saved_stones} Steine an Anschlüssen nicht doppelt gezählt")
+            if network.project.costs:
+                st.markdown(f"**Kosten Mauerzug:** {network.project.costs['total_cost']:.2f} €")
+            
+            st.plotly_chart(create_network_plan_view(network.geometry), use_container_width=True)
+            if st.checkbox("3D-Ansicht des Mauerzugs anzeigen", value=False):
+                st.plotly_chart(create_network_3d_view(network.geometry), use_container_width=True)
+            st.dataframe(segment_rows(network), hide_index=True, use_container_width=True)
 
 with tab_materials:
     st.header("Materialbedarf")
@@ -563,7 +858,109 @@ with tab_materials:
             st.metric("Anzahl Lagen", f"{rebar['rows']}")
             st.caption(f"{rebar['rods_per_row']} Stäbe pro Reihe")
             st.caption(f"= {rebar['total_rods_needed']} Stäbe gesamt")
-    
+        
+        # Schnittplan mit Übergreifungsstößen und Verschnitt
+        with st.expander("✂️ Schnittplan"):
+            plan = reinforcement_plan(rebar, result['layout'])
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Stäbe laut Schnittplan", f"{plan['rods_needed']} Stück",
+                          delta=plan['rods_needed'] - rebar['rods_6m_needed'], delta_color="inverse")
+            with col2:
+                st.metric("Stöße", f"{plan['laps']}")
+                st.caption(f"Übergreifung je {plan['lap_length_m']:.2f} m")
+            with col3:
+                st.metric("Verschnitt", f"{plan['waste_m']:.2f} m")
+                st.caption(f"davon wiederverwendbar: {plan['reusable_offcut_m']:.2f} m")
+            
+            st.dataframe([
+                {
+                    'Anzahl Stäbe': pattern['count'],
+                    'Schnitte (m)': ' + '.join(f"{cut:.2f}" for cut in pattern['cuts_m']),
+                    'Rest (m)': round(pattern['offcut_m'], 2),
+                    'Rest verwendbar': '✅' if pattern['reusable_offcut'] else '—'
+                }
+                for pattern in plan['patterns']
+            ], hide_index=True, use_container_width=True)
+            st.caption("Die Kosten basieren weiter auf Gesamtlänge ÷ 6 m; der Schnittplan zeigt den Bedarf mit Stößen.")
+
+    # Stückliste je Reihe (seitenweise, nur die angezeigte Seite wird berechnet)
+    st.markdown("---")
+    with st.expander("🧱 Reihen-Stückliste"):
+        page_size = 20
+        total_pages = max(1, math.ceil(course_count(result['layout']) / page_size))
+        page = st.number_input("Seite", min_value=1, max_value=total_pages, value=1, step=1,
+                               key="course_bom_page")
+        st.dataframe(course_page(result['layout'], selected_stone_type, int(page), page_size),
+                     hide_index=True, use_container_width=True)
+        st.caption(f"Seite {int(page)} von {total_pages} · Beton und Bewehrung anteilig nach gesetzter Länge")
+        if st.button("🧱 Stückliste erstellen"):
+            st.download_button(
+                label="📥 Stückliste als CSV",
+                data=''.join(iter_course_csv(result['layout'], selected_stone_type)),
+                file_name="reihen_stueckliste.csv",
+                mime="text/csv"
+            )
+
+    # Betonierplan: Abschnitte, Mischer-Chargen und Fahrmischer
+    with st.expander("🚚 Betonierplan"):
+        if st.checkbox("Betonierplan berechnen", value=False,
+                       help="Abschnitte, Mischer-Chargen und Fahrmischer aus der Reihen-Stückliste"):
+            pours = pour_plan(result, selected_stone_type)
+            recipe = pours['batch_recipe']
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Betonierabschnitte", f"{len(pours['lifts'])}")
+                st.caption(f"je max. {pours['max_lift_courses']} Reihen")
+            with col2:
+                st.metric("Mischer-Chargen", f"{pours['batches']}")
+                st.caption(f"à {recipe['volume_liters']:.0f} L Frischbeton")
+            with col3:
+                st.metric("Fahrmischer-Ladungen", f"{pours['truck_loads']}")
+                st.caption(f"à max. {pours['truck_capacity_m3']:.1f} m³")
+            st.dataframe([
+                {
+                    'Abschnitt': lift['lift'],
+                    'Reihen': f"{lift['first_course']}–{lift['last_course']}",
+                    'Beton (m³)': lift['volume_m3'],
+                    'Chargen': lift['batches'],
+                    'Fahrmischer': lift['truck_loads']
+                }
+                for lift in pours['lifts']
+            ], hide_index=True, use_container_width=True)
+            st.caption(
+                f"Je Charge: {recipe['cement_kg']} kg Zement ({recipe['cement_bags']} Sack), "
+                f"{recipe['gravel_kg']} kg Kies, {recipe['water_liters']} L Wasser"
+            )
+
+    # Lieferung: Paletten, Gewicht und LKW
+    with st.expander("🚛 Lieferung & Logistik"):
+        if st.checkbox("Lieferung berechnen", value=False,
+                       help="Paletten, Gewicht und Aufteilung auf LKW"):
+            delivery = delivery_plan(result, selected_stone_type)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Gesamtgewicht", f"{delivery['total_tons']:.2f} t")
+            with col2:
+                st.metric("Stellplätze", f"{delivery['pallet_places']}")
+                st.caption("Paletten und Big Bags")
+            with col3:
+                st.metric("LKW", f"{len(delivery['trucks'])}")
+                st.caption(f"Nutzlast je {delivery['truck_payload_kg'] / 1000:.1f} t")
+            st.dataframe([
+                {'Position': line['label'], 'Einheiten': line['units'], 'Gewicht (kg)': line['weight_kg']}
+                for line in delivery['lines'] if line['units']
+            ], hide_index=True, use_container_width=True)
+            st.dataframe([
+                {
+                    'LKW': truck['truck'],
+                    **{label: truck[line] for line, label in LOGISTICS_LINES.items()},
+                    'Gewicht (kg)': truck['weight_kg'],
+                    'Stellplätze': truck['pallet_places']
+                }
+                for truck in delivery['trucks']
+            ], hide_index=True, use_container_width=True)
+
     # Kosten (falls aktiviert)
     if enable_costs and result['costs']:
         st.markdown("---")
@@ -668,6 +1065,160 @@ with tab_materials:
             file_name="einkaufsliste_schalsteinmauer.txt",
             mime="text/plain"
         )
+        
+        # Preis-Sensitivität (Mengen einmal, Kosten über ganze Preisraster)
+        st.markdown("---")
+        st.subheader("📈 Preis-Sensitivität")
+        
+        if st.checkbox("Preis-Sensitivität anzeigen", value=False,
+                       help="Tornado-Diagramm und Heatmap über Preis- und Pufferraster"):
+            if openings:
+                st.caption("Ohne Öffnungen berechnet (volle Mauerfläche) – „Aktuell“ liegt daher "
+                           "über den Gesamtkosten oben.")
+            
+            spread_pct = st.slider(
+                "Preisspanne (± %)",
+                min_value=5,
+                max_value=50,
+                value=20,
+                step=5,
+                help="Wie stark Preise und Puffer um den aktuellen Wert variiert werden"
+            )
+            spread = spread_pct / 100
+            
+            st.plotly_chart(create_tornado_chart(tornado(wall_params, spread)), use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                heatmap_rows = st.selectbox(
+                    "Heatmap: Zeilen", SWEEP_PARAMS, index=0, format_func=SWEEP_LABELS.get
+                )
+            with col2:
+                column_options = [name for name in SWEEP_PARAMS if name != heatmap_rows]
+                heatmap_columns = st.selectbox(
+                    "Heatmap: Spalten", column_options, index=1, format_func=SWEEP_LABELS.get
+                )
+            
+            sweep_base = base_values(wall_params)
+            sweep = price_sweep(wall_params, {
+                heatmap_rows: relative_axis(sweep_base[heatmap_rows], spread),
+                heatmap_columns: relative_axis(sweep_base[heatmap_columns], spread)
+            })
+            st.plotly_chart(create_sensitivity_heatmap(sweep), use_container_width=True)
+            
+            st.download_button(
+                label="📥 Raster als CSV herunterladen",
+                data=sweep_to_csv(sweep),
+                file_name="preis_sensitivitaet.csv",
+                mime="text/csv"
+            )
+    
+    # Unsicherheit der Mengen (Monte Carlo statt festem Puffer)
+    st.markdown("---")
+    st.subheader("🎲 Unsicherheit (Monte Carlo)")
+    
+    if st.checkbox("Monte-Carlo-Schätzung anzeigen", value=False,
+                   help="Füllvolumen, Verlust, Mauerlängen und Preise werden zufällig variiert"):
+        mc_settings = get_mc_settings()
+        mc_seed = st.number_input(
+            "Zufalls-Seed",
+            min_value=0,
+            value=int(mc_settings['seed']),
+            step=1,
+            help="Gleicher Seed = gleiches Ergebnis"
+        )
+        st.dataframe(monte_carlo(wall_params, seed=int(mc_seed)), hide_index=True, use_container_width=True)
+        st.caption(
+            f"{int(mc_settings['samples'])} Stichproben · Füllvolumen ±{mc_settings['fill_volume_rel_sd']:.0%}, "
+            f"Verlust {mc_settings['waste_percentage_min']}–{mc_settings['waste_percentage_max']} % "
+            f"(wahrscheinlich {mc_settings['waste_percentage_mode']} %), "
+            f"Länge ±{mc_settings['dimension_sd_m'] * 100:.0f} cm, Preise ±{mc_settings['price_rel_sd']:.0%}. "
+            "P90 = in 9 von 10 Fällen reicht diese Menge."
+        )
+        if openings:
+            st.caption("Ohne Öffnungen berechnet (volle Mauerfläche) – die Mengen liegen über denen oben.")
+    
+    # Projekt aus mehreren Mauern (gemeinsam gerundet)
+    st.markdown("---")
+    st.subheader("🏗️ Projekt (mehrere Mauern)")
+    st.caption("Mehrere Mauern gemeinsam bestellen: Säcke, Kies und Stäbe werden erst für die Projektsumme aufgerundet.")
+    
+    project_walls = st.session_state.setdefault('project_walls', [])
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        wall_name = st.text_input("Bezeichnung der Mauer", value=f"Mauer {len(project_walls) + 1}")
+    with col2:
+        st.write("")
+        if st.button("➕ Zum Projekt hinzufügen", use_container_width=True):
+            project_walls.append(dict(calculation_params, name=wall_name))
+            st.session_state.setdefault('project_thumbnails', []).append(data_uri(thumbnail(result['layout'])))
+            st.rerun()
+    with col3:
+        st.write("")
+        if st.button("🗑️ Projekt leeren", use_container_width=True, disabled=not project_walls):
+            project_walls.clear()
+            st.session_state.pop('project_thumbnails', None)
+            st.rerun()
+    
+    if project_walls:
+        project_result = aggregate_walls(
+            project_walls,
+            cement_price=cement_price,
+            gravel_price=gravel_price,
+            stone_price=stone_price,
+            rebar_price=rebar_price
+        )
+        project_totals = project_result.totals
+        savings = project_result.savings
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Schalsteine", f"{project_totals['stones']} Stück")
+        with col2:
+            st.metric("Zement", f"{project_totals['cement_bags']} Säcke",
+                      delta=f"-{savings['cement_bags']:.0f} ggü. Einzelmauern" if savings['cement_bags'] else None,
+                      delta_color="off")
+        with col3:
+            st.metric("Kies", f"{project_totals['gravel_tons']:.1f} t",
+                      delta=f"-{savings['gravel_tons']:.1f} t ggü. Einzelmauern" if savings['gravel_tons'] else None,
+                      delta_color="off")
+        with col4:
+            st.metric("Bewehrung", f"{project_totals['rods_6m']} Stäbe",
+                      delta=f"-{savings['rods_6m']:.0f} ggü. Einzelmauern" if savings['rods_6m'] else None,
+                      delta_color="off")
+        
+        if project_totals['rods_6m']:
+            project_plan = project_cutting_plan(project_result)
+            st.caption(
+                f"✂️ Gemeinsamer Schnittplan: {project_plan['rods_needed']} Stäbe inkl. "
+                f"{project_plan['laps']} Stößen, Verschnitt {project_plan['waste_m']:.1f} m "
+                f"({project_plan['waste_percentage']} %)"
+            )
+        
+        project_pours = project_pour_plan(project_walls, project_result.per_wall['volume_with_buffer_m3'])
+        st.caption(
+            f"🚚 Betonierplan: {project_pours['batches']} Mischer-Chargen oder {project_pours['truck_loads']} "
+            f"Fahrmischer bei {len(project_pours['lifts'])} Betonierabschnitt(en), Abschnitt n aller Mauern am selben Tag"
+        )
+        
+        if project_result.costs:
+            st.markdown(f"**Projektkosten gesamt:** {project_result.costs['total_cost']:.2f} €")
+        
+        project_table = project_rows(project_result)
+        for row, preview in zip(project_table, st.session_state.get('project_thumbnails', [])):
+            row['Vorschau'] = preview
+        st.dataframe(
+            project_table,
+            hide_index=True,
+            use_container_width=True,
+            column_config={'Vorschau': st.column_config.ImageColumn("Vorschau", width="small")}
+        )
+        st.download_button(
+            label="📥 Projekt als CSV herunterladen",
+            data=project_to_csv(project_result),
+            file_name="projekt_schalsteinmauern.csv",
+            mime="text/csv"
+        )
 
 with tab_export:
     st.header("📄 Export & Dokumentation")
@@ -685,8 +1236,13 @@ with tab_export:
         if st.button("📥 PDF erstellen", type="primary", use_container_width=True):
             with st.spinner("PDF wird erstellt..."):
                 try:
-                    # Erstelle 2D Figure für PDF
-                    fig_2d_for_pdf = create_2d_view(result['layout'], width / 100)
+                    # 2D Figure für PDF: immer die ganze Mauer (die Kachelansicht zeigt nur den Ausschnitt)
+                    if use_tiled_view(result['layout']):
+                        fig_2d_for_pdf = create_tiled_2d_view(
+                            result['layout'], width / 100, (0.0, float(result['layout']['total_length']))
+                        )
+                    else:
+                        fig_2d_for_pdf = fig_2d
                     
                     # Eingabedaten
                     inputs = {
@@ -713,80 +1269,55 @@ with tab_export:
                     st.error(f"❌ Fehler beim Erstellen des PDFs: {str(e)}")
                     st.info("💡 Tipp: Für PDF-Export mit Bildern wird 'kaleido' benötigt: `pip install kaleido`")
     
-    # Workaround: Daten als Text exportieren
+    # CAD-Zeichnung direkt aus dem Layout (ohne Plotly-Figure)
     st.markdown("---")
-    st.subheader("Daten als Text exportieren")
+    st.subheader("CAD-Zeichnung (DXF)")
     
-    export_text = f"""
-SCHALSTEINMAUER BETONRECHNER - ERGEBNISSE
-==========================================
-
-MAUER-DIMENSIONEN:
-- Länge: {length} m
-- Anfangshöhe: {start_height} m
-- Endhöhe: {end_height} m
-- Breite/Dicke: {width} cm
-
-SCHALSTEIN:
-- Typ: {result['stone_data']['name']}
-- Maße: {result['stone_data']['length_cm']} × {result['stone_data']['width_cm']} × {result['stone_data']['height_cm']} cm
-- Gewicht: {result['stone_data']['weight_kg']} kg
-- Füllvolumen: {result['stone_data']['fill_volume_per_stone_liters']:.2f} L/Stein
-
-BERECHNUNGSERGEBNISSE:
-- Fläche: {result['area']} m²
-- Anzahl Steine: {result['total_stones']} St.
-- Reihen: {result['rows']}
-- Grundvolumen: {result['base_volume_m3']} m³
-- Volumen mit {result['buffer_percentage']}% Puffer: {result['volume_with_buffer_m3']} m³
-
-MATERIALBEDARF:
-- Zement: {materials['cement_bags']} Säcke à {materials['cement_bag_size_kg']} kg ({materials['cement_kg']} kg)
-- Kies: {materials['gravel_tons']} Tonnen ({materials['gravel_kg']} kg)
-- Wasser: {materials['water_liters']} Liter
-"""
+    col1, col2 = st.columns([2, 1])
     
-    if result['reinforcement']:
-        rebar = result['reinforcement']
-        export_text += f"""
-BEWEHRUNGSSTAHL (ab 1m Höhe):
-- Benötigte 6m Stäbe: {rebar['rods_6m_needed']} Stück (Ø {rebar['diameter_mm']} mm)
-- Anzahl Lagen: {rebar['rows']}
-- Stäbe pro Reihe: {rebar['rods_per_row']}
-- Gesamtlänge: {rebar['total_length_m']} m
-"""
+    with col1:
+        st.write("Ansicht mit allen Steinen und Grundriss, Zonentrennung, Öffnungen und Bemaßung (DXF R12, Meter).")
     
-    if enable_costs and result['costs']:
-        export_text += f"""
-KOSTEN:
-- Schalsteine: {result['total_stones']} St. × {stone_price:.2f} € = {costs['stone_cost']:.2f} € (netto)
-  + MwSt (19%): {costs['stone_vat']:.2f} €
-  = Gesamt: {costs['stone_cost_with_vat']:.2f} €
-- Zement: {materials['cement_bags']} Säcke × {cement_price:.2f} € = {costs['cement_cost']:.2f} €
-- Kies: {materials['gravel_tons']} t × {gravel_price:.2f} € = {costs['gravel_cost']:.2f} €"""
-        
-        if result['reinforcement']:
-            export_text += f"""
-- Bewehrungsstahl: {result['reinforcement']['rods_6m_needed']} Stäbe × {result['reinforcement']['price_per_rod_eur']:.2f} € = {costs['reinforcement_cost']:.2f} €"""
-        
-        export_text += f"""
----
-Zwischensumme (netto): {costs['subtotal']:.2f} €
-MwSt (19% auf Steine): {costs['stone_vat']:.2f} €
-GESAMTKOSTEN: {costs['total_cost']:.2f} €
-"""
+    with col2:
+        if st.button("📐 DXF erstellen", use_container_width=True):
+            with st.spinner("DXF wird erstellt..."):
+                st.download_button(
+                    label="📐 DXF herunterladen",
+                    data=create_dxf(result['layout'], width / 100),
+                    file_name="schalsteinmauer.dxf",
+                    mime="image/vnd.dxf",
+                    use_container_width=True
+                )
     
-    export_text += f"""
-BETONEMPFEHLUNG:
-Empfohlener Beton: C25/30 mit max. 16 mm Korn (Rundkies 0-16), F3-Konsistenz.
-Für Höhen >1 m oder tragende Wände Armierung empfohlen (z.B. 2 Ø 8 mm pro Lage).
-
-WICHTIGER HINWEIS:
-Dies ist eine Schätzung und berücksichtigt Verluste, aber keine statische Berechnung 
-oder spezifische Bauvorschriften. Konsultieren Sie einen Fachmann für tragende oder hohe Mauern!
-
-Erstellt mit: Schalsteinmauer Betonrechner
-"""
+    # 3D-Modell für CAD/Visualisierung (alle Steine, ohne Begrenzung der 3D-Ansicht)
+    st.markdown("---")
+    st.subheader("3D-Modell (glTF)")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.write("Die Mauer Stein für Stein als GLB-Datei für Blender, SketchUp, Twinmotion & Co.")
+        zone_materials = st.checkbox("Material je Zone", value=True, disabled=not is_two_zone)
+    
+    with col2:
+        if st.button("🧊 3D-Modell erstellen", use_container_width=True):
+            with st.spinner("3D-Modell wird erstellt..."):
+                st.download_button(
+                    label="🧊 GLB herunterladen",
+                    data=create_glb(result['layout'], width / 100, zone_materials),
+                    file_name="schalsteinmauer.glb",
+                    mime="model/gltf-binary",
+                    use_container_width=True
+                )
+    
+    # Workaround: Daten als Text exportieren
+    st.markdown("---")
+    st.subheader("Daten als Text exportieren")
+    
+    if precomputed:
+        export_text = precomputed.export_text
+    else:
+        export_text = create_text_report(result, wall_params)
     
     st.download_button(
         label="📥 Ergebnisse als Text herunterladen",
@@ -846,4 +1377,5 @@ with st.expander("⚖️ Rechtliche Hinweise & Haftungsausschluss"):
     **Kontakt:** Für Fragen wenden Sie sich bitte an LEANOFY über das [Impressum](https://leanofy.de/impressum)
     """)
 
-
+# Debug-Panel: Stufen-Aufschlüsselung dieses Reruns (nur mit ?debug=1)
+show_debug_panel()
@@ -0,0 +1,318 @@
+"""
+Vektorisierte Mengen- und Kostenberechnung mit NumPy
+
+Bildet die Rechenschritte von calculate_all() (Steine, Reihen, Volumen,
+Materialien, Bewehrung, Kosten) auf Arrays ab. Alle Eingaben werden per
+Broadcasting kombiniert, so dass viele Steintypen, Maße oder Preise in
+einem Aufruf ausgewertet werden. Operationsreihenfolge und Aufrunden
+entsprechen den Einzelfunktionen in calculations.py, die Ergebnisse
+stimmen daher mit calculate_all() überein.
+
+Eine Mauer wird als bis zu zwei Zonen beschrieben (wall_geometry()); eine
+einfache Mauer ist Zone 1 mit leerer Zone 2. Jede Zone kann einen eigenen
+Steintyp haben (Kombinationen im Optimierer).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config_store import get_config, config_version
+
+
+@dataclass(frozen=True)
+class StoneArrays:
+    """Kennwerte aller Steintypen als Arrays (Reihenfolge wie keys)"""
+
+    keys: Tuple[str, ...]
+    names: Tuple[str, ...]
+    stones_per_m2: np.ndarray
+    fill_liters: np.ndarray
+    height_m: np.ndarray
+    width_cm: np.ndarray
+    weight_kg: np.ndarray
+
+
+# Bis zu dieser Größe wird elementweise gerundet
+SMALL_ARRAY_SIZE = 64
+
+
+def round_cents(values) -> np.ndarray:
+    """
+    Rundet auf Cent wie Pythons round(x, 2)
+
+    np.round() skaliert mit 100 und rundet dann; bei Werten, die im
+    Binärformat knapp neben einer halben Cent-Grenze liegen, weicht das
+    von round() ab. Diese seltenen Fälle werden einzeln mit round() gerundet.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size <= SMALL_ARRAY_SIZE:
+        # Bei wenigen Werten ist round() schneller als die Array-Operationen
+        return np.array([round(v, 2) for v in values.ravel().tolist()]).reshape(values.shape)
+
+    scaled = values * 100
+    rounded = np.rint(scaled)
+    ties = np.abs(np.abs(scaled - rounded) - 0.5) < 1e-6
+    result = rounded / 100
+    if ties.any():
+        result[ties] = [round(v, 2) for v in values[ties].tolist()]
+    return result
+
+
+# Cache pro Config-Stand (Inhalts-Hash)
+_stone_cache: Dict[Tuple[str, Optional[Tuple[str, ...]]], StoneArrays] = {}
+
+
+def stone_arrays(stone_types: Optional[Sequence[str]] = None) -> StoneArrays:
+    """
+    Gibt die Kennwerte der Steintypen als Arrays zurück
+
+    Args:
+        stone_types: Auswahl an Steintypen (Standard: alle aus config.yaml)
+
+    Returns:
+        StoneArrays (pro Config-Stand zwischengespeichert)
+    """
+    cache_key = (config_version(), tuple(stone_types) if stone_types else None)
+    cached = _stone_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    all_types = get_config()['stone_types']
+    keys = tuple(stone_types) if stone_types else tuple(all_types)
+    stones = [all_types[key] for key in keys]
+    arrays = StoneArrays(
+        keys=keys,
+        names=tuple(s['name'] for s in stones),
+        stones_per_m2=np.array([s['stones_per_m2'] for s in stones], dtype=float),
+        fill_liters=np.array([s['fill_volume_per_stone_liters'] for s in stones], dtype=float),
+        height_m=np.array([s['height_cm'] / 100 for s in stones], dtype=float),
+        width_cm=np.array([s['width_cm'] for s in stones], dtype=float),
+        weight_kg=np.array([s['weight_kg'] for s in stones], dtype=float)
+    )
+
+    if len(_stone_cache) > 32:
+        _stone_cache.clear()
+    _stone_cache[cache_key] = arrays
+    return arrays
+
+
+def wall_geometry(
+    length,
+    start_height,
+    end_height,
+    is_two_zone: bool = False,
+    zone1_length=None,
+    zone1_height=None,
+    zone2_length=None,
+    zone2_end_height=None
+) -> Dict:
+    """
+    Zerlegt eine Mauer in die Größen, die die Mengenberechnung braucht
+
+    Alle Maße dürfen Skalare oder Arrays sein.
+
+    Args:
+        length: Gesamtlänge in Metern
+        start_height: Anfangshöhe in Metern
+        end_height: Endhöhe in Metern
+        is_two_zone: 2-Zonen-Mauer (wie calculate_all())
+        zone1_length, zone1_height, zone2_length, zone2_end_height: Zonenmaße
+
+    Returns:
+        Dictionary mit area1, area2 (Fläche je Zone), rows_height1,
+        rows_height2 (Höhe für die Reihenzahl je Zone), length und max_height;
+        bei einer einfachen Mauer sind area2 und rows_height2 None
+    """
+    if is_two_zone and all(v is not None for v in (zone1_length, zone1_height, zone2_length, zone2_end_height)):
+        zone2_avg_height = (zone1_height + zone2_end_height) / 2
+        return {
+            'area1': zone1_length * zone1_height,
+            'area2': zone2_length * zone2_avg_height,
+            'rows_height1': zone1_height,
+            'rows_height2': np.maximum(zone1_height, zone2_end_height),
+            'length': length,
+            'max_height': np.maximum(start_height, end_height)
+        }
+
+    avg_height = (start_height + end_height) / 2
+    return {
+        'area1': length * avg_height,
+        'area2': None,
+        'rows_height1': avg_height,
+        'rows_height2': None,
+        'length': length,
+        'max_height': np.maximum(start_height, end_height)
+    }
+
+
+def batch_quantities(
+    geometry: Dict,
+    stones_per_m2,
+    fill_liters,
+    height_m,
+    zone2_stones_per_m2=None,
+    zone2_fill_liters=None,
+    zone2_height_m=None,
+    buffer_percentage: Optional[float] = None,
+    removed_stones=0.0,
+    opening_stone_share=0.0,
+    interrupted_length=0.0
+) -> Dict[str, np.ndarray]:
+    """
+    Berechnet Steine, Volumen, Materialien und Bewehrungsstäbe
+
+    Args:
+        geometry: Ergebnis von wall_geometry()
+        stones_per_m2, fill_liters, height_m: Steinkennwerte (Zone 1)
+        zone2_*: Abweichende Steinkennwerte für Zone 2 (Standard: wie Zone 1)
+        buffer_percentage: Puffer in % (Standard: aus config.yaml, auch als Array)
+        removed_stones, opening_stone_share, interrupted_length: Abzüge für
+            Öffnungen wie in calculate_all() (stone_cuts() bzw.
+            interrupted_rebar_length(); Standard: keine Öffnungen)
+
+    Returns:
+        Dictionary mit Arrays (stones, zone2_stones, rows, base_volume_m3,
+        volume_with_buffer_m3, cement_kg, cement_bags, gravel_kg,
+        gravel_tons, water_liters, rebar_length_m, rods_6m; ungerundete
+        Werte für base_volume_m3, volume_with_buffer_m3, cement_kg,
+        gravel_kg, water_liters und rebar_length_m)
+    """
+    config = get_config()
+    mix = config['concrete_mix']
+    rebar = config['reinforcement_steel']
+    if buffer_percentage is None:
+        buffer_percentage = config['buffer']['percentage']
+
+    # Steine und Reihen je Zone (wie calculate_stone_count / calculate_two_zone_wall)
+    if geometry['area2'] is None:
+        # Einfache Mauer: Zone 2 entfällt
+        zone2_stones = 0.0
+        stones = np.ceil(geometry['area1'] * stones_per_m2)
+        rows = np.ceil(geometry['rows_height1'] / height_m)
+        fill_total_liters = stones * fill_liters
+    else:
+        spm2_2 = stones_per_m2 if zone2_stones_per_m2 is None else zone2_stones_per_m2
+        fill_2 = fill_liters if zone2_fill_liters is None else zone2_fill_liters
+        height_2 = height_m if zone2_height_m is None else zone2_height_m
+
+        zone2_stones = np.ceil(geometry['area2'] * spm2_2)
+        stones = np.ceil(geometry['area1'] * stones_per_m2) + zone2_stones
+        rows = np.maximum(np.ceil(geometry['rows_height1'] / height_m),
+                          np.ceil(geometry['rows_height2'] / height_2))
+        # Bei gleichem Stein in beiden Zonen exakt stones * fill
+        fill_total_liters = stones * fill_liters + zone2_stones * (fill_2 - fill_liters)
+
+    # Öffnungen: ganz überdeckte Steine entfallen, Füllung anteilig
+    stones = stones - removed_stones
+    fill_total_liters = fill_total_liters - opening_stone_share * fill_liters
+
+    base_volume = fill_total_liters / 1000
+    volume = base_volume * (1 + buffer_percentage / 100)
+
+    # Materialien (wie calculate_materials)
+    cement_kg = volume * mix['cement_kg_per_m3']
+    gravel_kg = volume * mix['gravel_kg_per_m3']
+
+    # Bewehrung (wie calculate_reinforcement), 0 unterhalb der Mindesthöhe
+    total_rebar_m = (geometry['length'] * rows - interrupted_length) * rebar['rods_per_row']
+    rods = np.ceil(total_rebar_m / rebar['rod_length_m'])
+    below_minimum = geometry['max_height'] < rebar['min_height_for_reinforcement_m']
+    if np.ndim(below_minimum):
+        rods = np.where(below_minimum, 0.0, rods)
+        total_rebar_m = np.where(below_minimum, 0.0, total_rebar_m)
+    elif below_minimum:
+        rods = rods * 0.0
+        total_rebar_m = total_rebar_m * 0.0
+
+    return {
+        'stones': stones,
+        'zone2_stones': zone2_stones,
+        'rows': rows,
+        'base_volume_m3': base_volume,
+        'volume_with_buffer_m3': volume,
+        'cement_kg': cement_kg,
+        'cement_bags': np.ceil(cement_kg / mix['cement_bag_size_kg']),
+        'gravel_kg': gravel_kg,
+        'gravel_tons': np.ceil(gravel_kg / 100) / 10,
+        'water_liters': volume * mix['water_liters_per_m3'],
+        'rebar_length_m': total_rebar_m,
+        'rods_6m': rods
+    }
+
+
+def batch_costs(
+    quantities: Dict[str, np.ndarray],
+    cement_price,
+    gravel_price,
+    stone_price=0.0,
+    rebar_price=None
+) -> Dict[str, np.ndarray]:
+    """
+    Berechnet die Kosten wie calculate_costs() für Arrays
+
+    Preise dürfen Skalare oder Arrays sein (Broadcasting mit den Mengen).
+
+    Args:
+        quantities: Ergebnis von batch_quantities()
+        cement_price: Preis pro Zementsack in €
+        gravel_price: Preis pro Tonne Kies in €
+        stone_price: Preis pro Schalstein in € (ohne MwSt)
+        rebar_price: Preis pro 6m Stab (Standard: aus config.yaml)
+
+    Returns:
+        Dictionary mit Arrays (cement_cost, gravel_cost, stone_cost,
+        stone_vat, reinforcement_cost, subtotal, total_cost; gerundet auf Cent)
+    """
+    parts = _cost_parts(quantities, cement_price, gravel_price, stone_price, rebar_price)
+    cement_cost, gravel_cost, stone_cost, stone_vat, reinforcement_cost = parts
+
+    subtotal = cement_cost + gravel_cost + stone_cost + reinforcement_cost
+    total_cost = cement_cost + gravel_cost + (stone_cost + stone_vat) + reinforcement_cost
+
+    return {
+        'cement_cost': round_cents(cement_cost),
+        'gravel_cost': round_cents(gravel_cost),
+        'stone_cost': round_cents(stone_cost),
+        'stone_vat': round_cents(stone_vat),
+        'reinforcement_cost': reinforcement_cost,
+        'subtotal': round_cents(subtotal),
+        'total_cost': round_cents(total_cost)
+    }
+
+
+def batch_total_cost(
+    quantities: Dict[str, np.ndarray],
+    cement_price,
+    gravel_price,
+    stone_price=0.0,
+    rebar_price=None
+) -> np.ndarray:
+    """
+    Berechnet nur die Gesamtkosten (wie batch_costs()['total_cost'])
+
+    Spart die Einzelposten, wenn nur sortiert oder über große Preisraster
+    ausgewertet wird.
+    """
+    cement_cost, gravel_cost, stone_cost, stone_vat, reinforcement_cost = _cost_parts(
+        quantities, cement_price, gravel_price, stone_price, rebar_price
+    )
+    return round_cents(cement_cost + gravel_cost + (stone_cost + stone_vat) + reinforcement_cost)
+
+
+def _cost_parts(quantities, cement_price, gravel_price, stone_price, rebar_price):
+    if rebar_price is None:
+        rebar_price = get_config()['reinforcement_steel']['price_per_6m_rod_eur']
+    if stone_price is None:
+        stone_price = 0.0
+
+    stone_cost = quantities['stones'] * stone_price
+    return (
+        quantities['cement_bags'] * cement_price,
+        quantities['gravel_tons'] * gravel_price,
+        stone_cost,
+        stone_cost * 0.19,
+        # calculate_reinforcement() rundet die Bewehrungskosten vor der Summe
+        round_cents(quantities['rods_6m'] * rebar_price)
+    )
@@ -0,0 +1,123 @@
+"""
+Stapel-Export mehrerer Mauern (Kommandozeile)
+
+Liest Mauern aus einer JSON-Datei (Liste oder {"walls": [...]}, Parameter
+wie für calculate_all() bzw. POST /batch, optional mit "name") und
+schreibt je Mauer die gewählten Formate in ein Verzeichnis:
+
+    python batch_export.py mauern.json --out export --formats dxf glb txt
+
+Die Dateien werden direkt in die Zieldatei gestreamt (DXF Reihe für
+Reihe), es entstehen keine Plotly-Figures.
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from api_server import parse_wall_params
+from calculations import calculate_all
+from dxf_export import write_dxf
+from gltf_export import write_glb
+from pdf_export import create_text_report
+
+
+# Formate: Schlüssel → Dateiendung
+FORMATS = {
+    'dxf': '.dxf',
+    'glb': '.glb',
+    'txt': '.txt'
+}
+
+
+def load_walls(path: Path) -> List[Dict]:
+    """
+    Mauern aus einer JSON-Datei
+
+    Raises:
+        ValueError: wenn die Datei keine Liste von Mauern enthält
+    """
+    data = json.loads(path.read_text(encoding='utf-8'))
+    walls = data.get('walls') if isinstance(data, dict) else data
+    if not isinstance(walls, list) or not walls:
+        raise ValueError("Datei enthält keine Mauern (Liste oder {\"walls\": [...]})!")
+    return walls
+
+
+def file_stem(name: str) -> str:
+    """Dateiname aus der Bezeichnung einer Mauer"""
+    stem = re.sub(r'[^0-9A-Za-zÄÖÜäöüß_-]+', '_', name).strip('_')
+    return stem or 'mauer'
+
+
+def export_wall(wall: Dict, out_dir: Path, formats: List[str], number: int = 1) -> List[Path]:
+    """
+    Berechnet eine Mauer und schreibt die Exportdateien
+
+    Args:
+        wall: Parameter wie für calculate_all(), optional mit 'name'
+        out_dir: Zielverzeichnis
+        formats: Schlüssel aus FORMATS
+        number: Laufende Nummer (für Mauern ohne Namen)
+
+    Returns:
+        Geschriebene Dateien
+
+    Raises:
+        ValueError: bei ungültigen Parametern oder Berechnungsfehler
+    """
+    wall = dict(wall)
+    name = wall.pop('name', None) or f"Mauer {number}"
+    params = parse_wall_params(wall)
+    result = calculate_all(**params)
+    if 'error' in result:
+        raise ValueError(result['error'])
+
+    stem = out_dir / file_stem(name)
+    width_m = params['width'] / 100
+    written = []
+    for key in formats:
+        path = stem.with_suffix(FORMATS[key])
+        if key == 'dxf':
+            with open(path, 'w', encoding='utf-8', newline='\n') as fp:
+                write_dxf(fp, result['layout'], width_m)
+        elif key == 'glb':
+            with open(path, 'wb') as fp:
+                write_glb(fp, result['layout'], width_m)
+        else:
+            path.write_text(create_text_report(result, params), encoding='utf-8')
+        written.append(path)
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="MauerPlaner Stapel-Export (DXF, GLB, Text)")
+    parser.add_argument('walls', type=Path, help="JSON-Datei mit Mauern")
+    parser.add_argument('--out', type=Path, default=Path('export'), help="Zielverzeichnis")
+    parser.add_argument('--formats', nargs='+', choices=list(FORMATS), default=['dxf'],
+                        help="Exportformate (Standard: dxf)")
+    args = parser.parse_args(argv)
+
+    try:
+        walls = load_walls(args.walls)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    failed = 0
+    for number, wall in enumerate(walls, start=1):
+        try:
+            for path in export_wall(wall, args.out, args.formats, number):
+                print(path)
+        except (TypeError, ValueError) as e:
+            failed += 1
+            print(f"Mauer {number}: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
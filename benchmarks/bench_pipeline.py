@@ -0,0 +1,465 @@
+"""
+Benchmark-Suite für Berechnung, Visualisierung und PDF-Export
+
+Misst calculate_all(), create_2d_view(), create_3d_view() und
+create_pdf_report() über Mauerlängen von 1 m bis 500 m, alle Steintypen
+sowie einfache und 2-Zonen-Mauern. Erfasst werden Laufzeit, Spitzen-
+speicher (tracemalloc) und die Payload-Größe der Plotly-Figures.
+Dazu kommen Szenarien für große Einzelfälle der Module (z.B. Projekte mit
+Tausenden Mauern) mit einem festen Zeitbudget.
+Die Ergebnisse werden mit einer gespeicherten Baseline verglichen.
+
+Verwendung:
+    python benchmarks/bench_pipeline.py                       # Vergleich mit Baseline
+    python benchmarks/bench_pipeline.py --update-baseline     # Baseline neu schreiben
+    python benchmarks/bench_pipeline.py --threshold 0.5 --quick
+    python benchmarks/bench_pipeline.py --scenario aggregate_walls_5000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from calculations import calculate_all, load_config  # noqa: E402
+
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+WALL_LENGTHS_M = [1.0, 10.0, 50.0, 100.0, 500.0]
+QUICK_WALL_LENGTHS_M = [1.0, 10.0, 50.0]
+MODES = ['single', 'two_zone']
+STAGES = ['calculate_all', 'create_2d_view', 'create_3d_view', 'create_pdf_report']
+
+# Laufzeiten unterhalb dieser Grenze gelten als Messrauschen
+MIN_TIME_MS = 1.0
+
+
+def wall_params(length: float, stone_type: str, mode: str) -> Dict:
+    """
+    Erstellt die Parameter für einen Benchmark-Fall
+
+    Args:
+        length: Gesamtlänge in Metern
+        stone_type: Steintyp
+        mode: 'single' (Gefälle 1,5 m → 1,0 m) oder 'two_zone' (1,0 m flach → 2,0 m)
+
+    Returns:
+        Parameter für calculate_all()
+    """
+    config = load_config()
+    prices = config['prices']
+    params = {
+        'length': length,
+        'width': config['stone_types'][stone_type]['width_cm'],
+        'stone_type': stone_type,
+        'cement_price': prices['cement_per_bag_eur'],
+        'gravel_price': prices['gravel_per_ton_eur'],
+        'stone_price': prices['stone_per_piece_eur']
+    }
+
+    if mode == 'two_zone':
+        params.update({
+            'start_height': 1.0,
+            'end_height': 2.0,
+            'is_two_zone': True,
+            'zone1_length': length / 2,
+            'zone1_height': 1.0,
+            'zone2_length': length / 2,
+            'zone2_end_height': 2.0
+        })
+    else:
+        params.update({'start_height': 1.5, 'end_height': 1.0})
+
+    return params
+
+
+def stage_callables(params: Dict) -> Dict[str, Callable]:
+    """
+    Erstellt die zu messenden Aufrufe für einen Fall
+
+    Returns:
+        Dictionary Stufe → Funktion, die das Stufenergebnis liefert
+    """
+    from pdf_export import create_pdf_report
+    from visualization import create_2d_view, create_3d_view
+
+    result = calculate_all(**params)
+    stone_width_m = params['width'] / 100
+    inputs = {k: params[k] for k in ('length', 'start_height', 'end_height', 'width')}
+
+    # PDF ohne eingebettetes Bild, damit die Messung nicht von Kaleido/Chrome abhängt
+    return {
+        'calculate_all': lambda: calculate_all(**params),
+        'create_2d_view': lambda: create_2d_view(result['layout'], stone_width_m),
+        'create_3d_view': lambda: create_3d_view(result['layout'], stone_width_m),
+        'create_pdf_report': lambda: create_pdf_report(result, inputs, None)
+    }
+
+
+# Szenarien: Name → (Zeitbudget in ms, Aufbau); der Aufbau bereitet die Daten
+# vor und liefert den zu messenden Aufruf. Über dem Budget gilt ein Szenario
+# unabhängig von der Baseline als Regression.
+SCENARIOS: Dict[str, Tuple[float, Callable[[], Callable]]] = {}
+
+
+def scenario(name: str, budget_ms: float):
+    """Registriert die Aufbau-Funktion eines Szenarios (Dekorator)"""
+    def register(setup: Callable[[], Callable]) -> Callable[[], Callable]:
+        SCENARIOS[name] = (budget_ms, setup)
+        return setup
+    return register
+
+
+@scenario('aggregate_walls_5000', budget_ms=500)
+def _aggregate_walls():
+    from project import aggregate_walls
+
+    walls = [dict(length=1.0 + (i % 50) / 10, start_height=1.2, end_height=1.2, width=36.5,
+                  stone_type='abmessung_1') for i in range(5000)]
+    return lambda: aggregate_walls(walls, cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0)
+
+
+
+@scenario('cutting_plan_50000_cuts', budget_ms=1000)
+def _cutting_plan():
+    import numpy as np
+    from rebar_cutting import cutting_plan
+
+    rng = np.random.default_rng(0)
+    lengths = rng.uniform(1, 25, 3000).round(2)
+    counts = rng.integers(2, 20, 3000)
+    return lambda: cutting_plan(lengths, counts)
+
+
+@scenario('project_pour_plan_5000', budget_ms=500)
+def _project_pour_plan():
+    import numpy as np
+    from pour_planner import project_pour_plan
+    from project import aggregate_walls
+
+    rng = np.random.default_rng(0)
+    walls = [dict(length=float(length), start_height=1.488, end_height=0.496, width=36.5,
+                  stone_type='abmessung_1') for length in rng.uniform(1, 20, 5000)]
+    volumes = aggregate_walls(walls).per_wall['volume_with_buffer_m3']
+    return lambda: project_pour_plan(walls, volumes)
+
+
+@scenario('plan_deliveries_5000', budget_ms=1000)
+def _plan_deliveries():
+    import numpy as np
+    from logistics import plan_deliveries
+
+    rng = np.random.default_rng(0)
+    orders = [
+        {'stone_type': 'abmessung_1', 'stones': int(s), 'cement_bags': int(c), 'gravel_tons': float(g)}
+        for s, c, g in zip(rng.integers(10, 2000, 5000), rng.integers(1, 200, 5000),
+                           rng.uniform(0.1, 40, 5000).round(1))
+    ]
+    return lambda: plan_deliveries(orders)
+
+
+@scenario('reverse_solver_live', budget_ms=20)
+def _reverse_solver():
+    from reverse_solver import solve_height, solve_length
+
+    def solve():
+        solve_length('cost', 2000, 1.24, 1.24, 'abmessung_1',
+                     cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0)
+        return solve_height('volume', 1.5, 5.0, 'abmessung_4')
+    return solve
+
+
+@scenario('openings_500', budget_ms=2000)
+def _openings():
+    openings = [dict(x=i * 0.9 + 0.1, width=0.5, bottom=0.2, height=0.6) for i in range(500)]
+    return lambda: calculate_all(100 * 4.6, 1.984, 1.984, 36.5, 'abmessung_1', openings=openings)
+
+
+@scenario('wall_network_599', budget_ms=1000)
+def _wall_network():
+    from wall_network import aggregate_network
+
+    segments = [dict(start=(3.0 * i, 0), end=(3.0 * (i + 1), 0), start_height=1.0) for i in range(300)]
+    segments += [dict(start=(3.0 * i, 0), end=(3.0 * i, 2), start_height=1.0) for i in range(1, 300)]
+    return lambda: aggregate_network(segments, 'abmessung_1')
+
+
+@scenario('create_glb_50000_stones', budget_ms=1500)
+def _create_glb():
+    from gltf_export import create_glb
+
+    layout = calculate_all(1000.0, 5.0, 5.0, 36.5, 'abmessung_1')['layout']
+    return lambda: create_glb(layout, 0.365)
+
+
+@scenario('write_dxf_50000_stones', budget_ms=3000)
+def _write_dxf():
+    import io
+    from dxf_export import write_dxf
+
+    layout = calculate_all(1000.0, 5.0, 5.0, 36.5, 'abmessung_1')['layout']
+    return lambda: write_dxf(io.StringIO(), layout, 0.365)
+
+
+@scenario('thumbnail_svg_png', budget_ms=10)
+def _thumbnail():
+    from calculations import get_stone_layout
+    from thumbnails import render_png, render_svg
+
+    layout = get_stone_layout(10.0, 1.5, 1.0, 'abmessung_1')
+    # Ohne Zwischenspeicher: ein SVG und ein PNG
+    return lambda: (render_svg(layout), render_png(layout))
+
+
+@scenario('price_sweep_1000000', budget_ms=1000)
+def _price_sweep():
+    from sensitivity import price_sweep, relative_axis
+
+    wall = dict(length=8.0, start_height=1.984, end_height=0.992, width=36.5, stone_type='abmessung_1',
+                cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0)
+    axes = {
+        'cement_price': relative_axis(5.0, points=100),
+        'gravel_price': relative_axis(34.0, points=100),
+        'stone_price': relative_axis(2.5, points=100)
+    }
+    return lambda: price_sweep(wall, axes)
+
+
+def measure(fn: Callable, repeat: int) -> Tuple[float, float, int, object]:
+    """
+    Misst eine Stufe
+
+    Args:
+        fn: Zu messende Funktion
+        repeat: Anzahl Wiederholungen für die Zeitmessung
+
+    Returns:
+        (min_ms, median_ms, peak_bytes, letzter Rückgabewert)
+    """
+    times = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        value = fn()
+        times.append((time.perf_counter_ns() - start) / 1e6)
+
+    # Speicher separat messen, da tracemalloc die Laufzeit verfälscht
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(times), statistics.median(times), peak, value
+
+
+def payload_bytes(value) -> Optional[int]:
+    """Größe der serialisierten Figure bzw. des PDFs in Bytes"""
+    if hasattr(value, 'to_json'):
+        return len(value.to_json().encode('utf-8'))
+    if hasattr(value, 'getbuffer'):
+        return value.getbuffer().nbytes
+    return None
+
+
+def case_key(stage: str, stone_type: str, mode: str, length: float) -> str:
+    return f"{stage}|{stone_type}|{mode}|{length:g}m"
+
+
+def run_benchmarks(
+    lengths: List[float],
+    repeat: int = 3,
+    stages: Optional[List[str]] = None,
+    stone_types: Optional[List[str]] = None,
+    progress: bool = False
+) -> Dict[str, Dict]:
+    """
+    Führt alle Benchmark-Fälle aus
+
+    Args:
+        lengths: Mauerlängen in Metern
+        repeat: Wiederholungen pro Messung
+        stages: Zu messende Stufen (Standard: alle)
+        stone_types: Steintypen (Standard: alle aus config.yaml)
+        progress: Fortschritt auf stderr ausgeben
+
+    Returns:
+        Dictionary Fall-Schlüssel → Messwerte
+    """
+    stages = stages or STAGES
+    stone_types = stone_types or list(load_config()['stone_types'])
+    results = {}
+
+    for stone_type in stone_types:
+        for mode in MODES:
+            for length in lengths:
+                calls = stage_callables(wall_params(length, stone_type, mode))
+                for stage in stages:
+                    min_ms, median_ms, peak, value = measure(calls[stage], repeat)
+                    key = case_key(stage, stone_type, mode, length)
+                    results[key] = {
+                        'time_ms': round(min_ms, 3),
+                        'median_ms': round(median_ms, 3),
+                        'peak_kb': round(peak / 1024, 1),
+                        'payload_bytes': payload_bytes(value)
+                    }
+                    if progress:
+                        print(f"  {key}: {min_ms:.2f} ms", file=sys.stderr)
+
+    return results
+
+
+def run_scenarios(names: List[str], repeat: int = 3, progress: bool = False) -> Dict[str, Dict]:
+    """
+    Führt Szenarien aus
+
+    Args:
+        names: Namen aus SCENARIOS
+        repeat: Wiederholungen pro Messung
+        progress: Fortschritt auf stderr ausgeben
+
+    Returns:
+        Dictionary Fall-Schlüssel → Messwerte (mit budget_ms)
+    """
+    results = {}
+    for name in names:
+        budget_ms, setup = SCENARIOS[name]
+        min_ms, median_ms, peak, value = measure(setup(), repeat)
+        key = f"scenario|{name}"
+        results[key] = {
+            'time_ms': round(min_ms, 3),
+            'median_ms': round(median_ms, 3),
+            'peak_kb': round(peak / 1024, 1),
+            'payload_bytes': payload_bytes(value),
+            'budget_ms': budget_ms
+        }
+        if progress:
+            print(f"  {key}: {min_ms:.2f} ms", file=sys.stderr)
+    return results
+
+
+def compare_results(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    threshold: float
+) -> List[str]:
+    """
+    Vergleicht Messwerte mit der Baseline
+
+    Args:
+        results: Aktuelle Messwerte
+        baseline: Gespeicherte Messwerte
+        threshold: Erlaubte relative Verschlechterung (0.25 = +25 %)
+
+    Returns:
+        Liste der Regressionen als Text
+    """
+    regressions = []
+    limit = 1 + threshold
+
+    for key, current in results.items():
+        if current.get('budget_ms') and current['time_ms'] > current['budget_ms']:
+            regressions.append(
+                f"{key}: Laufzeit {current['time_ms']:.2f} ms über Budget {current['budget_ms']:.0f} ms"
+            )
+
+        base = baseline.get(key)
+        if base is None:
+            continue
+
+        if current['time_ms'] >= MIN_TIME_MS and current['time_ms'] > base['time_ms'] * limit:
+            regressions.append(
+                f"{key}: Laufzeit {base['time_ms']:.2f} → {current['time_ms']:.2f} ms"
+            )
+        if current['peak_kb'] > base['peak_kb'] * limit:
+            regressions.append(
+                f"{key}: Speicher {base['peak_kb']:.0f} → {current['peak_kb']:.0f} KB"
+            )
+        if current['payload_bytes'] and base.get('payload_bytes') \
+                and current['payload_bytes'] > base['payload_bytes'] * limit:
+            regressions.append(
+                f"{key}: Payload {base['payload_bytes']} → {current['payload_bytes']} Bytes"
+            )
+
+    return regressions
+
+
+def print_table(results: Dict[str, Dict], baseline: Dict[str, Dict]):
+    """Gibt die Messwerte tabellarisch aus"""
+    print(f"{'Fall':<50} {'Zeit (ms)':>10} {'Basis':>10} {'Peak (KB)':>10} {'Payload':>10}")
+    for key, current in results.items():
+        base = baseline.get(key, {})
+        base_time = f"{base['time_ms']:.2f}" if base else '—'
+        payload = current['payload_bytes'] if current['payload_bytes'] is not None else '—'
+        print(f"{key:<50} {current['time_ms']:>10.2f} {base_time:>10} "
+              f"{current['peak_kb']:>10.0f} {payload:>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark-Suite MauerPlaner")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH,
+                        help="Pfad zur Baseline-JSON")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Erlaubte Verschlechterung (0.25 = +25 %%)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--quick', action='store_true', help="Nur Längen bis 50 m")
+    parser.add_argument('--stage', action='append', choices=STAGES,
+                        help="Nur bestimmte Stufen messen (mehrfach möglich)")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Nur bestimmte Szenarien messen (mehrfach möglich)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Aktuelle Messwerte als Baseline speichern")
+    parser.add_argument('--output', type=Path, help="Messwerte zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+
+    lengths = QUICK_WALL_LENGTHS_M if args.quick else WALL_LENGTHS_M
+    # Ohne Auswahl alles messen, sonst nur die gewählten Stufen bzw. Szenarien
+    stages, scenarios = args.stage, args.scenario
+    if stages is None and scenarios is None:
+        stages, scenarios = STAGES, sorted(SCENARIOS)
+
+    results = {}
+    if stages:
+        results.update(run_benchmarks(lengths, repeat=args.repeat, stages=stages, progress=True))
+    if scenarios:
+        results.update(run_scenarios(scenarios, repeat=args.repeat, progress=True))
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))['results']
+
+    print_table(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps({'results': results}, indent=1), encoding='utf-8')
+
+    if args.update_baseline:
+        merged = dict(baseline, **results)
+        args.baseline.write_text(
+            json.dumps({'python': sys.version.split()[0], 'results': merged}, indent=1) + '\n',
+            encoding='utf-8'
+        )
+        print(f"\nBaseline gespeichert: {args.baseline}")
+        return 0
+
+    regressions = compare_results(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} Regression(en) über {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print(f"\n✅ Keine Regressionen (Schwelle {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
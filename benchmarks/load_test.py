@@ -0,0 +1,207 @@
+"""
+Lasttest für die Streamlit-App mit parallelen Sitzungen
+
+Simuliert N gleichzeitige Sitzungen über Streamlits AppTest. Jede Sitzung
+spielt eine realistische Abfolge von Widget-Änderungen gegen app.py ab
+(Vorlagenwechsel, Preisänderung, 2-Zonen-Umschaltung, PDF-Export). Da
+Streamlit alle Tabs serverseitig rendert, enthält jeder Rerun auch die
+Übersicht-, Visualisierungs-, Material- und Export-Tabs.
+
+Gemessen werden pro Parallelitätsstufe Rerun-Latenz (p50/p95/p99),
+Durchsatz und Speicher pro Sitzung.
+
+Verwendung:
+    python benchmarks/load_test.py --sessions 1 2 4 8 --iterations 2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / 'app.py'
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+
+RERUN_TIMEOUT_S = 120
+
+
+def widget(elements, label: str):
+    """Sucht ein Widget anhand seines Labels"""
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"Widget nicht gefunden: {label}")
+
+
+def scenario_steps() -> List[Tuple[str, Callable]]:
+    """
+    Abfolge von Nutzeraktionen einer Sitzung
+
+    Returns:
+        Liste von (Schrittname, Aktion auf AppTest); jede Aktion löst einen Rerun aus
+    """
+    return [
+        ('start', lambda at: at),
+        ('vorlage', lambda at: widget(at.selectbox, "Vorlage").set_value(
+            widget(at.selectbox, "Vorlage").options[3])),
+        ('zementpreis', lambda at: widget(at.number_input, "Zement (25 kg) in €").set_value(6.5)),
+        ('steinpreis', lambda at: widget(at.number_input, "Schalstein (pro Stück) in €").set_value(2.8)),
+        ('zweizonen', lambda at: widget(at.radio, "Mauer-Typ").set_value(
+            "Zweizonen (flach + variabel)")),
+        ('laenge_zone2', lambda at: widget(at.number_input, "Länge Zone 2 (m)").set_value(12.0)),
+        ('pdf_export', lambda at: widget(at.button, "📥 PDF erstellen").click()),
+        ('einfach', lambda at: widget(at.radio, "Mauer-Typ").set_value("Einfach (durchgehend)")),
+    ]
+
+
+def run_session(iterations: int) -> List[Tuple[str, float]]:
+    """
+    Führt eine Sitzung aus
+
+    Args:
+        iterations: Wie oft die Schrittfolge wiederholt wird
+
+    Returns:
+        Liste von (Schrittname, Rerun-Latenz in ms)
+    """
+    at = AppTest.from_file(str(APP_PATH), default_timeout=RERUN_TIMEOUT_S)
+    timings = []
+
+    for _ in range(iterations):
+        for name, action in scenario_steps():
+            if name == 'start' and timings:
+                continue
+            action(at)
+            start = time.perf_counter_ns()
+            at.run()
+            timings.append((name, (time.perf_counter_ns() - start) / 1e6))
+            if at.exception:
+                raise RuntimeError(f"Fehler in Schritt '{name}': {at.exception[0].message}")
+
+    return timings
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Perzentil mit linearer Interpolation"""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run_level(sessions: int, iterations: int) -> Dict:
+    """
+    Führt eine Parallelitätsstufe aus
+
+    Args:
+        sessions: Anzahl gleichzeitiger Sitzungen
+        iterations: Wiederholungen der Schrittfolge pro Sitzung
+
+    Returns:
+        Kennzahlen der Stufe
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(run_session, iterations) for _ in range(sessions)]
+        timings = [t for f in futures for t in f.result()]
+    elapsed = time.perf_counter() - start
+
+    latencies = [ms for _, ms in timings]
+    per_step: Dict[str, List[float]] = {}
+    for name, ms in timings:
+        per_step.setdefault(name, []).append(ms)
+
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p95_ms': round(percentile(latencies, 95), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'steps_p50_ms': {name: round(statistics.median(v), 1) for name, v in per_step.items()}
+    }
+
+
+def memory_per_session(sessions: int) -> float:
+    """
+    Misst den zusätzlichen Speicher pro lebender Sitzung (tracemalloc)
+
+    Die Sitzungen werden nacheinander ausgeführt und bleiben im Speicher,
+    wie Sitzungen eines laufenden Servers.
+
+    Returns:
+        Speicher pro Sitzung in MB
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    alive = []
+    for _ in range(sessions):
+        at = AppTest.from_file(str(APP_PATH), default_timeout=RERUN_TIMEOUT_S)
+        for name, action in scenario_steps():
+            action(at)
+            at.run()
+        alive.append(at)
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / sessions / 1024 / 1024
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Lasttest MauerPlaner (Streamlit)")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Parallelitätsstufen")
+    parser.add_argument('--iterations', type=int, default=1,
+                        help="Wiederholungen der Schrittfolge pro Sitzung")
+    parser.add_argument('--memory-sessions', type=int, default=3,
+                        help="Sitzungen für die Speichermessung (0 = aus)")
+    parser.add_argument('--output', type=Path, help="Ergebnisse als JSON speichern")
+    args = parser.parse_args(argv)
+
+    # config.yaml wird relativ zum Arbeitsverzeichnis geladen
+    os.chdir(ROOT)
+
+    # Aufwärmen (Imports, Config-Cache)
+    run_session(1)
+
+    levels = []
+    print(f"{'Sitzungen':>9} {'Reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Reruns/s':>9}")
+    for sessions in args.sessions:
+        level = run_level(sessions, args.iterations)
+        levels.append(level)
+        print(f"{level['sessions']:>9} {level['reruns']:>7} {level['p50_ms']:>8} "
+              f"{level['p95_ms']:>8} {level['p99_ms']:>8} {level['throughput_rps']:>9}")
+
+    report = {'levels': levels, 'threads': threading.active_count()}
+
+    if args.memory_sessions:
+        mb = memory_per_session(args.memory_sessions)
+        report['memory_per_session_mb'] = round(mb, 2)
+        print(f"\nSpeicher pro Sitzung: {mb:.2f} MB")
+
+    print("\nMedian pro Schritt (höchste Stufe):")
+    for name, ms in levels[-1]['steps_p50_ms'].items():
+        print(f"  {name:<14} {ms:>8} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=1), encoding='utf-8')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,15 +3,26 @@ Berechnungslogik für Schalsteinmauer-Betonrechner
 Basierend auf FCN-Spezifikationen
 """
 
-import yaml
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import math
 
+import numpy as np
+
+from config_store import get_config, config_version, consistent_config
+from instrumentation import timed
+from openings import interrupted_rebar_length, opening_area, opening_arrays
+from stone_layout import stone_cuts, wall_height_at
+
 
 def load_config() -> Dict:
-    """Lädt die Konfigurationsdatei"""
-    with open('config.yaml', 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    """
+    Lädt die Konfiguration
+    
+    Gibt den aktuellen, unveränderlichen Snapshot aus dem prozessweiten
+    Config-Speicher zurück (kein YAML-Parsen pro Aufruf). Nach dem
+    Speichern im Admin-Bereich sehen alle Sitzungen sofort den neuen Stand.
+    """
+    return get_config()
 
 
 def validate_inputs(
@@ -54,6 +65,68 @@ def validate_inputs(
     return True, None
 
 
+def validate_openings(openings: List[Dict], layout: Dict) -> Tuple[bool, Optional[str]]:
+    """
+    Validiert Öffnungen (Rohrdurchführungen, Tore, Nischen) einer Mauer
+    
+    Jede Öffnung muss innerhalb der Mauer liegen (auch unter der
+    Mauerkrone bei Gefälle), Öffnungen dürfen sich nicht überschneiden.
+    
+    Args:
+        openings: Liste von Öffnungen mit x, width, bottom, height (Meter)
+        layout: Layout-Dictionary der Mauer
+        
+    Returns:
+        (is_valid, error_message)
+    """
+    names = []
+    for number, opening in enumerate(openings, start=1):
+        name = f"Öffnung {number}"
+        if isinstance(opening, dict) and opening.get('name'):
+            name = opening['name']
+        if not isinstance(opening, dict) or not all(
+            isinstance(opening.get(key), (int, float)) and not isinstance(opening.get(key), bool)
+            for key in ('x', 'width', 'bottom', 'height')
+        ):
+            return False, f"{name}: x, width, bottom und height (in m) angeben!"
+        if opening['width'] <= 0 or opening['height'] <= 0:
+            return False, f"{name}: Breite und Höhe müssen größer als 0 sein!"
+        if opening['x'] < 0 or opening['bottom'] < 0:
+            return False, f"{name}: Position und Unterkante dürfen nicht negativ sein!"
+        names.append(name)
+    
+    if not openings:
+        return True, None
+    
+    x0, x1, y0, y1 = opening_arrays(openings)
+    tolerance = 1e-6
+    
+    too_long = np.flatnonzero(x1 > layout['total_length'] + tolerance)
+    if too_long.size:
+        return False, f"{names[too_long[0]]}: reicht über das Mauerende hinaus!"
+    
+    # Mauerkrone ist stückweise linear: Minimum an den Kanten bzw. am Zonenwechsel
+    check_x = [x0, x1]
+    if layout.get('is_two_zone', False):
+        check_x.append(np.clip(layout['zone1_length'], x0, x1))
+    crown = np.min([wall_height_at(layout, x) for x in check_x], axis=0)
+    too_high = np.flatnonzero(y1 > crown + tolerance)
+    if too_high.size:
+        return False, f"{names[too_high[0]]}: reicht über die Mauerkrone hinaus!"
+    
+    # Paarweise Überschneidung (ohne Diagonale)
+    overlaps = (
+        (x0[:, None] < x1[None, :] - tolerance) & (x0[None, :] < x1[:, None] - tolerance)
+        & (y0[:, None] < y1[None, :] - tolerance) & (y0[None, :] < y1[:, None] - tolerance)
+    )
+    np.fill_diagonal(overlaps, False)
+    if overlaps.any():
+        first, second = np.argwhere(overlaps)[0]
+        return False, f"{names[first]} und {names[second]} überschneiden sich!"
+    
+    return True, None
+
+
 def get_height_warnings(start_height: float, end_height: float, is_backfilled: bool = False) -> list:
     """
     Gibt Warnungen für zu hohe Mauern zurück
@@ -218,7 +291,8 @@ def calculate_reinforcement(
     rows: int,
     wall_length: float,
     max_height: float,
-    price_per_rod: Optional[float] = None
+    price_per_rod: Optional[float] = None,
+    interrupted_length: float = 0.0
 ) -> Optional[Dict[str, float]]:
     """
     Berechnet Bewehrungsstahl-Bedarf ab 1m Höhe
@@ -228,6 +302,8 @@ def calculate_reinforcement(
         wall_length: Länge der Mauer in Metern
         max_height: Maximale Höhe der Mauer in Metern
         price_per_rod: Preis pro 6m Stab (optional, sonst aus Config)
+        interrupted_length: Durch Öffnungen unterbrochene Lagenlänge in
+            Metern (Breite × Lagen, wird je Stab abgezogen)
         
     Returns:
         Dictionary mit Bewehrungsdaten oder None wenn nicht benötigt
@@ -246,7 +322,7 @@ def calculate_reinforcement(
     total_rods_needed = rows * rods_per_row
     
     # Gesamtlänge in Metern (Länge der Mauer × Anzahl Lagen × Stäbe pro Lage)
-    total_length_m = wall_length * rows * rods_per_row
+    total_length_m = (wall_length * rows - interrupted_length) * rods_per_row
     
     # Anzahl 6m Stäbe (aufgerundet)
     rod_length_m = rebar['rod_length_m']
@@ -261,6 +337,7 @@ def calculate_reinforcement(
         'rows': rows,
         'rods_per_row': rods_per_row,
         'total_rods_needed': total_rods_needed,
+        'wall_length_m': wall_length,
         'total_length_m': round(total_length_m, 1),
         'rod_length_m': rod_length_m,
         'rods_6m_needed': rods_6m_needed,
@@ -462,6 +539,55 @@ def calculate_two_zone_wall(
     return total_area, total_stones, max_rows, total_area, zone_breakdown
 
 
+def get_two_zone_layout(
+    length: float,
+    start_height: float,
+    end_height: float,
+    stone_type: str,
+    zone1_length: float,
+    zone1_height: float,
+    zone2_length: float,
+    zone2_end_height: float
+) -> Dict:
+    """
+    Berechnet das Layout einer 2-Zonen-Mauer für die Visualisierung
+    
+    Args:
+        length: Gesamtlänge in Metern
+        start_height: Anfangshöhe in Metern
+        end_height: Endhöhe in Metern
+        stone_type: Typ des Steins
+        zone1_length, zone1_height, zone2_length, zone2_end_height: Zonenmaße
+        
+    Returns:
+        Dictionary mit Layout-Informationen (Reihen wie calculate_two_zone_wall())
+    """
+    config = load_config()
+    stone_data = config['stone_types'][stone_type]
+    stone_length_m = stone_data['length_cm'] / 100
+    stone_height_m = stone_data['height_cm'] / 100
+    
+    return {
+        'stone_length_m': stone_length_m,
+        'stone_width_m': stone_data['width_cm'] / 100,
+        'stone_height_m': stone_height_m,
+        'is_two_zone': True,
+        'zone1_length': zone1_length,
+        'zone1_height': zone1_height,
+        'zone2_length': zone2_length,
+        'zone2_start_height': zone1_height,
+        'zone2_end_height': zone2_end_height,
+        'total_length': length,
+        'start_height': start_height,
+        'end_height': end_height,
+        'rows_start': math.ceil(zone1_height / stone_height_m),
+        'rows_end': math.ceil(max(zone1_height, zone2_end_height) / stone_height_m),
+        'stones_per_row': math.ceil(length / stone_length_m)
+    }
+
+
+@timed('calculate_all')
+@consistent_config
 def calculate_all(
     length: float,
     start_height: float,
@@ -476,7 +602,8 @@ def calculate_all(
     zone1_length: Optional[float] = None,
     zone1_height: Optional[float] = None,
     zone2_length: Optional[float] = None,
-    zone2_end_height: Optional[float] = None
+    zone2_end_height: Optional[float] = None,
+    openings: Optional[List[Dict]] = None
 ) -> Dict:
     """
     Führt alle Berechnungen durch und gibt ein vollständiges Ergebnis zurück
@@ -490,6 +617,8 @@ def calculate_all(
         cement_price: Preis pro Zementsack (optional)
         gravel_price: Preis pro Tonne Kies (optional)
         rebar_price: Preis pro 6m Bewehrungsstab (optional)
+        openings: Öffnungen (x, width, bottom, height in m, optional name);
+            werden von Steinen, Füllbeton und Bewehrung abgezogen
         
     Returns:
         Dictionary mit allen Berechnungsergebnissen
@@ -513,37 +642,40 @@ def calculate_all(
         )
         
         # Layout für Visualisierung (2 Zonen)
-        layout = {
-            'stone_length_m': config['stone_types'][stone_type]['length_cm'] / 100,
-            'stone_width_m': config['stone_types'][stone_type]['width_cm'] / 100,
-            'stone_height_m': config['stone_types'][stone_type]['height_cm'] / 100,
-            'is_two_zone': True,
-            'zone1_length': zone1_length,
-            'zone1_height': zone1_height,
-            'zone2_length': zone2_length,
-            'zone2_start_height': zone1_height,
-            'zone2_end_height': zone2_end_height,
-            'total_length': length,
-            'start_height': start_height,
-            'end_height': end_height,
-            'rows_start': zone_breakdown['zone1']['rows'],
-            'rows_end': zone_breakdown['zone2']['rows'],
-            'stones_per_row': math.ceil(length / (config['stone_types'][stone_type]['length_cm'] / 100))
-        }
+        layout = get_two_zone_layout(
+            length, start_height, end_height, stone_type,
+            zone1_length, zone1_height, zone2_length, zone2_end_height
+        )
     else:
         # Standard-Berechnung (einfach)
         total_stones, rows, area = calculate_stone_count(length, start_height, end_height, stone_type)
         layout = get_stone_layout(length, start_height, end_height, stone_type)
     
+    # Öffnungen: ganz überdeckte Steine entfallen, Füllung anteilig
+    fill_stones = total_stones
+    interrupted_length = 0.0
+    if openings:
+        is_valid, error = validate_openings(openings, layout)
+        if not is_valid:
+            return {'error': error}
+        layout['openings'] = [dict(opening) for opening in openings]
+    cuts = stone_cuts(layout)
+    if openings:
+        total_stones -= cuts['removed_stones']
+        fill_stones -= cuts['opening_stone_share']
+        area -= opening_area(openings)
+        interrupted_length = interrupted_rebar_length(openings, layout['stone_height_m'], rows)
+    
     # Volumen
-    base_volume, volume_with_buffer = calculate_fill_volume(total_stones, stone_type)
+    base_volume, volume_with_buffer = calculate_fill_volume(fill_stones, stone_type)
     
     # Materialien
     materials = calculate_materials(volume_with_buffer)
     
     # Bewehrungsstahl (automatisch ab 1m Höhe)
     max_height = max(start_height, end_height)
-    reinforcement = calculate_reinforcement(rows, length, max_height, price_per_rod=rebar_price)
+    reinforcement = calculate_reinforcement(rows, length, max_height, price_per_rod=rebar_price,
+                                            interrupted_length=interrupted_length)
     
     # Kosten (falls Preise angegeben)
     costs = None
@@ -558,8 +690,8 @@ def calculate_all(
             reinforcement_cost=reinforcement_cost
         )
     
-    # Steininfo
-    stone_data = config['stone_types'][stone_type]
+    # Steininfo (als Kopie, der Config-Snapshot ist unveränderlich)
+    stone_data = dict(config['stone_types'][stone_type])
     
     result = {
         'valid': True,
@@ -574,16 +706,23 @@ def calculate_all(
         'costs': costs,
         'reinforcement': reinforcement,
         'layout': layout,
+        'stone_cuts': cuts,
         'stone_data': stone_data,
         'concrete_recommendation': get_concrete_recommendation(),
         'disclaimer': get_disclaimer(),
-        'is_two_zone': is_two_zone
+        'is_two_zone': is_two_zone,
+        'config_version': config_version()
     }
     
     # Füge Zone-Breakdown hinzu, wenn vorhanden
     if zone_breakdown:
         result['zone_breakdown'] = zone_breakdown
     
+    # Öffnungen mit Fläche (für Berichte)
+    if openings:
+        result['openings'] = layout['openings']
+        result['opening_area_m2'] = round(opening_area(openings), 3)
+    
     return result
 
 
@@ -0,0 +1,400 @@
+"""
+Konfigurationsspeicher mit unveränderlichen Snapshots
+Lesende Sitzungen erhalten einen eingefrorenen In-Memory-Snapshot der
+config.yaml, der bei Änderungen atomar ausgetauscht wird. Speichern
+(Admin-Seite) schreibt atomar über Temp-Datei, fsync und Umbenennen und
+vergibt eine fortlaufende Versionsnummer.
+
+Jeder Stand wird über einen Inhalts-Hash identifiziert (config_version())
+und beim Speichern in einer Append-only-Historie (config_history/)
+abgelegt. Mit pinned_config() lässt sich eine frühere Berechnung exakt
+mit dem damaligen Stand wiederholen.
+"""
+
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import yaml
+
+from instrumentation import span
+
+
+CONFIG_PATH = Path('config.yaml')
+
+# Versionsnummer steht als YAML-Kommentar in der ersten Zeile der Datei
+VERSION_HEADER = '# config-version: '
+
+# Wie oft (höchstens) auf externe Änderungen der Datei geprüft wird
+RELOAD_CHECK_INTERVAL_S = 1.0
+
+# Verzeichnis der Versionshistorie (neben der Config-Datei)
+HISTORY_DIR_NAME = 'config_history'
+HISTORY_INDEX_NAME = 'index.jsonl'
+
+# Für die Dauer einer Berechnung fest gewählter Snapshot
+_pinned: contextvars.ContextVar = contextvars.ContextVar('pinned_config', default=None)
+
+
+def freeze(value):
+    """
+    Erstellt eine unveränderliche Kopie (Dicts → MappingProxyType, Listen → Tupel)
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """
+    Erstellt eine veränderbare Kopie eines eingefrorenen Snapshots
+    """
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+def parse_version(text: str) -> int:
+    """
+    Liest die Versionsnummer aus der ersten Zeile
+
+    Returns:
+        Versionsnummer (0, wenn die Datei noch nie gespeichert wurde)
+    """
+    first_line = text.split('\n', 1)[0]
+    if first_line.startswith(VERSION_HEADER):
+        try:
+            return int(first_line[len(VERSION_HEADER):].strip())
+        except ValueError:
+            pass
+    return 0
+
+
+def dump_config(config: Dict, version: int) -> str:
+    """Serialisiert die Konfiguration inkl. Versionskopf"""
+    body = yaml.dump(config, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    return f"{VERSION_HEADER}{version}\n{body}"
+
+
+def content_hash(config) -> str:
+    """
+    Berechnet den Inhalts-Hash einer Konfiguration
+
+    Unabhängig von Schlüsselreihenfolge, Kommentaren und Versionskopf.
+
+    Returns:
+        Erste 16 Hex-Zeichen des SHA-256
+    """
+    canonical = json.dumps(thaw(config), sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Unveränderlicher Stand der Konfiguration"""
+
+    data: Mapping
+    version: int
+    stamp: Tuple[int, int]
+    content_hash: str
+
+
+def make_snapshot(config, version: int, stamp: Tuple[int, int] = (0, 0)) -> ConfigSnapshot:
+    """Erstellt einen Snapshot inkl. Inhalts-Hash (einmalig pro Stand)"""
+    return ConfigSnapshot(
+        data=freeze(config),
+        version=version,
+        stamp=stamp,
+        content_hash=content_hash(config)
+    )
+
+
+class ConfigStore:
+    """
+    Hält den aktuellen Snapshot einer Konfigurationsdatei
+
+    Lesen ist lock-frei (eine Attributzuweisung ist atomar); nur das
+    Neu-Einlesen und Speichern laufen unter einem Lock.
+    """
+
+    def __init__(self, path: Path = CONFIG_PATH, check_interval: float = RELOAD_CHECK_INTERVAL_S):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[ConfigSnapshot], None]] = []
+        # Alle in diesem Prozess gesehenen Stände, nach Inhalts-Hash
+        self._known: Dict[str, ConfigSnapshot] = {}
+
+    @property
+    def history_dir(self) -> Path:
+        return self.path.resolve().parent / HISTORY_DIR_NAME
+
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        Gibt den aktuellen Snapshot zurück
+
+        Auf externe Dateiänderungen wird höchstens alle check_interval
+        Sekunden per stat() geprüft; geparst wird nur bei Änderung.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() >= self._next_check:
+            snapshot = self._refresh()
+        return snapshot
+
+    def _refresh(self) -> ConfigSnapshot:
+        with self._lock:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            snapshot = self._snapshot
+
+            if snapshot is None or snapshot.stamp != stamp:
+                with span('config.parse'):
+                    text = self.path.read_text(encoding='utf-8')
+                    snapshot = make_snapshot(yaml.safe_load(text), parse_version(text), stamp)
+                self._snapshot = snapshot
+                self._known.setdefault(snapshot.content_hash, snapshot)
+                changed = True
+            else:
+                changed = False
+
+            self._next_check = time.monotonic() + self.check_interval
+
+        if changed:
+            self._notify(snapshot)
+        return snapshot
+
+    def save(self, config: Dict) -> ConfigSnapshot:
+        """
+        Speichert die Konfiguration atomar als neue Version
+
+        Schreibt in eine Temp-Datei im selben Verzeichnis, synchronisiert sie
+        auf die Platte und ersetzt config.yaml per Umbenennen. Leser sehen
+        dadurch nie eine halb geschriebene Datei.
+
+        Args:
+            config: Vollständige Konfiguration
+
+        Returns:
+            Neuer Snapshot
+        """
+        with self._lock:
+            current = self._snapshot
+            if current is None and self.path.exists():
+                current_version = parse_version(self.path.read_text(encoding='utf-8'))
+            else:
+                current_version = current.version if current else 0
+            version = current_version + 1
+
+            text = dump_config(config, version)
+            directory = self.path.resolve().parent
+            fd, tmp_name = tempfile.mkstemp(prefix='.config-', suffix='.yaml.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+                raise
+            _fsync_directory(directory)
+
+            stat = os.stat(self.path)
+            snapshot = make_snapshot(yaml.safe_load(text), version, (stat.st_mtime_ns, stat.st_size))
+
+            # Bisherigen (falls noch nie archiviert) und neuen Stand ablegen
+            if current is not None and not self._archive_path(current).exists():
+                self._archive(current)
+            self._archive(snapshot)
+
+            self._snapshot = snapshot
+            self._known[snapshot.content_hash] = snapshot
+            self._next_check = time.monotonic() + self.check_interval
+
+        self._notify(snapshot)
+        return snapshot
+
+    def _archive_path(self, snapshot: ConfigSnapshot) -> Path:
+        return self.history_dir / f"{snapshot.content_hash}.yaml"
+
+    def _archive(self, snapshot: ConfigSnapshot):
+        """
+        Legt einen Stand in der Append-only-Historie ab
+
+        Jeder Inhalt wird genau einmal als <hash>.yaml gespeichert; die
+        Indexdatei erhält pro Speichervorgang eine Zeile.
+        """
+        history = self.history_dir
+        history.mkdir(exist_ok=True)
+
+        target = self._archive_path(snapshot)
+        if not target.exists():
+            target.write_text(dump_config(thaw(snapshot.data), snapshot.version), encoding='utf-8')
+
+        entry = {
+            'version': snapshot.version,
+            'hash': snapshot.content_hash,
+            'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        with open(history / HISTORY_INDEX_NAME, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def history(self) -> List[Dict]:
+        """
+        Gibt die Versionshistorie zurück (älteste zuerst)
+
+        Returns:
+            Liste mit version, hash und saved_at
+        """
+        index = self.history_dir / HISTORY_INDEX_NAME
+        if not index.exists():
+            return []
+        with open(index, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def get_by_hash(self, config_hash: str) -> ConfigSnapshot:
+        """
+        Gibt einen früheren Stand anhand seines Inhalts-Hashes zurück
+
+        Bereits gesehene Stände kommen aus dem Speicher; sonst wird die
+        Datei aus der Historie einmalig geladen.
+
+        Raises:
+            KeyError: wenn der Stand unbekannt ist
+        """
+        snapshot = self._known.get(config_hash)
+        if snapshot is not None:
+            return snapshot
+
+        path = self.history_dir / f"{config_hash}.yaml"
+        if not path.exists():
+            raise KeyError(f"Unbekannte Config-Version: {config_hash}")
+
+        text = path.read_text(encoding='utf-8')
+        snapshot = make_snapshot(yaml.safe_load(text), parse_version(text))
+        self._known[config_hash] = snapshot
+        return snapshot
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]):
+        """
+        Registriert einen Callback, der bei jedem neuen Snapshot aufgerufen wird
+        """
+        self._subscribers.append(callback)
+
+    def _notify(self, snapshot: ConfigSnapshot):
+        for callback in list(self._subscribers):
+            callback(snapshot)
+
+
+def _fsync_directory(directory: Path):
+    """Macht das Umbenennen dauerhaft (nicht auf allen Systemen möglich)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Prozessweiter Speicher für config.yaml (von allen Sitzungen geteilt)
+default_store = ConfigStore()
+
+
+def get_config() -> Mapping:
+    """Gibt die aktuelle (unveränderliche) Konfiguration zurück"""
+    return get_snapshot().data
+
+
+def get_snapshot() -> ConfigSnapshot:
+    """Gibt den aktuellen (bzw. per pinned_config gewählten) Snapshot zurück"""
+    pinned = _pinned.get()
+    if pinned is not None:
+        return pinned
+    return default_store.snapshot()
+
+
+def config_version() -> str:
+    """
+    Gibt den Inhalts-Hash der aktuellen Konfiguration zurück
+
+    Der Hash wird einmal pro geladenem Stand berechnet; der Aufruf kostet
+    danach O(1) und eignet sich als Cache-Schlüssel.
+    """
+    return get_snapshot().content_hash
+
+
+@contextlib.contextmanager
+def pinned_config(config_hash: Optional[str] = None):
+    """
+    Legt den Config-Stand für den umschlossenen Block fest
+
+    Args:
+        config_hash: Inhalts-Hash eines früheren Stands (None = aktueller Stand)
+
+    Yields:
+        Der verwendete Snapshot
+    """
+    if config_hash is None:
+        snapshot = get_snapshot()
+    else:
+        snapshot = default_store.get_by_hash(config_hash)
+
+    token = _pinned.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _pinned.reset(token)
+
+
+def consistent_config(fn):
+    """
+    Decorator: alle load_config()-Aufrufe innerhalb der Funktion sehen
+    denselben Snapshot, auch wenn parallel gespeichert wird
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _pinned.get() is not None:
+            return fn(*args, **kwargs)
+        token = _pinned.set(default_store.snapshot())
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _pinned.reset(token)
+
+    return wrapper
+
+
+def config_history() -> List[Dict]:
+    """Gibt die Versionshistorie der config.yaml zurück"""
+    return default_store.history()
+
+
+def load_config_for_editing() -> Dict:
+    """Gibt eine veränderbare Kopie der aktuellen Konfiguration zurück"""
+    return thaw(default_store.snapshot().data)
+
+
+def save_config(config: Dict) -> ConfigSnapshot:
+    """Speichert die Konfiguration atomar als neue Version"""
+    return default_store.save(config)
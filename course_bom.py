@@ -0,0 +1,177 @@
+"""
+Stückliste je Reihe
+
+Erzeugt für jede Reihe des Verbands (stone_layout.py) einen Datensatz mit
+Höhenlage, Steinen (ganz, halb, geschnitten), Füllbeton und Bewehrung, so
+dass Reihe für Reihe gemauert und betoniert werden kann. Die Datensätze
+werden erst beim Durchlaufen berechnet (Generator, eine Reihe pro
+Array-Durchlauf); auch sehr lange Mauern lassen sich so als CSV streamen
+oder seitenweise anzeigen, ohne alle Reihen im Speicher zu halten.
+"""
+
+import csv
+import io
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from config_store import get_config
+from openings import interrupted_width
+from stone_layout import classify_widths, course_count, layout_grid
+
+
+# Spalten für Tabelle und CSV: Schlüssel → Bezeichnung
+COURSE_COLUMNS = {
+    'course': 'Reihe',
+    'bottom_m': 'Von (m)',
+    'top_m': 'Bis (m)',
+    'stones': 'Steine',
+    'full_stones': 'Ganze',
+    'half_stones': 'Halbe',
+    'cut_stones': 'Geschnitten',
+    'laid_length_m': 'Länge (m)',
+    'fill_m3': 'Beton (m³)',
+    'fill_with_buffer_m3': 'Beton inkl. Puffer (m³)',
+    'rebar_m': 'Bewehrung (m)'
+}
+
+
+def _course_records(layout: Dict, stone_type: str, courses: Sequence[int]) -> List[Dict]:
+    """Datensätze für die angegebenen Reihen (0-basiert) aus einem Array-Durchlauf"""
+    if not len(courses):
+        return []
+
+    config = get_config()
+    fill_liters = config['stone_types'][stone_type]['fill_volume_per_stone_liters']
+    buffer_factor = 1 + config['buffer']['percentage'] / 100
+    rebar = config['reinforcement_steel']
+    is_reinforced = (
+        max(layout['start_height'], layout['end_height']) >= rebar['min_height_for_reinforcement_m']
+    )
+
+    stone_length = layout['stone_length_m']
+    stone_height = layout['stone_height_m']
+    openings = layout.get('openings') or []
+
+    grid = layout_grid(layout, courses)
+    present = grid['present']
+    width = grid['x_end'] - grid['x_start']
+    is_full, is_half = classify_widths(width, stone_length)
+    # Von Öffnungen angeschnittene Steine gelten als geschnitten
+    is_full &= ~grid['opened']
+    is_half &= ~grid['opened']
+
+    stones = present.sum(axis=1)
+    full = (present & is_full).sum(axis=1)
+    half = (present & is_half).sum(axis=1)
+    laid_length = np.where(present, width, 0.0).sum(axis=1)
+    # Füllung nach gesetzter Länge, ohne den von Öffnungen überdeckten Anteil
+    fill_stones = np.where(present, width * (1 - grid['opening_fraction']), 0.0).sum(axis=1) / stone_length
+    fill_m3 = fill_stones * fill_liters / 1000
+    missing = (grid['visible'] & ~present & ~grid['removed']).any(axis=1)
+    # Bewehrung über die Reihe ohne Öffnungen, an den Öffnungen unterbrochen
+    rebar_length = laid_length
+    if openings:
+        rebar_length = (laid_length + np.where(grid['removed'], width, 0.0).sum(axis=1)
+                        - interrupted_width(openings, stone_height, courses))
+
+    return [
+        {
+            'course': course + 1,
+            'bottom_m': round(course * stone_height, 3),
+            'top_m': round((course + 1) * stone_height, 3),
+            'stones': int(stones[row]),
+            'full_stones': int(full[row]),
+            'half_stones': int(half[row]),
+            'cut_stones': int(stones[row] - full[row] - half[row]),
+            'laid_length_m': round(float(laid_length[row]), 3),
+            'fill_m3': round(float(fill_m3[row]), 4),
+            'fill_with_buffer_m3': round(float(fill_m3[row]) * buffer_factor, 4),
+            'rebar_m': round(float(rebar_length[row]) * rebar['rods_per_row'], 2) if is_reinforced else 0.0,
+            'partial': bool(stones[row] and missing[row])
+        }
+        for row, course in enumerate(courses)
+    ]
+
+
+def iter_course_records(layout: Dict, stone_type: str) -> Iterator[Dict]:
+    """
+    Liefert die Stückliste Reihe für Reihe (von unten nach oben)
+
+    Der Füllbeton je Reihe richtet sich nach der gesetzten Steinlänge
+    (ein halber Stein = halbes Füllvolumen); Bewehrung liegt ab der
+    Mindesthöhe mit rods_per_row Stäben über die Länge der Reihe.
+    Öffnungen werden wie in calculate_all() abgezogen: ganz überdeckte
+    Steine entfallen, angeschnittene zählen als geschnitten und füllen
+    nur den freien Anteil, die Bewehrung endet an der Öffnung.
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        stone_type: Typ des Steins (für das Füllvolumen)
+
+    Yields:
+        Dictionary je Reihe mit den Schlüsseln aus COURSE_COLUMNS
+        sowie partial (Teilreihe wegen Gefälle)
+    """
+    for course in range(course_count(layout)):
+        yield from _course_records(layout, stone_type, [course])
+
+
+def course_fill_volumes(layout: Dict, stone_type: str) -> np.ndarray:
+    """
+    Füllbeton inkl. Puffer je Reihe, wie fill_with_buffer_m3 der Stückliste
+
+    Alle Reihen in einem Array-Durchlauf (z.B. für den Betonierplan).
+
+    Args:
+        layout: Layout-Dictionary
+        stone_type: Typ des Steins
+
+    Returns:
+        Array mit dem Volumen je Reihe in m³ (von unten nach oben)
+    """
+    records = _course_records(layout, stone_type, range(course_count(layout)))
+    return np.array([record['fill_with_buffer_m3'] for record in records], dtype=float)
+
+
+def course_page(layout: Dict, stone_type: str, page: int, page_size: int = 20) -> List[Dict]:
+    """
+    Eine Seite der Stückliste für die Tabellenansicht
+
+    Args:
+        layout: Layout-Dictionary
+        stone_type: Typ des Steins
+        page: Seitennummer (ab 1)
+        page_size: Reihen pro Seite
+
+    Returns:
+        Zeilen mit den Bezeichnungen aus COURSE_COLUMNS (nur die Reihen
+        dieser Seite werden berechnet, in einem Array-Durchlauf)
+    """
+    start = (max(page, 1) - 1) * page_size
+    courses = list(range(start, min(start + page_size, course_count(layout))))
+    records = _course_records(layout, stone_type, courses)
+    return [{label: record[key] for key, label in COURSE_COLUMNS.items()} for record in records]
+
+
+def iter_course_csv(layout: Dict, stone_type: str) -> Iterator[str]:
+    """
+    Streamt die Stückliste als CSV (Kopfzeile, dann eine Zeile je Reihe)
+
+    Args:
+        layout: Layout-Dictionary
+        stone_type: Typ des Steins
+
+    Yields:
+        CSV-Zeilen inklusive Zeilenumbruch
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    writer.writerow(COURSE_COLUMNS.values())
+    for record in iter_course_records(layout, stone_type):
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(record[key] for key in COURSE_COLUMNS)
+    yield buffer.getvalue()
@@ -0,0 +1,177 @@
+"""
+Höhen auf ganze Steinreihen
+
+Liegt eine Höhe zwischen zwei Reihen, rechnen Steinanzahl und Reihen mit
+einer angeschnittenen obersten Reihe (math.ceil in calculate_stone_count()
+und get_stone_layout()), die Stein und Beton kostet. Dieser Optimierer
+rundet Anfangs- und Endhöhe (bei 2-Zonen-Mauern die Höhen von Zone 1 und
+Zone 2) je auf die Reihe darunter und darüber und wertet alle Kombinationen
+zusammen mit der aktuellen Mauer in einem Aufruf der vektorisierten
+Mengenberechnung aus. Ausgegeben wird je Kandidat die Änderung gegenüber
+der aktuellen Mauer.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from batch_calculations import batch_quantities, batch_total_cost, stone_arrays, wall_geometry
+from config_store import config_version, get_config
+
+
+# Toleranz, ab der eine Höhe als ganze Reihe gilt (Gleitkomma)
+SNAP_TOLERANCE = 1e-6
+
+# Verglichene Mengen: Schlüssel → Bezeichnung
+SNAP_QUANTITIES = {
+    'stones': 'Steine',
+    'volume_with_buffer_m3': 'Beton (m³)',
+    'cement_bags': 'Zement (Säcke)',
+    'gravel_tons': 'Kies (t)',
+    'rods_6m': 'Stäbe',
+    'total_cost': 'Kosten (€)'
+}
+
+# Mengen in ganzen Stück
+COUNT_QUANTITIES = ('stones', 'cement_bags', 'rods_6m')
+
+# Ergebnisse pro Config-Stand und Mauer (die App fragt bei jedem Rerun an)
+_candidate_cache: Dict[Tuple, Dict] = {}
+
+
+def snap_options(height: float, stone_height: float) -> List[float]:
+    """
+    Ganze Reihen unter und über einer Höhe
+
+    Args:
+        height: Höhe in Metern
+        stone_height: Steinhöhe in Metern
+
+    Returns:
+        Eine Höhe, wenn height schon eine ganze Reihe ist, sonst zwei
+        (mindestens eine Reihe)
+    """
+    rows = height / stone_height
+    nearest = round(rows)
+    if abs(rows - nearest) < SNAP_TOLERANCE and nearest >= 1:
+        return [nearest * stone_height]
+    lower = max(int(np.floor(rows)), 1)
+    upper = max(int(np.ceil(rows)), 1)
+    return sorted({lower * stone_height, upper * stone_height})
+
+
+def snap_candidates(
+    length: float,
+    start_height: float,
+    end_height: float,
+    stone_type: str,
+    cement_price: Optional[float] = None,
+    gravel_price: Optional[float] = None,
+    stone_price: Optional[float] = None,
+    rebar_price: Optional[float] = None,
+    is_two_zone: bool = False,
+    zone1_length: Optional[float] = None,
+    zone1_height: Optional[float] = None,
+    zone2_length: Optional[float] = None,
+    zone2_end_height: Optional[float] = None
+) -> Dict:
+    """
+    Bewertet die aktuelle Mauer und alle Kandidaten mit ganzen Reihen
+
+    Fehlende Preise werden aus config.yaml übernommen.
+
+    Args:
+        length, start_height, end_height, stone_type: Mauer wie calculate_all()
+        cement_price, gravel_price, stone_price, rebar_price: Preise (optional)
+        is_two_zone, zone1_*, zone2_*: 2-Zonen-Maße wie calculate_all()
+
+    Returns:
+        Dictionary mit Arrays (Eintrag 0 = aktuelle Mauer): start_height,
+        end_height (bei 2-Zonen-Mauern Höhe Zone 1 und Endhöhe Zone 2), die
+        Mengen aus SNAP_QUANTITIES und je Menge delta_<Schlüssel> gegenüber
+        der aktuellen Mauer; snapped gibt an, ob die aktuelle Mauer schon
+        nur ganze Reihen hat (pro Config-Stand und Mauer zwischengespeichert,
+        die Arrays nicht verändern)
+    """
+    cache_key = (
+        config_version(), length, start_height, end_height, stone_type,
+        cement_price, gravel_price, stone_price, rebar_price,
+        is_two_zone, zone1_length, zone1_height, zone2_length, zone2_end_height
+    )
+    cached = _candidate_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    prices = get_config()['prices']
+    if cement_price is None:
+        cement_price = prices['cement_per_bag_eur']
+    if gravel_price is None:
+        gravel_price = prices['gravel_per_ton_eur']
+    if stone_price is None:
+        stone_price = prices['stone_per_piece_eur']
+
+    stones = stone_arrays([stone_type])
+    stone_height = float(stones.height_m[0])
+    two_zone = is_two_zone and all(v is not None for v in (zone1_length, zone1_height, zone2_length, zone2_end_height))
+    first, second = (zone1_height, zone2_end_height) if two_zone else (start_height, end_height)
+
+    # Aktuelle Mauer und alle Kombinationen aus gerundeten Höhen
+    grid_first, grid_second = np.meshgrid(snap_options(first, stone_height), snap_options(second, stone_height),
+                                          indexing='ij')
+    heights_first = np.concatenate([[first], grid_first.ravel()])
+    heights_second = np.concatenate([[second], grid_second.ravel()])
+
+    if two_zone:
+        geometry = wall_geometry(length, heights_first, heights_second, True,
+                                 zone1_length, heights_first, zone2_length, heights_second)
+    else:
+        geometry = wall_geometry(length, heights_first, heights_second)
+    quantities = batch_quantities(geometry, stones.stones_per_m2[0], stones.fill_liters[0], stone_height)
+    quantities['total_cost'] = batch_total_cost(quantities, cement_price, gravel_price, stone_price, rebar_price)
+
+    # Kandidat gleich aktueller Mauer: schon ganze Reihen
+    same = (np.abs(heights_first[1:] - first) < SNAP_TOLERANCE) & (np.abs(heights_second[1:] - second) < SNAP_TOLERANCE)
+    keep = np.concatenate([[True], ~same])
+
+    candidates = {
+        'start_height': heights_first[keep],
+        'end_height': heights_second[keep],
+        'snapped': bool(same.any())
+    }
+    for key in SNAP_QUANTITIES:
+        values = np.broadcast_to(quantities[key], heights_first.shape)[keep]
+        candidates[key] = values
+        candidates[f'delta_{key}'] = values - values[0]
+
+    if len(_candidate_cache) > 32:
+        _candidate_cache.clear()
+    _candidate_cache[cache_key] = candidates
+    return candidates
+
+
+def snap_rows(candidates: Dict, two_zone: bool = False) -> List[Dict]:
+    """
+    Tabellenzeilen der Kandidaten (ohne aktuelle Mauer), günstigste zuerst
+
+    Args:
+        candidates: Ergebnis von snap_candidates()
+        two_zone: Spalten für 2-Zonen-Mauern beschriften
+
+    Returns:
+        Liste von Zeilen mit Höhen, Mengen und Änderungen
+    """
+    first_label, second_label = ('Höhe Zone 1 (m)', 'Endhöhe Zone 2 (m)') if two_zone else ('Anfangshöhe (m)', 'Endhöhe (m)')
+    rows = []
+    for index in np.argsort(candidates['total_cost'][1:], kind='stable') + 1:
+        row = {
+            first_label: round(float(candidates['start_height'][index]), 3),
+            second_label: round(float(candidates['end_height'][index]), 3)
+        }
+        for key, label in SNAP_QUANTITIES.items():
+            delta = float(candidates[f'delta_{key}'][index])
+            if key in COUNT_QUANTITIES:
+                row[f'Δ {label}'] = int(round(delta))
+            else:
+                row[f'Δ {label}'] = round(delta, 3 if key == 'volume_with_buffer_m3' else 2)
+        rows.append(row)
+    return rows
@@ -0,0 +1,194 @@
+"""
+CAD-Export der Mauer als DXF (R12, Ansicht und Grundriss)
+
+Die Zeichnung entsteht direkt aus den Layout-Daten, ohne Plotly-Figure:
+Ansicht mit allen Steinen (Reihe für Reihe aus layout_grid(), wie
+create_2d_view()), Mauerkrone, Zonentrennung und Öffnungen, darunter der
+Grundriss mit den Stoßfugen der untersten Reihe; dazu Bemaßung von Länge,
+Höhen, Zonen und Wandstärke als Linien mit Text.
+
+Der Writer ist ein Generator über Textblöcke (eine Reihe pro Block) und
+schreibt in jede Textdatei bzw. jeden Stream; auch sehr lange Mauern
+brauchen so nur den Speicher einer Reihe. DXF R12 (AC1009) wird von allen
+gängigen CAD-Programmen gelesen. Einheit: Meter, x = Länge, y = Höhe.
+"""
+
+import io
+from typing import Dict, Iterator, List, TextIO, Tuple
+
+from stone_layout import course_count, layout_grid
+
+
+# Layer: Name → Farbe (AutoCAD-Farbindex)
+LAYERS = {
+    'STEINE': 8,        # grau
+    'KONTUR': 7,        # schwarz/weiß
+    'ZONEN': 1,         # rot
+    'OEFFNUNGEN': 1,    # rot
+    'GRUNDRISS': 7,
+    'BEMASSUNG': 5      # blau
+}
+
+# Abstände der Zeichnung in Metern
+DIMENSION_OFFSET_M = 0.4
+PLAN_GAP_M = 1.5
+TEXT_HEIGHT_M = 0.1
+TICK_M = 0.05
+
+# Geschlossenes Rechteck als POLYLINE mit 4 Eckpunkten (x0, y0, x1, y0, x1, y1, x0, y1)
+_VERTEX = "0\nVERTEX\n8\n{layer}\n10\n%.4f\n20\n%.4f\n30\n0.0\n"
+_RECTANGLE = (
+    "0\nPOLYLINE\n8\n{layer}\n66\n1\n70\n1\n10\n0.0\n20\n0.0\n30\n0.0\n"
+    + _VERTEX * 4
+    + "0\nSEQEND\n8\n{layer}\n"
+)
+_STONE = _RECTANGLE.format(layer='STEINE')
+
+
+def _line(layer: str, x0: float, y0: float, x1: float, y1: float) -> str:
+    return (f"0\nLINE\n8\n{layer}\n10\n{x0:.4f}\n20\n{y0:.4f}\n30\n0.0\n"
+            f"11\n{x1:.4f}\n21\n{y1:.4f}\n31\n0.0\n")
+
+
+def _polyline(layer: str, points: List[Tuple[float, float]], closed: bool = False) -> str:
+    vertices = "".join(_VERTEX.format(layer=layer) % point for point in points)
+    return (f"0\nPOLYLINE\n8\n{layer}\n66\n1\n70\n{1 if closed else 0}\n10\n0.0\n20\n0.0\n30\n0.0\n"
+            f"{vertices}0\nSEQEND\n8\n{layer}\n")
+
+
+def _rectangle(layer: str, x0: float, y0: float, x1: float, y1: float) -> str:
+    return _RECTANGLE.format(layer=layer) % (x0, y0, x1, y0, x1, y1, x0, y1)
+
+
+def _text(layer: str, x: float, y: float, text: str, rotation: float = 0.0) -> str:
+    """Text mittig unten an (x, y)"""
+    return (f"0\nTEXT\n8\n{layer}\n10\n{x:.4f}\n20\n{y:.4f}\n30\n0.0\n40\n{TEXT_HEIGHT_M}\n"
+            f"1\n{text}\n50\n{rotation:.1f}\n72\n1\n11\n{x:.4f}\n21\n{y:.4f}\n31\n0.0\n")
+
+
+def _dimension(x0: float, y0: float, x1: float, y1: float, text: str) -> str:
+    """Waagerechte bzw. senkrechte Maßlinie mit Schrägstrichen und Maßzahl"""
+    vertical = abs(x1 - x0) < abs(y1 - y0)
+    ticks = "".join(_line('BEMASSUNG', x - TICK_M, y - TICK_M, x + TICK_M, y + TICK_M) for x, y in ((x0, y0), (x1, y1)))
+    if vertical:
+        label = _text('BEMASSUNG', x0 - TICK_M, (y0 + y1) / 2, text, rotation=90.0)
+    else:
+        label = _text('BEMASSUNG', (x0 + x1) / 2, y0 + TICK_M, text)
+    return _line('BEMASSUNG', x0, y0, x1, y1) + ticks + label
+
+
+def _header() -> str:
+    layers = "".join(
+        f"0\nLAYER\n2\n{name}\n70\n0\n62\n{color}\n6\nCONTINUOUS\n" for name, color in LAYERS.items()
+    )
+    return (
+        "0\nSECTION\n2\nHEADER\n9\n$ACADVER\n1\nAC1009\n0\nENDSEC\n"
+        "0\nSECTION\n2\nTABLES\n"
+        "0\nTABLE\n2\nLTYPE\n70\n1\n0\nLTYPE\n2\nCONTINUOUS\n70\n0\n3\nSolid line\n72\n65\n73\n0\n40\n0.0\n0\nENDTAB\n"
+        f"0\nTABLE\n2\nLAYER\n70\n{len(LAYERS)}\n{layers}0\nENDTAB\n"
+        "0\nENDSEC\n"
+        "0\nSECTION\n2\nENTITIES\n"
+    )
+
+
+def _crown(layout: Dict) -> List[Tuple[float, float]]:
+    """Umriss der Mauer in der Ansicht (Fuß, Krone mit Zonenknick)"""
+    length = layout['total_length']
+    if layout.get('is_two_zone', False):
+        crown = [(0.0, layout['zone1_height']), (layout['zone1_length'], layout['zone1_height']),
+                 (length, layout['zone2_end_height'])]
+    else:
+        crown = [(0.0, layout['start_height']), (length, layout['end_height'])]
+    return [(0.0, 0.0)] + crown + [(length, 0.0)]
+
+
+def iter_dxf(layout: Dict, stone_width_m: float) -> Iterator[str]:
+    """
+    Liefert die DXF-Datei in Textblöcken
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        stone_width_m: Wandstärke in Metern
+
+    Yields:
+        Textblöcke (Kopf, je Reihe die Steine, Kontur, Grundriss, Bemaßung, Ende)
+    """
+    length = layout['total_length']
+    is_two_zone = layout.get('is_two_zone', False)
+    outline = _crown(layout)
+    max_height = max(y for _, y in outline)
+
+    yield _header()
+
+    # Ansicht: Steine Reihe für Reihe
+    stone_height = layout['stone_height_m']
+    for course in range(course_count(layout)):
+        grid = layout_grid(layout, [course])
+        present = grid['present'][0]
+        y0, y1 = course * stone_height, (course + 1) * stone_height
+        yield "".join(_STONE % (x0, y0, x1, y0, x1, y1, x0, y1)
+                      for x0, x1 in zip(grid['x_start'][0][present].tolist(), grid['x_end'][0][present].tolist()))
+
+    yield _polyline('KONTUR', outline, closed=True)
+    for opening in layout.get('openings', []):
+        yield _rectangle('OEFFNUNGEN', opening['x'], opening['bottom'],
+                         opening['x'] + opening['width'], opening['bottom'] + opening['height'])
+    if is_two_zone:
+        yield _line('ZONEN', layout['zone1_length'], 0.0, layout['zone1_length'], max_height)
+
+    # Grundriss unter der Ansicht: Umriss und Stoßfugen der untersten Reihe
+    plan_y = -(PLAN_GAP_M + stone_width_m)
+    yield _rectangle('GRUNDRISS', 0.0, plan_y, length, plan_y + stone_width_m)
+    joints = layout_grid(layout, [0])
+    ends = joints['x_end'][0][joints['present'][0]]
+    yield "".join(_line('GRUNDRISS', x, plan_y, x, plan_y + stone_width_m) for x in ends[ends < length].tolist())
+    if is_two_zone:
+        yield _line('ZONEN', layout['zone1_length'], plan_y, layout['zone1_length'], plan_y + stone_width_m)
+
+    # Bemaßung: Länge (und Zonen) unter der Ansicht, Höhen links/rechts, Wandstärke am Grundriss
+    offset = DIMENSION_OFFSET_M
+    yield _dimension(0.0, -offset, length, -offset, f"{length:.2f}")
+    if is_two_zone:
+        zone1 = layout['zone1_length']
+        yield _dimension(0.0, -2 * offset, zone1, -2 * offset, f"{zone1:.2f}")
+        yield _dimension(zone1, -2 * offset, length, -2 * offset, f"{length - zone1:.2f}")
+    start_height, end_height = outline[1][1], outline[-2][1]
+    yield _dimension(-offset, 0.0, -offset, start_height, f"{start_height:.2f}")
+    yield _dimension(length + offset, 0.0, length + offset, end_height, f"{end_height:.2f}")
+    yield _dimension(-offset, plan_y, -offset, plan_y + stone_width_m, f"{stone_width_m:.3f}")
+
+    yield "0\nENDSEC\n0\nEOF\n"
+
+
+def write_dxf(fp: TextIO, layout: Dict, stone_width_m: float) -> int:
+    """
+    Schreibt die DXF-Datei in eine Textdatei bzw. einen Stream
+
+    Args:
+        fp: Textdatei (z.B. open(path, 'w', encoding='ascii')) oder StringIO
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        stone_width_m: Wandstärke in Metern
+
+    Returns:
+        Anzahl geschriebener Zeichen
+    """
+    written = 0
+    for chunk in iter_dxf(layout, stone_width_m):
+        written += fp.write(chunk)
+    return written
+
+
+def create_dxf(layout: Dict, stone_width_m: float) -> str:
+    """
+    Erstellt die DXF-Datei als Text (für st.download_button)
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        stone_width_m: Wandstärke in Metern
+
+    Returns:
+        DXF-Inhalt
+    """
+    buffer = io.StringIO()
+    write_dxf(buffer, layout, stone_width_m)
+    return buffer.getvalue()
@@ -0,0 +1,210 @@
+"""
+3D-Export der Mauer als binäres glTF (GLB)
+
+Jeder gesetzte Stein (wie in create_3d_view(), aber ohne Begrenzung der
+Steinanzahl) wird ein Quader mit 8 Eckpunkten und 12 Dreiecken. Eckpunkte
+und Indizes aller Steine entstehen als NumPy-Arrays aus layout_grid() und
+werden unverändert als Buffer Views in den Binär-Chunk geschrieben (float32
+bzw. uint32, little endian), ohne Schleife über Steine oder Eckpunkte.
+
+glTF ist Y-oben: x = Mauerlänge, y = Höhe, z = Wandstärke, alles in
+Metern. Ohne Normalen berechnen Viewer flache Normalen je Dreieck
+(glTF 2.0, Abschnitt 3.7.2.1), die Steine erscheinen also kantig wie in
+der 3D-Ansicht. Bei 2-Zonen-Mauern erhält jede Zone ein eigenes Primitive
+mit eigenem Material (Farben wie in der 2D-Ansicht).
+"""
+
+import io
+import json
+import struct
+from typing import BinaryIO, Dict, List, Tuple
+
+import numpy as np
+
+from stone_layout import layout_grid
+
+
+# Materialien je Zone (Basisfarbe RGBA, wie lightgray / lightblue)
+ZONE_MATERIALS = {
+    1: ('Zone 1', [0.827, 0.827, 0.827, 1.0]),
+    2: ('Zone 2', [0.678, 0.847, 0.902, 1.0])
+}
+
+# Eckpunkte eines Quaders: Index = x-Bit + 2 × y-Bit + 4 × z-Bit
+_CORNER_BITS = np.array([[i & 1, (i >> 1) & 1, (i >> 2) & 1] for i in range(8)], dtype=bool)
+
+# Dreiecke eines Quaders, gegen den Uhrzeigersinn von außen gesehen
+_BOX_TRIANGLES = np.array([
+    [0, 4, 6], [0, 6, 2], [1, 3, 7], [1, 7, 5],
+    [0, 1, 5], [0, 5, 4], [2, 6, 7], [2, 7, 3],
+    [0, 2, 3], [0, 3, 1], [4, 5, 7], [4, 7, 6]
+], dtype=np.uint32)
+
+# glTF-Konstanten
+_GLB_MAGIC = 0x46546C67
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+_FLOAT = 5126
+_UNSIGNED_INT = 5125
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+
+
+def stone_boxes(layout: Dict) -> Dict[str, np.ndarray]:
+    """
+    Gesetzte Steine als Arrays (Reihenfolge: Reihe für Reihe)
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+
+    Returns:
+        Dictionary mit x_start, x_end, y_bottom (Meter) und zone (1 oder 2)
+        je Stein
+    """
+    grid = layout_grid(layout)
+    rows, positions = np.nonzero(grid['present'])
+    x_start = grid['x_start'][rows, positions]
+    x_end = grid['x_end'][rows, positions]
+
+    zone = np.ones(rows.size, dtype=np.int64)
+    if layout.get('is_two_zone', False):
+        zone[(x_start + x_end) / 2 > layout['zone1_length']] = 2
+
+    return {
+        'x_start': x_start,
+        'x_end': x_end,
+        'y_bottom': rows * layout['stone_height_m'],
+        'zone': zone
+    }
+
+
+def box_mesh(boxes: Dict[str, np.ndarray], stone_height: float, stone_width: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Eckpunkte und Dreiecke aller Steine
+
+    Args:
+        boxes: Ergebnis von stone_boxes()
+        stone_height, stone_width: Steinhöhe und Wandstärke in Metern
+
+    Returns:
+        (vertices float32 (Steine × 8, 3), indices uint32 (Steine × 12, 3))
+    """
+    count = boxes['x_start'].size
+    x = np.where(_CORNER_BITS[:, 0], boxes['x_end'][:, None], boxes['x_start'][:, None])
+    y = boxes['y_bottom'][:, None] + _CORNER_BITS[:, 1] * stone_height
+    z = np.broadcast_to(_CORNER_BITS[:, 2] * stone_width, (count, 8))
+
+    vertices = np.empty((count, 8, 3), dtype='<f4')
+    vertices[:, :, 0] = x
+    vertices[:, :, 1] = y
+    vertices[:, :, 2] = z
+
+    indices = _BOX_TRIANGLES[None, :, :] + (8 * np.arange(count, dtype=np.uint32))[:, None, None]
+    return vertices.reshape(-1, 3), indices.astype('<u4', copy=False).reshape(-1, 3)
+
+
+def write_glb(fp: BinaryIO, layout: Dict, stone_width_m: float, zone_materials: bool = True) -> int:
+    """
+    Schreibt die Mauer als GLB in eine Datei bzw. einen Stream
+
+    Args:
+        fp: Binär geöffnete Datei oder BytesIO
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        stone_width_m: Wandstärke in Metern
+        zone_materials: Bei 2-Zonen-Mauern je Zone ein Material
+
+    Returns:
+        Anzahl geschriebener Bytes
+
+    Raises:
+        ValueError: wenn die Mauer keine Steine hat
+    """
+    boxes = stone_boxes(layout)
+    if not boxes['zone'].size:
+        raise ValueError("Mauer enthält keine Steine!")
+
+    # Steine nach Zone sortiert: jede Zone ist ein zusammenhängender Indexbereich
+    zones = [1]
+    if zone_materials and layout.get('is_two_zone', False):
+        order = np.argsort(boxes['zone'], kind='stable')
+        boxes = {key: values[order] for key, values in boxes.items()}
+        zones = np.unique(boxes['zone']).tolist()
+    vertices, indices = box_mesh(boxes, layout['stone_height_m'], stone_width_m)
+
+    # Buffer Views: Eckpunkte, dann Indizes (beide Vielfache von 4 Byte)
+    buffer_views = [
+        {'buffer': 0, 'byteOffset': 0, 'byteLength': vertices.nbytes, 'target': _ARRAY_BUFFER},
+        {'buffer': 0, 'byteOffset': vertices.nbytes, 'byteLength': indices.nbytes, 'target': _ELEMENT_ARRAY_BUFFER}
+    ]
+    accessors: List[Dict] = [{
+        'bufferView': 0,
+        'componentType': _FLOAT,
+        'count': len(vertices),
+        'type': 'VEC3',
+        'min': vertices.min(axis=0).tolist(),
+        'max': vertices.max(axis=0).tolist()
+    }]
+    primitives, materials = [], []
+    stones_per_zone = np.bincount(boxes['zone'], minlength=3)
+    first_stone = 0
+    for zone in zones:
+        stones = int(stones_per_zone[zone]) if len(zones) > 1 else len(boxes['zone'])
+        if not stones:
+            continue
+        accessors.append({
+            'bufferView': 1,
+            'byteOffset': first_stone * _BOX_TRIANGLES.nbytes,
+            'componentType': _UNSIGNED_INT,
+            'count': stones * _BOX_TRIANGLES.size,
+            'type': 'SCALAR'
+        })
+        name, color = ZONE_MATERIALS[zone]
+        materials.append({
+            'name': name if len(zones) > 1 else 'Schalstein',
+            'pbrMetallicRoughness': {'baseColorFactor': color, 'metallicFactor': 0.0, 'roughnessFactor': 0.9}
+        })
+        primitives.append({'attributes': {'POSITION': 0}, 'indices': len(accessors) - 1,
+                           'material': len(materials) - 1})
+        first_stone += stones
+
+    binary_length = vertices.nbytes + indices.nbytes
+    document = {
+        'asset': {'version': '2.0', 'generator': 'Schalsteinmauer Betonrechner'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'mesh': 0, 'name': 'Mauer'}],
+        'meshes': [{'name': 'Mauer', 'primitives': primitives}],
+        'materials': materials,
+        'accessors': accessors,
+        'bufferViews': buffer_views,
+        'buffers': [{'byteLength': binary_length}]
+    }
+    json_chunk = json.dumps(document, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * (-len(json_chunk) % 4)
+    total = 12 + 8 + len(json_chunk) + 8 + binary_length
+
+    # Header, JSON-Chunk, Binär-Chunk (Arrays direkt aus ihrem Speicher)
+    fp.write(struct.pack('<III', _GLB_MAGIC, 2, total))
+    fp.write(struct.pack('<II', len(json_chunk), _CHUNK_JSON))
+    fp.write(json_chunk)
+    fp.write(struct.pack('<II', binary_length, _CHUNK_BIN))
+    fp.write(memoryview(vertices).cast('B'))
+    fp.write(memoryview(indices).cast('B'))
+    return total
+
+
+def create_glb(layout: Dict, stone_width_m: float, zone_materials: bool = True) -> bytes:
+    """
+    Erstellt die Mauer als GLB (für st.download_button)
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        stone_width_m: Wandstärke in Metern
+        zone_materials: Bei 2-Zonen-Mauern je Zone ein Material
+
+    Returns:
+        GLB-Datei als Bytes
+    """
+    buffer = io.BytesIO()
+    write_glb(buffer, layout, stone_width_m, zone_materials)
+    return buffer.getvalue()
@@ -0,0 +1,287 @@
+"""
+Opt-in Zeitmessung für die Berechnungs- und Render-Pipeline
+Misst Stufen (Config, Berechnung, Grafiken, Serialisierung, PDF) mit
+perf_counter_ns und hält die letzten Traces in einem Ringpuffer
+
+Aktivierung:
+    - global über die Umgebungsvariable MAUERPLANER_TRACE=1 oder enable()
+    - pro Ablauf über begin_trace() / tracing() (z.B. Debug-Panel in app.py)
+
+Ist weder global aktiviert noch ein Trace aktiv, liefert span() einen
+geteilten No-op-Kontextmanager (nur ein ContextVar-Zugriff).
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+# Anzahl der gespeicherten Traces im Ringpuffer
+RING_SIZE = 200
+
+_enabled = os.environ.get('MAUERPLANER_TRACE', '') not in ('', '0')
+_traces: deque = deque(maxlen=RING_SIZE)
+_current: contextvars.ContextVar = contextvars.ContextVar('mauerplaner_trace', default=None)
+
+
+class Trace:
+    """Ein Ablauf (z.B. ein Streamlit-Rerun) mit seinen Stufen"""
+
+    __slots__ = ('name', 'started_at', 'start_ns', 'duration_ns', 'spans', 'depth')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.start_ns = time.perf_counter_ns()
+        self.duration_ns = 0
+        self.spans: List[Dict] = []
+        self.depth = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'started_at': self.started_at,
+            'duration_ms': self.duration_ns / 1e6,
+            'spans': [
+                {
+                    'name': s['name'],
+                    'depth': s['depth'],
+                    'offset_ms': s['offset_ns'] / 1e6,
+                    'duration_ms': s['duration_ns'] / 1e6
+                }
+                for s in self.spans
+            ]
+        }
+
+
+class _NullSpan:
+    """No-op-Kontextmanager, wenn die Messung deaktiviert ist"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Misst eine Stufe innerhalb eines aktiven Traces"""
+
+    __slots__ = ('trace', 'name', 'start_ns', 'record')
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        trace = self.trace
+        self.record = {'name': self.name, 'depth': trace.depth, 'offset_ns': 0, 'duration_ns': 0}
+        # Reihenfolge nach Start, damit verschachtelte Stufen unter ihrer Elternstufe stehen
+        trace.spans.append(self.record)
+        trace.depth += 1
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end_ns = time.perf_counter_ns()
+        self.trace.depth -= 1
+        self.record['offset_ns'] = self.start_ns - self.trace.start_ns
+        self.record['duration_ns'] = end_ns - self.start_ns
+        return False
+
+
+class _RootSpan:
+    """Stufe ohne umgebenden Trace (nur bei globaler Aktivierung)"""
+
+    __slots__ = ('trace', 'span', 'token')
+
+    def __init__(self, name: str):
+        self.trace = Trace(name)
+        self.span = _Span(self.trace, name)
+
+    def __enter__(self):
+        self.token = _current.set(self.trace)
+        self.span.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.span.__exit__(*exc)
+        _current.reset(self.token)
+        self.trace.duration_ns = time.perf_counter_ns() - self.trace.start_ns
+        _traces.append(self.trace)
+        return False
+
+
+def enable(flag: bool = True):
+    """Aktiviert oder deaktiviert die Messung global"""
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    """Gibt zurück, ob die Messung global aktiv ist"""
+    return _enabled
+
+
+def span(name: str):
+    """
+    Kontextmanager für eine gemessene Stufe
+
+    Args:
+        name: Name der Stufe (z.B. "calculate_all")
+
+    Returns:
+        Kontextmanager (No-op, wenn nicht gemessen wird)
+    """
+    trace = _current.get()
+    if trace is None:
+        if not _enabled:
+            return _NULL_SPAN
+        return _RootSpan(name)
+    return _Span(trace, name)
+
+
+def timed(name: Optional[str] = None):
+    """
+    Decorator, der jeden Aufruf einer Funktion als Stufe misst
+
+    Args:
+        name: Name der Stufe (Standard: Funktionsname)
+    """
+    def decorator(fn):
+        stage = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None and not _enabled:
+                return fn(*args, **kwargs)
+            with span(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def begin_trace(name: str, active: bool = True) -> Optional[Trace]:
+    """
+    Startet einen Trace im aktuellen Kontext
+
+    Args:
+        name: Name des Ablaufs (z.B. "rerun")
+        active: False setzt nur einen evtl. alten Trace zurück
+
+    Returns:
+        Trace oder None (wenn nicht aktiv)
+    """
+    if not active:
+        _current.set(None)
+        return None
+    trace = Trace(name)
+    _current.set(trace)
+    return trace
+
+
+def end_trace(trace: Optional[Trace]) -> Optional[Trace]:
+    """
+    Beendet einen Trace und legt ihn im Ringpuffer ab
+
+    Args:
+        trace: Rückgabewert von begin_trace()
+
+    Returns:
+        Der abgeschlossene Trace oder None
+    """
+    if trace is None:
+        return None
+    trace.duration_ns = time.perf_counter_ns() - trace.start_ns
+    if _current.get() is trace:
+        _current.set(None)
+    _traces.append(trace)
+    return trace
+
+
+@contextlib.contextmanager
+def tracing(name: str, active: bool = True):
+    """
+    Kontextmanager-Variante von begin_trace() / end_trace()
+
+    Args:
+        name: Name des Ablaufs
+        active: Ob gemessen werden soll
+
+    Yields:
+        Trace oder None
+    """
+    token = _current.set(None)
+    current = begin_trace(name, active)
+    try:
+        yield current
+    finally:
+        end_trace(current)
+        _current.reset(token)
+
+
+def recent_traces(limit: Optional[int] = None) -> List[Trace]:
+    """
+    Gibt die zuletzt abgeschlossenen Traces zurück (älteste zuerst)
+
+    Args:
+        limit: Maximale Anzahl (Standard: alle im Ringpuffer)
+    """
+    traces = list(_traces)
+    return traces[-limit:] if limit else traces
+
+
+def clear():
+    """Leert den Ringpuffer"""
+    _traces.clear()
+
+
+def stage_breakdown(trace: Trace) -> List[Dict]:
+    """
+    Bereitet die Stufen eines Traces für die Anzeige auf
+
+    Args:
+        trace: Abgeschlossener Trace
+
+    Returns:
+        Liste mit Stufe, Dauer (ms) und Anteil am Gesamtablauf (%)
+    """
+    total = trace.duration_ns or 1
+    return [
+        {
+            'Stufe': '  ' * s['depth'] + s['name'],
+            'Dauer (ms)': round(s['duration_ns'] / 1e6, 3),
+            'Anteil (%)': round(100 * s['duration_ns'] / total, 1)
+        }
+        for s in trace.spans
+    ]
+
+
+def export_jsonl(traces: Optional[Iterable[Trace]] = None) -> str:
+    """
+    Exportiert Traces als JSON Lines (ein Trace pro Zeile)
+
+    Args:
+        traces: Zu exportierende Traces (Standard: gesamter Ringpuffer)
+
+    Returns:
+        JSONL-Text
+    """
+    if traces is None:
+        traces = recent_traces()
+    return ''.join(
+        json.dumps(t.to_dict(), ensure_ascii=False, separators=(',', ':')) + '\n'
+        for t in traces
+    )
@@ -0,0 +1,89 @@
+"""
+Lite-Modus für Smartphones auf der Baustelle
+
+Über schwache Mobilfunkverbindungen ist die volle Ansicht zu schwer: 3D-Mesh,
+ein Shape je Stein in der 2D-Ansicht und alle Tabs mit Vergleich,
+Sensitivität und Monte Carlo. Im Lite-Modus zeigt die App nur die Mengen
+(Zahlen zuerst, als kurze Tabelle) und die Ansicht als kleines PNG aus
+thumbnails.py; Plotly-Figures werden weder gebaut noch übertragen.
+
+Der Modus wird am User-Agent erkannt (Abschnitt `mobile` in config.yaml)
+und lässt sich in der Sidebar oder mit ?lite=1 / ?lite=0 umschalten.
+"""
+
+from typing import Dict, List, Optional
+
+from config_store import get_config
+
+
+DEFAULT_SETTINGS = {
+    'auto_detect': True,
+    # Teilstrings im User-Agent, die ein Smartphone kennzeichnen
+    'user_agent_keywords': ['Mobi', 'Android', 'iPhone', 'iPod', 'Windows Phone'],
+    'thumbnail_width_px': 360,
+    'thumbnail_height_px': 160
+}
+
+
+def get_settings() -> Dict:
+    """Lite-Modus-Parameter aus config.yaml (mit Standardwerten ergänzt)"""
+    return dict(DEFAULT_SETTINGS, **get_config().get('mobile', {}))
+
+
+def is_mobile(user_agent: Optional[str], settings: Optional[Dict] = None) -> bool:
+    """
+    Erkennt Smartphones am User-Agent
+
+    Args:
+        user_agent: User-Agent-Header (None, wenn unbekannt)
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        True, wenn die automatische Erkennung aktiv ist und ein Schlüsselwort vorkommt
+    """
+    settings = settings or get_settings()
+    if not settings['auto_detect'] or not user_agent:
+        return False
+    return any(keyword in user_agent for keyword in settings['user_agent_keywords'])
+
+
+def lite_mode_default(query_value: Optional[str], user_agent: Optional[str], settings: Optional[Dict] = None) -> bool:
+    """
+    Startwert des Lite-Modus: ?lite=1 / ?lite=0 vor der Erkennung am User-Agent
+
+    Args:
+        query_value: Wert des Query-Parameters 'lite' (None, wenn nicht gesetzt)
+        user_agent: User-Agent-Header
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+    """
+    if query_value in ('1', '0'):
+        return query_value == '1'
+    return is_mobile(user_agent, settings)
+
+
+def lite_rows(result: Dict) -> List[Dict]:
+    """
+    Kompakte Ergebnistabelle, die Zahl vor der Bezeichnung
+
+    Args:
+        result: Ergebnis von calculate_all()
+
+    Returns:
+        Zeilen mit 'Menge' und 'Was' (Bestellmengen, Kosten falls berechnet)
+    """
+    materials = result['materials']
+    rows = [
+        {'Menge': f"{result['volume_with_buffer_m3']} m³", 'Was': f"Beton (inkl. {result['buffer_percentage']} % Puffer)"},
+        {'Menge': f"{result['total_stones']} St.", 'Was': f"Schalsteine, {result['rows']} Reihen"},
+        {'Menge': f"{materials['cement_bags']} Säcke", 'Was': f"Zement à {materials['cement_bag_size_kg']} kg"},
+        {'Menge': f"{materials['gravel_tons']} t", 'Was': "Kies"},
+        {'Menge': f"{materials['water_liters']:.0f} L", 'Was': "Wasser"}
+    ]
+    # Bewehrung nur ab 1 m Höhe
+    if result.get('reinforcement'):
+        rows.append({'Menge': f"{result['reinforcement']['rods_6m_needed']} Stäbe", 'Was': "Bewehrung (6 m, Ø 8 mm)"})
+    if result.get('openings'):
+        rows.append({'Menge': f"{result['opening_area_m2']} m²", 'Was': "Öffnungen (abgezogen)"})
+    if result.get('costs'):
+        rows.append({'Menge': f"{result['costs']['total_cost']:.2f} €", 'Was': "Gesamtkosten"})
+    return rows
@@ -0,0 +1,241 @@
+"""
+Lieferung: Paletten, Gewichte und Aufteilung auf LKW
+
+Aus den bestellten Mengen (Schalsteine, Zementsäcke, Kies, 6m-Stäbe)
+werden Ladeeinheiten gebildet: Steine und Zement auf Europaletten, Kies im
+Big Bag (je ein Stellplatz), Bewehrung in Bunden ohne eigenen Stellplatz.
+Die Ladeeinheiten werden reihum auf die LKW verteilt; reicht die Nutzlast
+nicht, kommt ein LKW dazu. Parameter im Abschnitt logistics der
+config.yaml.
+
+Alle Aufträge werden als Arrays (Aufträge × Ladeeinheiten × LKW)
+gerechnet, so dass auch die Tourenplanung für viele Aufträge in einem
+Durchlauf möglich ist.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config_store import get_config
+
+
+# Standardwerte, falls der Abschnitt logistics in der config.yaml fehlt
+DEFAULT_SETTINGS = {
+    'pallet_tare_kg': 25,
+    'stones_per_pallet': 60,
+    'cement_bags_per_pallet': 40,
+    'gravel_big_bag_tons': 1.0,
+    'rebar_bundle_rods': 50,
+    'truck_payload_kg': 12000,
+    'truck_pallet_places': 12
+}
+
+# Lieferpositionen: Schlüssel → Bezeichnung
+LINES = {
+    'stones': 'Schalsteine (Paletten)',
+    'cement': 'Zement (Paletten)',
+    'gravel': 'Kies (Big Bags)',
+    'rebar': 'Bewehrung (Bunde)'
+}
+
+# Dichte Betonstahl in kg/m³
+STEEL_DENSITY_KG_M3 = 7850
+
+
+def get_settings() -> Dict:
+    """Logistik-Parameter aus config.yaml (mit Standardwerten ergänzt)"""
+    return dict(DEFAULT_SETTINGS, **get_config().get('logistics', {}))
+
+
+def rod_weight_kg() -> float:
+    """Gewicht eines Lagerstabs aus Durchmesser und Länge (reinforcement_steel)"""
+    rebar = get_config()['reinforcement_steel']
+    area_m2 = math.pi * (rebar['diameter_mm'] / 1000) ** 2 / 4
+    return area_m2 * rebar['rod_length_m'] * STEEL_DENSITY_KG_M3
+
+
+def _units(count, per_unit, item_kg, tare_kg):
+    """Volle Einheiten und Resteinheit: (Anzahl voll, Gewicht voll, Anzahl Rest, Gewicht Rest)"""
+    full = np.floor(count / per_unit + 1e-9)
+    rest = np.maximum(count - full * per_unit, 0.0)
+    rest = np.where(rest > 1e-9, rest, 0.0)
+    has_rest = rest > 0
+    return (full, per_unit * item_kg + tare_kg, has_rest.astype(float),
+            np.where(has_rest, rest * item_kg + tare_kg, 0.0))
+
+
+def delivery_arrays(
+    stones,
+    stone_weight_kg,
+    cement_bags,
+    gravel_tons,
+    rods,
+    settings: Optional[Dict] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Ladeeinheiten, Gewichte und LKW-Aufteilung für viele Aufträge
+
+    Args:
+        stones, stone_weight_kg: Anzahl Schalsteine und Gewicht je Stein
+        cement_bags: Anzahl Zementsäcke
+        gravel_tons: Kies in Tonnen
+        rods: Anzahl 6m-Stäbe
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        Dictionary mit Arrays je Auftrag: <line>_units und <line>_kg für
+        stones, cement, gravel, rebar; total_kg, pallet_places, trucks;
+        sowie truck_units (Aufträge × LKW × Positionen), truck_kg und
+        truck_places (Aufträge × LKW)
+
+    Raises:
+        ValueError: wenn eine Ladeeinheit schwerer als die Nutzlast ist
+    """
+    settings = settings or get_settings()
+    config = get_config()
+    arrays = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                   for v in (stones, stone_weight_kg, cement_bags, gravel_tons, rods)))
+    stones, stone_weight, cement_bags, gravel_tons, rods = arrays
+    tare = settings['pallet_tare_kg']
+    big_bag_kg = settings['gravel_big_bag_tons'] * 1000
+
+    # Je Position volle Einheiten und eine Resteinheit (Spalten wie LINES)
+    parts = [
+        _units(stones, settings['stones_per_pallet'], stone_weight, tare),
+        _units(cement_bags, settings['cement_bags_per_pallet'], config['concrete_mix']['cement_bag_size_kg'], tare),
+        _units(gravel_tons * 1000, big_bag_kg, 1.0, 0.0),
+        _units(rods, settings['rebar_bundle_rods'], rod_weight_kg(), 0.0)
+    ]
+    # Aufträge × Einheitentypen (voll/Rest je Position)
+    counts = np.stack([c for full, full_kg, rest, rest_kg in parts for c in (full, rest)], axis=1)
+    weights = np.stack([np.broadcast_to(w, stones.shape) for full, full_kg, rest, rest_kg in parts
+                        for w in (full_kg, rest_kg)], axis=1)
+    # Bunde liegen auf der Ladung, alles andere braucht einen Stellplatz
+    places = np.array([1, 1, 1, 1, 1, 1, 0, 0], dtype=float)
+
+    payload = settings['truck_payload_kg']
+    truck_places = settings['truck_pallet_places']
+    if (weights * (counts > 0) > payload).any():
+        raise ValueError("Ladeeinheit schwerer als die Nutzlast des LKW!")
+
+    total_kg = (counts * weights).sum(axis=1)
+    pallet_places = counts @ places
+
+    # Untergrenze aus Gewicht und Stellplätzen, dann reihum verteilen
+    trucks = np.maximum(np.ceil(total_kg / payload - 1e-9), np.ceil(pallet_places / truck_places - 1e-9))
+    trucks = np.maximum(trucks, (total_kg > 0).astype(float)).astype(int)
+    while True:
+        truck_counts = _deal(counts, trucks)
+        truck_kg = np.einsum('otk,ok->ot', truck_counts, weights)
+        truck_place_count = truck_counts @ places
+        overloaded = ((truck_kg > payload + 1e-6) | (truck_place_count > truck_places)).any(axis=1)
+        if not overloaded.any():
+            break
+        trucks = trucks + overloaded
+
+    result = {
+        'total_kg': total_kg,
+        'pallet_places': pallet_places.astype(int),
+        'trucks': trucks,
+        'truck_units': truck_counts.reshape(*truck_counts.shape[:2], len(LINES), 2).sum(axis=3).astype(int),
+        'truck_kg': truck_kg,
+        'truck_places': truck_place_count.astype(int)
+    }
+    for index, line in enumerate(LINES):
+        result[f'{line}_units'] = counts[:, 2 * index:2 * index + 2].sum(axis=1).astype(int)
+        result[f'{line}_kg'] = (counts[:, 2 * index:2 * index + 2] * weights[:, 2 * index:2 * index + 2]).sum(axis=1)
+    return result
+
+
+def _deal(counts: np.ndarray, trucks: np.ndarray) -> np.ndarray:
+    """
+    Verteilt Einheiten reihum auf die LKW (Aufträge × LKW × Einheitentypen)
+
+    Jeder Einheitentyp beginnt beim LKW nach der letzten Einheit des
+    vorigen Typs; Stellplätze unterscheiden sich so um höchstens eins.
+    """
+    max_trucks = max(int(trucks.max(initial=0)), 1)
+    n = np.maximum(trucks, 1)[:, None]
+    start = np.concatenate([np.zeros((counts.shape[0], 1)), np.cumsum(counts, axis=1)[:, :-1]], axis=1) % n
+    truck = np.arange(max_trucks)[None, :, None]
+    base = np.floor(counts / n)[:, None, :]
+    extra = ((truck - start[:, None, :]) % n[:, :, None]) < (counts % n)[:, None, :]
+    dealt = base + extra
+    return np.where(truck < trucks[:, None, None], dealt, 0.0)
+
+
+def plan_deliveries(orders: Sequence[Dict], settings: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Logistik für viele Aufträge (Tourenplanung)
+
+    Args:
+        orders: Je Auftrag stone_type, stones, cement_bags, gravel_tons und
+            optional rods_6m (z.B. aus order_from_result())
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        Ergebnis von delivery_arrays() (Arrays in der Reihenfolge von orders)
+    """
+    stone_types = get_config()['stone_types']
+    return delivery_arrays(
+        [order['stones'] for order in orders],
+        [stone_types[order['stone_type']]['weight_kg'] for order in orders],
+        [order['cement_bags'] for order in orders],
+        [order['gravel_tons'] for order in orders],
+        [order.get('rods_6m', 0) for order in orders],
+        settings
+    )
+
+
+def order_from_result(result: Dict, stone_type: str) -> Dict:
+    """Bestellmengen aus dem Ergebnis von calculate_all()"""
+    rebar = result['reinforcement']
+    return {
+        'stone_type': stone_type,
+        'stones': result['total_stones'],
+        'cement_bags': result['materials']['cement_bags'],
+        'gravel_tons': result['materials']['gravel_tons'],
+        'rods_6m': rebar['rods_6m_needed'] if rebar else 0
+    }
+
+
+def delivery_plan(result: Dict, stone_type: str, settings: Optional[Dict] = None) -> Dict:
+    """
+    Lieferung für das Ergebnis einer Mauer
+
+    Args:
+        result: Ergebnis von calculate_all()
+        stone_type: Typ des Steins (für das Steingewicht)
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        Dictionary mit lines (Liste je Position mit line, label, units,
+        weight_kg), total_tons, pallet_places, trucks (Liste je LKW mit
+        truck, Einheiten je Position, weight_kg, pallet_places) und
+        truck_payload_kg
+    """
+    settings = settings or get_settings()
+    arrays = plan_deliveries([order_from_result(result, stone_type)], settings)
+
+    lines = [
+        {'line': line, 'label': label, 'units': int(arrays[f'{line}_units'][0]),
+         'weight_kg': round(float(arrays[f'{line}_kg'][0]), 1)}
+        for line, label in LINES.items()
+    ]
+    trucks: List[Dict] = []
+    for index in range(int(arrays['trucks'][0])):
+        truck = {'truck': index + 1}
+        truck.update(zip(LINES, arrays['truck_units'][0, index].tolist()))
+        truck['weight_kg'] = round(float(arrays['truck_kg'][0, index]), 1)
+        truck['pallet_places'] = int(arrays['truck_places'][0, index])
+        trucks.append(truck)
+
+    return {
+        'lines': lines,
+        'total_tons': round(float(arrays['total_kg'][0]) / 1000, 2),
+        'pallet_places': int(arrays['pallet_places'][0]),
+        'trucks': trucks,
+        'truck_payload_kg': settings['truck_payload_kg']
+    }
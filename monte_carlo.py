@@ -0,0 +1,184 @@
+"""
+Monte-Carlo-Schätzung der Materialmengen und Kosten
+
+Statt eines festen Puffers werden die unsicheren Größen als Verteilungen
+angesetzt (Füllvolumen pro Stein, Verlust/Puffer, tatsächliche Mauerlängen,
+Preise; Parameter im Abschnitt monte_carlo der config.yaml). Die Höhen
+bleiben ganze Steinreihen, da die Mauer reihenweise gebaut wird. Alle
+Stichproben laufen in einem Array-Durchlauf durch die vektorisierte
+Mengenberechnung (batch_calculations.py); Ergebnis sind P10/P50/P90 je
+Material und für die Gesamtkosten.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from batch_calculations import batch_quantities, batch_total_cost, wall_geometry
+from config_store import get_config
+
+
+# Standardwerte, falls der Abschnitt monte_carlo in der config.yaml fehlt
+DEFAULT_SETTINGS = {
+    'samples': 200000,
+    'seed': 42,
+    'fill_volume_rel_sd': 0.05,
+    'waste_percentage_min': 5,
+    'waste_percentage_mode': 15,
+    'waste_percentage_max': 30,
+    'dimension_sd_m': 0.03,
+    'price_rel_sd': 0.1
+}
+
+PERCENTILES = (10, 50, 90)
+
+# Ausgewertete Größen: Schlüssel → Bezeichnung
+MEASURES = {
+    'stones': 'Schalsteine (St.)',
+    'volume_with_buffer_m3': 'Beton (m³)',
+    'cement_bags': 'Zement (Säcke)',
+    'gravel_tons': 'Kies (t)',
+    'water_liters': 'Wasser (L)',
+    'rods_6m': 'Bewehrung (6m Stäbe)',
+    'total_cost': 'Gesamtkosten (€)'
+}
+
+# Kleinstes Maß nach dem Ziehen (verhindert negative Längen/Höhen)
+MIN_DIMENSION_M = 0.01
+
+
+def get_settings() -> Dict:
+    """Monte-Carlo-Parameter aus config.yaml (mit Standardwerten ergänzt)"""
+    return dict(DEFAULT_SETTINGS, **get_config().get('monte_carlo', {}))
+
+
+def _vary(rng: np.random.Generator, value: Optional[float], sd: float, samples: int, minimum: float):
+    """Normalverteilte Stichproben um value (None bleibt None)"""
+    if value is None:
+        return None
+    if sd <= 0:
+        return np.full(samples, float(value))
+    return np.maximum(rng.normal(value, sd, samples), minimum)
+
+
+def sample_quantities(
+    params: Dict,
+    samples: Optional[int] = None,
+    seed: Optional[int] = None,
+    settings: Optional[Dict] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Zieht Stichproben und berechnet Mengen und Kosten je Stichprobe
+
+    Args:
+        params: Parameter wie für calculate_all(); fehlende Preise kommen
+            aus config.yaml
+        samples: Anzahl Stichproben (Standard: aus config.yaml)
+        seed: Startwert des Zufallsgenerators (Standard: aus config.yaml;
+            gleicher Seed = gleiches Ergebnis)
+        settings: Verteilungsparameter (Standard: get_settings())
+
+    Returns:
+        Dictionary Schlüssel aus MEASURES → Array mit einem Wert je Stichprobe
+    """
+    config = get_config()
+    settings = dict(get_settings(), **(settings or {}))
+    samples = int(samples or settings['samples'])
+    rng = np.random.default_rng(settings['seed'] if seed is None else seed)
+
+    # Tatsächliche Längen; Höhen bleiben ganze Steinreihen (wie in der Sidebar)
+    dimension_sd = settings['dimension_sd_m']
+    zone1_length = _vary(rng, params.get('zone1_length'), dimension_sd, samples, MIN_DIMENSION_M)
+    zone2_length = _vary(rng, params.get('zone2_length'), dimension_sd, samples, MIN_DIMENSION_M)
+    is_two_zone = bool(params.get('is_two_zone')) and zone1_length is not None
+    if is_two_zone:
+        length = zone1_length + zone2_length
+    else:
+        length = _vary(rng, params['length'], dimension_sd, samples, MIN_DIMENSION_M)
+
+    geometry = wall_geometry(
+        length, params['start_height'], params['end_height'], is_two_zone,
+        zone1_length, params.get('zone1_height'), zone2_length, params.get('zone2_end_height')
+    )
+
+    # Füllvolumen pro Stein und Verlust
+    stone = config['stone_types'][params['stone_type']]
+    fill_liters = _vary(
+        rng, stone['fill_volume_per_stone_liters'],
+        stone['fill_volume_per_stone_liters'] * settings['fill_volume_rel_sd'], samples, 0.0
+    )
+    if settings['waste_percentage_min'] == settings['waste_percentage_max']:
+        # Fester Verlust (Dreiecksverteilung braucht eine Spannweite)
+        waste = np.full(samples, float(settings['waste_percentage_mode']))
+    else:
+        waste = rng.triangular(
+            settings['waste_percentage_min'], settings['waste_percentage_mode'],
+            settings['waste_percentage_max'], samples
+        )
+
+    quantities = batch_quantities(
+        geometry, stone['stones_per_m2'], fill_liters, stone['height_cm'] / 100,
+        buffer_percentage=waste
+    )
+
+    # Preise
+    base_prices = {
+        'cement_price': config['prices']['cement_per_bag_eur'],
+        'gravel_price': config['prices']['gravel_per_ton_eur'],
+        'stone_price': config['prices']['stone_per_piece_eur'],
+        'rebar_price': config['reinforcement_steel']['price_per_6m_rod_eur']
+    }
+    prices = {}
+    for name, default in base_prices.items():
+        base = params.get(name)
+        base = float(default if base is None else base)
+        prices[name] = _vary(rng, base, base * settings['price_rel_sd'], samples, 0.0)
+
+    result = {key: quantities[key] for key in MEASURES if key in quantities}
+    result['total_cost'] = batch_total_cost(quantities, **prices)
+    return result
+
+
+def percentile_table(draws: Dict[str, np.ndarray], percentiles=PERCENTILES) -> List[Dict]:
+    """
+    Fasst die Stichproben als Perzentil-Tabelle zusammen
+
+    Args:
+        draws: Ergebnis von sample_quantities()
+        percentiles: Perzentile (Standard: 10, 50, 90)
+
+    Returns:
+        Liste von Zeilen (Größe, Mittelwert, P10, P50, P90)
+    """
+    keys = [key for key in MEASURES if key in draws]
+    # Ein Aufruf für alle Größen und Perzentile
+    values = np.percentile(np.stack([draws[key] for key in keys]), percentiles, axis=1)
+    means = [float(draws[key].mean()) for key in keys]
+
+    rows = []
+    for column, key in enumerate(keys):
+        digits = 2 if key == 'total_cost' else (3 if key == 'volume_with_buffer_m3' else 1)
+        row = {'Größe': MEASURES[key], 'Mittelwert': round(means[column], digits)}
+        for index, pct in enumerate(percentiles):
+            row[f'P{pct}'] = round(float(values[index, column]), digits)
+        rows.append(row)
+    return rows
+
+
+def monte_carlo(
+    params: Dict,
+    samples: Optional[int] = None,
+    seed: Optional[int] = None
+) -> List[Dict]:
+    """
+    Monte-Carlo-Schätzung mit Perzentil-Tabelle
+
+    Args:
+        params: Parameter wie für calculate_all()
+        samples: Anzahl Stichproben (Standard: aus config.yaml)
+        seed: Startwert des Zufallsgenerators (Standard: aus config.yaml)
+
+    Returns:
+        Perzentil-Tabelle (siehe percentile_table())
+    """
+    return percentile_table(sample_quantities(params, samples=samples, seed=seed))
@@ -0,0 +1,207 @@
+"""
+Öffnungen in der Mauer (Rohrdurchführungen, Tore, Nischen)
+
+Eine Öffnung ist ein Rechteck in der Ansichtsebene durch die ganze
+Wandstärke: x (Abstand vom Mauerbeginn), width, bottom (Unterkante über
+dem Fundament) und height in Metern, optional name. Ganz überdeckte Steine
+entfallen, teilweise überdeckte werden zugeschnitten; Füllbeton entfällt
+anteilig nach der überdeckten Fläche, Bewehrung in den durchtrennten Lagen
+über die Breite der Öffnung.
+
+Die Schnitte werden ohne Schleife über Steine oder Öffnungen bestimmt: je
+Öffnung die betroffenen Reihen, je Reihe die betroffenen Steinpositionen
+(Versatz wie im Verband), als flache Arrays aufgezählt. Der Aufwand wächst
+mit der Zahl der geschnittenen Steine, nicht mit Mauerlänge × Öffnungen.
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+
+# Toleranz beim Ab- und Aufrunden auf Reihen und Steinpositionen
+_EPSILON = 1e-9
+
+
+def opening_arrays(openings: Sequence[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Öffnungen als Arrays
+
+    Args:
+        openings: Liste von Öffnungen (x, width, bottom, height)
+
+    Returns:
+        (x0, x1, y0, y1) je Öffnung
+    """
+    x0 = np.array([float(o['x']) for o in openings])
+    y0 = np.array([float(o['bottom']) for o in openings])
+    x1 = x0 + np.array([float(o['width']) for o in openings])
+    y1 = y0 + np.array([float(o['height']) for o in openings])
+    return x0, x1, y0, y1
+
+
+def _expand(first: np.ndarray, last: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Zählt je Eintrag first..last auf: (Index des Eintrags, Wert)"""
+    counts = np.maximum(last - first + 1, 0)
+    owner = np.repeat(np.arange(first.size), counts)
+    starts = np.cumsum(counts) - counts
+    return owner, first[owner] + (np.arange(owner.size) - starts[owner])
+
+
+def opening_overlap(
+    openings: Sequence[Dict],
+    stone_length: float,
+    stone_height: float,
+    total_length: float,
+    rows: np.ndarray,
+    positions: int
+) -> np.ndarray:
+    """
+    Von Öffnungen überdeckte Fläche je Stein im Verband
+
+    Args:
+        openings: Liste von Öffnungen
+        stone_length, stone_height: Steinmaße in Metern
+        total_length: Mauerlänge in Metern
+        rows: Reihen (0-basiert) wie in layout_grid()
+        positions: Steinpositionen je Reihe (stones_per_row + 1)
+
+    Returns:
+        Array (Reihen × Positionen) mit der überdeckten Fläche in m²
+    """
+    rows = np.asarray(rows, dtype=np.int64).ravel()
+    overlap = np.zeros(rows.size * positions)
+    if not len(openings) or not rows.size:
+        return overlap.reshape(rows.size, positions)
+
+    x0, x1, y0, y1 = opening_arrays(openings)
+
+    # Öffnung × Reihe: alle Reihen zwischen Unter- und Oberkante
+    first_row = np.floor(y0 / stone_height + _EPSILON).astype(np.int64)
+    last_row = np.ceil(y1 / stone_height - _EPSILON).astype(np.int64) - 1
+    opening, row = _expand(first_row, np.minimum(last_row, rows.max()))
+
+    # Nur die angefragten Reihen (Index in rows, -1 = nicht angefragt)
+    lookup = np.full(int(rows.max()) + 1, -1)
+    lookup[rows] = np.arange(rows.size)
+    keep = lookup[row] >= 0
+    opening, row = opening[keep], row[keep]
+
+    # Reihe × Steinposition: Steine zwischen linker und rechter Kante (mit Versatz)
+    offset = (row % 2) * (stone_length / 2)
+    first_pos = np.floor((x0[opening] + offset) / stone_length + _EPSILON).astype(np.int64)
+    last_pos = np.ceil((x1[opening] + offset) / stone_length - _EPSILON).astype(np.int64) - 1
+    pair, position = _expand(np.maximum(first_pos, 0), np.minimum(last_pos, positions - 1))
+    opening, row, offset = opening[pair], row[pair], offset[pair]
+
+    stone_x0 = np.maximum(position * stone_length - offset, 0.0)
+    stone_x1 = np.minimum(position * stone_length - offset + stone_length, total_length)
+    dx = np.minimum(x1[opening], stone_x1) - np.maximum(x0[opening], stone_x0)
+    dy = np.minimum(y1[opening], (row + 1) * stone_height) - np.maximum(y0[opening], row * stone_height)
+    area = np.clip(dx, 0.0, None) * np.clip(dy, 0.0, None)
+
+    overlap += np.bincount(lookup[row] * positions + position, weights=area, minlength=overlap.size)
+    return overlap.reshape(rows.size, positions)
+
+
+def _crossed_courses(y0: np.ndarray, y1: np.ndarray, stone_height: float, courses: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Erste und hinter der letzten durchtrennten Lage je Öffnung (Stäbe in Reihenmitte)"""
+    first = np.clip(np.ceil(y0 / stone_height - 0.5 - _EPSILON), 0, courses)
+    last = np.clip(np.ceil(y1 / stone_height - 0.5 - _EPSILON), 0, courses)
+    return first, last
+
+
+def interrupted_rebar_length(openings: Sequence[Dict], stone_height: float, courses: int) -> float:
+    """
+    Durch Öffnungen unterbrochene Bewehrung in Lagenmetern
+
+    Die Stäbe liegen in Reihenmitte; eine Lage ist unterbrochen, wenn die
+    Öffnung über die Reihenmitte reicht.
+
+    Args:
+        openings: Liste von Öffnungen
+        stone_height: Steinhöhe in Metern
+        courses: Anzahl Lagen
+
+    Returns:
+        Summe aus Breite × unterbrochenen Lagen je Öffnung (je Stab einer Lage)
+    """
+    if not len(openings):
+        return 0.0
+    x0, x1, y0, y1 = opening_arrays(openings)
+    first, last = _crossed_courses(y0, y1, stone_height, courses)
+    return float(((x1 - x0) * (last - first)).sum())
+
+
+def interrupted_width(openings: Sequence[Dict], stone_height: float, rows) -> np.ndarray:
+    """
+    Unterbrochene Bewehrung je Lage (wie interrupted_rebar_length())
+
+    Args:
+        openings: Liste von Öffnungen
+        stone_height: Steinhöhe in Metern
+        rows: Lagen (0-basiert)
+
+    Returns:
+        Summe der Breiten der Öffnungen, die die Lage durchtrennen, je Lage
+    """
+    rows = np.asarray(rows, dtype=np.int64).ravel()
+    if not len(openings) or not rows.size:
+        return np.zeros(rows.size)
+    x0, x1, y0, y1 = opening_arrays(openings)
+    first, last = _crossed_courses(y0, y1, stone_height, int(rows.max()) + 1)
+    crossed = (rows[:, None] >= first) & (rows[:, None] < last)
+    return crossed @ (x1 - x0)
+
+
+def rebar_runs(
+    openings: Sequence[Dict],
+    stone_height: float,
+    courses: int,
+    wall_length: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Durchgehende Bewehrungsstränge je Lage, an den Öffnungen getrennt
+
+    Lagen, die von denselben Öffnungen durchtrennt werden, haben dieselben
+    Stränge und werden zusammen ausgewertet.
+
+    Args:
+        openings: Liste von Öffnungen
+        stone_height: Steinhöhe in Metern
+        courses: Anzahl Lagen
+        wall_length: Mauerlänge in Metern
+
+    Returns:
+        (Stranglänge in Metern, Anzahl Lagen mit diesem Strang); die Summe
+        ist wall_length × courses - interrupted_rebar_length()
+    """
+    if courses <= 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    if not len(openings):
+        return np.array([float(wall_length)]), np.array([courses])
+
+    x0, x1, y0, y1 = opening_arrays(openings)
+    first, last = _crossed_courses(y0, y1, stone_height, courses)
+    rows = np.arange(courses)[:, None]
+    patterns, pattern_counts = np.unique((rows >= first) & (rows < last), axis=0, return_counts=True)
+
+    lengths, counts = [], []
+    for crossed, count in zip(patterns, pattern_counts):
+        # Öffnungen einer Lage überschneiden sich nicht: Strang von Kante zu Kante
+        order = np.argsort(x0[crossed])
+        edges = np.concatenate([[0.0], np.column_stack([x0[crossed][order], x1[crossed][order]]).ravel(),
+                                [float(wall_length)]])
+        segments = edges[1::2] - edges[0::2]
+        segments = segments[segments > _EPSILON]
+        lengths.append(segments)
+        counts.append(np.full(segments.size, count))
+    return np.concatenate(lengths), np.concatenate(counts)
+
+
+def opening_area(openings: Sequence[Dict]) -> float:
+    """Summe der Öffnungsflächen in m²"""
+    if not len(openings):
+        return 0.0
+    x0, x1, y0, y1 = opening_arrays(openings)
+    return float(((x1 - x0) * (y1 - y0)).sum())
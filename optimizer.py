@@ -0,0 +1,165 @@
+"""
+Steintyp-Optimierer
+
+Wertet alle Steintypen aus config.yaml (und bei 2-Zonen-Mauern optional
+maßgleiche Kombinationen aus zwei Steintypen) für die aktuelle Mauer in
+einem vektorisierten Durchlauf aus und sortiert sie nach Kosten,
+Betonvolumen, Gewicht oder Steinanzahl.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from batch_calculations import batch_quantities, batch_total_cost, stone_arrays, wall_geometry
+from config_store import get_config
+
+
+# Sortierkriterien: Schlüssel → (Spalte in compare_stone_types(), Bezeichnung)
+RANK_CRITERIA = {
+    'total_cost': ('total_cost', 'Gesamtkosten'),
+    'volume': ('volume_with_buffer_m3', 'Betonvolumen'),
+    'weight': ('weight_kg', 'Gewicht'),
+    'stones': ('stones', 'Anzahl Steine')
+}
+
+# Zwei Steintypen gelten als kombinierbar, wenn Breite und Höhe gleich sind
+COMBINATION_TOLERANCE_CM = 0.5
+
+
+def compare_stone_types(
+    length: float,
+    start_height: float,
+    end_height: float,
+    cement_price: Optional[float] = None,
+    gravel_price: Optional[float] = None,
+    stone_price: Optional[float] = None,
+    rebar_price: Optional[float] = None,
+    is_two_zone: bool = False,
+    zone1_length: Optional[float] = None,
+    zone1_height: Optional[float] = None,
+    zone2_length: Optional[float] = None,
+    zone2_end_height: Optional[float] = None,
+    include_combinations: bool = False
+) -> Dict:
+    """
+    Berechnet Mengen und Kosten für alle Steintypen in einem Durchlauf
+
+    Fehlende Preise werden aus config.yaml übernommen, damit immer nach
+    Kosten sortiert werden kann.
+
+    Args:
+        length, start_height, end_height: Mauermaße wie calculate_all()
+        cement_price, gravel_price, stone_price, rebar_price: Preise (optional)
+        is_two_zone, zone1_*, zone2_*: 2-Zonen-Maße wie calculate_all()
+        include_combinations: Bei 2-Zonen-Mauern auch Zone 1 und Zone 2 mit
+            unterschiedlichen, maßgleichen Steintypen auswerten
+
+    Returns:
+        Dictionary mit 'zone1_type', 'zone2_type', 'label' (Listen) und
+        Arrays für stones, volume_with_buffer_m3, cement_bags, gravel_tons,
+        rods_6m, weight_kg und total_cost
+    """
+    prices = get_config()['prices']
+    if cement_price is None:
+        cement_price = prices['cement_per_bag_eur']
+    if gravel_price is None:
+        gravel_price = prices['gravel_per_ton_eur']
+    if stone_price is None:
+        stone_price = prices['stone_per_piece_eur']
+
+    stones = stone_arrays()
+    count = len(stones.keys)
+
+    geometry = wall_geometry(
+        length, start_height, end_height, is_two_zone,
+        zone1_length, zone1_height, zone2_length, zone2_end_height
+    )
+
+    # Paare (Zone 1, Zone 2): Diagonale = ein Steintyp für die ganze Mauer
+    first = second = np.arange(count)
+    if include_combinations and geometry['area2'] is not None:
+        i, j = np.meshgrid(first, first, indexing='ij')
+        compatible = (
+            (i != j)
+            & (np.abs(stones.width_cm[i] - stones.width_cm[j]) <= COMBINATION_TOLERANCE_CM)
+            & (np.abs(stones.height_m[i] - stones.height_m[j]) * 100 <= COMBINATION_TOLERANCE_CM)
+        )
+        first = np.concatenate([first, i[compatible]])
+        second = np.concatenate([second, j[compatible]])
+
+    if first is second:
+        # Nur Einzeltypen: Kennwerte ohne Indizierung verwenden
+        quantities = batch_quantities(geometry, stones.stones_per_m2, stones.fill_liters, stones.height_m)
+        stone_weight = quantities['stones'] * stones.weight_kg
+    else:
+        quantities = batch_quantities(
+            geometry,
+            stones.stones_per_m2[first], stones.fill_liters[first], stones.height_m[first],
+            stones.stones_per_m2[second], stones.fill_liters[second], stones.height_m[second]
+        )
+        zone2_stones = quantities['zone2_stones']
+        stone_weight = (
+            (quantities['stones'] - zone2_stones) * stones.weight_kg[first]
+            + zone2_stones * stones.weight_kg[second]
+        )
+
+    total_cost = batch_total_cost(quantities, cement_price, gravel_price, stone_price, rebar_price)
+
+    # Steingewicht + Trockenmaterial (Zement, Kies)
+    weight_kg = stone_weight + quantities['cement_kg'] + quantities['gravel_kg']
+
+    labels = [
+        stones.names[a] if a == b else f"{stones.names[a]} + {stones.names[b]}"
+        for a, b in zip(first.tolist(), second.tolist())
+    ]
+
+    return {
+        'zone1_type': [stones.keys[a] for a in first.tolist()],
+        'zone2_type': [stones.keys[b] for b in second.tolist()],
+        'label': labels,
+        'stones': quantities['stones'],
+        'volume_with_buffer_m3': quantities['volume_with_buffer_m3'],
+        'cement_bags': quantities['cement_bags'],
+        'gravel_tons': quantities['gravel_tons'],
+        'rods_6m': quantities['rods_6m'],
+        'weight_kg': weight_kg,
+        'total_cost': total_cost
+    }
+
+
+def rank_options(options: Dict, criterion: str = 'total_cost') -> List[Dict]:
+    """
+    Sortiert die Optionen aufsteigend nach einem Kriterium
+
+    Args:
+        options: Ergebnis von compare_stone_types()
+        criterion: Schlüssel aus RANK_CRITERIA
+
+    Returns:
+        Liste von Zeilen für die Vergleichstabelle (beste zuerst)
+
+    Raises:
+        ValueError: bei unbekanntem Kriterium
+    """
+    if criterion not in RANK_CRITERIA:
+        raise ValueError(f"Unbekanntes Kriterium: {criterion}")
+
+    column, _ = RANK_CRITERIA[criterion]
+    # Stabil sortieren, bei Gleichstand entscheiden die Kosten
+    order = np.lexsort((options['total_cost'], options[column]))
+
+    rows = []
+    for rank, index in enumerate(order.tolist(), start=1):
+        rows.append({
+            'Rang': rank,
+            'Steintyp': options['label'][index],
+            'Steine': int(options['stones'][index]),
+            'Beton (m³)': round(float(options['volume_with_buffer_m3'][index]), 3),
+            'Zement (Säcke)': int(options['cement_bags'][index]),
+            'Kies (t)': round(float(options['gravel_tons'][index]), 1),
+            'Bewehrung (Stäbe)': int(options['rods_6m'][index]),
+            'Gewicht (kg)': round(float(options['weight_kg'][index])),
+            'Gesamtkosten (€)': round(float(options['total_cost'][index]), 2)
+        })
+    return rows
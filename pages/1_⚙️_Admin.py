@@ -5,7 +5,8 @@ Ermöglicht das Bearbeiten der config.yaml
 
 import streamlit as st
 import yaml
-from pathlib import Path
+
+from config_store import get_snapshot, load_config_for_editing, save_config, config_history
 
 st.set_page_config(
     page_title="Admin - Konfiguration",
@@ -45,12 +46,10 @@ if st.button("🚪 Abmelden"):
 
 st.markdown("---")
 
-# Lade Config
-config_path = Path("config.yaml")
-
+# Lade Config (veränderbare Kopie des aktuellen Snapshots)
 try:
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config_version = get_snapshot().version
+    config = load_config_for_editing()
 except Exception as e:
     st.error(f"❌ Fehler beim Laden der Konfiguration: {e}")
     st.stop()
@@ -286,10 +285,10 @@ col1, col2, col3 = st.columns([1, 1, 2])
 with col1:
     if st.button("💾 Speichern", type="primary", use_container_width=True):
         try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(config, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
-            st.success("✅ Konfiguration erfolgreich gespeichert!")
-            st.info("🔄 Laden Sie die Hauptseite neu, um die Änderungen zu übernehmen.")
+            # Atomar speichern (Temp-Datei + Umbenennen), neue Version für alle Sitzungen
+            snapshot = save_config(config)
+            st.success(f"✅ Konfiguration erfolgreich gespeichert (Version {snapshot.version})!")
+            st.info("🔄 Alle Sitzungen verwenden die neuen Werte ab dem nächsten Rerun.")
         except Exception as e:
             st.error(f"❌ Fehler beim Speichern: {e}")
 
@@ -298,7 +297,16 @@ with col2:
         st.rerun()
 
 with col3:
-    st.caption("Änderungen werden in config.yaml gespeichert")
+    st.caption(f"Änderungen werden in config.yaml gespeichert (aktuell Version {config_version})")
+
+# Versionshistorie
+with st.expander("🕓 Versionshistorie"):
+    history = config_history()
+    if history:
+        st.caption("Jeder gespeicherte Stand ist über seinen Inhalts-Hash reproduzierbar (config_history/).")
+        st.table(list(reversed(history)))
+    else:
+        st.caption("Noch keine Versionen gespeichert.")
 
 # Backup-Hinweis
 st.markdown("---")
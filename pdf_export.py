@@ -15,7 +15,11 @@ from typing import Dict
 import tempfile
 import os
 
+from instrumentation import timed
+from rebar_cutting import reinforcement_plan
 
+
+@timed('create_pdf_report')
 def create_pdf_report(result: Dict, inputs: Dict, fig_2d: go.Figure = None) -> BytesIO:
     """
     Erstellt einen PDF-Bericht mit allen Berechnungsergebnissen
@@ -123,6 +127,8 @@ def create_pdf_report(result: Dict, inputs: Dict, fig_2d: go.Figure = None) -> B
         ['Mauerfläche', f"{result['area']} m²"],
         ['Anzahl Steine', f"{result['total_stones']} St."],
         ['Anzahl Reihen', f"{result['rows']}"],
+        ['Zuschnitt (halbe / sonstige Steine)', f"{result['stone_cuts']['half_stones']} / {result['stone_cuts']['cut_stones']} St."],
+        ['Teilreihen (Gefälle)', f"{result['stone_cuts']['partial_courses']} von {result['stone_cuts']['courses']}"],
         ['Grundvolumen (Hohlräume)', f"{result['base_volume_m3']} m³"],
         ['Puffer', f"{result['buffer_percentage']}%"],
         ['Volumen mit Puffer', f"{result['volume_with_buffer_m3']} m³"],
@@ -276,6 +282,111 @@ def create_pdf_report(result: Dict, inputs: Dict, fig_2d: go.Figure = None) -> B
     return buffer
 
 
+def create_text_report(result: Dict, inputs: Dict) -> str:
+    """
+    Erstellt den Text-Export mit allen Berechnungsergebnissen
+    
+    Args:
+        result: Berechnungsergebnisse von calculate_all()
+        inputs: Dictionary mit Eingabewerten (Maße und, falls Kosten aktiv, Preise)
+        
+    Returns:
+        Bericht als Klartext
+    """
+    materials = result['materials']
+    costs = result['costs']
+    
+    export_text = f"""
+SCHALSTEINMAUER BETONRECHNER - ERGEBNISSE
+==========================================
+
+MAUER-DIMENSIONEN:
+- Länge: {inputs['length']} m
+- Anfangshöhe: {inputs['start_height']} m
+- Endhöhe: {inputs['end_height']} m
+- Breite/Dicke: {inputs['width']} cm
+
+SCHALSTEIN:
+- Typ: {result['stone_data']['name']}
+- Maße: {result['stone_data']['length_cm']} × {result['stone_data']['width_cm']} × {result['stone_data']['height_cm']} cm
+- Gewicht: {result['stone_data']['weight_kg']} kg
+- Füllvolumen: {result['stone_data']['fill_volume_per_stone_liters']:.2f} L/Stein
+
+BERECHNUNGSERGEBNISSE:
+- Fläche: {result['area']} m²
+- Anzahl Steine: {result['total_stones']} St.
+- Reihen: {result['rows']}
+- Zuschnitt: {result['stone_cuts']['half_stones']} halbe, {result['stone_cuts']['cut_stones']} sonstige Steine ({result['stone_cuts']['partial_courses']} Teilreihen)
+- Grundvolumen: {result['base_volume_m3']} m³
+- Volumen mit {result['buffer_percentage']}% Puffer: {result['volume_with_buffer_m3']} m³
+
+MATERIALBEDARF:
+- Zement: {materials['cement_bags']} Säcke à {materials['cement_bag_size_kg']} kg ({materials['cement_kg']} kg)
+- Kies: {materials['gravel_tons']} Tonnen ({materials['gravel_kg']} kg)
+- Wasser: {materials['water_liters']} Liter
+"""
+    
+    if result.get('openings'):
+        export_text += f"""
+ÖFFNUNGEN ({result['opening_area_m2']} m², {result['stone_cuts']['removed_stones']} Steine entfallen):
+"""
+        for opening in result['openings']:
+            export_text += (f"- {opening.get('name', 'Öffnung')}: {opening['width']} × {opening['height']} m "
+                            f"bei x = {opening['x']} m, Unterkante {opening['bottom']} m\n")
+    
+    if result['reinforcement']:
+        rebar = result['reinforcement']
+        export_text += f"""
+BEWEHRUNGSSTAHL (ab 1m Höhe):
+- Benötigte 6m Stäbe: {rebar['rods_6m_needed']} Stück (Ø {rebar['diameter_mm']} mm)
+- Anzahl Lagen: {rebar['rows']}
+- Stäbe pro Reihe: {rebar['rods_per_row']}
+- Gesamtlänge: {rebar['total_length_m']} m
+"""
+        plan = reinforcement_plan(rebar, result['layout'])
+        export_text += f"""
+SCHNITTPLAN (Stoß {plan['lap_length_m']:.2f} m):
+- Stäbe laut Schnittplan: {plan['rods_needed']} Stück ({plan['laps']} Stöße)
+- Schnittliste: {', '.join(f"{cut['count']} × {cut['length_m']:.2f} m" for cut in plan['cut_list'])}
+- Verschnitt: {plan['waste_m']:.2f} m ({plan['waste_percentage']} %), davon wiederverwendbar {plan['reusable_offcut_m']:.2f} m
+"""
+    
+    if costs:
+        export_text += f"""
+KOSTEN:
+- Schalsteine: {result['total_stones']} St. × {inputs['stone_price']:.2f} € = {costs['stone_cost']:.2f} € (netto)
+  + MwSt (19%): {costs['stone_vat']:.2f} €
+  = Gesamt: {costs['stone_cost_with_vat']:.2f} €
+- Zement: {materials['cement_bags']} Säcke × {inputs['cement_price']:.2f} € = {costs['cement_cost']:.2f} €
+- Kies: {materials['gravel_tons']} t × {inputs['gravel_price']:.2f} € = {costs['gravel_cost']:.2f} €"""
+        
+        if result['reinforcement']:
+            export_text += f"""
+- Bewehrungsstahl: {result['reinforcement']['rods_6m_needed']} Stäbe × {result['reinforcement']['price_per_rod_eur']:.2f} € = {costs['reinforcement_cost']:.2f} €"""
+        
+        export_text += f"""
+---
+Zwischensumme (netto): {costs['subtotal']:.2f} €
+MwSt (19% auf Steine): {costs['stone_vat']:.2f} €
+GESAMTKOSTEN: {costs['total_cost']:.2f} €
+"""
+    
+    export_text += f"""
+BETONEMPFEHLUNG:
+Empfohlener Beton: C25/30 mit max. 16 mm Korn (Rundkies 0-16), F3-Konsistenz.
+Für Höhen >1 m oder tragende Wände Armierung empfohlen (z.B. 2 Ø 8 mm pro Lage).
+
+WICHTIGER HINWEIS:
+Dies ist eine Schätzung und berücksichtigt Verluste, aber keine statische Berechnung 
+oder spezifische Bauvorschriften. Konsultieren Sie einen Fachmann für tragende oder hohe Mauern!
+
+Erstellt mit: Schalsteinmauer Betonrechner
+Config-Version: {result['config_version']}
+"""
+    
+    return export_text
+
+
 def get_pdf_button_html() -> str:
     """
     Gibt HTML für einen schönen PDF-Button zurück
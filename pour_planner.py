@@ -0,0 +1,266 @@
+"""
+Betonierplan: Mischer-Chargen, Betonierabschnitte und Fahrmischer
+
+Schalsteine werden abschnittsweise verfüllt: höchstens max_lift_courses
+Reihen auf einmal (Frischbetondruck auf die Steine). Die Reihen werden zu
+Abschnitten zusammengefasst, jeder Abschnitt wird für sich gemischt bzw.
+geliefert. Für eine Mauer kommt das Volumen je Reihe aus der Stückliste
+(course_bom.py), Betonierplan und Reihenliste stimmen also überein.
+
+Für Projekte liegen Mauern, Reihen und Abschnitte als Arrays vor (Mauern ×
+Reihen), viele Mauern werden in einem Durchlauf geplant: das Betonvolumen
+inkl. Puffer (wie calculate_all()) wird nach der Länge, die jede Reihe unter
+der Mauerkrone bedeckt, auf die Reihen verteilt, ohne den Verband jeder
+Mauer aufzubauen. Abschnitt n aller Mauern wird am selben Tag betoniert,
+Chargen und Fahrmischer werden daher je Betoniertag über alle Mauern
+gerundet.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from config_store import get_config
+from course_bom import course_fill_volumes
+
+
+# Standardwerte, falls der Abschnitt pour_planning in der config.yaml fehlt
+DEFAULT_SETTINGS = {
+    'mixer_drum_liters': 140,
+    'mixer_fill_ratio': 0.65,
+    'truck_capacity_m3': 8.0,
+    'max_lift_courses': 4
+}
+
+# Toleranz beim Auf- und Abrunden (Gleitkomma, z.B. 4 × 0,248 m)
+_EPSILON = 1e-9
+
+
+def get_settings() -> Dict:
+    """Parameter des Betonierplans aus config.yaml (mit Standardwerten ergänzt)"""
+    return dict(DEFAULT_SETTINGS, **get_config().get('pour_planning', {}))
+
+
+def batch_recipe(settings: Optional[Dict] = None) -> Dict[str, float]:
+    """
+    Mischung für eine Mischer-Charge (nach concrete_mix)
+
+    Args:
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        Dictionary mit volume_liters (Frischbeton je Charge), cement_kg,
+        cement_bags (Anteil Sack), gravel_kg und water_liters
+    """
+    settings = settings or get_settings()
+    mix = get_config()['concrete_mix']
+    volume_m3 = settings['mixer_drum_liters'] * settings['mixer_fill_ratio'] / 1000
+    cement_kg = volume_m3 * mix['cement_kg_per_m3']
+    return {
+        'volume_liters': round(volume_m3 * 1000, 1),
+        'cement_kg': round(cement_kg, 1),
+        'cement_bags': round(cement_kg / mix['cement_bag_size_kg'], 2),
+        'gravel_kg': round(volume_m3 * mix['gravel_kg_per_m3'], 1),
+        'water_liters': round(volume_m3 * mix['water_liters_per_m3'], 1)
+    }
+
+
+def _covered_length(length, start, end, bottoms):
+    """Länge eines geraden Mauerstücks, auf der die Mauer über den Reihenunterkanten liegt"""
+    low = np.minimum(start, end)[:, None]
+    high = np.maximum(start, end)[:, None]
+    span = high - low
+    fraction = np.where(span > 0, (high - bottoms) / np.where(span > 0, span, 1.0), bottoms < high)
+    return length[:, None] * np.clip(fraction, 0.0, 1.0)
+
+
+def _lift_courses(settings: Dict) -> int:
+    """Reihen je Betonierabschnitt (mindestens eine)"""
+    lift_courses = int(settings['max_lift_courses'])
+    if lift_courses < 1:
+        raise ValueError("Ein Betonierabschnitt muss mindestens eine Reihe umfassen!")
+    return lift_courses
+
+
+def pour_arrays(
+    volume_m3,
+    segments: Sequence,
+    course_height_m,
+    settings: Optional[Dict] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Plant Reihen, Abschnitte, Chargen und Fahrmischer für viele Mauern
+
+    Args:
+        volume_m3: Betonvolumen inkl. Puffer je Mauer (Array)
+        segments: Gerade Mauerstücke je Mauer als (Länge, Anfangshöhe,
+            Endhöhe), jeweils Arrays; eine 2-Zonen-Mauer hat zwei Stücke,
+            ein leeres Stück hat Länge 0
+        course_height_m: Steinhöhe je Mauer (Array)
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        Dictionary mit Arrays: course_volume_m3 (Mauern × Reihen),
+        lift_volume_m3 (Mauern × Abschnitte), courses, lifts, batches und
+        truck_loads je Mauer
+    """
+    settings = settings or get_settings()
+    volume = np.atleast_1d(np.asarray(volume_m3, dtype=float))
+    course_height = np.broadcast_to(np.asarray(course_height_m, dtype=float), volume.shape)
+    segments = [tuple(np.broadcast_to(np.asarray(v, dtype=float), volume.shape) for v in segment)
+                for segment in segments]
+
+    # Reihenzahl je Mauer (wie get_stone_layout: höchste Stelle, aufgerundet)
+    top = np.max([np.maximum(start, end) * (length > 0) for length, start, end in segments], axis=0)
+    courses = np.ceil(top / course_height - _EPSILON).astype(int)
+
+    lift_courses = _lift_courses(settings)
+    max_lifts = int((-(-courses // lift_courses)).max(initial=0))
+
+    # Reihen × Mauern: bedeckte Länge je Reihe, Volumen anteilig verteilt
+    course_index = np.arange(max_lifts * lift_courses)
+    bottoms = course_index * course_height[:, None]
+    covered = sum(_covered_length(length, start, end, bottoms) for length, start, end in segments)
+    covered = np.where(course_index < courses[:, None], covered, 0.0)
+    totals = covered.sum(axis=1, keepdims=True)
+    course_volume = covered / np.where(totals > 0, totals, 1.0) * volume[:, None]
+    return lift_arrays(course_volume, courses, settings)
+
+
+def lift_arrays(course_volume_m3, courses, settings: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Fasst das Volumen je Reihe zu Abschnitten, Chargen und Fahrmischern zusammen
+
+    Args:
+        course_volume_m3: Volumen je Reihe (Mauern × Reihen, fehlende Reihen 0)
+        courses: Reihenzahl je Mauer (Array)
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        Dictionary wie pour_arrays()
+    """
+    settings = settings or get_settings()
+    lift_courses = _lift_courses(settings)
+    courses = np.asarray(courses, dtype=int)
+    lifts = -(-courses // lift_courses)
+    max_lifts = int(lifts.max(initial=0))
+
+    course_volume = np.asarray(course_volume_m3, dtype=float)
+    padded = np.zeros((course_volume.shape[0], max_lifts * lift_courses))
+    padded[:, :course_volume.shape[1]] = course_volume[:, :padded.shape[1]]
+    lift_volume = padded.reshape(course_volume.shape[0], max_lifts, lift_courses).sum(axis=2)
+
+    batch_m3 = settings['mixer_drum_liters'] * settings['mixer_fill_ratio'] / 1000
+    truck_m3 = settings['truck_capacity_m3']
+    return {
+        'course_volume_m3': padded[:, :int(courses.max(initial=0))],
+        'lift_volume_m3': lift_volume,
+        'courses': courses,
+        'lifts': lifts,
+        'batches': np.ceil(lift_volume / batch_m3 - _EPSILON).sum(axis=1).astype(int),
+        'truck_loads': np.ceil(lift_volume / truck_m3 - _EPSILON).sum(axis=1).astype(int)
+    }
+
+
+def _summary(volume_m3: float, lift_volumes: np.ndarray, courses: int, settings: Dict) -> Dict:
+    """Abschnitte mit Chargen und Fahrmischern (ein Abschnitt = ein Betoniertag)"""
+    batch_m3 = settings['mixer_drum_liters'] * settings['mixer_fill_ratio'] / 1000
+    truck_m3 = settings['truck_capacity_m3']
+    lift_courses = int(settings['max_lift_courses'])
+    batches = np.ceil(lift_volumes / batch_m3 - _EPSILON).astype(int).tolist()
+    trucks = np.ceil(lift_volumes / truck_m3 - _EPSILON).astype(int).tolist()
+
+    lifts = [
+        {
+            'lift': index + 1,
+            'first_course': index * lift_courses + 1,
+            'last_course': min((index + 1) * lift_courses, courses),
+            'volume_m3': round(volume, 3),
+            'batches': batch_count,
+            'truck_loads': truck_count
+        }
+        for index, (volume, batch_count, truck_count) in enumerate(zip(lift_volumes.tolist(), batches, trucks))
+        if volume > 0
+    ]
+    return {
+        'volume_m3': round(volume_m3, 3),
+        'lifts': lifts,
+        'batches': sum(batches),
+        'truck_loads': sum(trucks),
+        'batch_recipe': batch_recipe(settings),
+        'truck_capacity_m3': truck_m3,
+        'max_lift_courses': lift_courses
+    }
+
+
+def pour_plan(result: Dict, stone_type: str, settings: Optional[Dict] = None) -> Dict:
+    """
+    Betonierplan für das Ergebnis einer Mauer
+
+    Die Verteilung auf die Reihen folgt fill_with_buffer_m3 der Stückliste
+    (course_bom.iter_course_records(), Öffnungen abgezogen); skaliert wird
+    auf volume_with_buffer_m3, damit der Plan zu den Mengen der Mauer und
+    zu project_pour_plan() passt.
+
+    Args:
+        result: Ergebnis von calculate_all()
+        stone_type: Typ des Steins
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        Dictionary mit volume_m3, lifts (Liste je Abschnitt mit lift,
+        first_course, last_course, volume_m3, batches, truck_loads),
+        batches, truck_loads, batch_recipe, truck_capacity_m3 und
+        max_lift_courses
+    """
+    settings = settings or get_settings()
+    course_volume = course_fill_volumes(result['layout'], stone_type)
+    total = course_volume.sum()
+    volume = result['volume_with_buffer_m3']
+    course_volume = course_volume / total * volume if total > 0 else course_volume
+    arrays = lift_arrays(course_volume[None, :], [course_volume.size], settings)
+    return _summary(float(volume), arrays['lift_volume_m3'][0], course_volume.size, settings)
+
+
+def project_pour_plan(walls: Sequence[Dict], volumes_m3, settings: Optional[Dict] = None) -> Dict:
+    """
+    Betonierplan für ein Projekt (Abschnitt n aller Mauern an einem Tag)
+
+    Args:
+        walls: Parameter je Mauer wie für calculate_all()
+        volumes_m3: Betonvolumen inkl. Puffer je Mauer, z.B.
+            aggregate_walls(walls).per_wall['volume_with_buffer_m3']
+        settings: Parameter wie get_settings() (Standard: config.yaml)
+
+    Returns:
+        Wie pour_plan(), die Abschnitte summiert über alle Mauern;
+        zusätzlich per_wall (Arrays courses, lifts, batches, truck_loads
+        bei getrennter Planung je Mauer)
+    """
+    settings = settings or get_settings()
+    stone_types = get_config()['stone_types']
+
+    zone1, zone2 = [], []
+    for wall in walls:
+        zones = (wall.get('zone1_length'), wall.get('zone1_height'),
+                 wall.get('zone2_length'), wall.get('zone2_end_height'))
+        if wall.get('is_two_zone') and all(zones):
+            zone1_length, zone1_height, zone2_length, zone2_end_height = zones
+            zone1.append((zone1_length, zone1_height, zone1_height))
+            zone2.append((zone2_length, zone1_height, zone2_end_height))
+        else:
+            zone1.append((wall['length'], wall['start_height'], wall['end_height']))
+            zone2.append((0.0, 0.0, 0.0))
+
+    course_height = np.array([stone_types[wall['stone_type']]['height_cm'] / 100 for wall in walls])
+    arrays = pour_arrays(
+        volumes_m3,
+        [tuple(np.array(column, dtype=float) for column in zip(*zone)) for zone in (zone1, zone2)],
+        course_height,
+        settings
+    )
+
+    plan = _summary(float(np.sum(volumes_m3)), arrays['lift_volume_m3'].sum(axis=0),
+                    int(arrays['courses'].max()), settings)
+    plan['per_wall'] = {key: arrays[key] for key in ('courses', 'lifts', 'batches', 'truck_loads')}
+    return plan
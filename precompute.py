@@ -0,0 +1,348 @@
+"""
+Vorberechnete Antworten für Vorlagen und häufige Maße
+
+Beim Start und nach jedem Speichern der config.yaml werden für alle
+Vorlagen, die Sidebar-Standardwerte und ein Raster häufiger Längen/Höhen
+pro Steintyp die vollständigen Ergebnisse, Figures und der Text-Export
+im Hintergrund berechnet. Passende Anfragen werden direkt aus der
+Tabelle beantwortet.
+
+Die Tabelle ist an den Inhalts-Hash der Config gebunden, aus der sie
+berechnet wurde; nach einer Config-Änderung liefert sie nichts mehr, bis
+die neue Tabelle fertig ist. Die Figures hängen nur von der Geometrie ab
+und werden daher auch bei abweichenden Preisen wiederverwendet.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import plotly.graph_objects as go
+
+import config_store
+from calculations import calculate_all
+from config_store import ConfigSnapshot, config_version, pinned_config
+from pdf_export import create_text_report
+from visualization import create_2d_view, create_3d_view, create_top_view
+
+
+# Raster häufiger Maße (pro Steintyp, einfache Mauer ohne Gefälle)
+GRID_LENGTHS_M = [2.0, 5.0, 10.0, 15.0, 20.0]
+GRID_ROWS = [2, 4, 6, 8]
+
+# Nachkommastellen für den Schlüsselvergleich (Eingaben aus number_input)
+KEY_DECIMALS = 4
+
+GEOMETRY_PARAMS = (
+    'length', 'start_height', 'end_height', 'width', 'stone_type', 'is_two_zone',
+    'zone1_length', 'zone1_height', 'zone2_length', 'zone2_end_height'
+)
+PRICE_PARAMS = ('cement_price', 'gravel_price', 'stone_price', 'rebar_price')
+
+
+@dataclass(frozen=True)
+class WallFigures:
+    """Die drei Ansichten einer Mauer (nur von der Geometrie abhängig)"""
+
+    fig_2d: go.Figure
+    fig_3d: go.Figure
+    fig_top: go.Figure
+
+
+@dataclass(frozen=True)
+class PrecomputedEntry:
+    """Vollständige Antwort für eine Anfrage"""
+
+    result: Dict
+    figures: WallFigures
+    export_text: str
+
+
+@dataclass(frozen=True)
+class AnswerTable:
+    """Vorberechnete Antworten zu genau einem Config-Stand"""
+
+    config_hash: str
+    answers: Mapping[Tuple, PrecomputedEntry]
+    figures: Mapping[Tuple, WallFigures]
+    build_ms: float
+
+
+def _normalize(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return round(float(value), KEY_DECIMALS)
+    return value
+
+
+def geometry_key(params: Dict) -> Tuple:
+    """Schlüssel für die Figures (Maße, Steintyp, Zonen)"""
+    return tuple(_normalize(params.get(name)) for name in GEOMETRY_PARAMS)
+
+
+def request_key(params: Dict) -> Tuple:
+    """Schlüssel für die vollständige Antwort (Geometrie + Preise)"""
+    return geometry_key(params) + tuple(_normalize(params.get(name)) for name in PRICE_PARAMS)
+
+
+def _snap(height: float, stone_height_m: float) -> float:
+    """Rastet eine Höhe wie die Sidebar auf ganze Steinreihen ein"""
+    return round(float(height) / stone_height_m) * stone_height_m
+
+
+def common_requests(config: Mapping) -> List[Dict]:
+    """
+    Erstellt die vorzuberechnenden Anfragen
+
+    Vorlagen und Standardwerte werden so aufbereitet, wie die Sidebar sie
+    an calculate_all() übergibt (Höhen eingerastet, Breite des Steins,
+    Standardpreise), jeweils als einfache und als 2-Zonen-Mauer.
+
+    Args:
+        config: Konfiguration
+
+    Returns:
+        Liste von Parametern für calculate_all()
+    """
+    prices = {
+        'cement_price': float(config['prices']['cement_per_bag_eur']),
+        'gravel_price': float(config['prices']['gravel_per_ton_eur']),
+        'stone_price': float(config['prices']['stone_per_piece_eur']),
+        'rebar_price': float(config['reinforcement_steel']['price_per_6m_rod_eur'])
+    }
+    no_zones = {
+        'is_two_zone': False, 'zone1_length': None, 'zone1_height': None,
+        'zone2_length': None, 'zone2_end_height': None
+    }
+
+    default_stone = next(
+        (key for key, stone in config['stone_types'].items() if stone.get('default', False)),
+        next(iter(config['stone_types']))
+    )
+    defaults = config['defaults']
+    presets = [(defaults['wall_length_m'], defaults['wall_start_height_m'],
+                defaults['wall_end_height_m'], default_stone)]
+    presets += [
+        (t['wall_length_m'], t['wall_start_height_m'], t['wall_end_height_m'], t['stone_type'])
+        for t in config['templates'].values()
+    ]
+
+    requests = []
+    for length, start, end, stone_type in presets:
+        stone = config['stone_types'][stone_type]
+        stone_height_m = stone['height_cm'] / 100
+        start_height = _snap(start, stone_height_m)
+        end_height = _snap(end, stone_height_m)
+        base = dict(width=float(stone['width_cm']), stone_type=stone_type, **prices)
+
+        requests.append(dict(
+            base, length=float(length), start_height=start_height, end_height=end_height,
+            **no_zones
+        ))
+
+        zone_length = float(length) / 2
+        requests.append(dict(
+            base, length=zone_length + zone_length,
+            start_height=start_height, end_height=end_height,
+            is_two_zone=True, zone1_length=zone_length, zone1_height=start_height,
+            zone2_length=zone_length, zone2_end_height=end_height
+        ))
+
+    for stone_type, stone in config['stone_types'].items():
+        stone_height_m = stone['height_cm'] / 100
+        for length in GRID_LENGTHS_M:
+            for rows in GRID_ROWS:
+                height = rows * stone_height_m
+                requests.append(dict(
+                    length=length, start_height=height, end_height=height,
+                    width=float(stone['width_cm']), stone_type=stone_type,
+                    **prices, **no_zones
+                ))
+
+    return requests
+
+
+def build_table(snapshot: ConfigSnapshot, requests: Optional[List[Dict]] = None) -> AnswerTable:
+    """
+    Berechnet die Antworttabelle für einen Config-Stand
+
+    Args:
+        snapshot: Config-Stand, mit dem gerechnet wird
+        requests: Anfragen (Standard: common_requests() zum Stand)
+
+    Returns:
+        Neue AnswerTable
+    """
+    start = time.perf_counter_ns()
+    answers = {}
+    figures = {}
+
+    if requests is None:
+        requests = common_requests(snapshot.data)
+
+    with pinned_config(snapshot.content_hash):
+        for params in requests:
+            key = request_key(params)
+            if key in answers:
+                continue
+
+            result = calculate_all(**params)
+            if 'error' in result:
+                continue
+
+            geometry = geometry_key(params)
+            if geometry not in figures:
+                stone_width_m = params['width'] / 100
+                figures[geometry] = WallFigures(
+                    fig_2d=create_2d_view(result['layout'], stone_width_m),
+                    fig_3d=create_3d_view(result['layout'], stone_width_m),
+                    fig_top=create_top_view(result['layout'], stone_width_m)
+                )
+
+            answers[key] = PrecomputedEntry(
+                result=result,
+                figures=figures[geometry],
+                export_text=create_text_report(result, params)
+            )
+
+    return AnswerTable(
+        config_hash=snapshot.content_hash,
+        answers=MappingProxyType(answers),
+        figures=MappingProxyType(figures),
+        build_ms=(time.perf_counter_ns() - start) / 1e6
+    )
+
+
+# Aktuelle Tabelle (Austausch per Attributzuweisung, Lesen ist lock-frei)
+_table: Optional[AnswerTable] = None
+
+_state_lock = threading.Lock()
+_running = False
+_rerun = False
+_subscribed = False
+
+
+def warm_up(snapshot: Optional[ConfigSnapshot] = None) -> AnswerTable:
+    """
+    Berechnet die Tabelle für den (aktuellen) Config-Stand und tauscht sie aus
+
+    Args:
+        snapshot: Config-Stand (Standard: aktueller Stand)
+
+    Returns:
+        Die neue Tabelle
+    """
+    global _table
+    table = build_table(snapshot or config_store.get_snapshot())
+    _table = table
+    return table
+
+
+def _warm_up_loop():
+    global _running, _rerun
+    while True:
+        try:
+            warm_up()
+        finally:
+            with _state_lock:
+                if not _rerun:
+                    _running = False
+                    return
+                _rerun = False
+
+
+def schedule_warm_up():
+    """
+    Startet die Vorberechnung im Hintergrund
+
+    Läuft bereits eine, wird sie danach einmal mit dem dann aktuellen
+    Stand wiederholt.
+    """
+    global _running, _rerun
+    with _state_lock:
+        if _running:
+            _rerun = True
+            return
+        _running = True
+
+    threading.Thread(target=_warm_up_loop, name='precompute-warm-up', daemon=True).start()
+
+
+def _on_config_change(snapshot: ConfigSnapshot):
+    table = _table
+    if table is None or table.config_hash != snapshot.content_hash:
+        schedule_warm_up()
+
+
+def ensure_warm_up():
+    """
+    Sorgt dafür, dass eine aktuelle Tabelle existiert bzw. berechnet wird
+
+    Beim ersten Aufruf im Prozess wird zusätzlich der Config-Speicher
+    abonniert, damit jedes Speichern eine neue Vorberechnung auslöst.
+    """
+    global _subscribed
+    with _state_lock:
+        subscribe = not _subscribed
+        _subscribed = True
+    if subscribe:
+        config_store.default_store.subscribe(_on_config_change)
+
+    table = _table
+    if table is None or table.config_hash != config_version():
+        schedule_warm_up()
+
+
+def _current_table() -> Optional[AnswerTable]:
+    table = _table
+    if table is None or table.config_hash != config_version():
+        return None
+    return table
+
+
+def get_precomputed(params: Dict) -> Optional[PrecomputedEntry]:
+    """
+    Sucht eine vorberechnete Antwort
+
+    Args:
+        params: Parameter wie für calculate_all()
+
+    Returns:
+        PrecomputedEntry oder None (nicht vorberechnet bzw. Tabelle veraltet)
+    """
+    table = _current_table()
+    # Mauern mit Öffnungen werden nie vorberechnet
+    if table is None or params.get('openings'):
+        return None
+    return table.answers.get(request_key(params))
+
+
+def get_figures(params: Dict) -> Optional[WallFigures]:
+    """
+    Sucht vorberechnete Figures für dieselbe Geometrie (Preise egal)
+
+    Args:
+        params: Parameter wie für calculate_all()
+
+    Returns:
+        WallFigures oder None
+    """
+    table = _current_table()
+    if table is None or params.get('openings'):
+        return None
+    return table.figures.get(geometry_key(params))
+
+
+def table_info() -> Dict:
+    """Kennzahlen der aktuellen Tabelle (für das Debug-Panel)"""
+    table = _table
+    if table is None:
+        return {'answers': 0, 'figures': 0, 'config_hash': None, 'build_ms': None, 'current': False}
+    return {
+        'answers': len(table.answers),
+        'figures': len(table.figures),
+        'config_hash': table.config_hash,
+        'build_ms': round(table.build_ms, 1),
+        'current': table.config_hash == config_version()
+    }
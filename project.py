@@ -0,0 +1,391 @@
+"""
+Projekte aus mehreren Mauern
+
+calculate_all() rundet Zementsäcke, Kies (0,1 t) und 6m-Stäbe pro Mauer.
+Werden die Einzelergebnisse addiert, wird bei vielen kleinen Mauern pro
+Mauer bis zu ein Sack und ein Stab zu viel bestellt. Ein Projekt summiert
+deshalb die ungerundeten Mengen aller Mauern (Array-Akkumulation über
+batch_calculations.py) und rundet erst die Projektsumme. Die Anteile der
+einzelnen Mauern bleiben für Berichte erhalten.
+"""
+
+import csv
+import io
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_calculations import batch_quantities, stone_arrays
+from calculations import (
+    calculate_costs, get_stone_layout, get_two_zone_layout, validate_inputs, validate_openings
+)
+from config_store import get_config, consistent_config
+from openings import interrupted_rebar_length, rebar_runs
+from rebar_cutting import cutting_plan
+from stone_layout import stone_cuts
+
+
+# Mengen, die ungerundet summiert und erst im Projekt gerundet werden
+RAW_QUANTITIES = (
+    'base_volume_m3', 'volume_with_buffer_m3', 'cement_kg', 'gravel_kg',
+    'water_liters', 'rebar_length_m'
+)
+
+# Je Mauer gerundete Mengen (Vergleich "Summe der Einzelmauern")
+ROUNDED_QUANTITIES = ('stones', 'cement_bags', 'gravel_tons', 'rods_6m')
+
+# Preise, die für das ganze Projekt gelten
+PROJECT_PRICES = ('cement_price', 'gravel_price', 'stone_price', 'rebar_price')
+
+
+@dataclass(frozen=True)
+class ProjectResult:
+    """Mengen und Kosten eines Projekts"""
+
+    names: Tuple[str, ...]
+    # Werte je Mauer (Arrays in der Reihenfolge von names)
+    per_wall: Dict[str, np.ndarray]
+    # Projektsumme, erst nach dem Summieren gerundet
+    totals: Dict[str, float]
+    # Summe der je Mauer gerundeten Mengen (wie addierte Einzelergebnisse)
+    standalone_totals: Dict[str, float]
+    stones_by_type: Dict[str, int]
+    costs: Optional[Dict[str, float]] = None
+    # Öffnungen je Mauerindex (nur Mauern mit Öffnungen), für den Schnittplan
+    openings: Dict[int, Tuple[Dict, ...]] = field(default_factory=dict)
+
+    @property
+    def savings(self) -> Dict[str, float]:
+        """Weniger bestellte Säcke, Tonnen und Stäbe gegenüber Einzelmauern"""
+        return {
+            key: round(self.standalone_totals[key] - self.totals[key], 1)
+            for key in ('cement_bags', 'gravel_tons', 'rods_6m')
+        }
+
+
+def _wall_geometry_arrays(walls: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """Geometrie wie wall_geometry(), gemischt aus einfachen und 2-Zonen-Mauern"""
+    area1, area2, rows_height1, rows_height2, lengths, max_heights = [], [], [], [], [], []
+    for wall in walls:
+        length, start, end = wall['length'], wall['start_height'], wall['end_height']
+        zones = (wall.get('zone1_length'), wall.get('zone1_height'),
+                 wall.get('zone2_length'), wall.get('zone2_end_height'))
+        if wall.get('is_two_zone') and all(zones):
+            zone1_length, zone1_height, zone2_length, zone2_end_height = zones
+            area1.append(zone1_length * zone1_height)
+            area2.append(zone2_length * ((zone1_height + zone2_end_height) / 2))
+            rows_height1.append(zone1_height)
+            rows_height2.append(max(zone1_height, zone2_end_height))
+        else:
+            avg_height = (start + end) / 2
+            area1.append(length * avg_height)
+            # Leere Zone 2: keine Steine, keine Reihen
+            area2.append(0.0)
+            rows_height1.append(avg_height)
+            rows_height2.append(0.0)
+        lengths.append(length)
+        max_heights.append(max(start, end))
+
+    return {
+        'area1': np.array(area1, dtype=float),
+        'area2': np.array(area2, dtype=float),
+        'rows_height1': np.array(rows_height1, dtype=float),
+        'rows_height2': np.array(rows_height2, dtype=float),
+        'length': np.array(lengths, dtype=float),
+        'max_height': np.array(max_heights, dtype=float)
+    }
+
+
+def _wall_layout(wall: Dict) -> Dict:
+    """Layout einer Mauer wie in calculate_all() (einfach oder 2 Zonen)"""
+    zones = (wall.get('zone1_length'), wall.get('zone1_height'),
+             wall.get('zone2_length'), wall.get('zone2_end_height'))
+    if wall.get('is_two_zone') and all(zones):
+        return get_two_zone_layout(wall['length'], wall['start_height'], wall['end_height'],
+                                   wall['stone_type'], *zones)
+    return get_stone_layout(wall['length'], wall['start_height'], wall['end_height'], wall['stone_type'])
+
+
+def _opening_deductions(
+    walls: Sequence[Dict],
+    names: Sequence[str],
+    rows: np.ndarray,
+    openings: Dict[int, Tuple[Dict, ...]]
+) -> Dict[str, np.ndarray]:
+    """
+    Abzüge für Öffnungen je Mauer wie in calculate_all()
+
+    Args:
+        walls: Parameter je Mauer
+        names: Bezeichnung je Mauer (für Fehlermeldungen)
+        rows: Reihen je Mauer (für die unterbrochene Bewehrung)
+        openings: Öffnungen je Mauerindex (nur Mauern mit Öffnungen)
+
+    Returns:
+        Arrays removed_stones, opening_stone_share und interrupted_length
+        (0 für Mauern ohne Öffnungen)
+
+    Raises:
+        ValueError: bei ungültiger Öffnung
+    """
+    deductions = {key: np.zeros(len(walls)) for key in ('removed_stones', 'opening_stone_share', 'interrupted_length')}
+    for index, wall_openings in openings.items():
+        layout = _wall_layout(walls[index])
+        is_valid, error = validate_openings(wall_openings, layout)
+        if not is_valid:
+            raise ValueError(f"{names[index]}: {error}")
+        layout['openings'] = list(wall_openings)
+        cuts = stone_cuts(layout)
+        deductions['removed_stones'][index] = cuts['removed_stones']
+        deductions['opening_stone_share'][index] = cuts['opening_stone_share']
+        deductions['interrupted_length'][index] = interrupted_rebar_length(
+            wall_openings, layout['stone_height_m'], int(rows[index])
+        )
+    return deductions
+
+
+@consistent_config
+def aggregate_walls(
+    walls: Sequence[Dict],
+    cement_price: Optional[float] = None,
+    gravel_price: Optional[float] = None,
+    stone_price: Optional[float] = None,
+    rebar_price: Optional[float] = None
+) -> ProjectResult:
+    """
+    Berechnet ein Projekt aus beliebig vielen Mauern
+
+    Steine werden je Mauer aufgerundet (ein Stein gehört zu genau einer
+    Mauer), Öffnungen wie in calculate_all() abgezogen; Beton, Zement,
+    Kies, Wasser und Bewehrungslänge werden ungerundet summiert und erst
+    für das Projekt auf Säcke, 0,1 t und ganze Stäbe aufgerundet.
+
+    Args:
+        walls: Parameter je Mauer wie für calculate_all() (auch 'openings'),
+            optional mit 'name'
+        cement_price, gravel_price, stone_price, rebar_price: Projektpreise
+            (Kosten nur, wenn Zement- und Kiespreis angegeben sind)
+
+    Returns:
+        ProjectResult
+
+    Raises:
+        ValueError: bei leerem Projekt, ungültiger Mauer oder Öffnung
+    """
+    if not walls:
+        raise ValueError("Projekt enthält keine Mauern!")
+
+    config = get_config()
+    mix = config['concrete_mix']
+    rebar = config['reinforcement_steel']
+    stones = stone_arrays()
+    type_index = {key: index for index, key in enumerate(stones.keys)}
+
+    names = []
+    for number, wall in enumerate(walls, start=1):
+        name = wall.get('name') or f"Mauer {number}"
+        is_valid, error = validate_inputs(
+            wall['length'], wall['start_height'], wall['end_height'], wall['width'], wall['stone_type']
+        )
+        if not is_valid:
+            raise ValueError(f"{name}: {error}")
+        names.append(name)
+
+    types = np.array([type_index[wall['stone_type']] for wall in walls])
+    geometry = _wall_geometry_arrays(walls)
+    height_m = stones.height_m[types]
+    # Reihen wie in batch_quantities() (leere Zone 2 ergibt 0 Reihen)
+    rows = np.maximum(np.ceil(geometry['rows_height1'] / height_m), np.ceil(geometry['rows_height2'] / height_m))
+    openings = {
+        index: tuple(dict(opening) for opening in wall['openings'])
+        for index, wall in enumerate(walls) if wall.get('openings')
+    }
+    quantities = batch_quantities(
+        geometry, stones.stones_per_m2[types], stones.fill_liters[types], height_m,
+        **_opening_deductions(walls, names, rows, openings)
+    )
+
+    per_wall = {key: quantities[key] for key in RAW_QUANTITIES + ROUNDED_QUANTITIES}
+    per_wall['length'] = np.array([wall['length'] for wall in walls], dtype=float)
+    per_wall['rows'] = quantities['rows']
+    per_wall['stone_height_m'] = height_m
+    raw = {key: float(per_wall[key].sum()) for key in RAW_QUANTITIES}
+    total_stones = int(per_wall['stones'].sum())
+
+    # Erst die Projektsumme runden (wie calculate_materials / calculate_reinforcement)
+    totals = dict(raw)
+    totals['stones'] = total_stones
+    totals['cement_bags'] = int(np.ceil(raw['cement_kg'] / mix['cement_bag_size_kg']))
+    totals['gravel_tons'] = float(np.ceil(raw['gravel_kg'] / 100) / 10)
+    totals['rods_6m'] = int(np.ceil(raw['rebar_length_m'] / rebar['rod_length_m']))
+
+    standalone_totals = {key: int(per_wall[key].sum()) for key in ('stones', 'cement_bags', 'rods_6m')}
+    standalone_totals['gravel_tons'] = round(float(per_wall['gravel_tons'].sum()), 1)
+
+    # Anteile der Mauern an den gemeinsam gerundeten Mengen
+    for share_key, raw_key, total_key in (
+        ('cement_bags_share', 'cement_kg', 'cement_bags'),
+        ('gravel_tons_share', 'gravel_kg', 'gravel_tons'),
+        ('rods_6m_share', 'rebar_length_m', 'rods_6m')
+    ):
+        denominator = raw[raw_key]
+        if denominator > 0:
+            per_wall[share_key] = per_wall[raw_key] / denominator * totals[total_key]
+        else:
+            per_wall[share_key] = np.zeros(len(walls))
+
+    stones_by_type = {
+        key: int(count)
+        for key, count in zip(stones.keys, np.bincount(types, weights=per_wall['stones'], minlength=len(stones.keys)))
+        if count > 0
+    }
+
+    costs = None
+    if cement_price is not None and gravel_price is not None:
+        if rebar_price is None:
+            rebar_price = rebar['price_per_6m_rod_eur']
+        stone_price = stone_price if stone_price is not None else 0.0
+        costs = calculate_costs(
+            totals, cement_price, gravel_price,
+            stone_count=total_stones,
+            stone_price=stone_price,
+            reinforcement_cost=round(totals['rods_6m'] * rebar_price, 2)
+        )
+        # Kosten je Mauer: eigene Steine plus Anteil an Säcken, Kies und Stäben
+        per_wall['cost_share'] = (
+            per_wall['stones'] * stone_price * 1.19
+            + per_wall['cement_bags_share'] * cement_price
+            + per_wall['gravel_tons_share'] * gravel_price
+            + per_wall['rods_6m_share'] * rebar_price
+        )
+
+    return ProjectResult(
+        names=tuple(names),
+        per_wall=per_wall,
+        totals=totals,
+        standalone_totals=standalone_totals,
+        stones_by_type=stones_by_type,
+        costs=costs,
+        openings=openings
+    )
+
+
+@dataclass
+class Project:
+    """Sammlung von Mauern, die gemeinsam bestellt werden"""
+
+    name: str = "Projekt"
+    walls: List[Dict] = field(default_factory=list)
+
+    def add_wall(self, params: Dict, name: Optional[str] = None) -> None:
+        """
+        Fügt eine Mauer hinzu
+
+        Args:
+            params: Parameter wie für calculate_all()
+            name: Bezeichnung für Berichte (Standard: "Mauer <n>")
+
+        Raises:
+            ValueError: bei ungültigen Maßen
+        """
+        wall = dict(params)
+        wall['name'] = name or wall.get('name') or f"Mauer {len(self.walls) + 1}"
+        is_valid, error = validate_inputs(
+            wall['length'], wall['start_height'], wall['end_height'], wall['width'], wall['stone_type']
+        )
+        if not is_valid:
+            raise ValueError(f"{wall['name']}: {error}")
+        self.walls.append(wall)
+
+    def aggregate(self, **prices) -> ProjectResult:
+        """Berechnet das Projekt (Preise wie aggregate_walls())"""
+        return aggregate_walls(self.walls, **prices)
+
+
+def project_cutting_plan(result: ProjectResult, **settings) -> Dict:
+    """
+    Gemeinsamer Schnittplan für die Bewehrung aller Mauern
+
+    Reststücke aller Mauern werden zusammen auf Lagerstäbe verteilt; an
+    Öffnungen werden die Stränge getrennt (wie reinforcement_plan()).
+
+    Args:
+        result: Ergebnis von aggregate_walls()
+        **settings: stock_length_m, lap_length_m, min_offcut_m (wie cutting_plan())
+
+    Returns:
+        Ergebnis von cutting_plan()
+    """
+    wall = result.per_wall
+    rods_per_row = get_config()['reinforcement_steel']['rods_per_row']
+    needs_rebar = wall['rebar_length_m'] > 0
+    plain = needs_rebar.copy()
+    plain[list(result.openings)] = False
+
+    lengths = [wall['length'][plain]]
+    runs = [wall['rows'][plain].astype(int) * rods_per_row]
+    for index in np.flatnonzero(needs_rebar & ~plain):
+        run_lengths, courses = rebar_runs(result.openings[index], wall['stone_height_m'][index],
+                                          int(wall['rows'][index]), wall['length'][index])
+        lengths.append(run_lengths)
+        runs.append(courses * rods_per_row)
+    return cutting_plan(np.concatenate(lengths), np.concatenate(runs).astype(int), **settings)
+
+
+def project_rows(result: ProjectResult) -> List[Dict]:
+    """
+    Zeilen je Mauer für Tabellen und Berichte
+
+    Args:
+        result: Ergebnis von aggregate_walls()
+
+    Returns:
+        Liste von Zeilen (eine je Mauer) mit Steinen, Beton und den
+        Anteilen an Säcken, Kies, Stäben und Kosten
+    """
+    wall = result.per_wall
+    rows = []
+    for index, name in enumerate(result.names):
+        row = {
+            'Mauer': name,
+            'Steine': int(wall['stones'][index]),
+            'Beton (m³)': round(float(wall['volume_with_buffer_m3'][index]), 3),
+            'Zement (Säcke, Anteil)': round(float(wall['cement_bags_share'][index]), 2),
+            'Kies (t, Anteil)': round(float(wall['gravel_tons_share'][index]), 2),
+            'Bewehrung (Stäbe, Anteil)': round(float(wall['rods_6m_share'][index]), 2)
+        }
+        if 'cost_share' in wall:
+            row['Kosten (€, Anteil)'] = round(float(wall['cost_share'][index]), 2)
+        rows.append(row)
+    return rows
+
+
+def project_to_csv(result: ProjectResult) -> str:
+    """
+    Exportiert die Mauer-Zeilen und die Projektsumme als CSV
+
+    Args:
+        result: Ergebnis von aggregate_walls()
+
+    Returns:
+        CSV-Text (eine Zeile je Mauer, letzte Zeile = Projekt)
+    """
+    rows = project_rows(result)
+    totals = {
+        'Mauer': 'Projekt gesamt',
+        'Steine': result.totals['stones'],
+        'Beton (m³)': round(result.totals['volume_with_buffer_m3'], 3),
+        'Zement (Säcke, Anteil)': result.totals['cement_bags'],
+        'Kies (t, Anteil)': result.totals['gravel_tons'],
+        'Bewehrung (Stäbe, Anteil)': result.totals['rods_6m']
+    }
+    if result.costs:
+        totals['Kosten (€, Anteil)'] = result.costs['total_cost']
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    writer.writerow(totals)
+    return buffer.getvalue()
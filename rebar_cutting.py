@@ -0,0 +1,240 @@
+"""
+Schnittplan für Bewehrungsstäbe (6m Lagerlänge)
+
+Jede Lage bekommt rods_per_row durchgehende Stäbe über die Mauerlänge.
+Ist die Mauer länger als ein Stab, werden Stäbe mit Übergreifungslänge
+(Stoß) aneinandergereiht: ganze Stäbe plus ein Reststück. Die Reststücke
+werden mit Best-Fit-Decreasing auf Lagerstäbe verteilt; Verschnitt unter
+der Mindestlänge gilt als Schrott, längere Reste als wiederverwendbar.
+
+Gerechnet wird in ganzen Millimetern. Gleich lange Stücke werden
+zusammengefasst und neue Stäbe blockweise belegt, offene Reststäbe
+liegen in einer sortierten Liste (bisect), so dass auch Projekte mit
+zehntausenden Schnitten schnell geplant werden.
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config_store import get_config
+from openings import rebar_runs
+
+
+def _settings(
+    stock_length_m: Optional[float],
+    lap_length_m: Optional[float],
+    min_offcut_m: Optional[float]
+) -> Tuple[int, int, int]:
+    """Lagerlänge, Stoß und Mindestrest in mm (fehlende Werte aus config.yaml)"""
+    rebar = get_config()['reinforcement_steel']
+    stock = rebar['rod_length_m'] if stock_length_m is None else stock_length_m
+    lap = rebar.get('lap_length_m', 0.0) if lap_length_m is None else lap_length_m
+    min_offcut = rebar.get('min_offcut_m', 0.0) if min_offcut_m is None else min_offcut_m
+
+    stock_mm, lap_mm = int(round(stock * 1000)), int(round(lap * 1000))
+    if lap_mm >= stock_mm:
+        raise ValueError("Übergreifungslänge muss kürzer als die Stablänge sein!")
+    return stock_mm, lap_mm, int(round(min_offcut * 1000))
+
+
+def split_runs(
+    run_lengths_mm,
+    run_counts,
+    stock_mm: int,
+    lap_mm: int
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Zerlegt durchgehende Stäbe in ganze Lagerstäbe und Reststücke
+
+    Ein Strang der Länge L > Lagerlänge braucht n = ⌈(L - Stoß) / (Lager - Stoß)⌉
+    Stücke: n - 1 ganze Stäbe und ein Reststück L - (n - 1) · (Lager - Stoß).
+
+    Args:
+        run_lengths_mm: Länge je Strang in mm (Array)
+        run_counts: Anzahl Stränge dieser Länge (Array)
+        stock_mm: Lagerlänge in mm
+        lap_mm: Übergreifungslänge in mm
+
+    Returns:
+        (ganze Stäbe, Reststück-Längen, Anzahl je Länge); jeder ganze Stab
+        endet in einem Stoß
+    """
+    lengths = np.asarray(run_lengths_mm, dtype=np.int64)
+    counts = np.asarray(run_counts, dtype=np.int64)
+    step = stock_mm - lap_mm
+
+    full = np.where(lengths > stock_mm, -(-(lengths - lap_mm) // step) - 1, 0)
+    remainder = lengths - full * step
+
+    pieces, inverse = np.unique(remainder, return_inverse=True)
+    piece_counts = np.bincount(inverse.ravel(), weights=counts, minlength=pieces.size).astype(np.int64)
+    keep = (pieces > 0) & (piece_counts > 0)
+    return int((full * counts).sum()), pieces[keep], piece_counts[keep]
+
+
+def pack_pieces(
+    lengths_mm: Sequence[int],
+    counts: Sequence[int],
+    stock_mm: int,
+    min_offcut_mm: int = 0
+) -> Tuple[Counter, Counter]:
+    """
+    Verteilt Stücke mit Best-Fit-Decreasing auf Lagerstäbe
+
+    Args:
+        lengths_mm: Stücklängen in mm
+        counts: Anzahl je Stücklänge
+        stock_mm: Lagerlänge in mm
+        min_offcut_mm: Kürzere Reste sind Schrott und werden nicht mehr belegt
+
+    Returns:
+        (belegte Stäbe, Stäbe mit wiederverwendbarem Rest); jeweils
+        Counter Schnittmuster (Tupel der Stücklängen) → Anzahl Stäbe
+    """
+    capacities: List[int] = []          # sortierte Restlängen offener Stäbe
+    open_rods: Dict[int, Counter] = {}  # Restlänge → Schnittmuster → Anzahl
+    closed: Counter = Counter()
+
+    def add(capacity: int, pattern: Tuple[int, ...], count: int):
+        if capacity < min_offcut_mm or capacity == 0:
+            closed[pattern] += count
+            return
+        bucket = open_rods.get(capacity)
+        if bucket is None:
+            insort(capacities, capacity)
+            bucket = open_rods[capacity] = Counter()
+        bucket[pattern] += count
+
+    def take(capacity: int) -> Tuple[int, ...]:
+        bucket = open_rods[capacity]
+        pattern = next(iter(bucket))
+        bucket[pattern] -= 1
+        if not bucket[pattern]:
+            del bucket[pattern]
+        if not bucket:
+            del open_rods[capacity]
+            capacities.pop(bisect_left(capacities, capacity))
+        return pattern
+
+    for length, count in sorted(zip(lengths_mm, counts), reverse=True):
+        length, remaining = int(length), int(count)
+        if length > stock_mm:
+            raise ValueError(f"Stück länger als Lagerstab: {length} mm")
+
+        # Zuerst in den kleinsten passenden Rest legen
+        while remaining:
+            index = bisect_left(capacities, length)
+            if index == len(capacities):
+                break
+            capacity = capacities[index]
+            add(capacity - length, take(capacity) + (length,), 1)
+            remaining -= 1
+
+        # Neue Stäbe blockweise mit gleich langen Stücken füllen
+        if remaining:
+            per_rod = stock_mm // length
+            full_rods, rest = divmod(remaining, per_rod)
+            if full_rods:
+                add(stock_mm - per_rod * length, (length,) * per_rod, full_rods)
+            if rest:
+                add(stock_mm - rest * length, (length,) * rest, 1)
+
+    reusable = Counter()
+    for bucket in open_rods.values():
+        reusable.update(bucket)
+    return closed, reusable
+
+
+def cutting_plan(
+    run_lengths_m,
+    run_counts,
+    stock_length_m: Optional[float] = None,
+    lap_length_m: Optional[float] = None,
+    min_offcut_m: Optional[float] = None
+) -> Dict:
+    """
+    Berechnet den Schnittplan für durchgehende Bewehrungsstränge
+
+    Args:
+        run_lengths_m: Länge je Strang in Metern (Skalar oder Array)
+        run_counts: Anzahl Stränge je Länge (z.B. Lagen × Stäbe pro Lage)
+        stock_length_m, lap_length_m, min_offcut_m: Lagerlänge, Stoß und
+            Mindestlänge wiederverwendbarer Reste (Standard: config.yaml)
+
+    Returns:
+        Dictionary mit rods_needed, cut_list (Länge → Anzahl), patterns
+        (Schnittmuster je Stab), laps, cut_length_m, waste_m, scrap_m,
+        reusable_offcut_m und waste_percentage
+    """
+    stock_mm, lap_mm, min_offcut_mm = _settings(stock_length_m, lap_length_m, min_offcut_m)
+
+    # Eine Mauer (Skalare) läuft als Arrays mit einem Element durch dieselben Schritte
+    run_lengths_mm = np.rint(np.atleast_1d(np.asarray(run_lengths_m, dtype=float)) * 1000).astype(np.int64)
+    run_counts = np.broadcast_to(np.asarray(run_counts, dtype=np.int64), run_lengths_mm.shape)
+    full_rods, lengths, counts = split_runs(run_lengths_mm, run_counts, stock_mm, lap_mm)
+    closed, reusable = pack_pieces(lengths.tolist(), counts.tolist(), stock_mm, min_offcut_mm)
+    cut_list = Counter(dict(zip(lengths.tolist(), counts.tolist())))
+    cut_list[stock_mm] += full_rods
+
+    if full_rods:
+        closed[(stock_mm,)] += full_rods
+
+    patterns = []
+    rods_needed = reusable_mm = 0
+    for pattern_counter, is_reusable in ((closed, False), (reusable, True)):
+        for pattern, count in pattern_counter.items():
+            offcut = stock_mm - sum(pattern)
+            rods_needed += count
+            if is_reusable:
+                reusable_mm += offcut * count
+            patterns.append({
+                'cuts_m': [length / 1000 for length in pattern],
+                'offcut_m': offcut / 1000,
+                'reusable_offcut': is_reusable,
+                'count': count
+            })
+    patterns.sort(key=lambda p: (-p['count'], p['offcut_m']))
+
+    cut_length_mm = sum(length * count for length, count in cut_list.items())
+    waste_mm = rods_needed * stock_mm - cut_length_mm
+
+    return {
+        'rods_needed': rods_needed,
+        'stock_length_m': stock_mm / 1000,
+        'lap_length_m': lap_mm / 1000,
+        'laps': full_rods,
+        'cut_list': [
+            {'length_m': length / 1000, 'count': count}
+            for length, count in sorted(cut_list.items(), reverse=True) if count
+        ],
+        'patterns': patterns,
+        'cut_length_m': round(cut_length_mm / 1000, 3),
+        'waste_m': round(waste_mm / 1000, 3),
+        'scrap_m': round((waste_mm - reusable_mm) / 1000, 3),
+        'reusable_offcut_m': round(reusable_mm / 1000, 3),
+        'waste_percentage': round(waste_mm / (rods_needed * stock_mm) * 100, 1) if rods_needed else 0.0
+    }
+
+
+def reinforcement_plan(reinforcement: Dict, layout: Optional[Dict] = None) -> Dict:
+    """
+    Schnittplan für das Bewehrungsergebnis einer Mauer
+
+    Args:
+        reinforcement: result['reinforcement'] aus calculate_all()
+        layout: result['layout'] aus calculate_all(); Stränge werden an
+            Öffnungen (layout['openings']) getrennt
+
+    Returns:
+        Ergebnis von cutting_plan() (Stränge über die Mauerlänge je Lage)
+    """
+    openings = layout.get('openings') if layout else None
+    if not openings:
+        return cutting_plan(reinforcement['wall_length_m'], reinforcement['total_rods_needed'])
+
+    lengths, courses = rebar_runs(openings, layout['stone_height_m'], reinforcement['rows'],
+                                  reinforcement['wall_length_m'])
+    return cutting_plan(lengths, courses * reinforcement['rods_per_row'])
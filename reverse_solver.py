@@ -0,0 +1,204 @@
+"""
+Rückwärtsrechnung: größte Mauer für Budget, Betonmenge oder Steinanzahl
+
+Die Mengen von calculate_all() wachsen mit Länge und Höhe monoton, aber in
+Stufen (aufgerundete Steine, Säcke, 0,1 t Kies, 6m-Stäbe). Gesucht wird
+deshalb auf einem Raster (1 cm Länge bzw. ganze Steinreihen) der größte
+Wert, dessen Mengen das Ziel nicht überschreiten. Die Suche teilt das
+Intervall je Schritt in SEARCH_POINTS Teile und wertet alle Teilungspunkte
+und alle Zielwerte in einem Aufruf der vektorisierten Mengenberechnung aus
+(mehrstufige Bisektion); 100 m auf 1 cm genau brauchen so drei Schritte.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from batch_calculations import batch_quantities, batch_total_cost, stone_arrays, wall_geometry
+from config_store import get_config, consistent_config
+
+
+# Zielgrößen: Schlüssel → Bezeichnung
+TARGETS = {
+    'cost': 'Budget (€)',
+    'volume': 'Beton (m³)',
+    'stones': 'Schalsteine (St.)'
+}
+
+# Raster der Länge (1 cm) und Suchbereich wie in der Sidebar
+LENGTH_STEP_M = 0.01
+MAX_LENGTH_M = 100.0
+MAX_HEIGHT_M = 5.0
+
+# Teilungspunkte je Suchschritt
+SEARCH_POINTS = 64
+
+
+def _search(evaluate, targets: np.ndarray, upper: int) -> np.ndarray:
+    """
+    Größter Rasterpunkt n in [0, upper] mit evaluate(n) <= Ziel, je Ziel
+
+    Args:
+        evaluate: Funktion Rasterpunkte (Ziele × Punkte) → Menge (Ziele × Punkte)
+        targets: Zielwerte (Array)
+        upper: Größter Rasterpunkt
+
+    Returns:
+        Array der Rasterpunkte (0, wenn schon der erste Punkt zu groß ist)
+    """
+    low = np.zeros(targets.shape, dtype=np.int64)       # erfüllt (n = 0: keine Mauer)
+    high = np.full(targets.shape, upper + 1, dtype=np.int64)  # überschreitet
+    fractions = np.arange(1, SEARCH_POINTS) / SEARCH_POINTS
+
+    while (high - low > 1).any():
+        points = low[:, None] + np.maximum(((high - low)[:, None] * fractions).astype(np.int64), 1)
+        points = np.minimum(points, high[:, None] - 1)
+        points = np.maximum(points, low[:, None])
+        fits = evaluate(points) <= targets[:, None]
+        # Neue Grenzen: letzter passender und erster zu großer Punkt
+        low = np.where(fits, points, low[:, None]).max(axis=1)
+        high = np.where(~fits, points, high[:, None]).min(axis=1)
+    return low
+
+
+def _quantity(target: str, quantities: Dict[str, np.ndarray], prices: Dict) -> np.ndarray:
+    """Zielgröße aus den Mengen (Kosten wie calculate_all())"""
+    if target == 'cost':
+        return batch_total_cost(quantities, prices['cement_price'], prices['gravel_price'],
+                                prices['stone_price'], prices['rebar_price'])
+    if target == 'volume':
+        return quantities['volume_with_buffer_m3']
+    return quantities['stones']
+
+
+def _prices(cement_price, gravel_price, stone_price, rebar_price) -> Dict[str, float]:
+    """Preise, fehlende Werte aus config.yaml"""
+    config = get_config()
+    return {
+        'cement_price': config['prices']['cement_per_bag_eur'] if cement_price is None else cement_price,
+        'gravel_price': config['prices']['gravel_per_ton_eur'] if gravel_price is None else gravel_price,
+        'stone_price': config['prices']['stone_per_piece_eur'] if stone_price is None else stone_price,
+        'rebar_price': config['reinforcement_steel']['price_per_6m_rod_eur'] if rebar_price is None else rebar_price
+    }
+
+
+def _check_target(target: str) -> None:
+    if target not in TARGETS:
+        raise ValueError(f"Ungültige Zielgröße: {target}")
+
+
+@consistent_config
+def solve_length(
+    target: str,
+    value,
+    start_height: float,
+    end_height: float,
+    stone_type: str,
+    cement_price: Optional[float] = None,
+    gravel_price: Optional[float] = None,
+    stone_price: Optional[float] = None,
+    rebar_price: Optional[float] = None,
+    max_length: float = MAX_LENGTH_M
+) -> Dict:
+    """
+    Größte Mauerlänge bei gegebenen Höhen
+
+    Args:
+        target: 'cost', 'volume' oder 'stones' (siehe TARGETS)
+        value: Zielwert (Skalar oder Array für mehrere Ziele)
+        start_height, end_height: Höhen in Metern
+        stone_type: Typ des Steins
+        cement_price, gravel_price, stone_price, rebar_price: Preise für
+            target='cost' (Standard: config.yaml)
+        max_length: Obergrenze der Suche in Metern
+
+    Returns:
+        Dictionary mit length (0, wenn schon 1 cm zu viel ist), value
+        (erreichte Zielgröße) und at_limit (Obergrenze erreicht); Arrays,
+        wenn value ein Array ist
+
+    Raises:
+        ValueError: bei ungültiger Zielgröße oder Höhe
+    """
+    _check_target(target)
+    if start_height <= 0 or end_height <= 0:
+        raise ValueError("Höhen müssen größer als 0 sein!")
+
+    stones = stone_arrays([stone_type])
+    prices = _prices(cement_price, gravel_price, stone_price, rebar_price)
+    targets = np.atleast_1d(np.asarray(value, dtype=float))
+    upper = int(round(max_length / LENGTH_STEP_M))
+
+    def evaluate(steps):
+        geometry = wall_geometry(steps * LENGTH_STEP_M, start_height, end_height)
+        quantities = batch_quantities(geometry, stones.stones_per_m2[0], stones.fill_liters[0], stones.height_m[0])
+        return _quantity(target, quantities, prices)
+
+    steps = _search(evaluate, targets, upper)
+    return _solution('length', steps, steps * LENGTH_STEP_M, evaluate, upper, np.ndim(value))
+
+
+@consistent_config
+def solve_height(
+    target: str,
+    value,
+    length: float,
+    stone_type: str,
+    cement_price: Optional[float] = None,
+    gravel_price: Optional[float] = None,
+    stone_price: Optional[float] = None,
+    rebar_price: Optional[float] = None,
+    max_height: float = MAX_HEIGHT_M
+) -> Dict:
+    """
+    Größte Höhe (ganze Steinreihen, ohne Gefälle) bei gegebener Länge
+
+    Args:
+        target: 'cost', 'volume' oder 'stones' (siehe TARGETS)
+        value: Zielwert (Skalar oder Array für mehrere Ziele)
+        length: Länge in Metern
+        stone_type: Typ des Steins
+        cement_price, gravel_price, stone_price, rebar_price: Preise für
+            target='cost' (Standard: config.yaml)
+        max_height: Obergrenze der Suche in Metern
+
+    Returns:
+        Dictionary mit height, rows, value (erreichte Zielgröße) und
+        at_limit; Arrays, wenn value ein Array ist
+
+    Raises:
+        ValueError: bei ungültiger Zielgröße oder Länge
+    """
+    _check_target(target)
+    if length <= 0:
+        raise ValueError("Länge muss größer als 0 sein!")
+
+    stones = stone_arrays([stone_type])
+    stone_height = float(stones.height_m[0])
+    prices = _prices(cement_price, gravel_price, stone_price, rebar_price)
+    targets = np.atleast_1d(np.asarray(value, dtype=float))
+    upper = int(np.floor(max_height / stone_height + 1e-9))
+
+    def evaluate(rows):
+        heights = rows * stone_height
+        geometry = wall_geometry(length, heights, heights)
+        quantities = batch_quantities(geometry, stones.stones_per_m2[0], stones.fill_liters[0], stones.height_m[0])
+        return _quantity(target, quantities, prices)
+
+    rows = _search(evaluate, targets, upper)
+    solution = _solution('height', rows, rows * stone_height, evaluate, upper, np.ndim(value))
+    solution['rows'] = rows if np.ndim(value) else int(rows[0])
+    return solution
+
+
+def _solution(key: str, steps: np.ndarray, dimension: np.ndarray, evaluate, upper: int, ndim: int) -> Dict:
+    """Ergebnis mit erreichter Zielgröße (Skalar bei einem Ziel)"""
+    achieved = np.where(steps > 0, evaluate(steps[:, None])[:, 0], 0.0)
+    solution = {
+        key: np.round(dimension, 3),
+        'value': achieved,
+        'at_limit': steps >= upper
+    }
+    if not ndim:
+        solution = {name: array[0].item() for name, array in solution.items()}
+    return solution
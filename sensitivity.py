@@ -0,0 +1,211 @@
+"""
+Preis-Sensitivität und Was-wäre-wenn-Analysen
+
+Die Mengen einer Mauer (Steine, Säcke, Tonnen, Stäbe) werden einmal
+berechnet; die Gesamtkosten werden anschließend per NumPy-Broadcasting
+über beliebig große Raster aus Zement-, Kies-, Stein- und Stahlpreisen
+sowie dem Puffer ausgewertet. Jede Rasterachse ist eine Array-Dimension,
+100 × 100 × 100 Preiskombinationen sind ein einziger Array-Durchlauf.
+
+Ergebnisse eignen sich für Heatmaps (zwei Achsen), Tornado-Diagramme
+(jeder Parameter einzeln ± x %) und den CSV-Export.
+"""
+
+import io
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from batch_calculations import batch_quantities, batch_total_cost, wall_geometry
+from config_store import get_config
+
+
+# Parameter, über die variiert werden kann (Reihenfolge = Achsenreihenfolge)
+SWEEP_PARAMS = ('cement_price', 'gravel_price', 'stone_price', 'rebar_price', 'buffer_percentage')
+
+SWEEP_LABELS = {
+    'cement_price': 'Zement (€/Sack)',
+    'gravel_price': 'Kies (€/t)',
+    'stone_price': 'Schalstein (€/St.)',
+    'rebar_price': 'Bewehrung (€/Stab)',
+    'buffer_percentage': 'Puffer (%)'
+}
+
+# Maße, aus denen wall_geometry() die Mengengrundlage bildet
+GEOMETRY_PARAMS = (
+    'length', 'start_height', 'end_height', 'is_two_zone',
+    'zone1_length', 'zone1_height', 'zone2_length', 'zone2_end_height'
+)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Gesamtkosten über einem Parameterraster"""
+
+    axes: Mapping[str, np.ndarray]
+    total_cost: np.ndarray
+    base: Mapping[str, float]
+
+
+def base_values(params: Dict) -> Dict[str, float]:
+    """
+    Ausgangswerte der Sweep-Parameter
+
+    Fehlende Preise und der Puffer werden aus config.yaml übernommen.
+
+    Args:
+        params: Parameter wie für calculate_all()
+
+    Returns:
+        Dictionary Parameter → Wert
+    """
+    config = get_config()
+    defaults = {
+        'cement_price': config['prices']['cement_per_bag_eur'],
+        'gravel_price': config['prices']['gravel_per_ton_eur'],
+        'stone_price': config['prices']['stone_per_piece_eur'],
+        'rebar_price': config['reinforcement_steel']['price_per_6m_rod_eur'],
+        'buffer_percentage': config['buffer']['percentage']
+    }
+    return {
+        name: float(params[name]) if params.get(name) is not None else float(default)
+        for name, default in defaults.items()
+    }
+
+
+def _evaluate(params: Dict, values: Dict[str, np.ndarray]) -> np.ndarray:
+    """Gesamtkosten für (broadcastfähige) Parameterwerte"""
+    stone = get_config()['stone_types'][params['stone_type']]
+    geometry = wall_geometry(**{name: params.get(name) for name in GEOMETRY_PARAMS})
+
+    # Nur der Puffer ändert die Mengen; ohne Puffer-Achse ist das ein Skalar
+    quantities = batch_quantities(
+        geometry,
+        stone['stones_per_m2'], stone['fill_volume_per_stone_liters'], stone['height_cm'] / 100,
+        buffer_percentage=values['buffer_percentage']
+    )
+    return batch_total_cost(
+        quantities,
+        values['cement_price'], values['gravel_price'],
+        values['stone_price'], values['rebar_price']
+    )
+
+
+def price_sweep(params: Dict, axes: Dict[str, Sequence[float]]) -> SweepResult:
+    """
+    Wertet die Gesamtkosten über einem Raster aus
+
+    Args:
+        params: Parameter wie für calculate_all() (Mauer und Ausgangspreise)
+        axes: Parameter aus SWEEP_PARAMS → Werte der Achse; nicht genannte
+            Parameter bleiben auf ihrem Ausgangswert
+
+    Returns:
+        SweepResult; total_cost hat eine Dimension pro Achse (in der
+        Reihenfolge von axes)
+
+    Raises:
+        ValueError: bei unbekanntem Parameter
+    """
+    unknown = set(axes) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Unbekannte Parameter: {', '.join(sorted(unknown))}")
+
+    base = base_values(params)
+    values = dict(base)
+    axis_arrays = {}
+
+    # Jede Achse bekommt eine eigene Dimension (Broadcasting)
+    for position, (name, points) in enumerate(axes.items()):
+        array = np.asarray(points, dtype=float)
+        axis_arrays[name] = array
+        shape = [1] * len(axes)
+        shape[position] = array.size
+        values[name] = array.reshape(shape)
+
+    total = np.broadcast_to(_evaluate(params, values), tuple(a.size for a in axis_arrays.values()))
+    return SweepResult(axes=axis_arrays, total_cost=total, base=base)
+
+
+def relative_axis(base: float, spread: float = 0.2, points: int = 21) -> np.ndarray:
+    """
+    Achse von base × (1 - spread) bis base × (1 + spread)
+
+    Args:
+        base: Ausgangswert
+        spread: Relative Abweichung (0.2 = ±20 %)
+        points: Anzahl Punkte
+
+    Returns:
+        Array mit den Achsenwerten
+    """
+    return np.linspace(base * (1 - spread), base * (1 + spread), points)
+
+
+def tornado(params: Dict, spread: float = 0.2, names: Optional[Sequence[str]] = None) -> List[Dict]:
+    """
+    Einzelvariation jedes Parameters um ± spread (Tornado-Diagramm)
+
+    Alle Szenarien (Ausgangswert, je Parameter niedrig/hoch) werden in
+    einem Array-Durchlauf berechnet.
+
+    Args:
+        params: Parameter wie für calculate_all()
+        spread: Relative Abweichung (0.2 = ±20 %)
+        names: Parameter (Standard: alle aus SWEEP_PARAMS)
+
+    Returns:
+        Liste (größte Spannweite zuerst) mit parameter, label, low_value,
+        high_value, low_cost, high_cost, base_cost, swing
+    """
+    names = list(names or SWEEP_PARAMS)
+    base = base_values(params)
+
+    # Szenario 0 = Ausgangswert, danach je Parameter niedrig und hoch
+    count = 1 + 2 * len(names)
+    values = {name: np.full(count, base[name]) for name in SWEEP_PARAMS}
+    for index, name in enumerate(names):
+        values[name][1 + 2 * index] = base[name] * (1 - spread)
+        values[name][2 + 2 * index] = base[name] * (1 + spread)
+
+    costs = _evaluate(params, values)
+    base_cost = float(costs[0])
+
+    rows = []
+    for index, name in enumerate(names):
+        low_cost = float(costs[1 + 2 * index])
+        high_cost = float(costs[2 + 2 * index])
+        rows.append({
+            'parameter': name,
+            'label': SWEEP_LABELS[name],
+            'low_value': base[name] * (1 - spread),
+            'high_value': base[name] * (1 + spread),
+            'low_cost': low_cost,
+            'high_cost': high_cost,
+            'base_cost': base_cost,
+            'swing': round(abs(high_cost - low_cost), 2)
+        })
+
+    rows.sort(key=lambda row: row['swing'], reverse=True)
+    return rows
+
+
+def sweep_to_csv(sweep: SweepResult) -> str:
+    """
+    Exportiert ein Raster als CSV (eine Zeile pro Kombination)
+
+    Args:
+        sweep: Ergebnis von price_sweep()
+
+    Returns:
+        CSV-Text mit einer Spalte pro Achse und der Gesamtkostenspalte
+    """
+    names = list(sweep.axes)
+    grids = np.meshgrid(*sweep.axes.values(), indexing='ij')
+    table = np.column_stack([g.ravel() for g in grids] + [sweep.total_cost.ravel()])
+
+    buffer = io.StringIO()
+    header = ','.join([SWEEP_LABELS[name] for name in names] + ['Gesamtkosten (€)'])
+    np.savetxt(buffer, table, delimiter=',', fmt='%.2f', header=header, comments='')
+    return buffer.getvalue()
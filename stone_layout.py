@@ -0,0 +1,260 @@
+"""
+Verband der Steine: ganze, halbe und geschnittene Steine je Reihe
+
+Bildet den halbsteinversetzten Verband aus create_2d_view() als Raster
+(Reihen × Steinpositionen) ab: ungerade Reihen beginnen mit einem halben
+Stein, Steine werden an den Mauerenden abgeschnitten, und unter dem
+Gefälle entfallen Steine, deren Reihe an dieser Stelle über der Mauer
+liegt. Alle Reihen werden in einem Array-Durchlauf ausgewertet; die
+Rechenschritte entsprechen der Zeichenlogik, die Zählung stimmt daher
+mit der 2D-Ansicht überein. Öffnungen (layout['openings'], openings.py)
+nehmen ganz überdeckte Steine aus dem Verband, teilweise überdeckte
+zählen als geschnitten.
+
+Ohne Öffnungen zählt stone_cuts() ohne das Raster: nur die Randsteine
+einer Reihe können halb oder geschnitten sein, und die gesetzten Steine
+bilden einen zusammenhängenden Bereich. Aufwand und Speicher wachsen dann
+mit der Zahl der Reihen, nicht mit der Mauerlänge.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from openings import opening_overlap
+
+
+# Toleranz für den Vergleich von Steinlängen (1 mm)
+LENGTH_TOLERANCE_M = 0.001
+
+
+def wall_height_at(layout: Dict, x):
+    """
+    Mauerhöhe an den Positionen x (wie in create_2d_view())
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        x: Positionen entlang der Mauer in Metern (Array)
+
+    Returns:
+        Array mit der Höhe je Position
+    """
+    if layout.get('is_two_zone', False):
+        zone1_length = layout['zone1_length']
+        zone2_length = layout['zone2_length']
+        zone2_start_height = layout['zone2_start_height']
+        zone2_slope = (
+            (zone2_start_height - layout['zone2_end_height']) / zone2_length if zone2_length > 0 else 0
+        )
+        return np.where(
+            x <= zone1_length,
+            layout['zone1_height'],
+            zone2_start_height - zone2_slope * (x - zone1_length)
+        )
+
+    total_length = layout['total_length']
+    slope = (layout['start_height'] - layout['end_height']) / total_length if total_length > 0 else 0
+    return layout['start_height'] - slope * x
+
+
+def course_count(layout: Dict) -> int:
+    """Anzahl der Reihen im Verband (wie create_2d_view())"""
+    return max(layout['rows_start'], layout['rows_end'])
+
+
+def layout_grid(layout: Dict, courses: Optional[Sequence[int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Raster aller Steinpositionen im Verband
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        courses: Nur diese Reihen (0-basiert) auswerten (Standard: alle)
+
+    Returns:
+        Dictionary mit 2D-Arrays (Reihen × Positionen): x_start, x_end
+        (an den Mauerenden abgeschnitten), visible (Position liegt in der
+        Mauerlänge), present (Stein wird gesetzt), removed (entfällt wegen
+        einer Öffnung), opened (gesetzt, aber von einer Öffnung
+        angeschnitten) und opening_fraction (überdeckter Anteil je Stein)
+    """
+    stone_length = layout['stone_length_m']
+    stone_height = layout['stone_height_m']
+    total_length = layout['total_length']
+
+    rows = np.arange(course_count(layout)) if courses is None else np.asarray(courses)
+    rows = rows[:, None]
+    # Ungerade Reihen um einen halben Stein versetzt
+    offsets = (rows % 2) * (stone_length / 2)
+    x_start = np.arange(layout['stones_per_row'] + 1) * stone_length - offsets
+    x_end = x_start + stone_length
+
+    visible = (x_start < total_length) & (x_end >= 0)
+    x_start = np.maximum(x_start, 0)
+    x_end = np.minimum(x_end, total_length)
+
+    # Reihe existiert, solange sie unter der Mauerhöhe in Steinmitte beginnt
+    height = wall_height_at(layout, (x_start + x_end) / 2)
+    present = visible & (rows * stone_height < height)
+
+    # Öffnungen: überdeckter Anteil der Steinfläche
+    fraction = np.zeros(present.shape)
+    if layout.get('openings'):
+        overlap = opening_overlap(layout['openings'], stone_length, stone_height, total_length,
+                                  rows, present.shape[1])
+        stone_area = (x_end - x_start) * stone_height
+        fraction = np.where(present & (stone_area > 0), overlap / np.where(stone_area > 0, stone_area, 1.0), 0.0)
+    removed = present & (fraction >= 1 - LENGTH_TOLERANCE_M)
+    opened = present & ~removed & (fraction > 0)
+
+    return {
+        'x_start': x_start,
+        'x_end': x_end,
+        'visible': visible,
+        'present': present & ~removed,
+        'removed': removed,
+        'opened': opened,
+        'opening_fraction': fraction
+    }
+
+
+def classify_widths(width: np.ndarray, stone_length: float):
+    """
+    Ordnet Steinlängen im Verband zu
+
+    Args:
+        width: Gesetzte Länge je Stein (nach dem Abschneiden an den Mauerenden)
+        stone_length: Länge eines ganzen Steins
+
+    Returns:
+        (is_full, is_half) als boolesche Arrays; alles andere ist geschnitten
+    """
+    is_full = width >= stone_length - LENGTH_TOLERANCE_M
+    is_half = np.abs(width - stone_length / 2) < LENGTH_TOLERANCE_M
+    return is_full, is_half
+
+
+def _grid_counts(grid: Dict[str, np.ndarray], stone_length: float):
+    """Ganze, halbe, geschnittene und fehlende Steine je Reihe aus layout_grid()"""
+    present = grid['present']
+    is_full, is_half = classify_widths(grid['x_end'] - grid['x_start'], stone_length)
+    # Von Öffnungen angeschnittene Steine gelten als geschnitten
+    is_full = is_full & ~grid['opened']
+    is_half = is_half & ~grid['opened']
+    # Eine Summe für alle Kategorien: ganz, halb, geschnitten, fehlend (Gefälle)
+    return np.stack((
+        present & is_full,
+        present & is_half,
+        present & ~(is_full | is_half),
+        grid['visible'] & ~present & ~grid['removed']
+    )).sum(axis=2).tolist()
+
+
+def _end_stone_counts(layout: Dict):
+    """
+    Ganze, halbe, geschnittene und fehlende Steine je Reihe ohne Raster
+
+    Nur für Mauern ohne Öffnungen: Innere Steine einer Reihe sind ganz,
+    nur der erste und der letzte sichtbare Stein können halb oder
+    geschnitten sein. Die Mauerhöhe ist linear bzw. (2 Zonen) stückweise
+    linear und stetig, die gesetzten Steine einer Reihe liegen daher am
+    Anfang oder am Ende der Reihe zusammen. Die Grenze wird per Bisektion
+    gesucht, mit denselben Ausdrücken wie in layout_grid().
+    """
+    stone_length = layout['stone_length_m']
+    stone_height = layout['stone_height_m']
+    total_length = layout['total_length']
+    positions = layout['stones_per_row']
+
+    rows = np.arange(course_count(layout))
+    offsets = (rows % 2) * (stone_length / 2)
+
+    def bounds(position: np.ndarray):
+        x_start = position * stone_length - offsets
+        return np.maximum(x_start, 0), np.minimum(x_start + stone_length, total_length)
+
+    def width(position: np.ndarray) -> np.ndarray:
+        x_start, x_end = bounds(position)
+        return x_end - x_start
+
+    def is_present(position: np.ndarray) -> np.ndarray:
+        x_start, x_end = bounds(position)
+        return rows * stone_height < wall_height_at(layout, (x_start + x_end) / 2)
+
+    # Letzter sichtbarer Stein (beginnt vor dem Mauerende), Rundung exakt nachgeprüft
+    last = np.minimum(np.ceil((total_length + offsets) / stone_length).astype(np.int64) - 1, positions)
+    last -= last * stone_length - offsets >= total_length
+    last += (last < positions) & ((last + 1) * stone_length - offsets < total_length)
+
+    first_present = is_present(np.zeros_like(rows))
+    last_present = is_present(last)
+
+    # Bisektion in Reihen, die nur teilweise belegt sind: lo auf der Seite des ersten Steins
+    lo = np.zeros_like(rows)
+    hi = np.where(first_present != last_present, last, 0)
+    while (hi - lo > 1).any():
+        middle = (lo + hi) // 2
+        same = is_present(middle) == first_present
+        lo = np.where(same, middle, lo)
+        hi = np.where(same, hi, middle)
+
+    stones = np.where(
+        first_present & last_present, last + 1,
+        np.where(first_present, lo + 1, np.where(last_present, last - hi + 1, 0))
+    )
+
+    first_full, first_half = classify_widths(width(np.zeros_like(rows)), stone_length)
+    last_full, last_half = classify_widths(width(last), stone_length)
+    # Besteht die Reihe aus einem Stein, zählt er nur als erster
+    has_last = last_present & (last > 0)
+
+    full = stones - (first_present & ~first_full) - (has_last & ~last_full)
+    half = (first_present & first_half).astype(np.int64) + (has_last & last_half)
+    return [full.tolist(), half.tolist(), (stones - full - half).tolist(), (last + 1 - stones).tolist()]
+
+
+def stone_cuts(layout: Dict) -> Dict:
+    """
+    Zählt ganze, halbe und geschnittene Steine je Reihe
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+
+    Returns:
+        Dictionary mit Summen (full_stones, half_stones, cut_stones,
+        layout_stones, courses, partial_courses) und per_course (Liste je
+        Reihe mit course, full, half, cut, partial); eine Teilreihe endet
+        wegen des Gefälles vor dem Mauerende. Bei Öffnungen zusätzlich
+        removed_stones (entfallen) und opening_stone_share (überdeckte
+        Fläche in Steinen, auch angeschnittene anteilig)
+    """
+    grid = None
+    if layout.get('openings'):
+        grid = layout_grid(layout)
+        full, half, cut, missing = _grid_counts(grid, layout['stone_length_m'])
+    else:
+        full, half, cut, missing = _end_stone_counts(layout)
+
+    per_course = []
+    partial_courses = 0
+    for index, (f, h, c, m) in enumerate(zip(full, half, cut, missing)):
+        # Teilreihe: Steine fehlen wegen des Gefälles, die Reihe ist aber nicht leer
+        partial = m > 0 and f + h + c > 0
+        partial_courses += partial
+        per_course.append({'course': index + 1, 'full': f, 'half': h, 'cut': c, 'partial': partial})
+
+    cuts = {
+        'full_stones': sum(full),
+        'half_stones': sum(half),
+        'cut_stones': sum(cut),
+        'layout_stones': sum(full) + sum(half) + sum(cut),
+        'courses': len(per_course),
+        'partial_courses': partial_courses,
+        'per_course': per_course
+    }
+    if grid is not None:
+        cuts['removed_stones'] = int(grid['removed'].sum())
+        # Überdeckte Fläche in Steinlängen (halber Stein am Ende = halbe Fläche)
+        cuts['opening_stone_share'] = float(
+            (grid['opening_fraction'] * (grid['x_end'] - grid['x_start']) / layout['stone_length_m']).sum()
+        )
+    return cuts
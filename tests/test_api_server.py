@@ -0,0 +1,161 @@
+"""
+Tests für die JSON-HTTP-API (api_server.py)
+"""
+
+import http.client
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api_server import APIServer
+from calculations import calculate_all
+
+
+WALL = {
+    'length': 5.0,
+    'start_height': 1.0,
+    'end_height': 1.0,
+    'width': 36.5,
+    'stone_type': 'abmessung_1',
+    'cement_price': 5.0,
+    'gravel_price': 34.0
+}
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Startet den API-Server auf einem freien Port"""
+    srv = APIServer(('127.0.0.1', 0), workers=2)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def conn(server):
+    """Keep-Alive-Verbindung zum Server"""
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=30)
+    yield connection
+    connection.close()
+
+
+def post(conn, path, payload):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+    conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+class TestAPIServer:
+    """Tests für die API-Endpunkte"""
+
+    def test_health(self, conn):
+        """Test Statusabfrage"""
+        conn.request('GET', '/health')
+        response = conn.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read()) == {'status': 'ok'}
+
+    def test_calculate_matches_calculate_all(self, conn):
+        """Test dass die API dasselbe Ergebnis wie calculate_all() liefert"""
+        status, body = post(conn, '/calculate', WALL)
+        assert status == 200
+
+        data = json.loads(body)
+        expected = calculate_all(**WALL)
+        assert data['total_stones'] == expected['total_stones']
+        assert data['materials'] == expected['materials']
+        assert data['costs'] == expected['costs']
+
+    def test_batch_over_keep_alive(self, conn):
+        """Test Batch-Endpunkt und mehrere Requests über eine Verbindung"""
+        walls = [dict(WALL, length=length) for length in (2.0, 4.0, 8.0)]
+        for _ in range(3):
+            status, body = post(conn, '/batch', {'walls': walls})
+            assert status == 200
+            results = json.loads(body)['results']
+            assert [r['area'] for r in results] == [2.0, 4.0, 8.0]
+
+    def test_invalid_json(self, conn):
+        """Test dass ungültiges JSON 400 liefert"""
+        status, body = post(conn, '/calculate', b'{kein json')
+        assert status == 400
+        assert 'JSON' in json.loads(body)['error']
+
+    def test_unknown_parameter(self, conn):
+        """Test dass unbekannte Parameter abgelehnt werden"""
+        status, body = post(conn, '/calculate', dict(WALL, farbe='rot'))
+        assert status == 400
+        assert 'farbe' in json.loads(body)['error']
+
+    def test_validation_error(self, conn):
+        """Test dass Validierungsfehler als 400 zurückgegeben werden"""
+        status, body = post(conn, '/calculate', dict(WALL, length=-1.0))
+        assert status == 400
+        assert 'Länge' in json.loads(body)['error']
+
+    def test_wrong_type(self, conn):
+        """Test dass falsch typisierte Werte 400 statt 500 liefern"""
+        status, body = post(conn, '/calculate', dict(WALL, length='lang'))
+        assert status == 400
+        assert 'length' in json.loads(body)['error']
+
+        status, body = post(conn, '/batch', {'walls': [dict(WALL, width=[25])]})
+        assert status == 400
+
+        status, body = post(conn, '/calculate', dict(WALL, is_two_zone='false'))
+        assert status == 400
+        assert 'is_two_zone' in json.loads(body)['error']
+
+    def test_busy_pool(self, server, conn):
+        """Test dass Batch und Projekt bei ausgelastetem Worker-Pool 503 liefern"""
+        slots = 0
+        while server.pending.acquire(blocking=False):
+            slots += 1
+        try:
+            for path in ('/batch', '/project'):
+                status, _ = post(conn, path, {'walls': [WALL]})
+                assert status == 503
+        finally:
+            for _ in range(slots):
+                server.pending.release()
+
+        status, _ = post(conn, '/batch', {'walls': [WALL]})
+        assert status == 200
+
+    def test_figure_2d(self, conn):
+        """Test Grafik-Endpunkt"""
+        status, body = post(conn, '/figure?view=2d', WALL)
+        assert status == 200
+        figure = json.loads(body)
+        assert 'layout' in figure
+        assert len(figure['layout']['shapes']) > 0
+
+    def test_project(self, conn):
+        """Test Projekt-Endpunkt mit gemeinsamer Rundung"""
+        walls = [dict(WALL, length=1.5, name='Beet') for _ in range(10)]
+        status, body = post(conn, '/project', {'walls': walls, 'cement_price': 5.0, 'gravel_price': 34.0})
+        assert status == 200
+
+        data = json.loads(body)
+        assert data['walls'][0]['Mauer'] == 'Beet'
+        assert data['totals']['cement_bags'] <= data['standalone_totals']['cement_bags']
+        assert data['costs']['total_cost'] > 0
+
+    def test_project_openings(self, conn):
+        """Test dass Öffnungen im Projekt abgezogen bzw. abgelehnt werden"""
+        door = {'x': 1.0, 'width': 1.0, 'bottom': 0.0, 'height': 0.5}
+        status, body = post(conn, '/project', {'walls': [dict(WALL, openings=[door])]})
+        assert status == 200
+        assert json.loads(body)['totals']['stones'] == calculate_all(**WALL, openings=[door])['total_stones']
+
+        status, _ = post(conn, '/project', {'walls': [dict(WALL, openings=[dict(door, x=50.0)])]})
+        assert status == 400
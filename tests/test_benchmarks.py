@@ -0,0 +1,49 @@
+"""
+Tests für die Benchmark-Suite (benchmarks/bench_pipeline.py)
+"""
+
+import sys
+from pathlib import Path
+
+# Füge parent directory und benchmarks zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from bench_pipeline import compare_results, run_benchmarks, wall_params
+
+
+class TestBenchmarks:
+    """Tests für Messung und Baseline-Vergleich"""
+
+    def test_two_zone_params(self):
+        """Test dass 2-Zonen-Fälle die Gesamtlänge aufteilen"""
+        params = wall_params(10.0, "abmessung_1", "two_zone")
+        assert params['is_two_zone'] is True
+        assert params['zone1_length'] + params['zone2_length'] == 10.0
+
+    def test_run_small_case(self):
+        """Test Messung eines kleinen Falls"""
+        results = run_benchmarks(
+            [1.0], repeat=1, stages=['calculate_all', 'create_2d_view'],
+            stone_types=['abmessung_1']
+        )
+        assert len(results) == 4  # 2 Stufen × 2 Modi
+        fig_case = results['create_2d_view|abmessung_1|single|1m']
+        assert fig_case['payload_bytes'] > 0
+        assert fig_case['peak_kb'] > 0
+
+    def test_compare_detects_regression(self):
+        """Test dass Verschlechterungen über der Schwelle erkannt werden"""
+        baseline = {'a': {'time_ms': 10.0, 'peak_kb': 100.0, 'payload_bytes': 1000}}
+        ok = {'a': {'time_ms': 11.0, 'peak_kb': 100.0, 'payload_bytes': 1000}}
+        slow = {'a': {'time_ms': 20.0, 'peak_kb': 100.0, 'payload_bytes': 1500}}
+
+        assert compare_results(ok, baseline, threshold=0.25) == []
+        regressions = compare_results(slow, baseline, threshold=0.25)
+        assert len(regressions) == 2
+
+    def test_compare_ignores_noise_floor(self):
+        """Test dass sehr kurze Laufzeiten nicht als Regression zählen"""
+        baseline = {'a': {'time_ms': 0.1, 'peak_kb': 10.0, 'payload_bytes': None}}
+        current = {'a': {'time_ms': 0.5, 'peak_kb': 10.0, 'payload_bytes': None}}
+        assert compare_results(current, baseline, threshold=0.25) == []
@@ -0,0 +1,205 @@
+"""
+Tests für den Config-Speicher (config_store.py)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config_store
+from config_store import (
+    ConfigStore, thaw, VERSION_HEADER, content_hash, make_snapshot,
+    config_version, pinned_config
+)
+from calculations import calculate_all
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Kopie der config.yaml in einem temporären Verzeichnis"""
+    source = Path(__file__).parent.parent / 'config.yaml'
+    path = tmp_path / 'config.yaml'
+    path.write_text(source.read_text(encoding='utf-8'), encoding='utf-8')
+    return path
+
+
+class TestConfigStore:
+    """Tests für Snapshots, atomares Speichern und Versionen"""
+
+    def test_initial_version_is_zero(self, config_file):
+        """Test dass eine nie gespeicherte Datei Version 0 hat"""
+        store = ConfigStore(config_file)
+        snapshot = store.snapshot()
+        assert snapshot.version == 0
+        assert 'abmessung_1' in snapshot.data['stone_types']
+
+    def test_snapshot_is_immutable(self, config_file):
+        """Test dass der Snapshot nicht verändert werden kann"""
+        data = ConfigStore(config_file).snapshot().data
+        with pytest.raises(TypeError):
+            data['prices']['cement_per_bag_eur'] = 99.0
+
+    def test_save_increments_version(self, config_file):
+        """Test dass jedes Speichern eine neue Version vergibt"""
+        store = ConfigStore(config_file)
+        config = thaw(store.snapshot().data)
+
+        config['prices']['cement_per_bag_eur'] = 7.5
+        first = store.save(config)
+        second = store.save(config)
+
+        assert (first.version, second.version) == (1, 2)
+        assert config_file.read_text(encoding='utf-8').startswith(f"{VERSION_HEADER}2\n")
+        assert store.snapshot().data['prices']['cement_per_bag_eur'] == 7.5
+
+        # Ein neuer Prozess (neuer Store) liest dieselbe Version
+        assert ConfigStore(config_file).snapshot().version == 2
+
+    def test_save_leaves_no_temp_files(self, config_file):
+        """Test dass nach dem Speichern keine Temp-Dateien übrig bleiben"""
+        store = ConfigStore(config_file)
+        store.save(thaw(store.snapshot().data))
+        assert sorted(p.name for p in config_file.parent.iterdir()) == ['config.yaml', 'config_history']
+
+    def test_readers_see_new_snapshot_without_parsing(self, config_file, monkeypatch):
+        """Test dass Leser nach dem Speichern ohne erneutes Parsen den neuen Stand sehen"""
+        store = ConfigStore(config_file, check_interval=3600)
+        old = store.snapshot()
+
+        config = thaw(old.data)
+        config['buffer']['percentage'] = 20
+        store.save(config)
+
+        calls = []
+        monkeypatch.setattr(config_store.yaml, 'safe_load', lambda *a: calls.append(a))
+        assert store.snapshot().data['buffer']['percentage'] == 20
+        assert old.data['buffer']['percentage'] == 15
+        assert calls == []
+
+    def test_external_change_is_picked_up(self, config_file):
+        """Test dass manuelle Änderungen an der Datei übernommen werden"""
+        store = ConfigStore(config_file, check_interval=0)
+        config = thaw(store.snapshot().data)
+        config['buffer']['percentage'] = 10
+        config_file.write_text(yaml.safe_dump(config), encoding='utf-8')
+
+        assert store.snapshot().data['buffer']['percentage'] == 10
+
+    def test_subscribers_are_notified(self, config_file):
+        """Test dass Abonnenten bei neuem Snapshot benachrichtigt werden"""
+        store = ConfigStore(config_file)
+        config = thaw(store.snapshot().data)
+        seen = []
+        store.subscribe(lambda snapshot: seen.append(snapshot.version))
+        store.save(config)
+        assert seen == [1]
+
+    def test_concurrent_readers_never_see_partial_config(self, config_file):
+        """Test dass parallele Leser während des Speicherns immer eine vollständige Config sehen"""
+        writer = ConfigStore(config_file)
+        reader = ConfigStore(config_file, check_interval=0)
+        config = thaw(writer.snapshot().data)
+        errors = []
+        done = threading.Event()
+
+        def read_loop():
+            while not done.is_set():
+                try:
+                    assert len(reader.snapshot().data['stone_types']) == 4
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=read_loop) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i in range(30):
+            config['prices']['cement_per_bag_eur'] = float(i)
+            writer.save(config)
+        done.set()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+
+
+class TestConfigHistory:
+    """Tests für Inhalts-Hashes und Versionshistorie"""
+
+    def test_hash_ignores_key_order_and_header(self, config_file):
+        """Test dass der Hash nur vom Inhalt abhängt"""
+        store = ConfigStore(config_file)
+        config = thaw(store.snapshot().data)
+        reordered = dict(reversed(list(config.items())))
+        assert content_hash(config) == content_hash(reordered)
+        assert store.save(config).content_hash == store.snapshot().content_hash
+
+    def test_hash_changes_with_content(self, config_file):
+        """Test dass geänderte Werte einen neuen Hash ergeben"""
+        store = ConfigStore(config_file)
+        before = store.snapshot().content_hash
+        config = thaw(store.snapshot().data)
+        config['prices']['gravel_per_ton_eur'] = 40.0
+        assert store.save(config).content_hash != before
+
+    def test_history_is_append_only(self, config_file):
+        """Test dass jeder Stand in der Historie landet"""
+        store = ConfigStore(config_file)
+        original = store.snapshot()
+        config = thaw(original.data)
+        config['buffer']['percentage'] = 20
+        first = store.save(config)
+        config['buffer']['percentage'] = 25
+        second = store.save(config)
+
+        entries = store.history()
+        assert [e['version'] for e in entries] == [0, 1, 2]
+        assert [e['hash'] for e in entries] == [
+            original.content_hash, first.content_hash, second.content_hash
+        ]
+
+    def test_get_by_hash_from_history_file(self, config_file):
+        """Test dass ein früherer Stand auch in einem neuen Prozess abrufbar ist"""
+        store = ConfigStore(config_file)
+        original = store.snapshot()
+        config = thaw(original.data)
+        config['buffer']['percentage'] = 30
+        store.save(config)
+
+        fresh = ConfigStore(config_file)
+        restored = fresh.get_by_hash(original.content_hash)
+        assert restored.data['buffer']['percentage'] == 15
+        with pytest.raises(KeyError):
+            fresh.get_by_hash('0000000000000000')
+
+
+class TestPinnedConfig:
+    """Tests für config_version() und pinned_config() mit der Projekt-Config"""
+
+    def test_result_is_tagged_with_config_version(self):
+        """Test dass calculate_all() die Config-Version zurückgibt"""
+        result = calculate_all(5.0, 1.0, 1.0, 36.5, "abmessung_1")
+        assert result['config_version'] == config_version()
+        assert len(result['config_version']) == 16
+
+    def test_reproduce_with_pinned_snapshot(self, monkeypatch):
+        """Test dass eine Berechnung mit einem früheren Stand wiederholbar ist"""
+        original = calculate_all(5.0, 1.0, 1.0, 36.5, "abmessung_1")
+
+        changed = thaw(config_store.get_config())
+        changed['buffer']['percentage'] = 50
+        changed_snapshot = make_snapshot(changed, version=99)
+        monkeypatch.setattr(config_store.default_store, '_snapshot', changed_snapshot)
+        monkeypatch.setattr(config_store.default_store, '_next_check', float('inf'))
+
+        assert calculate_all(5.0, 1.0, 1.0, 36.5, "abmessung_1")['buffer_percentage'] == 50
+
+        with pinned_config(original['config_version']):
+            reproduced = calculate_all(5.0, 1.0, 1.0, 36.5, "abmessung_1")
+        assert reproduced['volume_with_buffer_m3'] == original['volume_with_buffer_m3']
+        assert reproduced['config_version'] == original['config_version']
@@ -0,0 +1,87 @@
+"""
+Tests für die Stückliste je Reihe (course_bom.py)
+"""
+
+import sys
+import types
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all, get_stone_layout
+from course_bom import COURSE_COLUMNS, course_page, iter_course_csv, iter_course_records
+from stone_layout import stone_cuts
+
+
+class TestCourseRecords:
+    """Tests für die Datensätze je Reihe"""
+
+    def test_matches_stone_cuts(self):
+        """Test dass die Reihen dieselben Steine wie stone_cuts() ergeben"""
+        layout = get_stone_layout(8.0, 1.984, 0.496, 'abmessung_1')
+        records = list(iter_course_records(layout, 'abmessung_1'))
+        cuts = stone_cuts(layout)
+
+        assert len(records) == cuts['courses']
+        assert sum(r['stones'] for r in records) == cuts['layout_stones']
+        assert [r['cut_stones'] for r in records] == [c['cut'] for c in cuts['per_course']]
+        assert [r['partial'] for r in records] == [c['partial'] for c in cuts['per_course']]
+
+    def test_height_bands_and_fill(self):
+        """Test Höhenlage und Füllbeton einer geraden Reihe"""
+        result = calculate_all(5.0, 0.992, 0.992, 17.5, 'abmessung_4')
+        records = list(iter_course_records(result['layout'], 'abmessung_4'))
+
+        assert [(r['bottom_m'], r['top_m']) for r in records[:2]] == [(0.0, 0.248), (0.248, 0.496)]
+        # Jede Reihe deckt die ganze Mauerlänge: Füllung wie 10 ganze Steine
+        assert all(r['laid_length_m'] == 5.0 for r in records)
+        assert sum(r['fill_m3'] for r in records) == pytest.approx(result['base_volume_m3'], abs=0.001)
+
+    def test_rebar_only_from_min_height(self):
+        """Test dass Bewehrung erst ab der Mindesthöhe anfällt"""
+        low = get_stone_layout(5.0, 0.992, 0.992, 'abmessung_1')
+        high = get_stone_layout(5.0, 1.488, 1.488, 'abmessung_1')
+        assert all(r['rebar_m'] == 0 for r in iter_course_records(low, 'abmessung_1'))
+        assert all(r['rebar_m'] == 10.0 for r in iter_course_records(high, 'abmessung_1'))
+
+
+class TestLazyExport:
+    """Tests für Generator, Seiten und CSV"""
+
+    def test_records_are_lazy(self):
+        """Test dass eine 500-m-Mauer reihenweise erzeugt wird"""
+        layout = get_stone_layout(500.0, 1.984, 1.984, 'abmessung_1')
+        records = iter_course_records(layout, 'abmessung_1')
+        assert isinstance(records, types.GeneratorType)
+        first = next(records)
+        assert first['course'] == 1 and first['laid_length_m'] == 500.0
+
+    def test_page(self):
+        """Test seitenweise Anzeige mit deutschen Spalten"""
+        layout = get_stone_layout(8.0, 1.984, 0.496, 'abmessung_1')
+        page = course_page(layout, 'abmessung_1', page=2, page_size=3)
+        assert [row['Reihe'] for row in page] == [4, 5, 6]
+        assert list(page[0]) == list(COURSE_COLUMNS.values())
+
+    def test_page_matches_records(self):
+        """Test dass eine Seite dieselben Werte wie der Generator liefert (auch mit Öffnung)"""
+        result = calculate_all(8.0, 1.984, 0.496, 36.5, 'abmessung_1',
+                               openings=[dict(x=1.0, width=0.9, bottom=0.1, height=0.8)])
+        records = list(iter_course_records(result['layout'], 'abmessung_1'))
+        page = course_page(result['layout'], 'abmessung_1', page=1, page_size=5)
+
+        assert page == [{label: r[key] for key, label in COURSE_COLUMNS.items()} for r in records[:5]]
+        assert course_page(result['layout'], 'abmessung_1', page=3, page_size=5) == []
+
+    def test_csv_lines(self):
+        """Test CSV: Kopfzeile und eine Zeile je Reihe"""
+        layout = get_stone_layout(8.0, 1.984, 0.496, 'abmessung_1')
+        lines = list(iter_course_csv(layout, 'abmessung_1'))
+        assert lines[0].startswith('Reihe,Von (m),Bis (m),Steine')
+        assert len(lines) == 1 + 8
+        assert all(line.endswith('\n') and line.count('\n') == 1 for line in lines)
+        assert list(islice(iter_course_csv(layout, 'abmessung_1'), 2))[1].startswith('1,0.0,0.248,23,')
@@ -0,0 +1,73 @@
+"""
+Tests für Höhen auf ganze Steinreihen (course_snapping.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all
+from course_snapping import snap_candidates, snap_options, snap_rows
+
+PRICES = dict(cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0)
+
+
+class TestSnapOptions:
+    """Tests für die Reihen unter und über einer Höhe"""
+
+    def test_between_courses(self):
+        """Test Höhe zwischen zwei Reihen"""
+        assert snap_options(1.1, 0.248) == pytest.approx([0.992, 1.24])
+
+    def test_already_snapped(self):
+        """Test dass ganze Reihen trotz Gleitkomma unverändert bleiben"""
+        assert snap_options(3 * 0.248, 0.248) == pytest.approx([0.744])
+
+    def test_at_least_one_course(self):
+        """Test dass nie auf 0 Reihen gerundet wird"""
+        assert snap_options(0.1, 0.248) == pytest.approx([0.248])
+
+
+class TestSnapCandidates:
+    """Tests für die Bewertung aller Kandidaten"""
+
+    def test_deltas_match_calculate_all(self):
+        """Test dass Mengen und Änderungen calculate_all() entsprechen"""
+        candidates = snap_candidates(5.0, 1.1, 0.8, 'abmessung_1', **PRICES)
+        current = calculate_all(5.0, 1.1, 0.8, 36.5, 'abmessung_1', **PRICES)
+
+        assert not candidates['snapped']
+        assert len(candidates['start_height']) == 5
+        for index in range(1, 5):
+            start, end = candidates['start_height'][index], candidates['end_height'][index]
+            snapped = calculate_all(5.0, start, end, 36.5, 'abmessung_1', **PRICES)
+            assert candidates['delta_stones'][index] == snapped['total_stones'] - current['total_stones']
+            assert candidates['delta_total_cost'][index] == pytest.approx(
+                snapped['costs']['total_cost'] - current['costs']['total_cost'])
+
+    def test_snapped_wall(self):
+        """Test dass eine Mauer aus ganzen Reihen keine Vorschläge bekommt"""
+        candidates = snap_candidates(5.0, 0.992, 0.992, 'abmessung_1')
+        assert candidates['snapped']
+        assert snap_rows(candidates) == []
+
+    def test_cache(self):
+        """Test gleiches Ergebnis für gleiche Mauer, neues für andere Preise"""
+        first = snap_candidates(5.0, 1.1, 0.8, 'abmessung_1', **PRICES)
+        assert snap_candidates(5.0, 1.1, 0.8, 'abmessung_1', **PRICES) is first
+        assert snap_candidates(5.0, 1.1, 0.8, 'abmessung_1', **dict(PRICES, stone_price=3.0)) is not first
+
+    def test_two_zone_rows(self):
+        """Test 2-Zonen-Mauer: Höhen von Zone 1 und Zone 2, günstigste zuerst"""
+        candidates = snap_candidates(12.0, 0.8, 1.7, 'abmessung_1', is_two_zone=True,
+                                     zone1_length=4.5, zone1_height=0.8,
+                                     zone2_length=7.5, zone2_end_height=1.7)
+        rows = snap_rows(candidates, two_zone=True)
+        assert len(rows) == 4
+        assert rows[0]['Höhe Zone 1 (m)'] == 0.744
+        costs = [row['Δ Kosten (€)'] for row in rows]
+        assert costs == sorted(costs)
@@ -0,0 +1,137 @@
+"""
+Tests für den DXF-Export und den Stapel-Export (dxf_export.py, batch_export.py)
+"""
+
+import io
+import json
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from batch_export import export_wall, file_stem, load_walls, main
+from calculations import calculate_all
+from dxf_export import LAYERS, create_dxf, iter_dxf, write_dxf
+
+WALL = dict(length=8.0, start_height=1.0, end_height=0.75, width=36.5, stone_type='abmessung_1')
+TWO_ZONE = dict(is_two_zone=True, zone1_length=4.0, zone1_height=1.24, zone2_length=6.0, zone2_end_height=0.5)
+
+
+def entities(dxf: str):
+    """Zerlegt eine DXF-Datei in (Gruppencode, Wert)-Paare und zählt Entitäten je Layer"""
+    lines = dxf.split('\n')[:-1]
+    assert len(lines) % 2 == 0
+    pairs = list(zip(lines[0::2], lines[1::2]))
+    counts = {}
+    for index, (code, value) in enumerate(pairs):
+        if code == '0' and value in ('POLYLINE', 'LINE', 'TEXT'):
+            layer = pairs[index + 1]
+            assert layer[0] == '8'
+            counts[(value, layer[1])] = counts.get((value, layer[1]), 0) + 1
+    return pairs, counts
+
+
+class TestDxf:
+    """Tests für die DXF-Zeichnung"""
+
+    def test_structure(self):
+        """Test Sektionen, Version und Dateiende"""
+        result = calculate_all(**WALL)
+        pairs, _ = entities(create_dxf(result['layout'], 0.365))
+        assert pairs[:6] == [('0', 'SECTION'), ('2', 'HEADER'), ('9', '$ACADVER'), ('1', 'AC1009'),
+                             ('0', 'ENDSEC'), ('0', 'SECTION')]
+        assert pairs[-1] == ('0', 'EOF')
+        assert [value for code, value in pairs if code == '2' and value in ('HEADER', 'TABLES', 'ENTITIES')] == \
+            ['HEADER', 'TABLES', 'ENTITIES']
+        for name in LAYERS:
+            assert ('2', name) in pairs
+
+    def test_one_outline_per_stone(self):
+        """Test je gesetztem Stein eine geschlossene Polylinie"""
+        result = calculate_all(**WALL)
+        _, counts = entities(create_dxf(result['layout'], 0.365))
+        assert counts[('POLYLINE', 'STEINE')] == result['stone_cuts']['layout_stones']
+        assert counts[('POLYLINE', 'KONTUR')] == 1
+        assert ('LINE', 'ZONEN') not in counts
+
+    def test_zones_openings_dimensions(self):
+        """Test Zonentrennung, Öffnungen und Bemaßung"""
+        opening = dict(x=1.0, width=0.5, bottom=0.0, height=0.5)
+        result = calculate_all(10.0, 1.24, 0.5, 36.5, 'abmessung_1', openings=[opening], **TWO_ZONE)
+        _, counts = entities(create_dxf(result['layout'], 0.365))
+        assert counts[('POLYLINE', 'STEINE')] == result['stone_cuts']['layout_stones']
+        assert counts[('POLYLINE', 'OEFFNUNGEN')] == 1
+        assert counts[('LINE', 'ZONEN')] == 2
+        # Länge, zwei Zonen, zwei Höhen, Wandstärke
+        assert counts[('TEXT', 'BEMASSUNG')] == 6
+
+    def test_dimension_values(self):
+        """Test Maßzahlen aus dem Layout"""
+        result = calculate_all(**WALL)
+        pairs, _ = entities(create_dxf(result['layout'], 0.365))
+        texts = {value for code, value in pairs if code == '1'}
+        assert {'8.00', '1.00', '0.75', '0.365'} <= texts
+
+    def test_streaming(self):
+        """Test dass ein Block je Reihe geliefert und in Streams geschrieben wird"""
+        result = calculate_all(**WALL)
+        chunks = list(iter_dxf(result['layout'], 0.365))
+        assert len(chunks) > result['rows']
+        buffer = io.StringIO()
+        assert write_dxf(buffer, result['layout'], 0.365) == len(buffer.getvalue())
+        assert buffer.getvalue() == ''.join(chunks)
+
+    def test_large_wall(self):
+        """Test Mauer mit über 50.000 Steinen (Laufzeit: Benchmark-Szenario)"""
+        result = calculate_all(1000.0, 5.0, 5.0, 36.5, 'abmessung_1')
+        buffer = io.StringIO()
+        written = write_dxf(buffer, result['layout'], 0.365)
+        assert written == len(buffer.getvalue())
+        assert buffer.getvalue().endswith('EOF\n')
+
+
+class TestBatchExport:
+    """Tests für den Stapel-Export"""
+
+    def test_export_formats(self, tmp_path):
+        """Test DXF, GLB und Text je Mauer"""
+        paths = export_wall(dict(WALL, name='Garten Süd'), tmp_path, ['dxf', 'glb', 'txt'])
+        assert [path.name for path in paths] == ['Garten_Süd.dxf', 'Garten_Süd.glb', 'Garten_Süd.txt']
+        assert paths[0].read_text(encoding='utf-8').endswith('0\nEOF\n')
+        assert struct.unpack('<I', paths[1].read_bytes()[:4])[0] == 0x46546C67
+        assert 'SCHALSTEINMAUER' in paths[2].read_text(encoding='utf-8')
+
+    def test_invalid_wall(self, tmp_path):
+        """Test Fehler bei ungültigen Parametern"""
+        with pytest.raises(ValueError):
+            export_wall(dict(WALL, stone_type='unbekannt'), tmp_path, ['dxf'])
+        with pytest.raises(ValueError):
+            export_wall(dict(WALL, color='rot'), tmp_path, ['dxf'])
+
+    def test_load_walls(self, tmp_path):
+        """Test Liste und {"walls": [...]}"""
+        path = tmp_path / 'walls.json'
+        path.write_text(json.dumps({'walls': [WALL]}), encoding='utf-8')
+        assert load_walls(path) == [WALL]
+        path.write_text(json.dumps([WALL, WALL]), encoding='utf-8')
+        assert len(load_walls(path)) == 2
+        path.write_text('{}', encoding='utf-8')
+        with pytest.raises(ValueError):
+            load_walls(path)
+
+    def test_file_stem(self):
+        """Test Dateinamen aus Bezeichnungen"""
+        assert file_stem('Mauer 1 / Ost') == 'Mauer_1_Ost'
+        assert file_stem('***') == 'mauer'
+
+    def test_main(self, tmp_path, capsys):
+        """Test Kommandozeile mit einer gültigen und einer ungültigen Mauer"""
+        path = tmp_path / 'walls.json'
+        path.write_text(json.dumps([WALL, dict(WALL, length=-1)]), encoding='utf-8')
+        assert main([str(path), '--out', str(tmp_path / 'out')]) == 1
+        assert (tmp_path / 'out' / 'Mauer_1.dxf').exists()
+        assert 'Mauer 2' in capsys.readouterr().err
@@ -0,0 +1,125 @@
+"""
+Tests für den 3D-Export als GLB (gltf_export.py)
+"""
+
+import io
+import json
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all
+from gltf_export import box_mesh, create_glb, stone_boxes, write_glb
+
+TWO_ZONE = dict(is_two_zone=True, zone1_length=4.0, zone1_height=1.24, zone2_length=6.0, zone2_end_height=0.5)
+
+
+def parse_glb(data: bytes):
+    """Zerlegt eine GLB-Datei in JSON-Dokument und Binär-Chunk"""
+    magic, version, length = struct.unpack('<III', data[:12])
+    assert (magic, version, length) == (0x46546C67, 2, len(data))
+    json_length, json_type = struct.unpack('<II', data[12:20])
+    assert json_type == 0x4E4F534A
+    document = json.loads(data[20:20 + json_length])
+    offset = 20 + json_length
+    bin_length, bin_type = struct.unpack('<II', data[offset:offset + 8])
+    assert bin_type == 0x004E4942
+    return document, data[offset + 8:offset + 8 + bin_length]
+
+
+def read_accessor(document, binary, index):
+    accessor = document['accessors'][index]
+    view = document['bufferViews'][accessor['bufferView']]
+    dtype = '<f4' if accessor['componentType'] == 5126 else '<u4'
+    width = 3 if accessor['type'] == 'VEC3' else 1
+    start = view['byteOffset'] + accessor.get('byteOffset', 0)
+    return np.frombuffer(binary, dtype=dtype, count=accessor['count'] * width, offset=start).reshape(-1, width)
+
+
+class TestStoneBoxes:
+    """Tests für die Steine als Arrays"""
+
+    def test_count_matches_layout(self):
+        """Test dass alle gesetzten Steine exportiert werden"""
+        result = calculate_all(10.0, 1.5, 0.8, 36.5, 'abmessung_1')
+        boxes = stone_boxes(result['layout'])
+        assert boxes['x_start'].size == result['stone_cuts']['layout_stones']
+
+    def test_openings_left_out(self):
+        """Test dass wegen Öffnungen entfallene Steine fehlen"""
+        opening = dict(x=0.0, width=0.72, bottom=0.0, height=0.496)
+        result = calculate_all(10.0, 1.24, 1.24, 36.5, 'abmessung_1', openings=[opening])
+        boxes = stone_boxes(result['layout'])
+        assert boxes['x_start'].size == result['stone_cuts']['layout_stones']
+        assert result['stone_cuts']['removed_stones'] > 0
+
+    def test_zones(self):
+        """Test Zonen nach Steinmitte"""
+        result = calculate_all(10.0, 1.24, 0.5, 36.5, 'abmessung_1', **TWO_ZONE)
+        boxes = stone_boxes(result['layout'])
+        middle = (boxes['x_start'] + boxes['x_end']) / 2
+        assert set(boxes['zone'].tolist()) == {1, 2}
+        assert (middle[boxes['zone'] == 1] <= 4.0).all()
+
+    def test_box_mesh_shape(self):
+        """Test 8 Eckpunkte und 12 Dreiecke je Stein"""
+        boxes = {'x_start': np.array([0.0, 0.36]), 'x_end': np.array([0.36, 0.72]),
+                 'y_bottom': np.array([0.0, 0.248]), 'zone': np.array([1, 1])}
+        vertices, indices = box_mesh(boxes, 0.248, 0.365)
+        assert vertices.shape == (16, 3) and vertices.dtype == np.float32
+        assert indices.shape == (24, 3) and indices.dtype == np.uint32
+        assert indices.max() == 15
+        np.testing.assert_allclose(vertices[15], [0.72, 0.496, 0.365], rtol=1e-6)
+
+
+class TestGlb:
+    """Tests für die GLB-Datei"""
+
+    def test_valid_structure(self):
+        """Test Header, Chunks, Ausrichtung und Accessoren"""
+        result = calculate_all(5.0, 1.0, 1.0, 36.5, 'abmessung_1')
+        data = create_glb(result['layout'], 0.365)
+        document, binary = parse_glb(data)
+
+        assert len(data) % 4 == 0
+        assert document['asset']['version'] == '2.0'
+        assert document['buffers'][0]['byteLength'] == len(binary)
+        positions = read_accessor(document, binary, 0)
+        np.testing.assert_allclose(positions.min(axis=0), document['accessors'][0]['min'])
+        np.testing.assert_allclose(positions.max(axis=0), document['accessors'][0]['max'])
+        indices = read_accessor(document, binary, 1)
+        assert indices.max() < len(positions)
+        assert len(indices) == 36 * result['stone_cuts']['layout_stones']
+
+    def test_materials_per_zone(self):
+        """Test ein Primitive mit eigenem Material je Zone"""
+        result = calculate_all(10.0, 1.24, 0.5, 36.5, 'abmessung_1', **TWO_ZONE)
+        document, binary = parse_glb(create_glb(result['layout'], 0.365))
+        primitives = document['meshes'][0]['primitives']
+        assert [document['materials'][p['material']]['name'] for p in primitives] == ['Zone 1', 'Zone 2']
+
+        # Alle Steine der Zone 1 liegen in ihrem Indexbereich
+        positions = read_accessor(document, binary, 0)
+        zone1 = positions[read_accessor(document, binary, primitives[0]['indices']).ravel()]
+        assert zone1[:, 0].max() <= 4.0 + 0.36
+
+        single = parse_glb(create_glb(result['layout'], 0.365, zone_materials=False))[0]
+        assert len(single['meshes'][0]['primitives']) == 1
+
+    def test_write_to_stream(self):
+        """Test Schreiben in einen Stream mit Rückgabe der Länge"""
+        result = calculate_all(5.0, 1.0, 1.0, 36.5, 'abmessung_1')
+        buffer = io.BytesIO()
+        assert write_glb(buffer, result['layout'], 0.365) == len(buffer.getvalue())
+
+    def test_large_wall(self):
+        """Test Mauer mit über 50.000 Steinen: kompakt (Laufzeit: Benchmark-Szenario)"""
+        result = calculate_all(1000.0, 5.0, 5.0, 36.5, 'abmessung_1')
+        assert result['stone_cuts']['layout_stones'] > 50000
+        data = create_glb(result['layout'], 0.365)
+        assert len(data) < 20_000_000
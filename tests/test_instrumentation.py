@@ -0,0 +1,94 @@
+"""
+Tests für die Zeitmessung (instrumentation.py)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import instrumentation
+from instrumentation import (
+    span, timed, begin_trace, end_trace, tracing,
+    recent_traces, stage_breakdown, export_jsonl
+)
+from calculations import calculate_all
+
+
+@pytest.fixture(autouse=True)
+def clean_ring():
+    """Leert den Ringpuffer und deaktiviert die globale Messung"""
+    instrumentation.clear()
+    instrumentation.enable(False)
+    yield
+    instrumentation.clear()
+    instrumentation.enable(False)
+
+
+class TestInstrumentation:
+    """Tests für Spans, Traces und Export"""
+
+    def test_disabled_records_nothing(self):
+        """Test dass ohne Aktivierung nichts aufgezeichnet wird"""
+        with span("stufe"):
+            pass
+        calculate_all(5.0, 1.0, 1.0, 36.5, "abmessung_1")
+        assert recent_traces() == []
+
+    def test_nested_spans_in_trace(self):
+        """Test verschachtelte Stufen innerhalb eines Traces"""
+        trace = begin_trace("rerun")
+        with span("aussen"):
+            with span("innen"):
+                pass
+        end_trace(trace)
+
+        assert recent_traces() == [trace]
+        assert [s['name'] for s in trace.spans] == ["aussen", "innen"]
+        assert [s['depth'] for s in trace.spans] == [0, 1]
+        assert trace.spans[0]['duration_ns'] >= trace.spans[1]['duration_ns']
+
+    def test_pipeline_stages(self):
+        """Test dass calculate_all() als Stufe erscheint"""
+        with tracing("rerun") as trace:
+            calculate_all(5.0, 1.0, 1.0, 36.5, "abmessung_1")
+
+        names = [row['Stufe'].strip() for row in stage_breakdown(trace)]
+        assert "calculate_all" in names
+
+    def test_global_enable_creates_root_traces(self):
+        """Test globale Aktivierung ohne umgebenden Trace"""
+        instrumentation.enable()
+
+        @timed("einzeln")
+        def work():
+            return 42
+
+        assert work() == 42
+        traces = recent_traces()
+        assert len(traces) == 1
+        assert traces[0].name == "einzeln"
+
+    def test_ring_buffer_is_bounded(self):
+        """Test dass der Ringpuffer begrenzt ist"""
+        for _ in range(instrumentation.RING_SIZE + 10):
+            end_trace(begin_trace("rerun"))
+        assert len(recent_traces()) == instrumentation.RING_SIZE
+
+    def test_export_jsonl(self):
+        """Test JSON-Lines-Export"""
+        with tracing("a"):
+            with span("x"):
+                pass
+        with tracing("b"):
+            pass
+
+        lines = export_jsonl().splitlines()
+        assert len(lines) == 2
+        first = json.loads(lines[0])
+        assert first['name'] == "a"
+        assert first['spans'][0]['name'] == "x"
@@ -0,0 +1,84 @@
+"""
+Tests für den Lite-Modus (lite_mode.py)
+"""
+
+import sys
+from pathlib import Path
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all
+from lite_mode import DEFAULT_SETTINGS, get_settings, is_mobile, lite_mode_default, lite_rows
+from thumbnails import render_png
+
+IPHONE = ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+          "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1")
+ANDROID = ("Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 "
+           "(KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36")
+DESKTOP = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+           "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+
+
+class TestDetection:
+    """Tests für die Erkennung und den Startwert"""
+
+    def test_user_agents(self):
+        """Test Smartphones erkannt, Desktop nicht"""
+        assert is_mobile(IPHONE)
+        assert is_mobile(ANDROID)
+        assert not is_mobile(DESKTOP)
+        assert not is_mobile(None)
+        assert not is_mobile('')
+
+    def test_auto_detect_off(self):
+        """Test keine Erkennung bei auto_detect: false"""
+        assert not is_mobile(IPHONE, dict(DEFAULT_SETTINGS, auto_detect=False))
+
+    def test_query_parameter_first(self):
+        """Test ?lite=1 / ?lite=0 vor dem User-Agent"""
+        assert lite_mode_default('1', DESKTOP)
+        assert not lite_mode_default('0', IPHONE)
+        assert lite_mode_default(None, IPHONE)
+        assert not lite_mode_default('ja', DESKTOP)
+
+    def test_settings(self):
+        """Test Abschnitt mobile mit Standardwerten ergänzt"""
+        settings = get_settings()
+        assert set(DEFAULT_SETTINGS) <= set(settings)
+
+
+class TestLiteRows:
+    """Tests für die kompakte Ergebnistabelle"""
+
+    def test_numbers_first(self):
+        """Test Mengen vor Bezeichnungen, Kosten zuletzt"""
+        result = calculate_all(8.0, 1.5, 1.0, 36.5, 'abmessung_1', cement_price=5.0, gravel_price=40.0,
+                               stone_price=2.0, rebar_price=10.0)
+        rows = lite_rows(result)
+        assert list(rows[0]) == ['Menge', 'Was']
+        assert rows[0]['Menge'] == f"{result['volume_with_buffer_m3']} m³"
+        assert rows[1]['Menge'] == f"{result['total_stones']} St."
+        assert any(row['Was'].startswith('Bewehrung') for row in rows)
+        assert rows[-1]['Was'] == 'Gesamtkosten'
+
+    def test_without_reinforcement_and_costs(self):
+        """Test niedrige Mauer ohne Bewehrung und ohne Preise"""
+        result = calculate_all(8.0, 0.5, 0.5, 36.5, 'abmessung_1')
+        assert [row['Was'] for row in lite_rows(result)] == [
+            f"Beton (inkl. {result['buffer_percentage']} % Puffer)", f"Schalsteine, {result['rows']} Reihen",
+            'Zement à 25 kg', 'Kies', 'Wasser'
+        ]
+
+    def test_openings(self):
+        """Test Öffnungsfläche in der Tabelle"""
+        opening = dict(x=1.0, width=0.8, bottom=0.0, height=0.5)
+        rows = lite_rows(calculate_all(8.0, 1.0, 1.0, 36.5, 'abmessung_1', openings=[opening]))
+        assert {'Menge': '0.4 m²', 'Was': 'Öffnungen (abgezogen)'} in rows
+
+    def test_payload_small(self):
+        """Test Ansicht und Tabelle auch bei 100 m Mauer nur wenige KB"""
+        result = calculate_all(100.0, 2.0, 0.5, 36.5, 'abmessung_1')
+        settings = get_settings()
+        png = render_png(result['layout'], settings['thumbnail_width_px'], settings['thumbnail_height_px'])
+        assert len(png) + len(str(lite_rows(result))) < 10_000
@@ -0,0 +1,81 @@
+"""
+Tests für Paletten, Gewichte und LKW-Aufteilung (logistics.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all
+from logistics import delivery_arrays, delivery_plan, get_settings, plan_deliveries, rod_weight_kg
+
+
+def fixed_settings(**overrides):
+    """Feste Parameter unabhängig von der config.yaml"""
+    settings = dict(get_settings(), pallet_tare_kg=25, stones_per_pallet=60, cement_bags_per_pallet=40,
+                    gravel_big_bag_tons=1.0, rebar_bundle_rods=50, truck_payload_kg=12000,
+                    truck_pallet_places=12)
+    settings.update(overrides)
+    return settings
+
+
+class TestUnits:
+    """Tests für Ladeeinheiten und Gewichte"""
+
+    def test_pallets_and_weights(self):
+        """Test volle Paletten plus Restpalette mit Palettengewicht"""
+        plan = delivery_arrays(130, 25.0, 50, 2.5, 0, fixed_settings())
+
+        assert plan['stones_units'][0] == 3
+        assert plan['stones_kg'][0] == pytest.approx(130 * 25.0 + 3 * 25)
+        assert plan['cement_units'][0] == 2
+        assert plan['gravel_units'][0] == 3
+        assert plan['gravel_kg'][0] == pytest.approx(2500)
+        assert plan['pallet_places'][0] == 8
+
+    def test_rod_weight(self):
+        """Test Stabgewicht Ø 8 mm: 0,395 kg/m"""
+        assert rod_weight_kg() == pytest.approx(0.395 * 6, abs=0.01)
+
+
+class TestTrucks:
+    """Tests für die Aufteilung auf LKW"""
+
+    def test_payload_respected(self):
+        """Test dass kein LKW überladen ist und alle Einheiten verteilt werden"""
+        result = calculate_all(60.0, 1.984, 1.984, 36.5, 'abmessung_1')
+        plan = delivery_plan(result, 'abmessung_1', fixed_settings())
+
+        assert all(truck['weight_kg'] <= 12000 for truck in plan['trucks'])
+        assert all(truck['pallet_places'] <= 12 for truck in plan['trucks'])
+        for line in plan['lines']:
+            assert sum(truck[line['line']] for truck in plan['trucks']) == line['units']
+        assert sum(truck['weight_kg'] for truck in plan['trucks']) == pytest.approx(plan['total_tons'] * 1000, abs=10)
+
+    def test_pallet_places_limit(self):
+        """Test dass leichte Ladung nach Stellplätzen aufgeteilt wird"""
+        plan = delivery_arrays(0, 25.0, 1000, 0, 0, fixed_settings())
+        assert plan['pallet_places'][0] == 25
+        assert plan['trucks'][0] == 3
+
+    def test_unit_heavier_than_payload(self):
+        """Test dass zu schwere Ladeeinheiten abgelehnt werden"""
+        with pytest.raises(ValueError):
+            delivery_arrays(60, 25.0, 0, 0, 0, fixed_settings(truck_payload_kg=1000))
+
+    def test_batch_of_orders(self):
+        """Test Tourenplanung für viele Aufträge in einem Durchlauf (Laufzeit: Benchmark-Szenario)"""
+        rng = np.random.default_rng(0)
+        orders = [
+            {'stone_type': 'abmessung_1', 'stones': int(s), 'cement_bags': int(c), 'gravel_tons': float(g)}
+            for s, c, g in zip(rng.integers(10, 2000, 5000), rng.integers(1, 200, 5000),
+                               rng.uniform(0.1, 40, 5000).round(1))
+        ]
+        plan = plan_deliveries(orders, fixed_settings())
+        assert not (plan['truck_kg'] > 12000 + 1e-6).any()
+        assert (plan['trucks'] >= np.ceil(plan['total_kg'] / 12000)).all()
@@ -0,0 +1,86 @@
+"""
+Tests für die Monte-Carlo-Schätzung (monte_carlo.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all, load_config
+from monte_carlo import MEASURES, monte_carlo, sample_quantities
+
+
+WALL = dict(
+    length=8.0, start_height=1.984, end_height=0.992, width=36.5, stone_type='abmessung_1',
+    cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0
+)
+
+TWO_ZONE = dict(
+    WALL, length=8.0, start_height=0.992, end_height=1.984, is_two_zone=True,
+    zone1_length=4.0, zone1_height=0.992, zone2_length=4.0, zone2_end_height=1.984
+)
+
+
+def fixed_settings():
+    """Keine Streuung, Verlust fest auf dem Puffer aus config.yaml"""
+    buffer = load_config()['buffer']['percentage']
+    return {
+        'fill_volume_rel_sd': 0.0, 'dimension_sd_m': 0.0, 'price_rel_sd': 0.0,
+        'waste_percentage_min': buffer, 'waste_percentage_mode': buffer,
+        'waste_percentage_max': buffer
+    }
+
+
+class TestSampling:
+    """Tests für die Stichproben"""
+
+    def test_same_seed_same_result(self):
+        """Test dass gleicher Seed gleiche Stichproben liefert"""
+        first = sample_quantities(WALL, samples=1000, seed=7)
+        second = sample_quantities(WALL, samples=1000, seed=7)
+        other = sample_quantities(WALL, samples=1000, seed=8)
+
+        for key in MEASURES:
+            assert np.array_equal(first[key], second[key])
+        assert not np.array_equal(first['total_cost'], other['total_cost'])
+
+    def test_without_spread_matches_calculate_all(self):
+        """Test dass ohne Streuung genau calculate_all() herauskommt"""
+        for params in (WALL, TWO_ZONE):
+            draws = sample_quantities(params, samples=50, seed=1, settings=fixed_settings())
+            expected = calculate_all(**params)
+
+            assert np.all(draws['stones'] == expected['total_stones'])
+            assert np.all(draws['cement_bags'] == expected['materials']['cement_bags'])
+            assert np.all(draws['gravel_tons'] == expected['materials']['gravel_tons'])
+            assert np.all(draws['rods_6m'] == expected['reinforcement']['rods_6m_needed'])
+            assert np.allclose(draws['total_cost'], expected['costs']['total_cost'])
+
+    def test_sample_count(self):
+        """Test dass jede Größe einen Wert pro Stichprobe hat"""
+        draws = sample_quantities(TWO_ZONE, samples=2500, seed=3)
+        assert set(draws) == set(MEASURES)
+        assert all(values.shape == (2500,) for values in draws.values())
+
+
+class TestPercentileTable:
+    """Tests für die Perzentil-Tabelle"""
+
+    def test_rows_and_order(self):
+        """Test eine Zeile je Größe und P10 ≤ P50 ≤ P90"""
+        rows = monte_carlo(WALL, samples=20000, seed=42)
+
+        assert [row['Größe'] for row in rows] == list(MEASURES.values())
+        for row in rows:
+            assert row['P10'] <= row['P50'] <= row['P90']
+
+    def test_median_near_deterministic(self):
+        """Test dass der Median der Kosten nahe der festen Berechnung liegt"""
+        rows = monte_carlo(WALL, samples=20000, seed=42)
+        median = next(row['P50'] for row in rows if row['Größe'] == MEASURES['total_cost'])
+        expected = calculate_all(**WALL)['costs']['total_cost']
+        assert abs(median - expected) / expected < 0.1
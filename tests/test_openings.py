@@ -0,0 +1,214 @@
+"""
+Tests für Öffnungen in der Mauer (openings.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all, get_stone_layout, validate_openings
+from course_bom import iter_course_records
+from openings import interrupted_rebar_length, interrupted_width, opening_area, opening_overlap, rebar_runs
+from rebar_cutting import reinforcement_plan
+from stone_layout import layout_grid, stone_cuts
+from visualization import create_2d_view
+
+# Standardstein: 36 cm lang, 24,8 cm hoch
+STONE_LENGTH = 0.36
+STONE_HEIGHT = 0.248
+WALL = dict(length=10.0, start_height=1.984, end_height=1.984, width=36.5, stone_type='abmessung_1')
+
+
+def opening(x, width, bottom, height, **extra):
+    return dict(x=x, width=width, bottom=bottom, height=height, **extra)
+
+
+class TestOpeningOverlap:
+    """Tests für die überdeckte Fläche je Stein"""
+
+    def test_matches_brute_force(self):
+        """Test gegen die Rechteckschnitte Stein für Stein"""
+        rng = np.random.default_rng(7)
+        openings = [opening(float(x), float(w), float(b), float(h))
+                    for x, w, b, h in zip(rng.uniform(0, 8, 12), rng.uniform(0.05, 1.5, 12),
+                                          rng.uniform(0, 1, 12), rng.uniform(0.05, 0.9, 12))]
+        rows, positions, total_length = 8, 30, 10.0
+        overlap = opening_overlap(openings, STONE_LENGTH, STONE_HEIGHT, total_length, np.arange(rows), positions)
+
+        expected = np.zeros((rows, positions))
+        for row in range(rows):
+            offset = STONE_LENGTH / 2 if row % 2 else 0.0
+            for position in range(positions):
+                x0 = max(position * STONE_LENGTH - offset, 0.0)
+                x1 = min(position * STONE_LENGTH - offset + STONE_LENGTH, total_length)
+                for o in openings:
+                    dx = min(o['x'] + o['width'], x1) - max(o['x'], x0)
+                    dy = min(o['bottom'] + o['height'], (row + 1) * STONE_HEIGHT) - max(o['bottom'], row * STONE_HEIGHT)
+                    expected[row, position] += max(dx, 0.0) * max(dy, 0.0)
+
+        np.testing.assert_allclose(overlap, expected, atol=1e-12)
+
+    def test_selected_rows(self):
+        """Test dass nur die angefragten Reihen geliefert werden"""
+        openings = [opening(1.0, 1.0, 0.0, 1.0)]
+        full = opening_overlap(openings, STONE_LENGTH, STONE_HEIGHT, 10.0, np.arange(8), 30)
+        part = opening_overlap(openings, STONE_LENGTH, STONE_HEIGHT, 10.0, [5, 2], 30)
+        np.testing.assert_allclose(part, full[[5, 2]])
+
+    def test_area(self):
+        """Test Summe der Öffnungsflächen"""
+        assert opening_area([opening(0, 1.0, 0, 0.5), opening(2, 0.2, 0, 0.2)]) == pytest.approx(0.54)
+        assert opening_area([]) == 0.0
+
+
+class TestOpeningQuantities:
+    """Tests für Steine, Füllbeton und Bewehrung mit Öffnungen"""
+
+    def test_whole_stone_removed(self):
+        """Test dass ein genau überdeckter Stein entfällt und seine Füllung abgezogen wird"""
+        base = calculate_all(**WALL)
+        result = calculate_all(**WALL, openings=[opening(0.0, STONE_LENGTH, 0.0, STONE_HEIGHT)])
+
+        assert result['stone_cuts']['removed_stones'] == 1
+        assert result['stone_cuts']['opening_stone_share'] == pytest.approx(1.0)
+        assert result['total_stones'] == base['total_stones'] - 1
+        assert result['base_volume_m3'] == pytest.approx(base['base_volume_m3'] - 0.02091, abs=0.001)
+        assert result['area'] == pytest.approx(base['area'] - STONE_LENGTH * STONE_HEIGHT, abs=0.01)
+
+    def test_partial_overlap_cuts_stones(self):
+        """Test dass angeschnittene Steine bleiben, aber als geschnitten zählen"""
+        base = calculate_all(**WALL)
+        result = calculate_all(**WALL, openings=[opening(2.0, 0.1, 0.3, 0.1, name='Rohr')])
+
+        assert result['stone_cuts']['removed_stones'] == 0
+        assert result['total_stones'] == base['total_stones']
+        assert result['stone_cuts']['cut_stones'] == base['stone_cuts']['cut_stones'] + 1
+        assert result['stone_cuts']['opening_stone_share'] == pytest.approx(0.01 / (STONE_LENGTH * STONE_HEIGHT))
+
+    def test_rebar_interrupted(self):
+        """Test dass Bewehrung in den durchtrennten Lagen über die Öffnungsbreite entfällt"""
+        base = calculate_all(**WALL)
+        # Tor 1,2 m breit, 1,5 m hoch: Reihenmitten bis 1,364 m liegen in der Öffnung (6 Lagen)
+        result = calculate_all(**WALL, openings=[opening(2.0, 1.2, 0.0, 1.5)])
+        rods_per_row = base['reinforcement']['rods_per_row']
+
+        assert result['reinforcement']['total_length_m'] == pytest.approx(
+            base['reinforcement']['total_length_m'] - 6 * 1.2 * rods_per_row)
+        assert interrupted_rebar_length([opening(0, 1.0, 0.0, 0.1)], STONE_HEIGHT, 8) == 0.0
+
+    def test_without_openings_unchanged(self):
+        """Test dass ohne Öffnungen keine zusätzlichen Schlüssel entstehen"""
+        result = calculate_all(**WALL, openings=[])
+        assert 'openings' not in result
+        assert 'removed_stones' not in result['stone_cuts']
+
+    def test_many_openings(self):
+        """Test Hunderte Öffnungen an einer langen Mauer (Laufzeit: Benchmark-Szenario)"""
+        openings = [opening(i * 0.9 + 0.1, 0.5, 0.2, 0.6) for i in range(500)]
+        result = calculate_all(100 * 4.6, 1.984, 1.984, 36.5, 'abmessung_1', openings=openings)
+        assert result['stone_cuts']['removed_stones'] > 0
+        assert result['opening_area_m2'] == pytest.approx(500 * 0.5 * 0.6)
+
+
+class TestOpeningConsumers:
+    """Tests dass Schnittplan und Stückliste je Reihe Öffnungen wie calculate_all() abziehen"""
+
+    # Gerade Mauer aus ganzen Steinen (50 cm), Fenster über mehrere Reihen
+    GATE_WALL = dict(length=5.0, start_height=1.488, end_height=1.488, width=17.5, stone_type='abmessung_4')
+    GATE = [opening(1.2, 1.0, 0.2, 0.9)]
+
+    def test_rebar_runs(self):
+        """Test Stränge links und rechts der Öffnung in den durchtrennten Lagen"""
+        lengths, courses = rebar_runs([opening(2.0, 1.2, 0.0, 1.5)], STONE_HEIGHT, 8, 10.0)
+        assert sorted(zip(lengths.tolist(), courses.tolist())) == [(2.0, 6), (6.8, 6), (10.0, 2)]
+        assert (lengths * courses).sum() == pytest.approx(
+            10.0 * 8 - interrupted_rebar_length([opening(2.0, 1.2, 0.0, 1.5)], STONE_HEIGHT, 8))
+        assert interrupted_width([opening(2.0, 1.2, 0.0, 1.5)], STONE_HEIGHT, [5, 6]).tolist() == pytest.approx([1.2, 0.0])
+
+    def test_cutting_plan_matches_reinforcement(self):
+        """Test dass der Schnittplan nur die Bewehrung außerhalb der Öffnung schneidet"""
+        result = calculate_all(12.0, 1.488, 1.488, 36.5, 'abmessung_1', openings=[opening(3.0, 2.0, 0.0, 1.0)])
+        rebar = result['reinforcement']
+        plan = reinforcement_plan(rebar, result['layout'])
+
+        assert plan['cut_length_m'] - plan['laps'] * plan['lap_length_m'] == pytest.approx(rebar['total_length_m'])
+        assert plan['rods_needed'] < reinforcement_plan(rebar)['rods_needed']
+        assert {'length_m': 3.0, 'count': 8} in plan['cut_list']
+
+    def test_course_totals_match(self):
+        """Test dass die Summen der Stückliste den Werten von calculate_all() entsprechen"""
+        base = calculate_all(**self.GATE_WALL)
+        result = calculate_all(**self.GATE_WALL, openings=self.GATE)
+        base_records = list(iter_course_records(base['layout'], 'abmessung_4'))
+        records = list(iter_course_records(result['layout'], 'abmessung_4'))
+
+        removed = sum(r['stones'] for r in base_records) - sum(r['stones'] for r in records)
+        assert removed == base['total_stones'] - result['total_stones']
+        assert sum(r['cut_stones'] for r in records) == result['stone_cuts']['cut_stones']
+        assert sum(r['fill_m3'] for r in records) == pytest.approx(result['base_volume_m3'], abs=0.001)
+        assert sum(r['fill_with_buffer_m3'] for r in records) == pytest.approx(
+            result['volume_with_buffer_m3'], abs=0.001)
+        assert sum(r['rebar_m'] for r in records) == pytest.approx(result['reinforcement']['total_length_m'])
+
+
+class TestValidateOpenings:
+    """Tests für die Prüfung der Öffnungen"""
+
+    @pytest.fixture
+    def layout(self):
+        return get_stone_layout(10.0, 1.984, 0.992, 'abmessung_1')
+
+    def test_valid(self, layout):
+        """Test gültige Öffnungen"""
+        assert validate_openings([opening(1.0, 1.0, 0.0, 1.0), opening(2.0, 1.0, 0.0, 0.5)], layout) == (True, None)
+
+    def test_beyond_wall_end(self, layout):
+        """Test Öffnung über das Mauerende"""
+        is_valid, error = validate_openings([opening(9.5, 1.0, 0.0, 0.5)], layout)
+        assert not is_valid
+        assert "Mauerende" in error
+
+    def test_above_sloped_crown(self, layout):
+        """Test Öffnung über der Mauerkrone (Gefälle)"""
+        is_valid, error = validate_openings([opening(8.0, 1.0, 0.0, 1.2, name='Tor')], layout)
+        assert not is_valid
+        assert error.startswith("Tor:")
+
+    def test_overlap(self, layout):
+        """Test sich überschneidende Öffnungen"""
+        is_valid, error = validate_openings([opening(1.0, 1.0, 0.0, 1.0), opening(1.5, 1.0, 0.5, 0.5)], layout)
+        assert not is_valid
+        assert "überschneiden" in error
+
+    def test_invalid_values(self, layout):
+        """Test fehlende, negative, leere und boolesche Maße"""
+        assert not validate_openings([{'x': 1.0}], layout)[0]
+        assert not validate_openings([opening(-1.0, 1.0, 0.0, 1.0)], layout)[0]
+        assert not validate_openings([opening(1.0, 0.0, 0.0, 1.0)], layout)[0]
+        assert not validate_openings([opening(True, 1.0, 0.0, 1.0)], layout)[0]
+
+    def test_error_in_calculate_all(self):
+        """Test dass calculate_all() den Fehler zurückgibt"""
+        result = calculate_all(**WALL, openings=[opening(9.5, 1.0, 0.0, 0.5)])
+        assert 'error' in result
+
+
+class TestOpeningViews:
+    """Tests für die Darstellung der Öffnungen"""
+
+    def test_2d_stones_match_count(self):
+        """Test dass die 2D-Ansicht die Steine ohne entfallene zeichnet"""
+        layout = get_stone_layout(5.0, 1.5, 1.0, 'abmessung_1')
+        layout['openings'] = [opening(1.0, 1.1, 0.0, 0.8), opening(3.0, 0.2, 0.5, 0.2)]
+        fig = create_2d_view(layout, 0.365)
+
+        stones = [shape for shape in fig.layout.shapes if shape.fillcolor in ('lightgray', 'lightblue')]
+        openings = [shape for shape in fig.layout.shapes if shape.fillcolor == 'white']
+        assert len(stones) == stone_cuts(layout)['layout_stones']
+        assert len(openings) == 2
+        assert layout_grid(layout)['removed'].sum() > 0
@@ -0,0 +1,111 @@
+"""
+Tests für die vektorisierte Berechnung (batch_calculations.py) und den
+Steintyp-Optimierer (optimizer.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config_store
+from batch_calculations import round_cents
+from calculations import calculate_all, load_config
+from config_store import make_snapshot, thaw
+from optimizer import compare_stone_types, rank_options
+
+
+PRICES = dict(cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0)
+
+
+def direct(stone_type, **wall):
+    """calculate_all() mit der Wandstärke des Steins"""
+    width = load_config()['stone_types'][stone_type]['width_cm']
+    return calculate_all(width=width, stone_type=stone_type, **wall, **PRICES)
+
+
+class TestBatchMatchesCalculateAll:
+    """Tests dass die Array-Berechnung exakt calculate_all() entspricht"""
+
+    @pytest.mark.parametrize("wall", [
+        dict(length=5.0, start_height=0.992, end_height=0.992),
+        dict(length=23.7, start_height=1.984, end_height=0.496),
+        dict(length=12.0, start_height=0.744, end_height=1.736, is_two_zone=True,
+             zone1_length=4.5, zone1_height=0.744, zone2_length=7.5, zone2_end_height=1.736)
+    ])
+    def test_all_stone_types(self, wall):
+        """Test Steine, Volumen, Materialien, Bewehrung und Kosten für alle Typen"""
+        options = compare_stone_types(**wall, **PRICES)
+
+        for index, stone_type in enumerate(options['zone1_type']):
+            result = direct(stone_type, **wall)
+            rods = result['reinforcement']['rods_6m_needed'] if result['reinforcement'] else 0
+
+            assert options['stones'][index] == result['total_stones']
+            assert round(float(options['volume_with_buffer_m3'][index]), 3) == result['volume_with_buffer_m3']
+            assert options['cement_bags'][index] == result['materials']['cement_bags']
+            assert options['gravel_tons'][index] == result['materials']['gravel_tons']
+            assert options['rods_6m'][index] == rods
+            assert options['total_cost'][index] == result['costs']['total_cost']
+
+    def test_round_cents_matches_round(self):
+        """Test dass Cent-Rundung auch bei großen Arrays round() entspricht"""
+        values = np.random.default_rng(7).uniform(0, 5000, 10000).round(3)
+        expected = [round(v, 2) for v in values.tolist()]
+        assert round_cents(values).tolist() == expected
+
+
+class TestOptimizer:
+    """Tests für Sortierung und Kombinationen"""
+
+    def test_rank_by_cost(self):
+        """Test dass die günstigste Option zuerst kommt"""
+        options = compare_stone_types(10.0, 1.488, 1.488, **PRICES)
+        rows = rank_options(options, 'total_cost')
+
+        costs = [row['Gesamtkosten (€)'] for row in rows]
+        assert costs == sorted(costs)
+        assert [row['Rang'] for row in rows] == [1, 2, 3, 4]
+
+    def test_rank_by_weight(self):
+        """Test Sortierung nach Gewicht"""
+        rows = rank_options(compare_stone_types(10.0, 1.488, 1.488, **PRICES), 'weight')
+        weights = [row['Gewicht (kg)'] for row in rows]
+        assert weights == sorted(weights)
+
+    def test_unknown_criterion(self):
+        """Test dass ein unbekanntes Kriterium abgelehnt wird"""
+        with pytest.raises(ValueError):
+            rank_options(compare_stone_types(5.0, 1.0, 1.0), 'farbe')
+
+    def test_missing_prices_use_config(self):
+        """Test dass ohne Preise die Standardpreise verwendet werden"""
+        options = compare_stone_types(5.0, 0.992, 0.992)
+        assert np.all(options['total_cost'] > 0)
+
+    def test_combinations_need_equal_width(self, monkeypatch):
+        """Test dass nur maßgleiche Steintypen je Zone kombiniert werden"""
+        changed = thaw(config_store.get_config())
+        changed['stone_types']['abmessung_2']['width_cm'] = 36.5
+        monkeypatch.setattr(config_store.default_store, '_snapshot', make_snapshot(changed, version=99))
+        monkeypatch.setattr(config_store.default_store, '_next_check', float('inf'))
+
+        wall = dict(length=10.0, start_height=0.992, end_height=1.488, is_two_zone=True,
+                    zone1_length=5.0, zone1_height=0.992, zone2_length=5.0, zone2_end_height=1.488)
+        options = compare_stone_types(**wall, **PRICES, include_combinations=True)
+
+        pairs = set(zip(options['zone1_type'], options['zone2_type']))
+        assert ('abmessung_1', 'abmessung_2') in pairs
+        assert ('abmessung_2', 'abmessung_1') in pairs
+        assert ('abmessung_1', 'abmessung_3') not in pairs
+        assert len(options['label']) == 6
+
+        # Kombination = Zone 1 mit Typ 1, Zone 2 mit Typ 2
+        index = list(zip(options['zone1_type'], options['zone2_type'])).index(('abmessung_1', 'abmessung_2'))
+        zone1 = direct('abmessung_1', **wall)['zone_breakdown']['zone1']['stones']
+        zone2 = direct('abmessung_2', **wall)['zone_breakdown']['zone2']['stones']
+        assert options['stones'][index] == zone1 + zone2
@@ -0,0 +1,121 @@
+"""
+Tests für den Betonierplan (pour_planner.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all
+from course_bom import iter_course_records
+from pour_planner import batch_recipe, get_settings, pour_arrays, pour_plan, project_pour_plan
+from project import aggregate_walls
+
+
+def fixed_settings(**overrides):
+    """Feste Parameter unabhängig von der config.yaml"""
+    settings = dict(get_settings(), mixer_drum_liters=140, mixer_fill_ratio=0.65,
+                    truck_capacity_m3=8.0, max_lift_courses=4)
+    settings.update(overrides)
+    return settings
+
+
+class TestPourPlan:
+    """Tests für Abschnitte, Chargen und Fahrmischer einer Mauer"""
+
+    def test_flat_wall_lifts(self):
+        """Test gleich große Abschnitte bei gerader Mauer"""
+        result = calculate_all(10.0, 1.984, 1.984, 36.5, 'abmessung_1')
+        plan = pour_plan(result, 'abmessung_1', fixed_settings())
+
+        assert [(lift['first_course'], lift['last_course']) for lift in plan['lifts']] == [(1, 4), (5, 8)]
+        assert plan['lifts'][0]['volume_m3'] == pytest.approx(plan['lifts'][1]['volume_m3'])
+        assert plan['volume_m3'] == result['volume_with_buffer_m3']
+        assert sum(lift['volume_m3'] for lift in plan['lifts']) == pytest.approx(
+            result['volume_with_buffer_m3'], abs=0.001)
+
+    def test_matches_wall_and_project(self):
+        """Test gleiches Volumen wie calculate_all() und gleicher Plan wie im Projekt"""
+        wall = dict(length=5.0, start_height=1.0, end_height=1.0, width=36.5, stone_type='abmessung_1')
+        result = calculate_all(**wall)
+        plan = pour_plan(result, 'abmessung_1', fixed_settings())
+        project = project_pour_plan([wall], [result['volume_with_buffer_m3']], fixed_settings())
+
+        assert plan['volume_m3'] == result['volume_with_buffer_m3']
+        assert plan['volume_m3'] == project['volume_m3']
+        assert plan['batches'] == project['batches']
+        assert plan['truck_loads'] == project['truck_loads']
+
+    def test_matches_course_records(self):
+        """Test dass die Abschnitte wie die Reihen der Stückliste verteilt sind (auch mit Öffnung)"""
+        result = calculate_all(8.0, 1.984, 0.496, 36.5, 'abmessung_1',
+                               openings=[dict(x=2.0, width=1.0, bottom=0.0, height=1.0)])
+        records = list(iter_course_records(result['layout'], 'abmessung_1'))
+        lifts = pour_plan(result, 'abmessung_1', fixed_settings(max_lift_courses=3))['lifts']
+        scale = result['volume_with_buffer_m3'] / sum(r['fill_with_buffer_m3'] for r in records)
+
+        for lift in lifts:
+            expected = sum(r['fill_with_buffer_m3'] for r in records[lift['first_course'] - 1:lift['last_course']])
+            assert lift['volume_m3'] == pytest.approx(expected * scale, abs=0.001)
+
+    def test_slope_fills_lower_lifts_first(self):
+        """Test dass bei Gefälle die unteren Abschnitte mehr Beton brauchen"""
+        result = calculate_all(8.0, 1.984, 0.496, 36.5, 'abmessung_1')
+        lifts = pour_plan(result, 'abmessung_1', fixed_settings(max_lift_courses=2))['lifts']
+        volumes = [lift['volume_m3'] for lift in lifts]
+        assert len(lifts) == 4
+        assert volumes == sorted(volumes, reverse=True)
+
+    def test_batches_and_trucks(self):
+        """Test Chargen je Abschnitt aufgerundet (91 L je Charge)"""
+        result = calculate_all(10.0, 1.984, 1.984, 36.5, 'abmessung_1')
+        plan = pour_plan(result, 'abmessung_1', fixed_settings())
+        per_lift = int(np.ceil(plan['lifts'][0]['volume_m3'] / 0.091))
+
+        assert plan['batches'] == 2 * per_lift
+        assert plan['truck_loads'] == 2
+        assert batch_recipe(fixed_settings())['cement_kg'] == pytest.approx(0.091 * 300)
+
+    def test_two_zone_wall(self):
+        """Test 2-Zonen-Mauer: Reihenzahl nach der höchsten Zone"""
+        result = calculate_all(12.0, 0.744, 1.736, 36.5, 'abmessung_1', is_two_zone=True,
+                               zone1_length=4.5, zone1_height=0.744,
+                               zone2_length=7.5, zone2_end_height=1.736)
+        plan = pour_plan(result, 'abmessung_1', fixed_settings())
+        assert plan['lifts'][-1]['last_course'] == 7
+
+    def test_invalid_lift(self):
+        """Test dass Abschnitte ohne Reihen abgelehnt werden"""
+        with pytest.raises(ValueError):
+            pour_arrays([1.0], [([5.0], [1.0], [1.0])], [0.248], fixed_settings(max_lift_courses=0))
+
+
+class TestProjectPourPlan:
+    """Tests für den gemeinsamen Betonierplan eines Projekts"""
+
+    def test_shared_trucks(self):
+        """Test dass kleine Mauern sich Fahrmischer je Betoniertag teilen"""
+        walls = [dict(length=3.0, start_height=0.992, end_height=0.992, width=36.5, stone_type='abmessung_1')
+                 for _ in range(4)]
+        volumes = aggregate_walls(walls).per_wall['volume_with_buffer_m3']
+        plan = project_pour_plan(walls, volumes, fixed_settings())
+
+        assert plan['per_wall']['truck_loads'].tolist() == [1, 1, 1, 1]
+        assert plan['truck_loads'] == 1
+        assert plan['volume_m3'] == pytest.approx(volumes.sum(), abs=0.001)
+
+    def test_thousands_of_walls(self):
+        """Test dass Tausende Mauern in einem Durchlauf geplant werden (Laufzeit: Benchmark-Szenario)"""
+        rng = np.random.default_rng(0)
+        walls = [dict(length=float(length), start_height=1.488, end_height=0.496, width=36.5,
+                      stone_type='abmessung_1') for length in rng.uniform(1, 20, 5000)]
+        volumes = aggregate_walls(walls).per_wall['volume_with_buffer_m3']
+
+        plan = project_pour_plan(walls, volumes, fixed_settings())
+        assert plan['per_wall']['lifts'].tolist() == [2] * 5000
+        assert plan['batches'] <= plan['per_wall']['batches'].sum()
@@ -0,0 +1,90 @@
+"""
+Tests für die vorberechneten Antworten (precompute.py)
+"""
+
+import sys
+from pathlib import Path
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import precompute
+from calculations import calculate_all
+from config_store import get_config, get_snapshot
+from pdf_export import create_text_report
+from precompute import (
+    build_table, common_requests, get_figures, get_precomputed, request_key
+)
+
+
+def find_request(requests, **criteria):
+    for params in requests:
+        if all(params[k] == v for k, v in criteria.items()):
+            return params
+    raise LookupError(criteria)
+
+
+class TestCommonRequests:
+    """Tests für die Auswahl der vorzuberechnenden Anfragen"""
+
+    def test_templates_are_snapped_like_sidebar(self):
+        """Test dass Vorlagenhöhen wie in der Sidebar auf Steinreihen einrasten"""
+        config = get_config()
+        template = config['templates']['hangbefestigung']
+        stone_height_m = config['stone_types'][template['stone_type']]['height_cm'] / 100
+
+        params = find_request(
+            common_requests(config), length=template['wall_length_m'], is_two_zone=False
+        )
+        assert params['start_height'] == round(template['wall_start_height_m'] / stone_height_m) * stone_height_m
+        assert params['width'] == config['stone_types'][template['stone_type']]['width_cm']
+
+    def test_grid_covers_all_stone_types(self):
+        """Test dass das Raster für jeden Steintyp erzeugt wird"""
+        config = get_config()
+        stone_types = {p['stone_type'] for p in common_requests(config)}
+        assert stone_types == set(config['stone_types'])
+
+    def test_key_ignores_float_noise(self):
+        """Test dass Rundungsrauschen aus number_input denselben Schlüssel ergibt"""
+        params = common_requests(get_config())[0]
+        noisy = dict(params, start_height=params['start_height'] + 1e-9)
+        assert request_key(noisy) == request_key(params)
+
+
+class TestAnswerTable:
+    """Tests für Aufbau und Abfrage der Tabelle"""
+
+    def setup_method(self):
+        self.requests = common_requests(get_config())[:2]
+        self.table = build_table(get_snapshot(), self.requests)
+
+    def teardown_method(self):
+        precompute._table = None
+
+    def test_entry_matches_direct_calculation(self):
+        """Test dass die vorberechnete Antwort der direkten Berechnung entspricht"""
+        params = self.requests[0]
+        entry = self.table.answers[request_key(params)]
+        direct = calculate_all(**params)
+
+        assert entry.result['volume_with_buffer_m3'] == direct['volume_with_buffer_m3']
+        assert entry.result['costs'] == direct['costs']
+        assert entry.export_text == create_text_report(direct, params)
+
+    def test_served_only_for_current_config(self, monkeypatch):
+        """Test dass eine veraltete Tabelle nicht verwendet wird"""
+        monkeypatch.setattr(precompute, '_table', self.table)
+        assert get_precomputed(self.requests[0]) is not None
+
+        monkeypatch.setattr(precompute, 'config_version', lambda: 'anderer-stand')
+        assert get_precomputed(self.requests[0]) is None
+
+    def test_figures_reused_for_other_prices(self, monkeypatch):
+        """Test dass Figures bei abweichenden Preisen wiederverwendet werden"""
+        monkeypatch.setattr(precompute, '_table', self.table)
+        params = dict(self.requests[0], cement_price=9.99)
+
+        assert get_precomputed(params) is None
+        figures = get_figures(params)
+        assert figures is self.table.answers[request_key(self.requests[0])].figures
@@ -0,0 +1,127 @@
+"""
+Tests für Projekte aus mehreren Mauern (project.py)
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all, load_config
+from project import Project, aggregate_walls, project_cutting_plan, project_rows, project_to_csv
+from rebar_cutting import reinforcement_plan
+
+
+PRICES = dict(cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0)
+
+SMALL_WALL = dict(length=1.5, start_height=1.2, end_height=1.2, width=36.5, stone_type='abmessung_1')
+
+TWO_ZONE = dict(
+    length=8.0, start_height=0.992, end_height=1.984, width=36.5, stone_type='abmessung_1',
+    is_two_zone=True, zone1_length=4.0, zone1_height=0.992, zone2_length=4.0, zone2_end_height=1.984
+)
+
+DOOR = {'x': 4.0, 'width': 2.0, 'bottom': 0.0, 'height': 1.5}
+
+
+class TestAggregation:
+    """Tests für die gemeinsame Rundung"""
+
+    def test_single_wall_matches_calculate_all(self):
+        """Test dass ein Projekt mit einer Mauer calculate_all() entspricht"""
+        for wall in (SMALL_WALL, TWO_ZONE):
+            result = aggregate_walls([wall], **PRICES)
+            expected = calculate_all(**wall, **PRICES)
+
+            assert result.totals['stones'] == expected['total_stones']
+            assert result.totals['cement_bags'] == expected['materials']['cement_bags']
+            assert result.totals['gravel_tons'] == expected['materials']['gravel_tons']
+            assert result.totals['rods_6m'] == expected['reinforcement']['rods_6m_needed']
+            assert result.costs == expected['costs']
+
+    def test_many_small_walls_round_once(self):
+        """Test dass 30 kleine Mauern nicht 30-mal aufgerundet werden"""
+        walls = [SMALL_WALL] * 30
+        single = calculate_all(**SMALL_WALL)
+        result = aggregate_walls(walls, **PRICES)
+
+        config = load_config()
+        cement_kg = 30 * single['volume_with_buffer_m3'] * config['concrete_mix']['cement_kg_per_m3']
+        assert result.standalone_totals['cement_bags'] == 30 * single['materials']['cement_bags']
+        assert result.totals['cement_bags'] == math.ceil(cement_kg / config['concrete_mix']['cement_bag_size_kg'])
+        assert result.totals['cement_bags'] < result.standalone_totals['cement_bags']
+        assert result.totals['rods_6m'] < result.standalone_totals['rods_6m']
+        assert result.savings['rods_6m'] == result.standalone_totals['rods_6m'] - result.totals['rods_6m']
+
+    def test_attribution_adds_up(self):
+        """Test dass die Anteile je Mauer die Projektsumme ergeben"""
+        walls = [SMALL_WALL, TWO_ZONE, dict(SMALL_WALL, stone_type='abmessung_2', width=30.0)]
+        result = aggregate_walls(walls, **PRICES)
+
+        assert result.per_wall['cement_bags_share'].sum() == pytest.approx(result.totals['cement_bags'])
+        assert result.per_wall['rods_6m_share'].sum() == pytest.approx(result.totals['rods_6m'])
+        assert result.per_wall['cost_share'].sum() == pytest.approx(result.costs['total_cost'], abs=0.01)
+        assert sum(result.stones_by_type.values()) == result.totals['stones']
+
+    def test_thousands_of_walls(self):
+        """Test dass 5000 Mauern in einem Durchlauf aggregiert werden (Laufzeit: Benchmark-Szenario)"""
+        walls = [dict(SMALL_WALL, length=1.0 + (i % 50) / 10) for i in range(5000)]
+        result = aggregate_walls(walls, **PRICES)
+        assert len(result.names) == 5000
+        assert result.per_wall['stones'].sum() == result.totals['stones']
+
+    def test_openings_match_calculate_all(self):
+        """Test dass Öffnungen wie in calculate_all() abgezogen werden"""
+        walls = [
+            dict(SMALL_WALL, length=10.0, start_height=1.984, end_height=1.984, openings=[DOOR]),
+            dict(TWO_ZONE, openings=[dict(DOOR, x=5.0, width=1.0, height=0.6)])
+        ]
+        for wall in walls:
+            result = aggregate_walls([wall], **PRICES)
+            expected = calculate_all(**wall, **PRICES)
+
+            assert result.totals['stones'] == expected['total_stones']
+            assert round(result.totals['volume_with_buffer_m3'], 3) == expected['volume_with_buffer_m3']
+            assert result.totals['rods_6m'] == expected['reinforcement']['rods_6m_needed']
+            assert result.costs == expected['costs']
+            assert project_cutting_plan(result) == reinforcement_plan(expected['reinforcement'], expected['layout'])
+
+    def test_invalid_opening(self):
+        """Test dass Öffnungen über das Mauerende abgelehnt werden"""
+        wall = dict(SMALL_WALL, length=10.0, name='Garage', openings=[dict(DOOR, x=50.0)])
+        with pytest.raises(ValueError, match="Garage"):
+            aggregate_walls([wall])
+
+    def test_invalid_wall(self):
+        """Test dass eine ungültige Mauer mit Namen gemeldet wird"""
+        with pytest.raises(ValueError, match="Garage"):
+            aggregate_walls([SMALL_WALL, dict(SMALL_WALL, length=0, name='Garage')])
+        with pytest.raises(ValueError):
+            aggregate_walls([])
+
+
+class TestProject:
+    """Tests für das Projektmodell und den Bericht"""
+
+    def test_add_wall_and_report(self):
+        """Test Namen, Zeilen je Mauer und CSV mit Projektsumme"""
+        project = Project("Reihenhäuser")
+        project.add_wall(SMALL_WALL, name="Beet")
+        project.add_wall(TWO_ZONE)
+        result = project.aggregate(**PRICES)
+
+        rows = project_rows(result)
+        assert [row['Mauer'] for row in rows] == ["Beet", "Mauer 2"]
+        lines = project_to_csv(result).strip().splitlines()
+        assert len(lines) == 4
+        assert lines[-1].startswith('Projekt gesamt,')
+
+    def test_without_prices(self):
+        """Test dass ohne Preise keine Kosten berechnet werden"""
+        result = aggregate_walls([SMALL_WALL])
+        assert result.costs is None
+        assert 'Kosten (€, Anteil)' not in project_rows(result)[0]
@@ -0,0 +1,114 @@
+"""
+Tests für den Schnittplan der Bewehrung (rebar_cutting.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all
+from project import aggregate_walls, project_cutting_plan
+from rebar_cutting import cutting_plan, pack_pieces, reinforcement_plan, split_runs
+
+
+class TestSplitRuns:
+    """Tests für die Zerlegung in ganze Stäbe und Reststücke"""
+
+    def test_short_run_is_one_piece(self):
+        """Test dass kurze Stränge nicht gestoßen werden"""
+        full, pieces, counts = split_runs([4500], [2], 6000, 400)
+        assert full == 0
+        assert pieces.tolist() == [4500] and counts.tolist() == [2]
+
+    def test_lap_lengths(self):
+        """Test Stöße: 12,5 m = 2 ganze Stäbe + 1,3 m (2 × 5,6 m Fortschritt)"""
+        full, pieces, counts = split_runs([12500], [3], 6000, 400)
+        assert full == 6
+        assert pieces.tolist() == [1300]
+        # Verlegte Länge = Strang + Stöße
+        assert 2 * 6000 + 1300 == 12500 + 2 * 400
+
+
+class TestPacking:
+    """Tests für Best-Fit-Decreasing"""
+
+    def test_best_fit_uses_offcuts(self):
+        """Test dass kurze Stücke in vorhandene Reste gelegt werden"""
+        closed, reusable = pack_pieces([4000, 2000], [1, 1], 6000)
+        assert closed == {(4000, 2000): 1}
+        assert not reusable
+
+    def test_small_offcut_is_scrap(self):
+        """Test dass Reste unter der Mindestlänge nicht mehr belegt werden"""
+        closed, reusable = pack_pieces([5700, 300], [1, 1], 6000, min_offcut_mm=500)
+        assert closed == {(5700,): 1}
+        # Der 300-mm-Schnitt kommt aus einem neuen Stab, dessen Rest verwendbar bleibt
+        assert reusable == {(300,): 1}
+
+    def test_piece_too_long(self):
+        """Test dass Stücke über der Lagerlänge abgelehnt werden"""
+        with pytest.raises(ValueError):
+            pack_pieces([6100], [1], 6000)
+
+
+class TestCuttingPlan:
+    """Tests für den vollständigen Schnittplan"""
+
+    def test_totals_add_up(self):
+        """Test dass Schnittlänge + Verschnitt = Anzahl Stäbe × 6 m"""
+        plan = cutting_plan(8.0, 16, lap_length_m=0.4, min_offcut_m=0.5)
+        assert plan['rods_needed'] == 24
+        assert plan['laps'] == 16
+        assert plan['cut_length_m'] + plan['waste_m'] == pytest.approx(24 * 6.0)
+        assert sum(p['count'] for p in plan['patterns']) == plan['rods_needed']
+
+    def test_single_and_array_path_agree(self):
+        """Test dass der Einzelmauer-Pfad dem Array-Pfad entspricht"""
+        for length, count in [(5.0, 4), (12.5, 12), (0.9, 6), (6.0, 3), (11.6, 2)]:
+            single = cutting_plan(length, count)
+            batch = cutting_plan([length], [count])
+            assert single['rods_needed'] == batch['rods_needed']
+            assert single['cut_list'] == batch['cut_list']
+            assert single['waste_m'] == batch['waste_m']
+
+    def test_lap_not_shorter_than_rod(self):
+        """Test dass eine zu lange Übergreifung abgelehnt wird"""
+        with pytest.raises(ValueError):
+            cutting_plan(10.0, 2, lap_length_m=6.0)
+
+    def test_tens_of_thousands_of_cuts(self):
+        """Test Plan mit über 50.000 Schnitten (Laufzeit: Benchmark-Szenario)"""
+        rng = np.random.default_rng(0)
+        lengths = rng.uniform(1, 25, 3000).round(2)
+        counts = rng.integers(2, 20, 3000)
+
+        plan = cutting_plan(lengths, counts)
+        assert sum(cut['count'] for cut in plan['cut_list']) > 50000
+        assert plan['cut_length_m'] + plan['waste_m'] == pytest.approx(plan['rods_needed'] * 6.0)
+
+
+class TestIntegration:
+    """Tests für Mauer- und Projektergebnisse"""
+
+    def test_reinforcement_plan(self):
+        """Test Schnittplan aus dem Ergebnis von calculate_all()"""
+        rebar = calculate_all(12.5, 1.488, 1.488, 36.5, 'abmessung_1')['reinforcement']
+        plan = reinforcement_plan(rebar)
+        assert plan == cutting_plan(12.5, rebar['rows'] * rebar['rods_per_row'])
+        # Preisbasis unverändert: Gesamtlänge ÷ 6 m
+        assert rebar['rods_6m_needed'] == 25
+
+    def test_project_plan_shares_offcuts(self):
+        """Test dass Reste zwischen Mauern geteilt werden"""
+        walls = [dict(length=length, start_height=1.24, end_height=1.24, width=36.5, stone_type='abmessung_1')
+                 for length in (2.5, 3.4, 2.5, 3.4)]
+        project = project_cutting_plan(aggregate_walls(walls))
+        separate = sum(
+            reinforcement_plan(calculate_all(**wall)['reinforcement'])['rods_needed'] for wall in walls
+        )
+        assert project['rods_needed'] < separate
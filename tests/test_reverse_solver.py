@@ -0,0 +1,65 @@
+"""
+Tests für die Rückwärtsrechnung (reverse_solver.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all
+from reverse_solver import solve_height, solve_length
+
+PRICES = dict(cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0)
+
+
+class TestSolveLength:
+    """Tests für die größte Länge"""
+
+    def test_budget_boundary(self):
+        """Test dass 1 cm mehr das Budget überschreitet (Stufen durch Aufrunden)"""
+        solution = solve_length('cost', 2000, 1.24, 1.24, 'abmessung_1', **PRICES)
+        length = solution['length']
+
+        fits = calculate_all(length, 1.24, 1.24, 36.5, 'abmessung_1', **PRICES)
+        too_long = calculate_all(round(length + 0.01, 2), 1.24, 1.24, 36.5, 'abmessung_1', **PRICES)
+        assert fits['costs']['total_cost'] == solution['value'] <= 2000
+        assert too_long['costs']['total_cost'] > 2000
+
+    def test_volume_and_stones(self):
+        """Test Beton- und Steinvorgaben"""
+        volume = solve_length('volume', 1.5, 0.992, 0.992, 'abmessung_1')
+        result = calculate_all(volume['length'], 0.992, 0.992, 36.5, 'abmessung_1')
+        assert result['volume_with_buffer_m3'] <= 1.5
+
+        stones = solve_length('stones', 100, 0.992, 0.992, 'abmessung_1')
+        assert calculate_all(stones['length'], 0.992, 0.992, 36.5, 'abmessung_1')['total_stones'] == 100
+
+    def test_many_targets_at_once(self):
+        """Test mehrere Ziele in einem Aufruf, Obergrenze und zu kleines Ziel"""
+        solution = solve_length('stones', [0, 50, 100, 1e6], 0.992, 0.992, 'abmessung_1')
+        assert solution['length'][0] == 0
+        assert np.all(np.diff(solution['length']) > 0)
+        assert solution['at_limit'].tolist() == [False, False, False, True]
+
+    def test_invalid_target(self):
+        """Test dass unbekannte Zielgrößen abgelehnt werden"""
+        with pytest.raises(ValueError):
+            solve_length('weight', 100, 1.0, 1.0, 'abmessung_1')
+
+
+class TestSolveHeight:
+    """Tests für die größte Höhe in ganzen Reihen"""
+
+    def test_whole_courses(self):
+        """Test dass die Höhe ein Vielfaches der Steinhöhe ist"""
+        solution = solve_height('cost', 2000, 10.0, 'abmessung_1', **PRICES)
+        assert solution['height'] == pytest.approx(solution['rows'] * 0.248)
+
+        higher = (solution['rows'] + 1) * 0.248
+        result = calculate_all(10.0, higher, higher, 36.5, 'abmessung_1', **PRICES)
+        assert result['costs']['total_cost'] > 2000
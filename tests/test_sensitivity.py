@@ -0,0 +1,94 @@
+"""
+Tests für Preis-Sensitivität und Sweeps (sensitivity.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config_store
+from calculations import calculate_all
+from config_store import make_snapshot, thaw
+from sensitivity import price_sweep, relative_axis, sweep_to_csv, tornado
+
+
+WALL = dict(
+    length=8.0, start_height=1.984, end_height=0.992, width=36.5, stone_type='abmessung_1',
+    cement_price=5.0, gravel_price=34.0, stone_price=2.5, rebar_price=6.0
+)
+
+
+class TestPriceSweep:
+    """Tests für Preisraster"""
+
+    def test_grid_matches_calculate_all(self):
+        """Test dass jeder Rasterpunkt calculate_all() entspricht"""
+        cement = [4.0, 5.5, 7.25]
+        gravel = [30.0, 41.5]
+        sweep = price_sweep(WALL, {'cement_price': cement, 'gravel_price': gravel})
+
+        assert sweep.total_cost.shape == (3, 2)
+        for i, cement_price in enumerate(cement):
+            for j, gravel_price in enumerate(gravel):
+                expected = calculate_all(**dict(WALL, cement_price=cement_price, gravel_price=gravel_price))
+                assert sweep.total_cost[i, j] == expected['costs']['total_cost']
+
+    def test_buffer_axis_changes_quantities(self, monkeypatch):
+        """Test dass die Puffer-Achse der Berechnung mit geändertem Puffer entspricht"""
+        sweep = price_sweep(WALL, {'buffer_percentage': [10.0, 25.0]})
+
+        changed = thaw(config_store.get_config())
+        changed['buffer']['percentage'] = 25.0
+        monkeypatch.setattr(config_store.default_store, '_snapshot', make_snapshot(changed, version=99))
+        monkeypatch.setattr(config_store.default_store, '_next_check', float('inf'))
+
+        assert sweep.total_cost[1] == calculate_all(**WALL)['costs']['total_cost']
+        assert sweep.total_cost[0] < sweep.total_cost[1]
+
+    def test_million_combinations(self):
+        """Test dass 100 × 100 × 100 Kombinationen ein Raster ergeben (Laufzeit: Benchmark-Szenario)"""
+        sweep = price_sweep(WALL, {
+            'cement_price': relative_axis(5.0, points=100),
+            'gravel_price': relative_axis(34.0, points=100),
+            'stone_price': relative_axis(2.5, points=100)
+        })
+        assert sweep.total_cost.shape == (100, 100, 100)
+
+    def test_unknown_parameter(self):
+        """Test dass unbekannte Parameter abgelehnt werden"""
+        with pytest.raises(ValueError):
+            price_sweep(WALL, {'water_price': [1.0]})
+
+    def test_csv_export(self):
+        """Test CSV mit einer Zeile pro Kombination"""
+        sweep = price_sweep(WALL, {'cement_price': [4.0, 6.0], 'stone_price': [2.0, 3.0, 4.0]})
+        lines = sweep_to_csv(sweep).strip().splitlines()
+
+        assert lines[0] == 'Zement (€/Sack),Schalstein (€/St.),Gesamtkosten (€)'
+        assert len(lines) == 1 + 6
+        assert lines[1].split(',')[:2] == ['4.00', '2.00']
+        assert float(lines[1].split(',')[2]) == sweep.total_cost[0, 0]
+
+
+class TestTornado:
+    """Tests für die Einzelvariation der Parameter"""
+
+    def test_sorted_by_swing(self):
+        """Test dass der einflussreichste Parameter zuerst kommt"""
+        rows = tornado(WALL, spread=0.2)
+        swings = [row['swing'] for row in rows]
+        assert swings == sorted(swings, reverse=True)
+        assert {row['parameter'] for row in rows} == {
+            'cement_price', 'gravel_price', 'stone_price', 'rebar_price', 'buffer_percentage'
+        }
+
+    def test_low_and_high_match_single_sweep(self):
+        """Test dass niedrig/hoch den Einzel-Sweeps entsprechen"""
+        row = next(r for r in tornado(WALL, spread=0.1) if r['parameter'] == 'gravel_price')
+        sweep = price_sweep(WALL, {'gravel_price': [34.0 * 0.9, 34.0 * 1.1]})
+        assert [row['low_cost'], row['high_cost']] == sweep.total_cost.tolist()
+        assert row['base_cost'] == calculate_all(**WALL)['costs']['total_cost']
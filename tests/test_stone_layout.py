@@ -0,0 +1,90 @@
+"""
+Tests für ganze, halbe und geschnittene Steine im Verband (stone_layout.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all, get_stone_layout
+from stone_layout import classify_widths, layout_grid, stone_cuts
+from visualization import create_2d_view
+
+
+class TestStoneCuts:
+    """Tests für die Zählung je Reihe"""
+
+    def test_flat_wall_half_stones(self):
+        """Test Halbsteinversatz: ungerade Reihen beginnen und enden mit halbem Stein"""
+        # 5,0 m mit 50-cm-Steinen, 4 Reihen
+        cuts = stone_cuts(get_stone_layout(5.0, 0.992, 0.992, 'abmessung_4'))
+
+        assert cuts['courses'] == 4
+        assert cuts['full_stones'] == 2 * 10 + 2 * 9
+        assert cuts['half_stones'] == 4
+        assert cuts['cut_stones'] == 0
+        assert cuts['partial_courses'] == 0
+        assert [c['half'] for c in cuts['per_course']] == [0, 2, 0, 2]
+
+    def test_wall_end_cuts(self):
+        """Test dass Steine am Mauerende abgeschnitten werden"""
+        # 5,1 m: gerade Reihen enden mit 10 cm, ungerade mit 35 cm
+        cuts = stone_cuts(get_stone_layout(5.1, 0.496, 0.496, 'abmessung_4'))
+        assert [c['cut'] for c in cuts['per_course']] == [1, 1]
+        assert [c['half'] for c in cuts['per_course']] == [0, 1]
+
+    def test_slope_gives_partial_courses(self):
+        """Test dass obere Reihen bei Gefälle vor dem Mauerende enden"""
+        cuts = stone_cuts(get_stone_layout(8.0, 1.984, 0.496, 'abmessung_1'))
+        assert cuts['partial_courses'] > 0
+        assert not cuts['per_course'][0]['partial']
+        stones = [c['full'] + c['half'] + c['cut'] for c in cuts['per_course']]
+        assert stones == sorted(stones, reverse=True)
+
+    @pytest.mark.parametrize("wall", [
+        dict(length=8.3, start_height=1.984, end_height=0.496),
+        dict(length=12.0, start_height=0.744, end_height=1.736, is_two_zone=True,
+             zone1_length=4.5, zone1_height=0.744, zone2_length=7.5, zone2_end_height=1.736)
+    ])
+    def test_matches_2d_view(self, wall):
+        """Test dass die Zählung den Steinen der 2D-Ansicht entspricht"""
+        result = calculate_all(width=36.5, stone_type='abmessung_1', **wall)
+        fig = create_2d_view(result['layout'], 0.365)
+        drawn = sum(1 for shape in fig.layout.shapes if shape.type == 'rect')
+
+        assert result['stone_cuts']['layout_stones'] == drawn
+        assert result['stone_cuts']['courses'] == len(result['stone_cuts']['per_course'])
+
+    def test_matches_grid(self):
+        """Test dass die Zählung ohne Raster dem Raster aus layout_grid() entspricht"""
+        rng = np.random.default_rng(7)
+        for _ in range(200):
+            stone_type = str(rng.choice(['abmessung_1', 'abmessung_4']))
+            length = float(np.round(rng.uniform(0.2, 60.0), 2))
+            heights = np.round(rng.uniform(0.25, 2.5, size=2), 3)
+            if rng.random() < 0.5:
+                layout = get_stone_layout(length, heights[0], heights[1], stone_type)
+            else:
+                zone1_length = float(np.round(rng.uniform(0.1, length - 0.05), 2)) if length > 0.2 else length / 2
+                layout = calculate_all(length, heights[0], heights[1], 36.5, stone_type, is_two_zone=True,
+                                       zone1_length=zone1_length, zone1_height=float(heights[0]),
+                                       zone2_length=length - zone1_length,
+                                       zone2_end_height=float(heights[1]))['layout']
+
+            grid = layout_grid(layout)
+            present = grid['present']
+            is_full, is_half = classify_widths(grid['x_end'] - grid['x_start'], layout['stone_length_m'])
+            expected = [
+                {'full': int(f), 'half': int(h), 'cut': int(c), 'partial': bool(m > 0 and f + h + c > 0)}
+                for f, h, c, m in zip((present & is_full).sum(axis=1), (present & is_half).sum(axis=1),
+                                      (present & ~(is_full | is_half)).sum(axis=1),
+                                      (grid['visible'] & ~present).sum(axis=1))
+            ]
+            counted = [{key: c[key] for key in ('full', 'half', 'cut', 'partial')}
+                       for c in stone_cuts(layout)['per_course']]
+            assert counted == expected, layout
@@ -0,0 +1,112 @@
+"""
+Tests für die Vorschaubilder ohne Plotly (thumbnails.py)
+"""
+
+import re
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import thumbnails
+from calculations import calculate_all, get_stone_layout
+from thumbnails import PALETTE, data_uri, layout_hash, rasterize, render_png, render_svg, thumbnail
+
+TWO_ZONE = dict(is_two_zone=True, zone1_length=4.0, zone1_height=1.24, zone2_length=6.0, zone2_end_height=0.5)
+
+
+def png_pixels(png: bytes) -> np.ndarray:
+    """Liest die Farbindizes aus einem PNG mit Palette (Filtertyp 0)"""
+    assert png[:8] == b'\x89PNG\r\n\x1a\n'
+    width, height = struct.unpack('>II', png[16:24])
+    start = png.index(b'IDAT') + 4
+    length = struct.unpack('>I', png[start - 8:start - 4])[0]
+    raw = np.frombuffer(zlib.decompress(png[start:start + length]), dtype=np.uint8).reshape(height, width + 1)
+    assert not raw[:, 0].any()
+    return raw[:, 1:]
+
+
+class TestSvg:
+    """Tests für die SVG-Ansicht"""
+
+    def test_one_rect_per_stone(self):
+        """Test je gesetztem Stein ein Rechteck (plus Hintergrund)"""
+        result = calculate_all(8.0, 1.0, 0.75, 36.5, 'abmessung_1')
+        svg = render_svg(result['layout'])
+        assert svg.startswith('<svg') and svg.endswith('</svg>')
+        assert svg.count('<rect') == result['stone_cuts']['layout_stones'] + 1
+
+    def test_zones_and_openings(self):
+        """Test Zone 2 hellblau und Öffnungen mit rotem Rand"""
+        opening = dict(x=1.0, width=0.5, bottom=0.0, height=0.5)
+        result = calculate_all(10.0, 1.24, 0.5, 36.5, 'abmessung_1', openings=[opening], **TWO_ZONE)
+        svg = render_svg(result['layout'])
+        assert 'fill="#add8e6"' in svg
+        assert svg.count('stroke="#dc0000"') == 1
+        assert svg.count('<rect') == result['stone_cuts']['layout_stones'] + 2
+
+    def test_inside_image(self):
+        """Test dass alle Steine im Bild liegen"""
+        svg = render_svg(get_stone_layout(3.0, 2.0, 1.0, 'abmessung_1'), 200, 100)
+        values = [float(v) for v in re.findall(r'(?:x|y)="([-\d.]+)"', svg)]
+        assert min(values) >= 0 and max(values) <= 200
+
+
+class TestPng:
+    """Tests für die gerasterte Ansicht"""
+
+    def test_png_structure(self):
+        """Test Signatur, Größe und lesbare Bilddaten"""
+        png = render_png(get_stone_layout(8.0, 1.0, 0.75, 'abmessung_1'), 160, 90)
+        pixels = png_pixels(png)
+        assert pixels.shape == (90, 160)
+        assert set(np.unique(pixels)) <= set(range(len(PALETTE)))
+
+    def test_colors(self):
+        """Test Steine, Fugen, Zone 2 und Öffnungsrand im Bild"""
+        opening = dict(x=1.0, width=0.5, bottom=0.0, height=0.5)
+        result = calculate_all(10.0, 1.24, 0.5, 36.5, 'abmessung_1', openings=[opening], **TWO_ZONE)
+        used = set(np.unique(rasterize(result['layout'], 400, 120)).tolist())
+        assert used == set(range(len(PALETTE)))
+
+    def test_stone_area(self):
+        """Test Fläche der Steine ungefähr wie die Fläche aller Reihen"""
+        layout = get_stone_layout(6.0, 1.5, 1.5, 'abmessung_1')
+        height = layout['rows_start'] * layout['stone_height_m']
+        pixels = rasterize(layout, 300, 100)
+        filled = np.isin(pixels, [PALETTE.index('zone1'), PALETTE.index('joint')]).sum()
+        scale = min(292 / 6.0, 92 / height)
+        assert filled == pytest.approx(6.0 * height * scale ** 2, rel=0.05)
+
+
+class TestCache:
+    """Tests für Hash und Zwischenspeicher"""
+
+    def test_hash(self):
+        """Test gleicher Hash für gleiche Layouts, anderer bei Öffnungen"""
+        layout = get_stone_layout(8.0, 1.0, 0.75, 'abmessung_1')
+        assert layout_hash(layout) == layout_hash(dict(layout))
+        assert layout_hash(layout) != layout_hash(dict(layout, openings=[dict(x=1.0, width=0.5, bottom=0.0, height=0.5)]))
+
+    def test_cache(self):
+        """Test Treffer im Zwischenspeicher und Leeren bei voller Größe"""
+        thumbnails._cache.clear()
+        layout = get_stone_layout(8.0, 1.0, 0.75, 'abmessung_1')
+        first = thumbnail(layout, 'png')
+        assert thumbnail(dict(layout), 'png') is first
+        assert thumbnail(layout) != first
+        assert len(thumbnails._cache) == 2
+        with pytest.raises(ValueError):
+            thumbnail(layout, 'gif')
+
+    def test_data_uri(self):
+        """Test data:-URLs für SVG und PNG"""
+        layout = get_stone_layout(8.0, 1.0, 0.75, 'abmessung_1')
+        assert data_uri(thumbnail(layout)).startswith('data:image/svg+xml;base64,')
+        assert data_uri(thumbnail(layout, 'png')).startswith('data:image/png;base64,')
@@ -0,0 +1,97 @@
+"""
+Tests für die Kachelansicht langer Mauern (tiled_view.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from calculations import calculate_all
+from tiled_view import (
+    MAX_DETAIL_STONES, detail_stones, layout_index, overview_bands, use_tiled_view, visible_range
+)
+from visualization import create_tiled_2d_view
+
+OPENING = dict(x=5.0, width=1.0, bottom=0.0, height=0.5)
+TWO_ZONE = dict(is_two_zone=True, zone1_length=150.0, zone1_height=1.24, zone2_length=150.0, zone2_end_height=0.5)
+
+
+def brute_force(index, x_min, x_max):
+    """Steine im Ausschnitt durch Vergleich aller Steine"""
+    return np.nonzero((index.x_end > x_min) & (index.x_start < x_max))[0]
+
+
+class TestLayoutIndex:
+    """Tests für Index und Bereichssuche"""
+
+    def test_index_matches_stone_count(self):
+        """Test Index enthält alle gesetzten Steine, sortiert nach Schlüssel"""
+        result = calculate_all(30.0, 1.5, 1.0, 36.5, 'abmessung_1', openings=[OPENING])
+        index = layout_index(result['layout'])
+        assert index.stones == result['stone_cuts']['layout_stones']
+        assert np.all(np.diff(index.start_key) > 0)
+        assert np.all(np.diff(index.end_key) > 0)
+
+    def test_cache(self):
+        """Test gleicher Index für gleiches Layout"""
+        result = calculate_all(30.0, 1.5, 1.0, 36.5, 'abmessung_1')
+        assert layout_index(result['layout']) is layout_index(dict(result['layout']))
+
+    @pytest.mark.parametrize('x_range', [(0.0, 20.0), (12.3, 12.4), (-5.0, 300.0), (29.9, 40.0), (40.0, 50.0)])
+    def test_detail_matches_brute_force(self, x_range):
+        """Test Bereichssuche gegen Vergleich aller Steine"""
+        result = calculate_all(30.0, 1.5, 1.0, 36.5, 'abmessung_1', openings=[OPENING])
+        index = layout_index(result['layout'])
+        stones = detail_stones(index, *x_range)
+        expected = brute_force(index, *x_range)
+        np.testing.assert_array_equal(stones['x_start'], index.x_start[expected])
+        np.testing.assert_array_equal(stones['y_bottom'], index.course[expected] * index.stone_height)
+        first, last = visible_range(index, *x_range)
+        assert (last - first).sum() == expected.size
+
+    def test_overview_bands(self):
+        """Test Bänder je Reihe, getrennt an Öffnung und Zonengrenze"""
+        result = calculate_all(300.0, 1.24, 0.5, 36.5, 'abmessung_1', **TWO_ZONE)
+        index = layout_index(result['layout'])
+        bands = overview_bands(index)
+        # Je Reihe höchstens ein Band je Zone
+        assert bands['x_start'].size <= 2 * index.courses
+        assert bands['x_start'].size < index.stones / 100
+        assert set(bands['zone2'].tolist()) == {False, True}
+
+        result = calculate_all(30.0, 1.5, 1.0, 36.5, 'abmessung_1', openings=[OPENING])
+        bands = overview_bands(layout_index(result['layout']))
+        # Unterste Reihen sind an der Öffnung getrennt
+        assert (bands['y_bottom'] == 0).sum() == 2
+
+
+class TestTiledFigure:
+    """Tests für die Kachelansicht als Figure"""
+
+    def test_payload_bounded(self):
+        """Test Größe der Figure unabhängig von der Mauerlänge"""
+        sizes = []
+        for length in (30.0, 300.0):
+            result = calculate_all(length, 1.5, 1.0, 36.5, 'abmessung_1')
+            sizes.append(len(create_tiled_2d_view(result['layout'], 0.365, (0.0, 20.0)).to_json()))
+        assert sizes[1] < 1.5 * sizes[0]
+
+    def test_overview_only_for_wide_range(self):
+        """Test nur Übersicht, wenn der Ausschnitt zu viele Steine enthält"""
+        result = calculate_all(300.0, 1.24, 0.5, 36.5, 'abmessung_1', **TWO_ZONE)
+        assert result['stone_cuts']['layout_stones'] > MAX_DETAIL_STONES
+        fig = create_tiled_2d_view(result['layout'], 0.365, (0.0, 300.0))
+        assert {trace.name for trace in fig.data} == {'Übersicht', 'Übersicht Zone 2'}
+        fig = create_tiled_2d_view(result['layout'], 0.365, (140.0, 160.0))
+        assert {'Steine', 'Steine Zone 2'} <= {trace.name for trace in fig.data}
+        assert list(fig.layout.xaxis.range) == [140.0, 160.0]
+
+    def test_use_tiled_view(self):
+        """Test Kachelansicht nur für große Mauern"""
+        assert not use_tiled_view(calculate_all(8.0, 1.0, 0.75, 36.5, 'abmessung_1')['layout'])
+        assert use_tiled_view(calculate_all(300.0, 1.0, 0.75, 36.5, 'abmessung_1')['layout'])
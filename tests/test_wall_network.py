@@ -0,0 +1,143 @@
+"""
+Tests für Mauerzüge im Grundriss (wall_network.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Füge parent directory zum path hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from project import aggregate_walls
+from visualization import create_network_3d_view, create_network_plan_view
+from wall_network import aggregate_network, footprints, network_geometry, segment_rows
+
+STONE = 'abmessung_1'
+WIDTH_M = 0.365
+
+
+def segment(start, end, start_height=1.0, end_height=None, **extra):
+    data = dict(start=start, end=end, start_height=start_height, **extra)
+    if end_height is not None:
+        data['end_height'] = end_height
+    return data
+
+
+# T-Anschluss: durchlaufende Mauer bei x = 5 geteilt, Abzweig nach oben
+T_SHAPE = [segment((0, 0), (5, 0)), segment((5, 0), (10, 0)), segment((5, 0), (5, 4))]
+
+
+class TestNetworkGeometry:
+    """Tests für Knoten, Knotenarten und Kürzungen"""
+
+    def test_l_corner_not_trimmed(self):
+        """Test dass eine Ecke mit Achsmaßen nicht gekürzt wird"""
+        geometry = network_geometry([segment((0, 0), (5, 0)), segment((5, 0), (5, 3))], STONE)
+        assert sorted(geometry.node_kind) == ['corner', 'end', 'end']
+        np.testing.assert_allclose(geometry.length, [5.0, 3.0])
+
+    def test_straight_joint(self):
+        """Test dass zwei gerade durchlaufende Stücke einen Stoß bilden"""
+        geometry = network_geometry([segment((0, 0), (5, 0)), segment((5, 0), (9, 0))], STONE)
+        assert sorted(geometry.node_kind) == ['end', 'end', 'straight']
+
+    def test_t_junction_trim(self):
+        """Test dass am T-Anschluss zusammen eine halbe Wandstärke abgezogen wird"""
+        geometry = network_geometry(T_SHAPE, STONE)
+        assert geometry.node_kind.count('junction') == 1
+        assert geometry.length.sum() == pytest.approx(14.0 - WIDTH_M / 2)
+
+    def test_cross_trim(self):
+        """Test dass an einer Kreuzung eine ganze Wandstärke abgezogen wird"""
+        arms = [segment((0, 0), end) for end in ((3, 0), (-3, 0), (0, 3), (0, -3))]
+        geometry = network_geometry(arms, STONE)
+        assert geometry.length.sum() == pytest.approx(12.0 - WIDTH_M)
+
+    def test_node_tolerance(self):
+        """Test dass Endpunkte unter 1 mm Abstand zusammenfallen"""
+        geometry = network_geometry([segment((0, 0), (5, 0)), segment((5.0004, 0), (5, 3))], STONE)
+        assert len(geometry.points) == 3
+
+    def test_trimmed_heights_follow_slope(self):
+        """Test dass die Höhen an gekürzten Enden dem Gefälle folgen"""
+        segments = [segment((0, 0), (5, 0)), segment((5, 0), (10, 0)), segment((5, 0), (5, 4), 2.0, 1.0)]
+        geometry = network_geometry(segments, STONE)
+        trim = geometry.trim_start[2]
+        assert trim > 0
+        assert geometry.start_height[2] == pytest.approx(2.0 - trim / 4)
+        assert geometry.end_height[2] == pytest.approx(1.0)
+
+    def test_invalid(self):
+        """Test leere Mauerzüge, Stücke ohne Länge und fehlenden Steintyp"""
+        with pytest.raises(ValueError):
+            network_geometry([], STONE)
+        with pytest.raises(ValueError, match="Stück 1"):
+            network_geometry([segment((1, 1), (1, 1))], STONE)
+        with pytest.raises(ValueError, match="Steintyp"):
+            network_geometry([segment((0, 0), (1, 0))])
+        with pytest.raises(ValueError, match="kürzer"):
+            network_geometry([segment((0, 0), (5, 0)), segment((5, 0), (10, 0)), segment((5, 0), (5, 0.05))], STONE)
+
+
+class TestAggregateNetwork:
+    """Tests für die Mengen eines Mauerzugs"""
+
+    def test_matches_project_of_trimmed_walls(self):
+        """Test dass der Mauerzug dem Projekt aus den gekürzten Stücken entspricht"""
+        result = aggregate_network(T_SHAPE, STONE)
+        walls = [
+            dict(length=length, start_height=1.0, end_height=1.0, width=36.5, stone_type=STONE)
+            for length in result.geometry.length
+        ]
+        assert result.project.totals == aggregate_walls(walls).totals
+
+    def test_junction_stones_saved(self):
+        """Test dass an vielen Anschlüssen Steine gespart werden"""
+        segments = [segment((3.0 * i, 0), (3.0 * (i + 1), 0)) for i in range(20)]
+        segments += [segment((3.0 * i, 0), (3.0 * i, 2)) for i in range(1, 20)]
+        result = aggregate_network(segments, STONE)
+        assert result.saved_stones > 0
+        assert result.project.totals['stones'] == result.uncorrected_stones - result.saved_stones
+
+    def test_costs(self):
+        """Test Kosten für den ganzen Mauerzug"""
+        result = aggregate_network(T_SHAPE, STONE, cement_price=5.0, gravel_price=34.0, stone_price=2.5)
+        assert result.project.costs['total_cost'] > 0
+
+    def test_segment_rows(self):
+        """Test Tabellenzeilen je Stück"""
+        rows = segment_rows(aggregate_network(T_SHAPE, STONE))
+        assert [row['Stück'] for row in rows] == ['Stück 1', 'Stück 2', 'Stück 3']
+        assert rows[0]['Gerechnet (m)'] < rows[0]['Achslänge (m)']
+
+    def test_hundreds_of_segments(self):
+        """Test Mauerzug mit Hunderten Stücken (Laufzeit: Benchmark-Szenario)"""
+        segments = [segment((3.0 * i, 0), (3.0 * (i + 1), 0)) for i in range(300)]
+        segments += [segment((3.0 * i, 0), (3.0 * i, 2)) for i in range(1, 300)]
+        result = aggregate_network(segments, STONE)
+        assert len(result.geometry.names) == 599
+
+
+class TestNetworkViews:
+    """Tests für Grundriss und 3D-Ansicht"""
+
+    def test_footprints_extended_at_joints(self):
+        """Test dass Rechtecke an Ecken um die halbe Wandstärke verlängert werden"""
+        geometry = network_geometry([segment((0, 0), (5, 0)), segment((5, 0), (5, 3))], STONE)
+        corners = footprints(geometry)
+        assert corners.shape == (2, 4, 2)
+        assert corners[0, :, 0].min() == pytest.approx(0.0)
+        assert corners[0, :, 0].max() == pytest.approx(5.0 + WIDTH_M / 2)
+
+    def test_single_buffers(self):
+        """Test dass alle Stücke in einer Trace bzw. einem Mesh liegen"""
+        geometry = network_geometry(T_SHAPE, STONE)
+        plan = create_network_plan_view(geometry)
+        assert len(plan.data[0].x) == 3 * 6
+        mesh = create_network_3d_view(geometry)
+        assert len(mesh.data) == 1
+        assert len(mesh.data[0].x) == 3 * 8
+        assert len(mesh.data[0].i) == 3 * 12
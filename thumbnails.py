@@ -0,0 +1,249 @@
+"""
+Vorschaubilder der Mauer ohne Plotly (SVG und PNG)
+
+Für Angebotslisten, E-Mails und die Vorlagen-Galerie werden viele kleine
+Ansichten gebraucht; der Weg über Plotly-Figure und Kaleido dauert pro
+Bild Sekunden. Hier wird der Verband (layout_grid(), wie in
+create_2d_view()) direkt gezeichnet:
+
+- SVG: ein <rect> je Stein, alle Koordinaten in einem Array und mit einer
+  einzigen Formatierung in den Text geschrieben
+- PNG: Rasterung mit NumPy (Stein je Pixel aus Reihe und Position, Fugen
+  dort, wo sich der Stein zum Nachbarpixel ändert), kodiert mit zlib
+
+Zone 2 einer 2-Zonen-Mauer ist hellblau, Öffnungen sind weiß mit rotem
+Rand. Ergebnisse werden nach einem Hash des Layouts zwischengespeichert.
+"""
+
+import base64
+import hashlib
+import json
+import struct
+import zlib
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+from stone_layout import course_count, layout_grid
+
+
+# Standardgröße in Pixeln und Rand
+THUMBNAIL_WIDTH = 240
+THUMBNAIL_HEIGHT = 120
+PADDING_PX = 4
+
+# Farben wie in der 2D-Ansicht (RGB)
+COLORS = {
+    'background': (255, 255, 255),
+    'zone1': (211, 211, 211),
+    'zone2': (173, 216, 230),
+    'joint': (60, 60, 60),
+    'opening': (220, 0, 0)
+}
+
+# Farbindizes der Rasterung
+PALETTE = ('background', 'zone1', 'zone2', 'joint', 'opening')
+
+# Größe des Zwischenspeichers (Einträge)
+CACHE_SIZE = 1024
+
+_cache: Dict[Tuple, Union[str, bytes]] = {}
+
+
+def layout_hash(layout: Dict) -> str:
+    """Stabiler Hash eines Layouts (inkl. Zonen und Öffnungen)"""
+    text = json.dumps(layout, sort_keys=True, default=float, separators=(',', ':'))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=12).hexdigest()
+
+
+def _fit(layout: Dict, width_px: int, height_px: int) -> Tuple[float, float, float]:
+    """Maßstab (Pixel je Meter) und Pixelposition des Mauerfußes links (Mauer mittig im Bild)"""
+    max_height = max(layout['start_height'], layout['end_height'], layout.get('zone1_height') or 0.0,
+                     course_count(layout) * layout['stone_height_m'])
+    scale = min((width_px - 2 * PADDING_PX) / layout['total_length'], (height_px - 2 * PADDING_PX) / max_height)
+    return scale, (width_px - layout['total_length'] * scale) / 2, (height_px + max_height * scale) / 2
+
+
+def _stones(layout: Dict) -> Dict[str, np.ndarray]:
+    """Gesetzte Steine: Raster aus layout_grid() und Zone je Stein"""
+    grid = layout_grid(layout)
+    zone2 = np.zeros(grid['present'].shape, dtype=bool)
+    if layout.get('is_two_zone', False):
+        zone2 = (grid['x_start'] + grid['x_end']) / 2 > layout['zone1_length']
+    grid['zone2'] = zone2
+    return grid
+
+
+def _rgb(key: str) -> str:
+    return '#%02x%02x%02x' % COLORS[key]
+
+
+def render_svg(layout: Dict, width_px: int = THUMBNAIL_WIDTH, height_px: int = THUMBNAIL_HEIGHT) -> str:
+    """
+    Zeichnet die Ansicht der Mauer als SVG
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        width_px, height_px: Bildgröße in Pixeln
+
+    Returns:
+        SVG-Dokument als Text
+    """
+    scale, left, base = _fit(layout, width_px, height_px)
+    grid = _stones(layout)
+    stone_height = layout['stone_height_m']
+    rows = np.nonzero(grid['present'])[0]
+    present = grid['present']
+
+    # Steine je Zone: x, y (oben), Breite, Höhe in Pixeln
+    x = left + grid['x_start'][present] * scale
+    w = (grid['x_end'] - grid['x_start'])[present] * scale
+    y = base - (rows + 1) * stone_height * scale
+    h = np.full(x.shape, stone_height * scale)
+    coordinates = np.column_stack([x, y, w, h])
+    zone2 = grid['zone2'][present]
+
+    rect = '<rect x="%.1f" y="%.1f" width="%.1f" height="%.1f"/>'
+    groups = []
+    for key, mask in (('zone1', ~zone2), ('zone2', zone2)):
+        if mask.any():
+            values = coordinates[mask]
+            groups.append(f'<g fill="{_rgb(key)}">' + (rect * len(values)) % tuple(values.ravel().tolist()) + '</g>')
+
+    openings = ''.join(
+        rect.replace('/>', f' fill="white" stroke="{_rgb("opening")}"/>') % (
+            left + o['x'] * scale, base - (o['bottom'] + o['height']) * scale,
+            o['width'] * scale, o['height'] * scale)
+        for o in layout.get('openings', [])
+    )
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width_px}" height="{height_px}" '
+        f'viewBox="0 0 {width_px} {height_px}">'
+        f'<rect width="100%" height="100%" fill="white"/>'
+        f'<g stroke="{_rgb("joint")}" stroke-width="0.5">{"".join(groups)}</g>{openings}</svg>'
+    )
+
+
+def _edges(labels: np.ndarray) -> np.ndarray:
+    """Pixel, deren oberer, unterer, linker oder rechter Nachbar anders ist"""
+    edges = np.zeros(labels.shape, dtype=bool)
+    vertical = labels[1:] != labels[:-1]
+    horizontal = labels[:, 1:] != labels[:, :-1]
+    edges[1:] |= vertical
+    edges[:-1] |= vertical
+    edges[:, 1:] |= horizontal
+    edges[:, :-1] |= horizontal
+    return edges
+
+
+def rasterize(layout: Dict, width_px: int = THUMBNAIL_WIDTH, height_px: int = THUMBNAIL_HEIGHT) -> np.ndarray:
+    """
+    Rastert die Ansicht der Mauer
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        width_px, height_px: Bildgröße in Pixeln
+
+    Returns:
+        Farbindex je Pixel (Höhe × Breite, uint8; Reihenfolge wie PALETTE)
+    """
+    scale, left, base = _fit(layout, width_px, height_px)
+    grid = _stones(layout)
+    stone_length = layout['stone_length_m']
+    courses, positions = grid['present'].shape
+
+    # Pixelmitten in Metern (y von unten); Reihe je Pixelzeile, Position je Pixelspalte und Versatz
+    x = (np.arange(width_px) + 0.5 - left) / scale
+    y = (base - (np.arange(height_px) + 0.5)) / scale
+    course = np.floor(y / layout['stone_height_m']).astype(np.intp)
+    position = np.floor((x[None, :] + np.array([[0.0], [stone_length / 2]])) / stone_length).astype(np.intp)
+
+    # Stein je Pixel als Index in die Farbtabelle; Pixel außerhalb zeigen auf den letzten (freien) Eintrag
+    color_table = np.append(np.where(grid['present'], np.where(grid['zone2'], 2, 1), 0).ravel(), 0).astype(np.uint8)
+    invalid = color_table.size - 1
+    row_base = np.where((course >= 0) & (course < courses), course * positions, invalid)
+    outside = (position < 0) | (position >= positions) | ((x < 0) | (x >= layout['total_length']))[None, :]
+    position[outside] = invalid
+    stone = np.minimum(row_base[:, None] + position[course % 2], invalid)
+
+    # Öffnungen: Pixel frei, Rand rot
+    openings = layout.get('openings', [])
+    in_opening = np.zeros(stone.shape, dtype=bool)
+    for o in openings:
+        in_opening |= (((y >= o['bottom']) & (y < o['bottom'] + o['height']))[:, None]
+                       & ((x >= o['x']) & (x < o['x'] + o['width']))[None, :])
+    color = color_table[stone]
+    stone[(color == 0) | in_opening] = invalid
+    color[in_opening] = 0
+
+    # Fuge, wo ein Nachbarpixel zu einem anderen Stein gehört; Rand der Öffnungen
+    color[_edges(stone) & (stone != invalid)] = 3
+    if openings:
+        color[_edges(in_opening) & in_opening] = 4
+    return color
+
+
+def encode_png(indices: np.ndarray) -> bytes:
+    """Kodiert ein Bild aus Farbindizes (Höhe × Breite, uint8) als PNG mit Palette"""
+    height, width = indices.shape
+    # Filtertyp 0 (keiner) vor jeder Zeile
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), indices.astype(np.uint8, copy=False)], axis=1)
+    palette = bytes(value for key in PALETTE for value in COLORS[key])
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0))
+        + chunk(b'PLTE', palette)
+        + chunk(b'IDAT', zlib.compress(raw.tobytes(), 6))
+        + chunk(b'IEND', b'')
+    )
+
+
+def render_png(layout: Dict, width_px: int = THUMBNAIL_WIDTH, height_px: int = THUMBNAIL_HEIGHT) -> bytes:
+    """Zeichnet die Ansicht der Mauer als PNG (siehe rasterize())"""
+    return encode_png(rasterize(layout, width_px, height_px))
+
+
+def thumbnail(
+    layout: Dict,
+    fmt: str = 'svg',
+    width_px: int = THUMBNAIL_WIDTH,
+    height_px: int = THUMBNAIL_HEIGHT
+) -> Union[str, bytes]:
+    """
+    Vorschaubild mit Zwischenspeicher (Schlüssel: Layout-Hash, Format, Größe)
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        fmt: 'svg' (Text) oder 'png' (Bytes)
+        width_px, height_px: Bildgröße in Pixeln
+
+    Returns:
+        SVG-Text bzw. PNG-Bytes
+
+    Raises:
+        ValueError: bei unbekanntem Format
+    """
+    if fmt not in ('svg', 'png'):
+        raise ValueError(f"Unbekanntes Format: {fmt}")
+    key = (layout_hash(layout), fmt, width_px, height_px)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    image = render_svg(layout, width_px, height_px) if fmt == 'svg' else render_png(layout, width_px, height_px)
+    if len(_cache) >= CACHE_SIZE:
+        _cache.clear()
+    _cache[key] = image
+    return image
+
+
+def data_uri(image: Union[str, bytes]) -> str:
+    """Vorschaubild als data:-URL (z.B. für Bildspalten in Tabellen oder E-Mails)"""
+    if isinstance(image, str):
+        return 'data:image/svg+xml;base64,' + base64.b64encode(image.encode('utf-8')).decode('ascii')
+    return 'data:image/png;base64,' + base64.b64encode(image).decode('ascii')
@@ -0,0 +1,181 @@
+"""
+Kachelansicht für sehr lange Mauern (Übersicht + Details im Ausschnitt)
+
+Bei Mauern von einigen hundert Metern lädt die 2D-Ansicht jeden Stein in
+den Browser, auch wenn nur wenige Meter zu sehen sind. Die Kachelansicht
+liefert stattdessen:
+
+- eine Übersicht, in der die Steine jeder Reihe zu durchgehenden Bändern
+  zusammengefasst sind (getrennt an Öffnungen und an der Zonengrenze)
+- Steine nur für den sichtbaren Ausschnitt, gesucht per np.searchsorted
+  in einem einmal aufgebauten, sortierten Index aller gesetzten Steine
+
+Der Index wird nach dem Layout-Hash zwischengespeichert; Übersicht und
+Ausschnitt sind unabhängig von der Mauerlänge klein.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from stone_layout import layout_grid
+from thumbnails import layout_hash
+
+
+# Ab dieser Steinanzahl zeigt die App die Kachelansicht
+TILED_MIN_STONES = 1000
+
+# Höchstens so viele Steine im Ausschnitt, darüber nur die Übersicht
+MAX_DETAIL_STONES = 2000
+
+# Anfangsbreite des Ausschnitts in Metern
+DEFAULT_VIEWPORT_M = 20.0
+
+# Toleranz für Fugen zwischen Nachbarsteinen (1 mm)
+JOINT_TOLERANCE_M = 0.001
+
+
+@dataclass(frozen=True)
+class LayoutIndex:
+    """Gesetzte Steine sortiert nach Reihe und x, mit Suchschlüsseln je Reihe"""
+
+    x_start: np.ndarray
+    x_end: np.ndarray
+    course: np.ndarray
+    zone2: np.ndarray
+    # Schlüssel Reihe × span + x (aufsteigend über alle Steine)
+    start_key: np.ndarray
+    end_key: np.ndarray
+    span: float
+    courses: int
+    stone_height: float
+
+    @property
+    def stones(self) -> int:
+        return int(self.x_start.size)
+
+
+# Index pro Layout (Layout-Hash)
+_index_cache: Dict[str, LayoutIndex] = {}
+
+
+def layout_index(layout: Dict) -> LayoutIndex:
+    """
+    Sortierter Index aller gesetzten Steine
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+
+    Returns:
+        LayoutIndex (pro Layout zwischengespeichert)
+    """
+    cache_key = layout_hash(layout)
+    cached = _index_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    grid = layout_grid(layout)
+    # np.nonzero liefert Reihe für Reihe, innerhalb der Reihe nach x sortiert
+    course, position = np.nonzero(grid['present'])
+    x_start = grid['x_start'][course, position]
+    x_end = grid['x_end'][course, position]
+    zone2 = np.zeros(course.size, dtype=bool)
+    if layout.get('is_two_zone', False):
+        zone2 = (x_start + x_end) / 2 > layout['zone1_length']
+
+    span = layout['total_length'] + 1.0
+    index = LayoutIndex(
+        x_start=x_start,
+        x_end=x_end,
+        course=course,
+        zone2=zone2,
+        start_key=course * span + x_start,
+        end_key=course * span + x_end,
+        span=span,
+        courses=grid['present'].shape[0],
+        stone_height=layout['stone_height_m']
+    )
+
+    if len(_index_cache) > 32:
+        _index_cache.clear()
+    _index_cache[cache_key] = index
+    return index
+
+
+def visible_range(index: LayoutIndex, x_min: float, x_max: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bereiche der Steine, die in [x_min, x_max] liegen, je Reihe
+
+    Args:
+        index: Ergebnis von layout_index()
+        x_min, x_max: Ausschnitt in Metern
+
+    Returns:
+        (erster, hinter dem letzten) Steinindex je Reihe
+    """
+    # Auf die Mauer begrenzen, sonst reicht die Suche in die nächste Reihe
+    x_min, x_max = max(x_min, 0.0), min(x_max, index.span - 1.0)
+    base = np.arange(index.courses) * index.span
+    first = np.searchsorted(index.end_key, base + x_min, side='right')
+    last = np.searchsorted(index.start_key, base + x_max, side='left')
+    return first, np.maximum(last, first)
+
+
+def detail_stones(index: LayoutIndex, x_min: float, x_max: float) -> Dict[str, np.ndarray]:
+    """
+    Steine im Ausschnitt
+
+    Args:
+        index: Ergebnis von layout_index()
+        x_min, x_max: Ausschnitt in Metern
+
+    Returns:
+        Dictionary mit x_start, x_end, y_bottom und zone2 je Stein
+    """
+    first, last = visible_range(index, x_min, x_max)
+    counts = last - first
+    # Indizes aller Bereiche ohne Schleife: Start je Bereich plus laufende Nummer darin
+    selected = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return {
+        'x_start': index.x_start[selected],
+        'x_end': index.x_end[selected],
+        'y_bottom': index.course[selected] * index.stone_height,
+        'zone2': index.zone2[selected]
+    }
+
+
+def overview_bands(index: LayoutIndex) -> Dict[str, np.ndarray]:
+    """
+    Übersicht: Steine jeder Reihe zu Bändern zusammengefasst
+
+    Ein Band endet an einer Lücke (Öffnung, Gefälle), beim Reihenwechsel und
+    an der Zonengrenze.
+
+    Args:
+        index: Ergebnis von layout_index()
+
+    Returns:
+        Dictionary mit x_start, x_end, y_bottom und zone2 je Band
+    """
+    if not index.stones:
+        return {key: np.zeros(0) for key in ('x_start', 'x_end', 'y_bottom', 'zone2')}
+
+    breaks = (
+        (index.course[1:] != index.course[:-1])
+        | (index.x_start[1:] > index.x_end[:-1] + JOINT_TOLERANCE_M)
+        | (index.zone2[1:] != index.zone2[:-1])
+    )
+    starts = np.concatenate([[0], np.nonzero(breaks)[0] + 1])
+    ends = np.concatenate([starts[1:] - 1, [index.stones - 1]])
+    return {
+        'x_start': index.x_start[starts],
+        'x_end': index.x_end[ends],
+        'y_bottom': index.course[starts] * index.stone_height,
+        'zone2': index.zone2[starts]
+    }
+
+
+def use_tiled_view(layout: Dict) -> bool:
+    """Kachelansicht statt vollständiger 2D-Ansicht (große Mauern)"""
+    return layout['stones_per_row'] * max(layout['rows_start'], layout['rows_end']) > TILED_MIN_STONES
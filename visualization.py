@@ -7,7 +7,26 @@ import plotly.express as px
 from typing import Dict, List, Tuple
 import numpy as np
 
+from instrumentation import timed
+from openings import opening_arrays
+from sensitivity import SWEEP_LABELS
+from stone_layout import layout_grid
+from tiled_view import MAX_DETAIL_STONES, detail_stones, layout_index, overview_bands
+from wall_network import NODE_KINDS, NetworkGeometry, footprints
 
+
+def _removed_stones(layout: Dict) -> np.ndarray:
+    """Wegen Öffnungen entfallende Steine (Reihen × Positionen), sonst leeres Array"""
+    if not layout.get('openings'):
+        return np.zeros((0, 0), dtype=bool)
+    return layout_grid(layout)['removed']
+
+
+def _is_removed(removed: np.ndarray, row: int, stone_idx: int) -> bool:
+    return row < removed.shape[0] and bool(removed[row, stone_idx])
+
+
+@timed('create_2d_view')
 def create_2d_view(layout: Dict, stone_width_m: float) -> go.Figure:
     """
     Erstellt eine 2D-Ansicht der Mauer (Seitenansicht mit versetztem Mauerwerk)
@@ -65,6 +84,7 @@ def create_2d_view(layout: Dict, stone_width_m: float) -> go.Figure:
     annotations = []
     
     stone_count = 0
+    removed = _removed_stones(layout)
     
     # Für jede Position entlang der Länge
     for row in range(max(rows_start, rows_end)):
@@ -113,6 +133,10 @@ def create_2d_view(layout: Dict, stone_width_m: float) -> go.Figure:
             if current_height_at_start >= max_height_at_position:
                 continue
             
+            # Stein entfällt wegen einer Öffnung
+            if _is_removed(removed, row, stone_idx):
+                continue
+            
             y_bottom = row * stone_height
             y_top = y_bottom + stone_height
             
@@ -130,6 +154,19 @@ def create_2d_view(layout: Dict, stone_width_m: float) -> go.Figure:
             
             stone_count += 1
     
+    # Öffnungen über die angeschnittenen Steine legen
+    for opening in layout.get('openings', []):
+        shapes.append({
+            'type': 'rect',
+            'x0': opening['x'],
+            'y0': opening['bottom'],
+            'x1': opening['x'] + opening['width'],
+            'y1': opening['bottom'] + opening['height'],
+            'line': {'color': 'red', 'width': 2, 'dash': 'dot'},
+            'fillcolor': 'white',
+            'opacity': 1.0
+        })
+    
     # Füge Trennlinie zwischen Zonen hinzu (falls 2-Zonen)
     if is_two_zone:
         shapes.append({
@@ -210,6 +247,95 @@ def create_2d_view(layout: Dict, stone_width_m: float) -> go.Figure:
     return fig
 
 
+def _rect_outlines(x_start: np.ndarray, x_end: np.ndarray, y_bottom: np.ndarray, y_top: np.ndarray) -> np.ndarray:
+    """Rechtecke als ein Linienzug: 4 Ecken, zurück zur ersten, Trenner (NaN), auf mm gerundet"""
+    nan = np.full(x_start.shape, np.nan)
+    x = np.column_stack([x_start, x_end, x_end, x_start, x_start, nan])
+    y = np.column_stack([y_bottom, y_bottom, y_top, y_top, y_bottom, nan])
+    return np.round(np.stack([x.ravel(), y.ravel()], axis=1), 3)
+
+
+@timed('create_tiled_2d_view')
+def create_tiled_2d_view(layout: Dict, stone_width_m: float, x_range: Tuple[float, float]) -> go.Figure:
+    """
+    Erstellt die Kachelansicht einer langen Mauer
+
+    Die ganze Mauer erscheint als Übersicht (Reihen als Bänder), einzelne
+    Steine nur im Ausschnitt x_range – jeweils eine Trace je Zone statt
+    eines Shapes je Stein. Sind im Ausschnitt mehr als MAX_DETAIL_STONES
+    Steine, bleibt es bei der Übersicht.
+
+    Args:
+        layout: Layout-Dictionary von get_stone_layout() bzw. calculate_all()
+        stone_width_m: Breite/Dicke des Steins in Metern
+        x_range: Ausschnitt (von, bis) in Metern
+
+    Returns:
+        Plotly Figure (x-Achse auf den Ausschnitt gesetzt)
+    """
+    index = layout_index(layout)
+    stone_height = layout['stone_height_m']
+    max_height = max(layout['start_height'], layout['end_height'], index.courses * stone_height)
+    x_min, x_max = x_range
+
+    fig = go.Figure()
+    bands = overview_bands(index)
+    for zone2, color, name in ((False, 'gainsboro', 'Übersicht'), (True, 'lightcyan', 'Übersicht Zone 2')):
+        mask = bands['zone2'] == zone2
+        if not mask.any():
+            continue
+        y_bottom = bands['y_bottom'][mask]
+        outline = _rect_outlines(bands['x_start'][mask], bands['x_end'][mask], y_bottom, y_bottom + stone_height)
+        fig.add_trace(go.Scatter(
+            x=outline[:, 0], y=outline[:, 1], fill='toself', fillcolor=color,
+            line={'color': 'gray', 'width': 1}, mode='lines', name=name, hoverinfo='skip'
+        ))
+
+    stones = detail_stones(index, x_min, x_max)
+    detail = 0 < stones['x_start'].size <= MAX_DETAIL_STONES
+    if detail:
+        for zone2, color, name in ((False, 'lightgray', 'Steine'), (True, 'lightblue', 'Steine Zone 2')):
+            mask = stones['zone2'] == zone2
+            if not mask.any():
+                continue
+            y_bottom = stones['y_bottom'][mask]
+            outline = _rect_outlines(stones['x_start'][mask], stones['x_end'][mask], y_bottom, y_bottom + stone_height)
+            fig.add_trace(go.Scatter(
+                x=outline[:, 0], y=outline[:, 1], fill='toself', fillcolor=color,
+                line={'color': 'black', 'width': 1}, mode='lines', name=name, hoverinfo='skip'
+            ))
+
+    openings = layout.get('openings', [])
+    if openings:
+        outline = _rect_outlines(*opening_arrays(openings))
+        fig.add_trace(go.Scatter(
+            x=outline[:, 0], y=outline[:, 1], fill='toself', fillcolor='white',
+            line={'color': 'red', 'width': 2, 'dash': 'dot'}, mode='lines', name='Öffnungen', hoverinfo='skip'
+        ))
+
+    if layout.get('is_two_zone', False):
+        fig.add_vline(x=layout['zone1_length'], line_dash='dash', line_color='red')
+
+    subtitle = (f'{stones["x_start"].size} Steine im Ausschnitt {x_min:.1f}–{x_max:.1f} m' if detail
+                else f'Ausschnitt zu groß für Einzelsteine (max. {MAX_DETAIL_STONES})')
+    fig.update_layout(
+        title={
+            'text': f'Seitenansicht (Kachelansicht, {index.stones} Steine gesamt)<br><sub>{subtitle}</sub>',
+            'x': 0.5,
+            'xanchor': 'center'
+        },
+        xaxis={'title': 'Länge (m)', 'showgrid': True, 'range': [x_min, x_max]},
+        yaxis={'title': 'Höhe (m)', 'showgrid': True, 'range': [-0.1, max_height + 0.1]},
+        width=900,
+        height=500,
+        plot_bgcolor='white',
+        showlegend=False
+    )
+
+    return fig
+
+
+@timed('create_3d_view')
 def create_3d_view(layout: Dict, stone_width_m: float) -> go.Figure:
     """
     Erstellt eine 3D-Ansicht der Mauer mit einzelnen Steinen als Quader
@@ -264,6 +390,7 @@ def create_3d_view(layout: Dict, stone_width_m: float) -> go.Figure:
     
     vertex_offset = 0
     stone_count = 0
+    removed = _removed_stones(layout)
     
     # Begrenze Anzahl für Performance
     max_stones_to_render = 800
@@ -303,6 +430,10 @@ def create_3d_view(layout: Dict, stone_width_m: float) -> go.Figure:
             if current_height >= max_height_at_position:
                 continue
             
+            # Stein entfällt wegen einer Öffnung
+            if _is_removed(removed, row, stone_idx):
+                continue
+            
             # Quader-Eckpunkte
             z_bottom = current_height
             z_top = z_bottom + stone_height
@@ -377,6 +508,10 @@ def create_3d_view(layout: Dict, stone_width_m: float) -> go.Figure:
         )
     ])
     
+    # Öffnungen als Umrisse auf Vorder- und Rückseite
+    if layout.get('openings'):
+        fig.add_trace(_opening_outlines(layout['openings'], stone_width))
+    
     # Layout
     max_height = max(layout['start_height'], layout['end_height'])
     
@@ -409,6 +544,26 @@ def create_3d_view(layout: Dict, stone_width_m: float) -> go.Figure:
     return fig
 
 
+def _opening_outlines(openings: List[Dict], stone_width: float) -> go.Scatter3d:
+    """Umrisse der Öffnungen (ein Linienzug, Öffnungen durch None getrennt)"""
+    x0, x1, y0, y1 = opening_arrays(openings)
+    xs, ys, zs = [], [], []
+    for a, b, bottom, top in zip(x0.tolist(), x1.tolist(), y0.tolist(), y1.tolist()):
+        for side in (0.0, stone_width):
+            xs += [a, b, b, a, a, None]
+            ys += [side] * 5 + [None]
+            zs += [bottom, bottom, top, top, bottom, None]
+    return go.Scatter3d(
+        x=xs, y=ys, z=zs,
+        mode='lines',
+        line=dict(color='red', width=4),
+        name='Öffnungen',
+        showlegend=False,
+        hoverinfo='skip'
+    )
+
+
+@timed('create_top_view')
 def create_top_view(layout: Dict, stone_width_m: float) -> go.Figure:
     """
     Erstellt eine Draufsicht der Mauer (optional, zusätzlich)
@@ -462,6 +617,232 @@ def create_top_view(layout: Dict, stone_width_m: float) -> go.Figure:
     return fig
 
 
+@timed('create_network_plan_view')
+def create_network_plan_view(geometry: NetworkGeometry) -> go.Figure:
+    """
+    Erstellt den Grundriss eines Mauerzugs (alle Stücke in einer Trace)
+    
+    Args:
+        geometry: NetworkGeometry von network_geometry()
+        
+    Returns:
+        Plotly Figure
+    """
+    corners = footprints(geometry)
+    # Ein Linienzug für alle Stücke: 4 Ecken, zurück zur ersten, Trenner (NaN)
+    outline = np.concatenate([corners, corners[:, :1], np.full((len(corners), 1, 2), np.nan)], axis=1).reshape(-1, 2)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=outline[:, 0],
+        y=outline[:, 1],
+        fill='toself',
+        fillcolor='lightgray',
+        line={'color': 'black', 'width': 1},
+        mode='lines',
+        name='Mauerstücke',
+        hoverinfo='skip'
+    ))
+    
+    # Knoten nach Art
+    kinds = np.array(geometry.node_kind)
+    colors = {'end': 'gray', 'corner': 'blue', 'straight': 'green', 'junction': 'red'}
+    for kind, label in NODE_KINDS.items():
+        mask = kinds == kind
+        if not mask.any():
+            continue
+        fig.add_trace(go.Scatter(
+            x=geometry.points[mask, 0],
+            y=geometry.points[mask, 1],
+            mode='markers',
+            marker={'size': 8, 'color': colors[kind]},
+            name=f'{label} ({int(mask.sum())})',
+            hoverinfo='name'
+        ))
+    
+    fig.update_layout(
+        title={
+            'text': f'Grundriss des Mauerzugs<br><sub>{len(geometry.names)} Mauerstücke, '
+                    f'{geometry.length.sum():.2f} m gerechnete Länge</sub>',
+            'x': 0.5,
+            'xanchor': 'center'
+        },
+        xaxis={'title': 'x (m)', 'showgrid': True, 'scaleanchor': 'y', 'scaleratio': 1},
+        yaxis={'title': 'y (m)', 'showgrid': True},
+        width=900,
+        height=600,
+        plot_bgcolor='white'
+    )
+    
+    return fig
+
+
+# Dreiecke eines Quaders (Ecken 0-3 unten, 4-7 oben, wie in create_3d_view)
+_BOX_FACES = np.array([
+    [0, 1, 2], [0, 2, 3], [4, 6, 5], [4, 7, 6],
+    [0, 4, 5], [0, 5, 1], [2, 6, 7], [2, 7, 3],
+    [0, 3, 7], [0, 7, 4], [1, 5, 6], [1, 6, 2]
+])
+
+
+@timed('create_network_3d_view')
+def create_network_3d_view(geometry: NetworkGeometry) -> go.Figure:
+    """
+    Erstellt eine 3D-Ansicht des Mauerzugs (ein Mesh für alle Stücke)
+    
+    Jedes Stück ist ein Körper über seinem Grundrissrechteck mit Anfangs-
+    und Endhöhe; Eckpunkte und Dreiecke aller Stücke liegen in
+    gemeinsamen Arrays.
+    
+    Args:
+        geometry: NetworkGeometry von network_geometry()
+        
+    Returns:
+        Plotly Figure
+    """
+    corners = footprints(geometry)
+    count = len(corners)
+    # Höhen der Ecken: Anfang links, Ende links, Ende rechts, Anfang rechts
+    top = np.stack([geometry.start_height, geometry.end_height,
+                    geometry.end_height, geometry.start_height], axis=1)
+    vertices = np.concatenate([
+        np.concatenate([corners, np.zeros((count, 4, 1))], axis=2),
+        np.concatenate([corners, top[:, :, None]], axis=2)
+    ], axis=1).reshape(-1, 3)
+    faces = (_BOX_FACES[None, :, :] + 8 * np.arange(count)[:, None, None]).reshape(-1, 3)
+    
+    fig = go.Figure(data=[
+        go.Mesh3d(
+            x=vertices[:, 0],
+            y=vertices[:, 1],
+            z=vertices[:, 2],
+            i=faces[:, 0],
+            j=faces[:, 1],
+            k=faces[:, 2],
+            color='lightgray',
+            opacity=0.9,
+            flatshading=True,
+            lighting=dict(ambient=0.6, diffuse=0.8, specular=0.2, roughness=0.5),
+            lightposition=dict(x=100, y=200, z=300),
+            hoverinfo='skip'
+        )
+    ])
+    
+    fig.update_layout(
+        title={
+            'text': f'3D-Ansicht des Mauerzugs<br><sub>{count} Mauerstücke</sub>',
+            'x': 0.5,
+            'xanchor': 'center'
+        },
+        scene=dict(
+            xaxis=dict(title='x (m)', backgroundcolor="white", gridcolor="lightgray"),
+            yaxis=dict(title='y (m)', backgroundcolor="white", gridcolor="lightgray"),
+            zaxis=dict(title='Höhe (m)', backgroundcolor="white", gridcolor="lightgray"),
+            aspectmode='data'
+        ),
+        width=900,
+        height=700,
+        margin=dict(l=0, r=0, t=40, b=0)
+    )
+    
+    return fig
+
+
+def create_sensitivity_heatmap(sweep) -> go.Figure:
+    """
+    Erstellt eine Heatmap der Gesamtkosten über zwei Preisachsen
+    
+    Args:
+        sweep: SweepResult von sensitivity.price_sweep() mit genau zwei Achsen
+        
+    Returns:
+        Plotly Figure
+    """
+    # Erste Achse = Zeilen (y), zweite Achse = Spalten (x)
+    (row_name, row_values), (col_name, col_values) = list(sweep.axes.items())
+    
+    fig = go.Figure(go.Heatmap(
+        x=col_values,
+        y=row_values,
+        z=sweep.total_cost,
+        colorscale='RdYlGn_r',
+        colorbar={'title': '€'},
+        hovertemplate=(
+            f"{SWEEP_LABELS[col_name]}: %{{x:.2f}}<br>"
+            f"{SWEEP_LABELS[row_name]}: %{{y:.2f}}<br>"
+            "Gesamtkosten: %{z:.2f} €<extra></extra>"
+        )
+    ))
+    
+    # Ausgangspunkt markieren
+    fig.add_trace(go.Scatter(
+        x=[sweep.base[col_name]],
+        y=[sweep.base[row_name]],
+        mode='markers',
+        marker={'symbol': 'x', 'size': 12, 'color': 'black'},
+        name='Aktuell',
+        hoverinfo='skip'
+    ))
+    
+    fig.update_layout(
+        title={'text': 'Gesamtkosten je Preiskombination', 'x': 0.5, 'xanchor': 'center'},
+        xaxis={'title': SWEEP_LABELS[col_name]},
+        yaxis={'title': SWEEP_LABELS[row_name]},
+        height=450,
+        showlegend=False
+    )
+    
+    return fig
+
+
+def create_tornado_chart(rows: List[Dict]) -> go.Figure:
+    """
+    Erstellt ein Tornado-Diagramm (Einfluss einzelner Parameter auf die Gesamtkosten)
+    
+    Args:
+        rows: Ergebnis von sensitivity.tornado() (größte Spannweite zuerst)
+        
+    Returns:
+        Plotly Figure
+    """
+    rows = list(reversed(rows))  # größter Balken oben
+    labels = [row['label'] for row in rows]
+    base_cost = rows[0]['base_cost'] if rows else 0.0
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=labels,
+        x=[row['low_cost'] - base_cost for row in rows],
+        base=base_cost,
+        orientation='h',
+        name='Niedrig',
+        marker_color='#27ae60',
+        customdata=[row['low_value'] for row in rows],
+        hovertemplate="%{y} = %{customdata:.2f}<br>Gesamtkosten: %{x:.2f} €<extra></extra>"
+    ))
+    fig.add_trace(go.Bar(
+        y=labels,
+        x=[row['high_cost'] - base_cost for row in rows],
+        base=base_cost,
+        orientation='h',
+        name='Hoch',
+        marker_color='#e74c3c',
+        customdata=[row['high_value'] for row in rows],
+        hovertemplate="%{y} = %{customdata:.2f}<br>Gesamtkosten: %{x:.2f} €<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title={'text': 'Einfluss auf die Gesamtkosten', 'x': 0.5, 'xanchor': 'center'},
+        barmode='overlay',
+        xaxis={'title': 'Gesamtkosten (€)'},
+        height=350,
+        plot_bgcolor='white'
+    )
+    fig.add_vline(x=base_cost, line_dash='dash', line_color='grey')
+    
+    return fig
+
+
 def should_show_performance_warning(layout: Dict) -> Tuple[bool, str]:
     """
     Prüft ob eine Performance-Warnung angezeigt werden soll
@@ -0,0 +1,282 @@
+"""
+Mauerzüge im Grundriss: gerade Mauerstücke mit Ecken und Anschlüssen
+
+Ein Mauerzug (L-, U-Form oder verzweigt) besteht aus geraden Mauerstücken
+zwischen zwei Punkten auf der Mauerachse. Fallen Endpunkte zusammen, bilden
+sie einen Knoten: Ende (ein Stück), Ecke oder Stoß (zwei Stücke) bzw.
+Anschluss (T- oder Kreuzung, drei und mehr Stücke). Eine durchlaufende
+Mauer wird am Anschluss in zwei Stücke geteilt.
+
+Mit Achsmaßen ist eine Ecke genau einmal gezählt: das eine Stück deckt die
+Hälfte des Eckquadrats (Wandstärke × Wandstärke) ab, das andere die andere
+Hälfte. An einem Anschluss mit n Stücken wäre das Quadrat dagegen n/2-mal
+gezählt; die Stücke werden dort zusammen um (n - 2) × Wandstärke / 2
+gekürzt (gleichmäßig auf die Stücke verteilt, rechtwinklig angenommen).
+Die gekürzten Stücke werden als Projekt (project.aggregate_walls)
+berechnet, Zement, Kies und Stäbe also erst für den ganzen Mauerzug
+gerundet.
+
+Knoten, Grade und Kürzungen werden für alle Stücke als Arrays bestimmt;
+auch Mauerzüge mit Hunderten Stücken sind in Millisekunden gerechnet.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_calculations import batch_quantities, stone_arrays, wall_geometry
+from config_store import consistent_config
+from project import ProjectResult, aggregate_walls
+
+
+# Endpunkte näher als 1 mm bilden einen Knoten
+NODE_TOLERANCE_M = 0.001
+
+# Knotenarten: Schlüssel → Bezeichnung
+NODE_KINDS = {
+    'end': 'Ende',
+    'corner': 'Ecke',
+    'straight': 'Stoß',
+    'junction': 'Anschluss'
+}
+
+# Zwei Stücke gelten als gerade durchlaufend bis ca. 2,5° Knick
+STRAIGHT_COSINE = -0.999
+
+
+@dataclass(frozen=True)
+class NetworkGeometry:
+    """Knoten und Mauerstücke eines Mauerzugs (Arrays je Knoten bzw. Stück)"""
+
+    # Knoten: Koordinaten (Knoten × 2), Anzahl Stücke, Art (siehe NODE_KINDS)
+    points: np.ndarray
+    degree: np.ndarray
+    node_kind: Tuple[str, ...]
+    # Stücke: Knotenindex am Anfang und Ende, Richtung (Einheitsvektor)
+    start_node: np.ndarray
+    end_node: np.ndarray
+    direction: np.ndarray
+    # Achslänge, Kürzung an Anfang und Ende, gerechnete Länge
+    axis_length: np.ndarray
+    trim_start: np.ndarray
+    trim_end: np.ndarray
+    length: np.ndarray
+    # Höhen an den gekürzten Enden, Wandstärke in Metern
+    start_height: np.ndarray
+    end_height: np.ndarray
+    width_m: np.ndarray
+    stone_types: Tuple[str, ...]
+    names: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class NetworkResult:
+    """Mengen eines Mauerzugs"""
+
+    geometry: NetworkGeometry
+    # Projekt aus den gekürzten Stücken (Summen erst für den Mauerzug gerundet)
+    project: ProjectResult
+    # Steine, wenn jedes Stück mit seiner Achslänge gezählt würde
+    uncorrected_stones: int
+
+    @property
+    def saved_stones(self) -> int:
+        """An Anschlüssen nicht doppelt gezählte Steine"""
+        return self.uncorrected_stones - self.project.totals['stones']
+
+
+def network_geometry(segments: Sequence[Dict], stone_type: Optional[str] = None) -> NetworkGeometry:
+    """
+    Knoten, Anschlüsse und gekürzte Längen eines Mauerzugs
+
+    Args:
+        segments: Je Stück start und end ((x, y) in Metern, Mauerachse),
+            start_height, optional end_height (Standard: start_height),
+            stone_type und name
+        stone_type: Steintyp für Stücke ohne eigenen stone_type
+
+    Returns:
+        NetworkGeometry
+
+    Raises:
+        ValueError: bei leerem Mauerzug, Stücken ohne Länge, fehlendem
+            Steintyp oder Stücken, die kürzer als ihre Anschlüsse sind
+    """
+    if not segments:
+        raise ValueError("Mauerzug enthält keine Mauerstücke!")
+
+    names = tuple(segment.get('name') or f"Stück {number}" for number, segment in enumerate(segments, start=1))
+    types = tuple(segment.get('stone_type') or stone_type for segment in segments)
+    if None in types:
+        raise ValueError(f"{names[types.index(None)]}: Steintyp fehlt!")
+
+    start = np.array([segment['start'] for segment in segments], dtype=float).reshape(-1, 2)
+    end = np.array([segment['end'] for segment in segments], dtype=float).reshape(-1, 2)
+    start_height = np.array([segment['start_height'] for segment in segments], dtype=float)
+    end_height = np.array([segment.get('end_height', segment['start_height']) for segment in segments], dtype=float)
+
+    axis = end - start
+    axis_length = np.hypot(axis[:, 0], axis[:, 1])
+    short = np.flatnonzero(axis_length < NODE_TOLERANCE_M)
+    if short.size:
+        raise ValueError(f"{names[short[0]]}: Anfang und Ende fallen zusammen!")
+    direction = axis / axis_length[:, None]
+
+    stones = stone_arrays(sorted(set(types)))
+    type_index = {key: index for index, key in enumerate(stones.keys)}
+    width_m = stones.width_cm[[type_index[key] for key in types]] / 100
+
+    # Knoten: Endpunkte auf 1 mm gerastert zusammenfassen
+    count = len(segments)
+    ends = np.concatenate([start, end])
+    grid = np.round(ends / NODE_TOLERANCE_M).astype(np.int64)
+    _, first, node = np.unique(grid, axis=0, return_index=True, return_inverse=True)
+    node = node.ravel()
+    points = ends[first]
+    degree = np.bincount(node, minlength=len(points))
+
+    # Anschluss mit n Stücken: zusammen (n - 2) × Wandstärke / 2, je Stück ein n-tel
+    node_width = np.zeros(len(points))
+    np.maximum.at(node_width, node, np.concatenate([width_m, width_m]))
+    trim = np.maximum(degree - 2, 0) * node_width / (2 * degree)
+    trim_start, trim_end = trim[node[:count]], trim[node[count:]]
+    length = axis_length - trim_start - trim_end
+    too_short = np.flatnonzero(length <= NODE_TOLERANCE_M)
+    if too_short.size:
+        raise ValueError(f"{names[too_short[0]]}: kürzer als die Wandstärke der Anschlüsse!")
+
+    # Höhen an den gekürzten Enden (Gefälle entlang der Achse)
+    slope = (end_height - start_height) / axis_length
+    trimmed_start_height = start_height + slope * trim_start
+    trimmed_end_height = end_height - slope * trim_end
+
+    return NetworkGeometry(
+        points=points,
+        degree=degree,
+        node_kind=_node_kinds(node, degree, np.concatenate([direction, -direction])),
+        start_node=node[:count],
+        end_node=node[count:],
+        direction=direction,
+        axis_length=axis_length,
+        trim_start=trim_start,
+        trim_end=trim_end,
+        length=length,
+        start_height=trimmed_start_height,
+        end_height=trimmed_end_height,
+        width_m=width_m,
+        stone_types=types,
+        names=names
+    )
+
+
+def _node_kinds(node: np.ndarray, degree: np.ndarray, outward: np.ndarray) -> Tuple[str, ...]:
+    """Knotenart aus Grad und (bei zwei Stücken) dem Winkel zwischen den Stücken"""
+    # Stückenden nach Knoten sortiert: die Enden eines Knotens liegen hintereinander
+    order = np.argsort(node, kind='stable')
+    first = np.cumsum(degree) - degree
+    pair = first[degree == 2]
+    cosine = np.einsum('ij,ij->i', outward[order[pair]], outward[order[np.minimum(pair + 1, len(order) - 1)]])
+
+    kinds = np.where(degree >= 3, 'junction', np.where(degree == 1, 'end', 'corner')).astype(object)
+    kinds[np.flatnonzero(degree == 2)[cosine < STRAIGHT_COSINE]] = 'straight'
+    return tuple(kinds.tolist())
+
+
+@consistent_config
+def aggregate_network(
+    segments: Sequence[Dict],
+    stone_type: Optional[str] = None,
+    cement_price: Optional[float] = None,
+    gravel_price: Optional[float] = None,
+    stone_price: Optional[float] = None,
+    rebar_price: Optional[float] = None
+) -> NetworkResult:
+    """
+    Berechnet einen Mauerzug mit Ecken und Anschlüssen
+
+    Args:
+        segments: Mauerstücke wie für network_geometry()
+        stone_type: Steintyp für Stücke ohne eigenen stone_type
+        cement_price, gravel_price, stone_price, rebar_price: Preise wie
+            für aggregate_walls()
+
+    Returns:
+        NetworkResult (project.per_wall in der Reihenfolge der Stücke)
+
+    Raises:
+        ValueError: bei ungültigem Mauerzug (siehe network_geometry())
+    """
+    geometry = network_geometry(segments, stone_type)
+    walls = [
+        {
+            'name': name,
+            'length': length,
+            'start_height': start,
+            'end_height': end,
+            'width': width * 100,
+            'stone_type': key
+        }
+        for name, length, start, end, width, key in zip(
+            geometry.names, geometry.length.tolist(), geometry.start_height.tolist(),
+            geometry.end_height.tolist(), geometry.width_m.tolist(), geometry.stone_types
+        )
+    ]
+    project = aggregate_walls(walls, cement_price=cement_price, gravel_price=gravel_price,
+                              stone_price=stone_price, rebar_price=rebar_price)
+
+    # Vergleich: jedes Stück mit Achslänge und ursprünglichen Höhen
+    stones = stone_arrays(sorted(set(geometry.stone_types)))
+    type_index = {key: index for index, key in enumerate(stones.keys)}
+    types = np.array([type_index[key] for key in geometry.stone_types])
+    slope = (geometry.end_height - geometry.start_height) / geometry.length
+    uncorrected = batch_quantities(
+        wall_geometry(geometry.axis_length,
+                      geometry.start_height - slope * geometry.trim_start,
+                      geometry.end_height + slope * geometry.trim_end),
+        stones.stones_per_m2[types], stones.fill_liters[types], stones.height_m[types]
+    )
+
+    return NetworkResult(
+        geometry=geometry,
+        project=project,
+        uncorrected_stones=int(uncorrected['stones'].sum())
+    )
+
+
+def footprints(geometry: NetworkGeometry) -> np.ndarray:
+    """
+    Grundrissrechtecke der Stücke für die Darstellung
+
+    An Ecken und Anschlüssen wird jedes Stück um die halbe Wandstärke
+    verlängert, damit sich die Rechtecke ohne Lücke überlappen.
+
+    Returns:
+        Array (Stücke × 4 Ecken × 2): Anfang links, Ende links, Ende
+        rechts, Anfang rechts
+    """
+    extend_start = np.where(geometry.degree[geometry.start_node] >= 2, geometry.width_m / 2, 0.0)
+    extend_end = np.where(geometry.degree[geometry.end_node] >= 2, geometry.width_m / 2, 0.0)
+    start = geometry.points[geometry.start_node] - geometry.direction * extend_start[:, None]
+    end = geometry.points[geometry.end_node] + geometry.direction * extend_end[:, None]
+    normal = np.stack([-geometry.direction[:, 1], geometry.direction[:, 0]], axis=1) * (geometry.width_m / 2)[:, None]
+    return np.stack([start + normal, end + normal, end - normal, start - normal], axis=1)
+
+
+def segment_rows(result: NetworkResult) -> List[Dict]:
+    """Tabellenzeilen je Mauerstück (Achslänge, gerechnete Länge, Mengen)"""
+    geometry = result.geometry
+    per_wall = result.project.per_wall
+    return [
+        {
+            'Stück': name,
+            'Achslänge (m)': round(float(axis), 2),
+            'Gerechnet (m)': round(float(length), 2),
+            'Steine': int(stones),
+            'Beton (m³)': round(float(volume), 3)
+        }
+        for name, axis, length, stones, volume in zip(
+            geometry.names, geometry.axis_length, geometry.length,
+            per_wall['stones'], per_wall['volume_with_buffer_m3']
+        )
+    ]